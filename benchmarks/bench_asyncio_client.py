@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+from bench_util import *
+from ib_tws_server.asyncio.client_pool import AsyncioClientPool
+from ib_tws_server.asyncio.historical_pacing import HistoricalPacingGovernor
+from ib_tws_server.asyncio.rate_limiter import TokenBucketRateLimiter, UnlimitedRateLimiter
+from ib_tws_server.asyncio.ib_writer import IBWriter
+from ib_tws_server.gen.asyncio_client import AsyncioClient
+from ib_tws_server.mock.contracts import contract_for_symbol
+from ib_tws_server.mock.tws_server import MockTwsConfig, MockTwsServer
+import logging
+import sys
+
+"""
+Measures the throughput and latency of AsyncioClient against the mock TWS server, or against
+a running TWS/Gateway when --port is given. Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_asyncio_client.py
+"""
+
+logger = logging.getLogger()
+
+SYMBOLS = [ "AMZN", "AAPL", "MSFT", "GOOG", "TSLA", "NFLX", "NVDA", "INTC" ]
+
+async def bench_queries(c: AsyncioClient, num_requests: int, concurrency: int):
+    # Requests without a request id can only have one request in flight
+    (await run_concurrently("reqCurrentTime", num_requests, 1, lambda: c.reqCurrentTime())).report()
+    n = 0
+    def contract_details():
+        nonlocal n
+        n += 1
+        return c.reqContractDetails(contract_for_symbol(SYMBOLS[n % len(SYMBOLS)]))
+    (await run_concurrently("reqContractDetails", num_requests, concurrency, contract_details)).report()
+    def historical_data():
+        nonlocal n
+        n += 1
+        return c.reqHistoricalData(contract_for_symbol(SYMBOLS[n % len(SYMBOLS)]), "", "1 D", "1 min", "TRADES", 0, 2, [])
+    (await run_concurrently("reqHistoricalData", num_requests // 10, concurrency, historical_data)).report()
+
+async def bench_stream(name: str, subscribe, num_subscriptions: int, duration: float):
+    recorder = RateRecorder(f"{name} ({num_subscriptions} subscriptions)")
+
+    async def consume(gen):
+        async for _ in gen:
+            recorder.count += 1
+
+    gens = [ await subscribe(contract_for_symbol(SYMBOLS[i % len(SYMBOLS)])) for i in range(num_subscriptions) ]
+    tasks = [ asyncio.create_task(consume(g)) for g in gens ]
+    recorder.start()
+    await asyncio.sleep(duration)
+    recorder.stop()
+    for t in tasks:
+        t.cancel()
+    for g in gens:
+        await g.aclose()
+    recorder.report()
+
+async def main_loop(c: AsyncioClient, args):
+    await bench_queries(c, args.num_requests, args.concurrency)
+    for n in [ 1, args.subscriptions ]:
+        await bench_stream("reqTickByTickData BidAsk", lambda contract: c.reqTickByTickData(contract, "BidAsk", 0, False), n, args.duration)
+        await bench_stream("reqMktData", lambda contract: c.reqMktDataAsSubscription(contract, "", False, []), n, args.duration)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="AsyncioClient throughput and latency benchmark")
+    parser.add_argument("--host", "-t", dest='host', help="TWS/Gateway host. Starts a mock TWS server when --port is not given", default="127.0.0.1")
+    parser.add_argument("--port", "-p", dest='port', type=int, help="TWS/Gateway port", default=None)
+    parser.add_argument("--num-requests", "-n", dest='num_requests', type=int, help="Requests per query benchmark", default=2000)
+    parser.add_argument("--concurrency", "-c", dest='concurrency', type=int, help="Requests in flight for the concurrent benchmarks", default=50)
+    parser.add_argument("--subscriptions", "-s", dest='subscriptions', type=int, help="Concurrent subscriptions for the streaming benchmarks", default=8)
+    parser.add_argument("--duration", dest='duration', type=float, help="Seconds to run each streaming benchmark", default=3)
+    parser.add_argument("--tick-rate", dest='tick_rate', type=float, help="Mock server ticks per second per subscription, 0 for unthrottled", default=1000)
+    parser.add_argument("--rate-limit", dest='rate_limit', action="store_true", help="Keep the TWS message rate limit and pacing rules", default=False)
+    parser.add_argument("--pool-size", dest='pool_size', type=int, help="Connections of an AsyncioClientPool, 1 to use a single AsyncioClient", default=1)
+    args = parser.parse_args()
+    logging.basicConfig(stream=sys.stdout, level=logging.WARN)
+
+    server = None
+    port = args.port
+    if port is None:
+        server = MockTwsServer(MockTwsConfig(tick_rate=args.tick_rate))
+        server.start_in_thread()
+        port = server.port
+
+    if args.rate_limit:
+        historical_pacing = HistoricalPacingGovernor()
+        client_factory = lambda: AsyncioClient(TokenBucketRateLimiter(IBWriter.MAX_REQS_PER_SECOND), historical_pacing=historical_pacing)
+    else:
+        # The mock server doesn't enforce the TWS limits, so measure the client overhead alone
+        historical_pacing = HistoricalPacingGovernor(0, 0, sys.maxsize, 0, sys.maxsize)
+        client_factory = lambda: AsyncioClient(UnlimitedRateLimiter(), historical_pacing=historical_pacing)
+    c = AsyncioClientPool(args.pool_size, client_factory) if args.pool_size > 1 else client_factory()
+    c.start(args.host, port, 0, 0)
+    try:
+        asyncio.run(main_loop(c, args))
+    finally:
+        c.disconnect(True)
+        if server is not None:
+            server.stop_thread()
@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+from bench_util import *
+import json
+import logging
+import os
+import sys
+
+"""
+Measures the throughput and latency of the GraphQL server application against the mock TWS server,
+or against a running TWS/Gateway when --port is given. The application is driven in-process through
+the ASGI interface so the numbers exclude the HTTP server. Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_graphql.py
+"""
+
+logger = logging.getLogger()
+
+CONTRACT = '{ symbol: "%s", secType: "STK", exchange: "SMART", currency: "USD" }'
+SYMBOLS = [ "AMZN", "AAPL", "MSFT", "GOOG", "TSLA", "NFLX", "NVDA", "INTC" ]
+
+class AsgiDriver():
+    """
+    Runs the lifespan protocol of an ASGI application and issues in-process HTTP requests
+    """
+    def __init__(self, app):
+        self.app = app
+        self._lifespan_in: asyncio.Queue = None
+        self._lifespan_out: asyncio.Queue = None
+        self._lifespan_task: asyncio.Task = None
+
+    async def startup(self):
+        self._lifespan_in = asyncio.Queue()
+        self._lifespan_out = asyncio.Queue()
+        self._lifespan_task = asyncio.create_task(self.app({ "type": "lifespan", "asgi": { "version": "3.0" } }, self._lifespan_in.get, self._lifespan_out.put))
+        await self._lifespan_in.put({ "type": "lifespan.startup" })
+        msg = await self._lifespan_out.get()
+        if msg["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"Startup failed {msg}")
+
+    async def shutdown(self):
+        await self._lifespan_in.put({ "type": "lifespan.shutdown" })
+        await self._lifespan_out.get()
+        await self._lifespan_task
+
+    async def post(self, body: bytes) -> (int, bytes):
+        scope = {
+            "type": "http",
+            "asgi": { "version": "3.0" },
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/",
+            "raw_path": b"/",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [ (b"host", b"localhost"), (b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()) ],
+            "client": ("127.0.0.1", 0),
+            "server": ("127.0.0.1", 80)
+        }
+        sent = False
+        async def receive():
+            nonlocal sent
+            if sent:
+                # Wait for the response like a connected client would
+                await asyncio.Event().wait()
+            sent = True
+            return { "type": "http.request", "body": body, "more_body": False }
+
+        status = None
+        response = []
+        async def send(msg):
+            nonlocal status
+            if msg["type"] == "http.response.start":
+                status = msg["status"]
+            elif msg["type"] == "http.response.body":
+                response.append(msg.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(response)
+
+    async def query(self, query: str, persisted: bool = False) -> dict:
+        if persisted:
+            # Send the hash of the query alone, and the query too if the server doesn't know it yet
+            extensions = { "persistedQuery": { "version": 1, "sha256Hash": operation_hash(query) } }
+            status,body = await self.post(json.dumps({ "extensions": extensions }).encode())
+            res = json.loads(body)
+            if "errors" in res and res["errors"][0].get("extensions", {}).get("code") == PERSISTED_QUERY_NOT_FOUND:
+                status,body = await self.post(json.dumps({ "query": query, "extensions": extensions }).encode())
+                res = json.loads(body)
+        else:
+            status,body = await self.post(json.dumps({ "query": query }).encode())
+            res = json.loads(body)
+        if status != 200 or "errors" in res:
+            raise RuntimeError(f"Query failed with status {status}: {body}")
+        return res["data"]
+
+async def main_loop(driver: AsgiDriver, server: 'MockTwsServer', args):
+    await driver.startup()
+    try:
+        (await run_concurrently("ib_reqCurrentTime", args.num_requests, 1, lambda: driver.query("{ ib_reqCurrentTime }"))).report()
+        n = 0
+        def contract_details():
+            nonlocal n
+            n += 1
+            return driver.query("{ ib_reqContractDetails(contract: %s) { contract { conId } longName } }" % (CONTRACT % SYMBOLS[n % len(SYMBOLS)]))
+        (await run_concurrently("ib_reqContractDetails", args.num_requests, args.concurrency, contract_details)).report()
+        def persisted_contract_details():
+            nonlocal n
+            n += 1
+            return driver.query("{ ib_reqContractDetails(contract: %s) { contract { conId } longName } }" % (CONTRACT % SYMBOLS[n % len(SYMBOLS)]), True)
+        (await run_concurrently("ib_reqContractDetails by hash", args.num_requests, args.concurrency, persisted_contract_details)).report()
+        def historical_data():
+            nonlocal n
+            n += 1
+            return driver.query('{ ib_reqHistoricalData(contract: %s, endDateTime: "", durationStr: "1 D", barSizeSetting: "1 min", whatToShow: "TRADES", useRTH: 0, formatDate: 2, chartOptions: []) { date open high low close volume } }' % (CONTRACT % SYMBOLS[n % len(SYMBOLS)]))
+        (await run_concurrently("ib_reqHistoricalData", args.num_requests // 10, args.concurrency, historical_data)).report()
+        # One operation that asks for the contract details of many contracts, some of them repeatedly
+        fields = " ".join([ "c%d: ib_reqContractDetails(contract: %s) { contract { conId } }" % (i, CONTRACT % SYMBOLS[i % len(SYMBOLS)]) for i in range(args.fields_per_query) ])
+        received = server.requests_received if server is not None else None
+        stats = await run_concurrently(f"{args.fields_per_query} x ib_reqContractDetails", args.num_requests // 100, 1, lambda: driver.query("{ %s }" % fields))
+        stats.report()
+        if received is not None:
+            print(f"TWS requests per operation: {(server.requests_received - received) / (args.num_requests // 100):.1f}")
+    finally:
+        await driver.shutdown()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="GraphQL server throughput and latency benchmark")
+    parser.add_argument("--host", "-t", dest='host', help="TWS/Gateway host. Starts a mock TWS server when --port is not given", default="127.0.0.1")
+    parser.add_argument("--port", "-p", dest='port', type=int, help="TWS/Gateway port", default=None)
+    parser.add_argument("--num-requests", "-n", dest='num_requests', type=int, help="Requests per query benchmark", default=1000)
+    parser.add_argument("--concurrency", "-c", dest='concurrency', type=int, help="Requests in flight for the concurrent benchmarks", default=50)
+    parser.add_argument("--fields-per-query", dest='fields_per_query', type=int, help="Contract details fields of the batched query benchmark", default=200)
+    parser.add_argument("--rate-limit", dest='rate_limit', action="store_true", help="Keep the TWS message rate limit and pacing rules", default=False)
+    args = parser.parse_args()
+    logging.basicConfig(stream=sys.stdout, level=logging.WARN)
+
+    from ib_tws_server.asyncio.historical_pacing import HistoricalPacingGovernor
+    from ib_tws_server.asyncio.rate_limiter import UnlimitedRateLimiter
+    from ib_tws_server.gen.asyncio_client import AsyncioClient
+    from ib_tws_server.mock.tws_server import MockTwsServer
+    server = None
+    port = args.port
+    if port is None:
+        server = MockTwsServer()
+        server.start_in_thread()
+        port = server.port
+
+    # The server entry point reads the TWS address from the environment when the application starts
+    os.environ['IB_SERVER_HOST'] = args.host
+    os.environ['IB_SERVER_PORT'] = str(port)
+    from ib_tws_server.graphql.server_entry import create_app
+    from ib_tws_server.graphql.persisted_operations import PERSISTED_QUERY_NOT_FOUND, operation_hash
+    if args.rate_limit:
+        client_factory = AsyncioClient
+    else:
+        # The mock server doesn't enforce the TWS limits, so measure the server overhead alone
+        client_factory = lambda: AsyncioClient(UnlimitedRateLimiter(), historical_pacing=HistoricalPacingGovernor(0, 0, sys.maxsize, 0, sys.maxsize))
+    try:
+        asyncio.run(main_loop(AsgiDriver(create_app(client_factory)), server, args))
+    finally:
+        if server is not None:
+            server.stop_thread()
@@ -0,0 +1,75 @@
+import argparse
+from datetime import datetime, timezone
+from ib_tws_server.ib_imports import *
+from ib_tws_server.util.historical_columns import HistoricalBarColumns
+import numpy
+import time
+import tracemalloc
+from typing import Iterator, List, Tuple
+
+"""
+Compares collecting historical bars in a list and converting them to a numpy array afterwards
+with accumulating them into HistoricalBarColumns, as reqHistoricalData and reqHistoricalDataColumnar
+do. Bars are created one at a time like the TWS API decoder does. Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_historical_columns.py
+"""
+
+START = 1577836800
+
+def bar_fields(num_bars: int) -> List[Tuple[str, float]]:
+    # One minute bars, 390 per trading day
+    ret = []
+    for i in range(num_bars):
+        t = START + (i // 390) * 86400 + 34200 + (i % 390) * 60
+        ret.append((datetime.fromtimestamp(t, timezone.utc).strftime("%Y%m%d %H:%M:%S"), 100.0 + i % 100))
+    return ret
+
+def bars(fields: List[Tuple[str, float]]) -> Iterator['ibapi.common.BarData']:
+    for date,price in fields:
+        b = ibapi.common.BarData()
+        b.date = date
+        b.open = b.high = b.low = b.close = b.average = price
+        b.volume = 100
+        b.barCount = 10
+        yield b
+
+def list_to_numpy(res: List['ibapi.common.BarData']) -> numpy.ndarray:
+    a = numpy.empty(len(res), dtype=[ ('time', 'datetime64[s]'), ('open', 'f8'), ('high', 'f8'), ('low', 'f8'), ('close', 'f8'), ('volume', 'f8'), ('barCount', 'i8'), ('average', 'f8') ])
+    a['time'] = [ datetime.strptime(b.date, "%Y%m%d %H:%M:%S") for b in res ]
+    for n in [ 'open', 'high', 'low', 'close', 'volume', 'barCount', 'average' ]:
+        a[n] = [ getattr(b, n) for b in res ]
+    return a
+
+def accumulate(fields: List[Tuple[str, float]], accumulator):
+    res = accumulator()
+    for b in bars(fields):
+        res.append(b)
+    return res
+
+def retained_bytes(fields: List[Tuple[str, float]], accumulator) -> int:
+    tracemalloc.start()
+    try:
+        res = accumulate(fields, accumulator)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def bench(name: str, fields: List[Tuple[str, float]], accumulator, to_numpy):
+    start = time.perf_counter()
+    res = accumulate(fields, accumulator)
+    accumulated = time.perf_counter()
+    a = to_numpy(res)
+    end = time.perf_counter()
+    print(f"{name:<24} {len(a):>8} bars {(accumulated - start) * 1000:>8.1f} ms accumulate {(end - accumulated) * 1000:>8.1f} ms to numpy {retained_bytes(fields, accumulator) / len(a):>8.1f} bytes/bar retained")
+
+def main(args):
+    fields = bar_fields(args.num_bars)
+    bench("list", fields, list, list_to_numpy)
+    bench("HistoricalBarColumns", fields, HistoricalBarColumns, HistoricalBarColumns.to_numpy)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Historical columns benchmark")
+    parser.add_argument("--num-bars", "-n", dest='num_bars', type=int, help="Bars per request", default=390 * 252)
+    args = parser.parse_args()
+    main(args)
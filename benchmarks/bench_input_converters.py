@@ -0,0 +1,64 @@
+import argparse
+from ib_tws_server.gen.graphql_resolver import convert_ContractInput, convert_OrderInput
+from ib_tws_server.ib_imports import *
+import time
+from typing import Any, Callable, Type
+
+"""
+Compares converting the GraphQL arguments of contracts and orders with dict_to_object, which is
+how resolver arguments were converted before and which doesn't convert nested objects, with the
+input converters generated from the GraphQL schema (ib_tws_server/gen/graphql_resolver.py). Run
+from the repository root after generating the code:
+
+    PYTHONPATH=. python benchmarks/bench_input_converters.py
+"""
+
+def dict_to_object(d: dict, cls: Type):
+    # How resolver arguments were converted before the input converters were generated
+    ret = cls()
+    for k,v in d.items():
+        ret.__setattr__(k, v)
+    return ret
+
+def contract_input() -> dict:
+    return {
+        'symbol': "SPY", 'secType': "BAG", 'exchange': "SMART", 'currency': "USD",
+        'comboLegs': [
+            { 'conId': 756733, 'ratio': 1, 'action': "BUY", 'exchange': "SMART" },
+            { 'conId': 412888950, 'ratio': 1, 'action': "SELL", 'exchange': "SMART" }
+        ]
+    }
+
+def order_input() -> dict:
+    return {
+        'action': "BUY", 'totalQuantity': 100, 'orderType': "LMT", 'lmtPrice': 412.5, 'tif': "DAY",
+        'account': "DU123456", 'outsideRth': True, 'transmit': True, 'algoStrategy': "Vwap",
+        'algoParams': [
+            { 'tag': "maxPctVol", 'value': "0.1" },
+            { 'tag': "startTime", 'value': "09:30:00 US/Eastern" },
+            { 'tag': "endTime", 'value': "16:00:00 US/Eastern" }
+        ]
+    }
+
+def bench(name: str, d: dict, convert: Callable[[dict], Any], num: int):
+    start = time.perf_counter()
+    for _ in range(num):
+        convert(d)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<48} {num:>8} inputs {elapsed * 1000:>10.2f} ms {elapsed / num * 1e6:>10.2f} us/input")
+
+def main(args):
+    contract = contract_input()
+    order = order_input()
+    bench("Contract dict_to_object", contract, lambda d: dict_to_object(d, ibapi.contract.Contract), args.num)
+    bench("Contract dict_to_object with combo legs", contract, lambda d: dict_to_object(dict(d, comboLegs=[ dict_to_object(l, ibapi.contract.ComboLeg) for l in d['comboLegs'] ]), ibapi.contract.Contract), args.num)
+    bench("Contract convert_ContractInput", contract, convert_ContractInput, args.num)
+    bench("Order dict_to_object", order, lambda d: dict_to_object(d, ibapi.order.Order), args.num)
+    bench("Order dict_to_object with algo params", order, lambda d: dict_to_object(dict(d, algoParams=[ dict_to_object(p, ibapi.tag_value.TagValue) for p in d['algoParams'] ]), ibapi.order.Order), args.num)
+    bench("Order convert_OrderInput", order, convert_OrderInput, args.num)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="GraphQL input converter benchmark")
+    parser.add_argument("--num", "-n", dest='num', type=int, help="Conversions per measurement", default=100000)
+    args = parser.parse_args()
+    main(args)
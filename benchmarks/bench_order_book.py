@@ -0,0 +1,93 @@
+import argparse
+from ib_tws_server.gen.client_responses import UpdateMktDepth
+from ib_tws_server.util.order_book import OrderBook, OPERATION_DELETE, OPERATION_INSERT, OPERATION_UPDATE
+import random
+import time
+from typing import Callable, List
+
+"""
+Compares maintaining an order book from UpdateMktDepth responses in lists of row objects, as
+consumers of reqMktDepth do, with the array backed OrderBook that reqMktDepthAsOrderBook
+maintains. Reports updates/s without readers, with a reader that reads the mid and spread after
+every update, and with readers that take a top 5 snapshot after every update. Run from the
+repository root:
+
+    PYTHONPATH=. python benchmarks/bench_order_book.py
+"""
+
+def updates(num_updates: int, num_rows: int) -> List[UpdateMktDepth]:
+    rng = random.Random(1)
+    counts = [ 0, 0 ]
+    ret = []
+    for _ in range(num_updates):
+        side = rng.randint(0, 1)
+        n = counts[side]
+        op = rng.choice([ OPERATION_INSERT, OPERATION_UPDATE, OPERATION_UPDATE, OPERATION_UPDATE, OPERATION_DELETE ]) if n > 0 else OPERATION_INSERT
+        if op == OPERATION_INSERT and n == num_rows:
+            op = OPERATION_UPDATE
+        position = rng.randint(0, n if op == OPERATION_INSERT else n - 1)
+        counts[side] += 1 if op == OPERATION_INSERT else -1 if op == OPERATION_DELETE else 0
+        ret.append(UpdateMktDepth(position, op, side, 100.0 + rng.random(), rng.randint(1, 10)))
+    return ret
+
+class ListOrderBook():
+    def __init__(self, num_rows: int):
+        self.sides = [ [], [] ]
+        self.version = 0
+
+    def apply(self, u: UpdateMktDepth):
+        rows = self.sides[u.side]
+        if u.operation == OPERATION_INSERT:
+            rows.insert(u.position, UpdateMktDepth(u.position, u.operation, u.side, u.price, u.size))
+        elif u.operation == OPERATION_UPDATE:
+            rows[u.position] = UpdateMktDepth(u.position, u.operation, u.side, u.price, u.size)
+        else:
+            del rows[u.position]
+        self.version += 1
+
+    def mid_spread(self):
+        bids,asks = self.sides[1],self.sides[0]
+        if len(bids) == 0 or len(asks) == 0:
+            return None,None
+        return (bids[0].price + asks[0].price) / 2, asks[0].price - bids[0].price
+
+    def snapshot(self, n: int):
+        return ([ (r.price, r.size) for r in self.sides[1][:n] ], [ (r.price, r.size) for r in self.sides[0][:n] ])
+
+def bench(name: str, book, events: List[UpdateMktDepth], read: Callable[[object], None]):
+    start = time.perf_counter()
+    for u in events:
+        book.apply(u)
+        read(book)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<36} {len(events):>8} updates {len(events) / elapsed:>12.0f} updates/s")
+
+def no_reader(book):
+    pass
+
+def mid_spread(book):
+    if isinstance(book, OrderBook):
+        book.mid()
+        book.spread()
+    else:
+        book.mid_spread()
+
+def snapshots(num_readers: int) -> Callable[[object], None]:
+    def read(book):
+        for _ in range(num_readers):
+            book.snapshot(5)
+    return read
+
+def main(args):
+    events = updates(args.num_updates, args.num_rows)
+    for name,read in [ ("", no_reader), (" + mid/spread", mid_spread), (" + 1 top 5 snapshot", snapshots(1)), (f" + {args.num_readers} top 5 snapshots", snapshots(args.num_readers)) ]:
+        bench(f"list{name}", ListOrderBook(args.num_rows), events, read)
+        bench(f"OrderBook{name}", OrderBook(args.num_rows), events, read)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Order book benchmark")
+    parser.add_argument("--num-updates", "-n", dest='num_updates', type=int, help="Market depth updates", default=1000000)
+    parser.add_argument("--num-readers", dest='num_readers', type=int, help="Readers that take a snapshot after every update", default=4)
+    parser.add_argument("--num-rows", "-r", dest='num_rows', type=int, help="Rows per side", default=20)
+    args = parser.parse_args()
+    main(args)
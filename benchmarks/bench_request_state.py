@@ -0,0 +1,107 @@
+import argparse
+from bench_util import *
+from collections import defaultdict
+from ib_tws_server.asyncio.request_state import RequestState, RequestStateRegistry
+from threading import Lock, Thread
+
+"""
+Compares the lock-free RequestStateRegistry with the previous design, where a single lock guarded
+request id allocation, the request map and the subscription map. Request threads allocate ids and
+register requests while a reader thread completes them and looks up subscriptions, like the TWS
+reader thread does for every streaming update. Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_request_state.py
+"""
+
+class LockedRequestState():
+    """
+    The previous design, as used by the generated client and wrapper
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._current_request_id = 0
+        self._req_state = defaultdict(RequestState)
+        self._subscriptions = defaultdict(object)
+        self._subscriptions[0] = object()
+
+    def register(self, cb):
+        with self._lock:
+            self._current_request_id += 1
+            id = self._current_request_id
+        with self._lock:
+            self._req_state[id].cb = cb
+        return id
+
+    def complete(self, id):
+        cb = None
+        with self._lock:
+            if id in self._req_state:
+                cb = self._req_state[id].cb
+                del self._req_state[id]
+        if cb is not None:
+            cb(id)
+
+    def lookup_subscription(self, id):
+        with self._lock:
+            if id in self._subscriptions:
+                return self._subscriptions[id]
+        return None
+
+class RegistryRequestState():
+    def __init__(self):
+        self._registry = RequestStateRegistry()
+        self._req_state = self._registry.requests
+        self._subscriptions = self._registry.subscriptions
+        self._subscriptions[0] = object()
+
+    def register(self, cb):
+        id = self._registry.next_request_id()
+        self._req_state[id] = RequestState(cb)
+        return id
+
+    def complete(self, id):
+        s = self._req_state.pop(id, None)
+        if s is not None and s.cb is not None:
+            s.cb(id)
+
+    def lookup_subscription(self, id):
+        return self._subscriptions.get(id)
+
+def bench(name: str, state, num_threads: int, num_requests: int, updates_per_request: int):
+    recorder = RateRecorder(name)
+    completed = [ 0 ]
+    def cb(id):
+        completed[0] += 1
+
+    def request_thread():
+        for _ in range(num_requests):
+            state.register(cb)
+
+    def reader_thread():
+        id = 1
+        total = num_threads * num_requests
+        while id <= total:
+            for _ in range(updates_per_request):
+                state.lookup_subscription(0)
+            state.complete(id)
+            if completed[0] >= id:
+                id += 1
+
+    threads = [ Thread(target=request_thread) for _ in range(num_threads) ] + [ Thread(target=reader_thread) ]
+    recorder.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    recorder.stop()
+    recorder.count = num_threads * num_requests * (2 + updates_per_request)
+    recorder.report("ops")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Request state registry benchmark")
+    parser.add_argument("--threads", "-t", dest='threads', type=int, help="Threads issuing requests", default=8)
+    parser.add_argument("--num-requests", "-n", dest='num_requests', type=int, help="Requests per thread", default=50000)
+    parser.add_argument("--updates", "-u", dest='updates', type=int, help="Subscription lookups per request", default=10)
+    args = parser.parse_args()
+    bench("Single lock", LockedRequestState(), args.threads, args.num_requests, args.updates)
+    bench("RequestStateRegistry", RegistryRequestState(), args.threads, args.num_requests, args.updates)
@@ -0,0 +1,77 @@
+import argparse
+from bench_util import *
+from ib_tws_server.codegen.response_types_generator import ResponseClassStyle, ResponseTypesGenerator
+from ibapi.common import TickAttrib, TickAttribBidAsk
+import importlib.util
+import os
+import sys
+import tempfile
+import tracemalloc
+
+"""
+Compares the per tick construction time and memory of the response classes generated in the
+dataclass and tuple styles, for the high rate streaming callbacks. Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_response_classes.py
+"""
+
+def load_responses(style: ResponseClassStyle, output_dir: str):
+    filename = os.path.join(output_dir, f"client_responses_{style.value}.py")
+    ResponseTypesGenerator.generate(filename, style)
+    spec = importlib.util.spec_from_file_location(f"client_responses_{style.value}", filename)
+    module = importlib.util.module_from_spec(spec)
+    # dataclass resolves string annotations through sys.modules
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def tick_factories(m):
+    attrib = TickAttrib()
+    bid_ask_attrib = TickAttribBidAsk()
+    return {
+        "TickPrice": lambda i: m.TickPrice(tickType = 1,price = float(i),attrib = attrib),
+        "TickSize": lambda i: m.TickSize(tickType = 0,size = i),
+        "TickByTickBidAsk": lambda i: m.TickByTickBidAsk(time = i,bidPrice = 1.0,askPrice = 1.5,bidSize = 100,askSize = 200,tickAttribBidAsk = bid_ask_attrib),
+        "UpdateMktDepth": lambda i: m.UpdateMktDepth(position = 0,operation = 1,side = 0,price = float(i),size = 100)
+    }
+
+def bench_construction(name: str, factory, num_ticks: int):
+    recorder = RateRecorder(name)
+    recorder.start()
+    for i in range(num_ticks):
+        factory(i)
+    recorder.count = num_ticks
+    recorder.stop()
+    recorder.report("objects")
+
+def bytes_per_object(factory, num_objects: int) -> float:
+    """
+    Memory of the response objects themselves. Members are shared between the objects, and
+    the pointers held by the list are excluded
+    """
+    tracemalloc.start()
+    try:
+        objects = [ None ] * num_objects
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(num_objects):
+            objects[i] = factory(0)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / num_objects
+
+def main(args):
+    with tempfile.TemporaryDirectory() as output_dir:
+        modules = { s: load_responses(s, output_dir) for s in ResponseClassStyle }
+        for cls in tick_factories(modules[ResponseClassStyle.DATACLASS]):
+            for style,m in modules.items():
+                factory = tick_factories(m)[cls]
+                bench_construction(f"{cls} ({style.value})", factory, args.num_ticks)
+                print(f"{'':<48} {bytes_per_object(factory, args.num_objects):>8.1f} bytes/object")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Response class benchmark")
+    parser.add_argument("--num-ticks", "-n", dest='num_ticks', type=int, help="Objects constructed per benchmark", default=1000000)
+    parser.add_argument("--num-objects", dest='num_objects', type=int, help="Objects kept alive to measure their size", default=100000)
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,67 @@
+import argparse
+from ib_tws_server.ib_imports import *
+from ib_tws_server.util.object_to_json import object_to_json, object_to_json_bytes
+import json
+import time
+from typing import Any, Callable, List
+
+"""
+Compares encoding large responses to JSON with a default function that returns the __dict__
+of each object, which is how responses were encoded before, with the serializers generated
+from the GraphQL schema (ib_tws_server/gen/serializers.py). Run from the repository root
+after generating the code:
+
+    PYTHONPATH=. python benchmarks/bench_serializer.py
+"""
+
+def dict_default(o):
+    if isinstance(o, set):
+        return list(o)
+    return o.__dict__
+
+def bars(num_bars: int) -> List['ibapi.common.BarData']:
+    ret = []
+    for i in range(num_bars):
+        b = ibapi.common.BarData()
+        b.date = f"20200102 {9 + i // 60 % 7:02d}:{i % 60:02d}:00"
+        b.open = b.high = b.low = b.close = b.average = 100.0 + i % 100
+        b.volume = 100
+        b.barCount = 10
+        ret.append(b)
+    return ret
+
+def contract_details(num: int) -> List['ibapi.contract.ContractDetails']:
+    ret = []
+    for i in range(num):
+        d = ibapi.contract.ContractDetails()
+        d.contract.symbol = f"SYM{i}"
+        d.contract.secType = "STK"
+        d.contract.exchange = "SMART"
+        d.contract.currency = "USD"
+        d.contract.conId = i
+        d.longName = f"Company {i}"
+        d.validExchanges = "SMART,NYSE,ARCA,BATS,ISLAND"
+        d.orderTypes = "ACTIVETIM,AD,ADJUST,ALERT,ALGO,ALLOC,AVGCOST,BASKET,COND,CONDORDER,DAY,DEACT,DEACTDIS"
+        ret.append(d)
+    return ret
+
+def bench(name: str, res: List[Any], encode: Callable[[Any], Any], repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = encode(res)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<48} {len(res):>8} objects {elapsed * 1000:>10.2f} ms {len(res) / elapsed:>14.0f} objects/s {len(out):>12} bytes")
+
+def main(args):
+    for name,res in [ ("BarData", bars(args.num_bars)), ("ContractDetails", contract_details(args.num_contracts)) ]:
+        bench(f"{name} json.dumps with __dict__ default", res, lambda r: json.dumps(r, default=dict_default), args.repeat)
+        bench(f"{name} object_to_json", res, object_to_json, args.repeat)
+        bench(f"{name} object_to_json_bytes", res, object_to_json_bytes, args.repeat)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Response serializer benchmark")
+    parser.add_argument("--num-bars", "-n", dest='num_bars', type=int, help="Bars of the reqHistoricalData response", default=390 * 252)
+    parser.add_argument("--num-contracts", dest='num_contracts', type=int, help="Contract details of the reqContractDetails response", default=10000)
+    parser.add_argument("--repeat", "-r", dest='repeat', type=int, help="Encodings per measurement", default=5)
+    args = parser.parse_args()
+    main(args)
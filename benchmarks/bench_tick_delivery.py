@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+from bench_util import *
+from ib_tws_server.asyncio.loop_bridge import LoopBridge
+from threading import Thread
+
+"""
+Compares delivering ticks from a producer thread to an event loop with one call_soon_threadsafe
+call per tick against LoopBridge batches. Run from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_tick_delivery.py
+"""
+
+async def bench(name: str, num_ticks: int, deliver):
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    recorder = RateRecorder(name)
+
+    def on_tick(seq: int):
+        recorder.count += 1
+        if seq == num_ticks - 1:
+            done.set_result(None)
+
+    def produce():
+        for i in range(num_ticks):
+            deliver(loop, on_tick, i)
+
+    recorder.start()
+    t = Thread(target=produce)
+    t.start()
+    await done
+    recorder.stop()
+    t.join()
+    recorder.report()
+
+async def main_loop(args):
+    await bench("call_soon_threadsafe per tick", args.num_ticks, lambda loop, cb, i: loop.call_soon_threadsafe(cb, i))
+    for interval in [ 0, 0.001 ]:
+        bridge = LoopBridge(asyncio.get_running_loop(), interval)
+        await bench(f"LoopBridge interval {interval * 1000:g} ms", args.num_ticks, lambda loop, cb, i: bridge.call_soon(cb, i))
+        print(f"{'':<48} {bridge.stats.batches:>8} batches  {bridge.stats.average_batch_size():>12.1f} ticks/batch")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tick delivery benchmark")
+    parser.add_argument("--num-ticks", "-n", dest='num_ticks', type=int, help="Ticks delivered per benchmark", default=500000)
+    args = parser.parse_args()
+    asyncio.run(main_loop(args))
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+class LatencyRecorder():
+    """
+    Collects latencies in seconds and reports throughput and percentiles
+    """
+    name: str
+    samples: List[float]
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples = []
+        self._start = None
+        self._end = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self._end = time.perf_counter()
+
+    def record(self, latency: float):
+        self.samples.append(latency)
+
+    def elapsed(self) -> float:
+        return self._end - self._start
+
+    def percentile(self, p: float) -> float:
+        if len(self.samples) == 0:
+            return float('nan')
+        s = sorted(self.samples)
+        return s[min(len(s) - 1, int(round(p / 100 * (len(s) - 1))))]
+
+    def report(self, unit: str = "requests"):
+        rate = len(self.samples) / self.elapsed() if self.elapsed() > 0 else float('nan')
+        print(f"{self.name:<48} {len(self.samples):>8} {unit:<8} {rate:>12.1f} {unit}/s   p50 {self.percentile(50) * 1000:>8.3f} ms   p99 {self.percentile(99) * 1000:>8.3f} ms")
+
+class RateRecorder():
+    """
+    Counts events such as ticks over a period
+    """
+    name: str
+    count: int
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self._start = None
+        self._end = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self._end = time.perf_counter()
+
+    def report(self, unit: str = "ticks"):
+        elapsed = self._end - self._start
+        print(f"{self.name:<48} {self.count:>8} {unit:<8} {self.count / elapsed:>12.1f} {unit}/s")
+
+async def run_concurrently(name: str, num_requests: int, concurrency: int, request: Callable[[], Awaitable]) -> LatencyRecorder:
+    """
+    Issues num_requests requests with at most concurrency requests in flight, and records the latency of each
+    """
+    recorder = LatencyRecorder(f"{name} (concurrency {concurrency})")
+    remaining = num_requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            await request()
+            recorder.record(time.perf_counter() - start)
+
+    recorder.start()
+    await asyncio.gather(*[ worker() for _ in range(concurrency) ])
+    recorder.stop()
+    return recorder
@@ -1,6 +1,7 @@
 import argparse
 import logging
 from ibapi.contract import Contract
+from ib_tws_server.asyncio.request_coalescer import RequestCoalescer
 from ib_tws_server.gen.client_responses import *
 from ib_tws_server.gen.asyncio_client import *
 from ib_tws_server.util.object_to_json import object_to_pretty_json
@@ -87,7 +88,7 @@ if __name__ == '__main__':
     symbol = args.symbol
     expiration = args.expiration
 
-    ib_client = AsyncioClient()
+    ib_client = AsyncioClient(coalescer=RequestCoalescer())
     ib_client.start(args.host, args.port, args.client_id, 5)
 
     asyncio.run(main_loop())
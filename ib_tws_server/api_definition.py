@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from ibapi.client import EClient
 from ibapi.wrapper import EWrapper
+from ib_tws_server.asyncio.request_priority import RequestPriority
 from ib_tws_server.ib_imports import *
 import inspect
 import logging
@@ -18,6 +19,16 @@ class ApiDefinition:
     is_subscription: bool = False
     subscription_flag_name: str = None
     subscription_flag_value: bool = True
+    priority: RequestPriority = RequestPriority.INTERACTIVE
+    uses_historical_pacing: bool = False
+    idempotent: bool = False
+    cache_ttl: float = None
+    cache_stale_ttl: float = None
+    shareable: bool = False
+    columnar_response: str = None
+    timeout: float = None
+    order_book_rows_param: str = None
+    quotes: bool = False
 
     def __init__(self, request_method: Callable, 
         cancel_method: Callable = None, 
@@ -27,7 +38,17 @@ class ApiDefinition:
         has_done_flag: bool = False,
         is_subscription: bool = False,
         subscription_flag_name: str = None,
-        subscription_flag_value: bool = True):
+        subscription_flag_value: bool = True,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        uses_historical_pacing: bool = False,
+        idempotent: bool = False,
+        cache_ttl: float = None,
+        cache_stale_ttl: float = None,
+        shareable: bool = False,
+        columnar_response: str = None,
+        timeout: float = None,
+        order_book_rows_param: str = None,
+        quotes: bool = False):
         self.request_method = request_method
         self.cancel_method = cancel_method
         self.callback_methods = callback_methods
@@ -37,6 +58,41 @@ class ApiDefinition:
         self.is_subscription = is_subscription
         self.subscription_flag_name = subscription_flag_name
         self.subscription_flag_value = subscription_flag_value
+        # Cancellations are always sent with RequestPriority.CANCEL
+        self.priority = priority
+        self.uses_historical_pacing = uses_historical_pacing
+        # Queries without side effects. Concurrent calls with equal arguments can share a request.
+        # Only applies to the query variant of requests with a subscription flag
+        self.idempotent = idempotent
+        # Seconds that responses can be cached by ResponseCache. None disables caching
+        self.cache_ttl = cache_ttl
+        # Seconds after cache_ttl during which the GraphQL query field of the request answers the cached
+        # result while it's reloaded in the background by FieldCache. None doesn't cache the field
+        self.cache_stale_ttl = cache_stale_ttl
+        # Subscriptions that SubscriptionMultiplexer can share between consumers with equal arguments.
+        # Only applies to the subscription variant of requests with a subscription flag
+        self.shareable = shareable
+        # Name of a class in ib_tws_server.util.historical_columns that accumulates the responses of
+        # the query into columns. A {request}Columnar variant of the query is generated that returns it
+        self.columnar_response = columnar_response
+        # Seconds to wait for the response of the query before it's cancelled and RequestTimeoutError
+        # is raised. None waits forever. Only applies to the query variant of requests with a subscription flag
+        self.timeout = timeout
+        # Parameter with the number of rows of a market depth subscription. A {request}AsOrderBook variant
+        # is generated that returns an OrderBookSubscription with an order book of that many rows
+        self.order_book_rows_param = order_book_rows_param
+        # Market data requests whose ticks are kept in the QuoteStore of the client, keyed by the contract
+        # parameter. A {request}AsQuotes variant is generated that yields conflated Quote snapshots
+        self.quotes = quotes
+
+        if self.cache_ttl is not None and not self.idempotent:
+            raise RuntimeError(f"Only idempotent requests can be cached {request_method.__name__}")
+
+        if self.cache_stale_ttl is not None and self.cache_ttl is None:
+            raise RuntimeError(f"Only requests with a cache_ttl can have a cache_stale_ttl {request_method.__name__}")
+
+        if self.columnar_response is not None and (self.is_subscription or (not self.has_done_flag and self.done_method is None)):
+            raise RuntimeError(f"Only queries with a list of responses can be columnar {request_method.__name__}")
 
         if self.is_subscription or self.subscription_flag_name is not None:
             if not self.callback_methods or len(self.callback_methods) == 0:
@@ -115,12 +171,19 @@ IGNORE_METHODS: FrozenSet[Callable] = set({
     EWrapper.winError
 })
 
+CACHE_TTL_HOUR = 60 * 60
+CACHE_TTL_DAY = 24 * CACHE_TTL_HOUR
+
+# Default deadlines in seconds of queries. Historical data requests can take minutes for long durations
+TIMEOUT_QUERY = 60
+TIMEOUT_HISTORICAL = 10 * 60
+
 # Mappings of requests with their callbacks.
 REQUEST_DEFINITIONS: List[ApiDefinition] = [
     ApiDefinition(request_method=EClient.queryDisplayGroups, 
         callback_methods=[EWrapper.displayGroupList],
         uses_req_id=True),
-    ApiDefinition(request_method=EClient.exerciseOptions, uses_req_id=True),
+    ApiDefinition(request_method=EClient.exerciseOptions, uses_req_id=True, priority=RequestPriority.ORDER),
     ApiDefinition(request_method=EClient.calculateImpliedVolatility, 
         callback_methods=[EWrapper.tickOptionComputation],
         cancel_method=EClient.cancelCalculateImpliedVolatility,
@@ -144,21 +207,36 @@ REQUEST_DEFINITIONS: List[ApiDefinition] = [
     ApiDefinition(request_method=EClient.reqFundamentalData, 
         callback_methods=[EWrapper.fundamentalData],
         cancel_method=EClient.cancelFundamentalData,
-        uses_req_id=True),
+        uses_req_id=True,
+        priority=RequestPriority.BULK,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY),
     ApiDefinition(request_method=EClient.reqHeadTimeStamp, 
         callback_methods=[EWrapper.headTimestamp],
         cancel_method=EClient.cancelHeadTimeStamp,
-        uses_req_id=True),
+        uses_req_id=True,
+        priority=RequestPriority.BULK,
+        uses_historical_pacing=True,
+        idempotent=True,
+        timeout=TIMEOUT_HISTORICAL),
     ApiDefinition(request_method=EClient.reqHistogramData, 
         callback_methods=[EWrapper.histogramData],
         cancel_method=EClient.cancelHistogramData,
-        uses_req_id=True),
+        uses_req_id=True,
+        priority=RequestPriority.BULK,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY),
     ApiDefinition(request_method=EClient.reqHistoricalData, 
         callback_methods=[EWrapper.historicalData, EWrapper.historicalDataUpdate],
         cancel_method=EClient.cancelHistoricalData,
         done_method=EWrapper.historicalDataEnd,
         subscription_flag_name = 'keepUpToDate',
-        uses_req_id=True),
+        uses_req_id=True,
+        priority=RequestPriority.BULK,
+        uses_historical_pacing=True,
+        idempotent=True,
+        timeout=TIMEOUT_HISTORICAL,
+        columnar_response='HistoricalBarColumns'),
     ApiDefinition(request_method=EClient.reqMktData, 
         callback_methods=[EWrapper.tickPrice, EWrapper.tickSize, 
             EWrapper.tickEFP,
@@ -169,12 +247,17 @@ REQUEST_DEFINITIONS: List[ApiDefinition] = [
         done_method=EWrapper.tickSnapshotEnd,
         subscription_flag_name = 'snapshot',
         subscription_flag_value = False,
-        uses_req_id=True),
+        uses_req_id=True,
+        timeout=TIMEOUT_QUERY,
+        shareable=True,
+        quotes=True),
     ApiDefinition(request_method=EClient.reqMktDepth, 
         callback_methods=[EWrapper.updateMktDepth, EWrapper.updateMktDepthL2],
         cancel_method=EClient.cancelMktDepth,
         is_subscription = True,
-        uses_req_id=True),
+        uses_req_id=True,
+        shareable=True,
+        order_book_rows_param='numRows'),
     ApiDefinition(request_method=EClient.reqNewsBulletins,
         callback_methods=[EWrapper.updateNewsBulletin],
         cancel_method=EClient.cancelNewsBulletins,
@@ -182,7 +265,8 @@ REQUEST_DEFINITIONS: List[ApiDefinition] = [
     ApiDefinition(request_method=EClient.placeOrder,
         callback_methods=[EWrapper.orderStatus],
         is_subscription = True,
-        cancel_method=EClient.cancelOrder),
+        cancel_method=EClient.cancelOrder,
+        priority=RequestPriority.ORDER),
     ApiDefinition(request_method=EClient.reqPnL,
         callback_methods=[EWrapper.pnl],
         cancel_method=EClient.cancelPnL,
@@ -214,7 +298,8 @@ REQUEST_DEFINITIONS: List[ApiDefinition] = [
         callback_methods=[EWrapper.tickByTickAllLast, EWrapper.tickByTickBidAsk, EWrapper.tickByTickMidPoint],
         cancel_method=EClient.cancelTickByTickData,
         is_subscription = True,
-        uses_req_id=True),
+        uses_req_id=True,
+        shareable=True),
     ApiDefinition(request_method=EClient.replaceFA,
         # Enable when using 9.85.x
         #done_method=EWrapper.replaceFAEnd,
@@ -228,9 +313,15 @@ REQUEST_DEFINITIONS: List[ApiDefinition] = [
     ApiDefinition(request_method=EClient.reqContractDetails,
         callback_methods=[EWrapper.contractDetails,EWrapper.bondContractDetails],
         done_method=EWrapper.contractDetailsEnd,
-        uses_req_id=True),
+        uses_req_id=True,
+        priority=RequestPriority.BULK,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY,
+        cache_ttl=CACHE_TTL_DAY),
     ApiDefinition(request_method=EClient.reqCurrentTime,
-        callback_methods=[EWrapper.currentTime]),
+        callback_methods=[EWrapper.currentTime],
+        idempotent=True,
+        timeout=TIMEOUT_QUERY),
     ApiDefinition(request_method=EClient.reqCompletedOrders,
         callback_methods=[EWrapper.completedOrder],
         done_method=EWrapper.completedOrdersEnd),
@@ -239,43 +330,90 @@ REQUEST_DEFINITIONS: List[ApiDefinition] = [
         done_method=EWrapper.execDetailsEnd,
         uses_req_id=True),
     ApiDefinition(request_method=EClient.reqFamilyCodes,
-        callback_methods=[EWrapper.familyCodes]),
-    ApiDefinition(request_method=EClient.reqGlobalCancel),
+        callback_methods=[EWrapper.familyCodes],
+        idempotent=True,
+        timeout=TIMEOUT_QUERY,
+        cache_ttl=CACHE_TTL_HOUR,
+        cache_stale_ttl=CACHE_TTL_DAY),
+    ApiDefinition(request_method=EClient.reqGlobalCancel,
+        priority=RequestPriority.CANCEL),
     ApiDefinition(request_method=EClient.reqHistoricalNews,
         callback_methods=[EWrapper.historicalNews],
         done_method=EWrapper.historicalNewsEnd,
-        uses_req_id=True),
+        uses_req_id=True,
+        priority=RequestPriority.BULK,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY),
     ApiDefinition(request_method=EClient.reqHistoricalTicks,
         callback_methods=[EWrapper.historicalTicks, EWrapper.historicalTicksBidAsk, EWrapper.historicalTicksLast],
         uses_req_id=True,
-        has_done_flag=True),
+        has_done_flag=True,
+        priority=RequestPriority.BULK,
+        uses_historical_pacing=True,
+        idempotent=True,
+        timeout=TIMEOUT_HISTORICAL,
+        columnar_response='HistoricalTickColumns'),
     ApiDefinition(request_method=EClient.reqIds,
-        callback_methods=[EWrapper.nextValidId]),
+        callback_methods=[EWrapper.nextValidId],
+        priority=RequestPriority.ORDER),
     ApiDefinition(request_method=EClient.reqManagedAccts,
-        callback_methods=[EWrapper.managedAccounts]),
+        callback_methods=[EWrapper.managedAccounts],
+        idempotent=True,
+        timeout=TIMEOUT_QUERY),
     ApiDefinition(request_method=EClient.reqMarketDataType),
     ApiDefinition(request_method=EClient.reqMarketRule,
-        callback_methods=[EWrapper.marketRule]),
+        callback_methods=[EWrapper.marketRule],
+        idempotent=True,
+        timeout=TIMEOUT_QUERY,
+        cache_ttl=CACHE_TTL_DAY,
+        cache_stale_ttl=CACHE_TTL_DAY),
     ApiDefinition(request_method=EClient.reqMatchingSymbols,
-        callback_methods=[EWrapper.symbolSamples]),
+        callback_methods=[EWrapper.symbolSamples],
+        uses_req_id=True,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY,
+        cache_ttl=CACHE_TTL_HOUR),
     ApiDefinition(request_method=EClient.reqMktDepthExchanges,
-        callback_methods=[EWrapper.mktDepthExchanges]),
+        callback_methods=[EWrapper.mktDepthExchanges],
+        idempotent=True,
+        timeout=TIMEOUT_QUERY,
+        cache_ttl=CACHE_TTL_HOUR,
+        cache_stale_ttl=CACHE_TTL_DAY),
     ApiDefinition(request_method=EClient.reqNewsArticle,
-        callback_methods=[EWrapper.newsArticle]),
+        callback_methods=[EWrapper.newsArticle],
+        idempotent=True,
+        timeout=TIMEOUT_QUERY),
     ApiDefinition(request_method=EClient.reqNewsProviders,
-        callback_methods=[EWrapper.newsProviders]),
+        callback_methods=[EWrapper.newsProviders],
+        idempotent=True,
+        timeout=TIMEOUT_QUERY,
+        cache_ttl=CACHE_TTL_HOUR,
+        cache_stale_ttl=CACHE_TTL_DAY),
     ApiDefinition(request_method=EClient.reqScannerParameters,
-        callback_methods=[EWrapper.scannerParameters]),
+        callback_methods=[EWrapper.scannerParameters],
+        priority=RequestPriority.BULK,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY,
+        cache_ttl=CACHE_TTL_DAY,
+        cache_stale_ttl=CACHE_TTL_DAY),
     ApiDefinition(request_method=EClient.reqSecDefOptParams,
         callback_methods=[EWrapper.securityDefinitionOptionParameter],
         done_method=EWrapper.securityDefinitionOptionParameterEnd,
-        uses_req_id=True),
+        uses_req_id=True,
+        priority=RequestPriority.BULK,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY,
+        cache_ttl=CACHE_TTL_DAY),
     ApiDefinition(request_method=EClient.reqSmartComponents,
         callback_methods=[EWrapper.smartComponents],
-        uses_req_id=True),
+        uses_req_id=True,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY),
     ApiDefinition(request_method=EClient.reqSoftDollarTiers,
         callback_methods=[EWrapper.softDollarTiers],
-        uses_req_id=True),
+        uses_req_id=True,
+        idempotent=True,
+        timeout=TIMEOUT_QUERY),
     ApiDefinition(request_method=EClient.requestFA,
         callback_methods=[EWrapper.receiveFA]),
     ApiDefinition(request_method=EClient.setServerLogLevel),
@@ -320,6 +458,9 @@ ENUM_ALIASES = {
 
 """"""
 REQUIRED_FIELDS = {
+    'ibapi.order_condition.OrderCondition': {
+        'condType'
+    },
     'ibapi.common.BarData': {
         'close',
         'date',
@@ -351,9 +492,30 @@ OVERRIDDEN_MEMBER_TYPE_HINTS = {
     },
     'SoftDollarTiers': {
         'tiers': 'List[ibapi.softdollartier.SoftDollarTier]'
+    },
+    'OrderCondition': {
+        'condType': 'int',
+        'isConjunctionConnection': 'bool',
+        'isMore': 'bool',
+        'conId': 'int',
+        'exchange': 'str',
+        'secType': 'str',
+        'symbol': 'str',
+        'percent': 'float',
+        'time': 'str',
+        'price': 'float',
+        'triggerMethod': 'int',
+        'changePercent': 'float',
+        'volume': 'int'
     }
 }
 
+"""Base classes whose subclasses are created by a factory from a type member, by the type member and the
+factory. Their schema types have the members of every subclass"""
+POLYMORPHIC_TYPES = {
+    'ibapi.order_condition.OrderCondition': ('condType', 'ibapi.order_condition.Create')
+}
+
 """Missing or incorrect method signatures"""
 OVERRIDDEN_METHOD_SIGNATURES = {
     'softDollarTiers': 'def softDollarTiers(self, reqId: int, tiers: SoftDollarTierList)'
@@ -0,0 +1,27 @@
+import random
+
+class ExponentialBackoff():
+    """
+    Delays between connection attempts. The delay of attempt n is initial * multiplier ** (n - 1),
+    capped at maximum, and is randomized by up to +/- jitter of itself so clients that lost
+    their connection at the same time don't reconnect at the same time
+    """
+    initial: float
+    maximum: float
+    multiplier: float
+    jitter: float
+
+    def __init__(self, initial: float = 0.5, maximum: float = 30, multiplier: float = 2, jitter: float = 0.2, rng: random.Random = None):
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._random = rng if rng is not None else random.Random()
+
+    def delay(self, attempt: int) -> float:
+        """
+        Returns the seconds to wait after the given failed attempt, starting at 1
+        """
+        # Limit the exponent so the delay doesn't overflow after many attempts
+        d = min(self.maximum, self.initial * self.multiplier ** min(attempt - 1, 64))
+        return d * (1 + self.jitter * self._random.uniform(-1, 1))
@@ -0,0 +1,89 @@
+import asyncio
+from ib_tws_server.asyncio.subscription_generator import SubscriptionGenerator, SubscriptionQueueOptions
+from ib_tws_server.util.bar_aggregator import AggregatedBar, BarAggregator, BarKind, tick_price_size
+import time
+from typing import AsyncGenerator, Callable, List
+
+class BarSubscription(SubscriptionGenerator[AggregatedBar]):
+    """
+    Yields the bars of one series of a BarEngine. Time bars are emitted when they end, even if no
+    tick arrives after them. aclose removes the series from the engine
+    """
+    aggregator: BarAggregator
+
+    def __init__(self, engine: 'BarEngine', kind: BarKind, size: float, options: SubscriptionQueueOptions = None, keep_history: bool = False):
+        super().__init__(lambda: engine._remove(self), None, options)
+        self.aggregator = BarAggregator(kind, size, self.add_to_queue, keep_history)
+        self._clock = engine.clock
+        self._timer: asyncio.TimerHandle = None
+
+    def add_tick(self, price: float, size: float, timestamp: float):
+        a = self.aggregator
+        a.add(price, size, timestamp)
+        if self._timer is None and a.kind == BarKind.TIME:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        end = self.aggregator.bar_end
+        if end is not None:
+            self._timer = self._loop.call_later(max(0, end - self._clock()), self._flush)
+
+    def _flush(self):
+        self._timer = None
+        self.aggregator.flush(self._clock())
+        # A tick may have opened a later bar after the timer was scheduled
+        self._schedule_flush()
+
+    def _stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+class BarEngine():
+    """
+    Aggregates the ticks of one tick-by-tick subscription, e.g. from reqTickByTickData with AllLast
+    or BidAsk ticks, into any number of bar series at different intervals. Every tick is read
+    from the upstream subscription once and added to the open bar of each series.
+
+    Ticks are timestamped with `clock` when they are read, since TWS reports tick times in whole
+    seconds, which allows time bars shorter than a second
+    """
+    clock: Callable[[], float]
+
+    def __init__(self, ticks: AsyncGenerator[object, None], clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._ticks = ticks
+        self._series: List[BarSubscription] = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def bars(self, kind: BarKind, size: float, queue_options: SubscriptionQueueOptions = None, keep_history: bool = False) -> BarSubscription:
+        """
+        Starts a bar series. See BarKind for the meaning of `size`
+        """
+        s = BarSubscription(self, kind, size, queue_options, keep_history)
+        self._series.append(s)
+        return s
+
+    def series_count(self) -> int:
+        return len(self._series)
+
+    def _remove(self, s: BarSubscription):
+        s._stop()
+        if s in self._series:
+            self._series.remove(s)
+
+    async def _run(self):
+        async for tick in self._ticks:
+            price,size = tick_price_size(tick)
+            now = self.clock()
+            for s in self._series:
+                s.add_tick(price, size, now)
+
+    async def aclose(self):
+        """
+        Stops the series and closes the upstream subscription
+        """
+        for s in list(self._series):
+            await s.aclose()
+        self._task.cancel()
+        await self._ticks.aclose()
@@ -0,0 +1,114 @@
+import asyncio
+from typing import AsyncIterator, Callable, Generic, List, TypeVar
+
+YieldType = TypeVar("YieldType")
+
+class BroadcastChannel(Generic[YieldType]):
+    """
+    Delivers every published value to all subscribers from a single ring buffer of `capacity`
+    values. Each subscriber has a cursor into the buffer instead of a queue of its own, so
+    publishing stores the value once regardless of the number of subscribers, and all waiting
+    subscribers are woken up by one future. A subscriber that falls more than `capacity`
+    values behind skips to the oldest buffered value and counts the values it missed.
+    """
+    CAPACITY = 1024
+
+    capacity: int
+
+    def __init__(self, capacity: int = CAPACITY):
+        if capacity < 1:
+            raise ValueError("A broadcast channel needs a capacity of at least one value")
+        self.capacity = capacity
+        self._buffer: List[YieldType] = [ None ] * capacity
+        # Sequence number of the next published value
+        self._seq = 0
+        self._loop = asyncio.get_running_loop()
+        self._published: asyncio.Future = None
+        self._closed = False
+        self._subscriber_count = 0
+
+    def publish(self, val: YieldType):
+        if self._closed:
+            return
+        self._buffer[self._seq % self.capacity] = val
+        self._seq += 1
+        self._wake()
+
+    def close(self):
+        """
+        Ends the iteration of the subscribers once they consumed the buffered values
+        """
+        self._closed = True
+        self._wake()
+
+    def _wake(self):
+        f = self._published
+        if f is not None:
+            self._published = None
+            if not f.done():
+                f.set_result(None)
+
+    def subscribe(self, release: Callable[['BroadcastSubscriber'], None] = None, replay: List[YieldType] = None) -> 'BroadcastSubscriber[YieldType]':
+        """
+        Returns a subscriber that receives the `replay` values and then the values published from
+        now on. `release` is called when the subscriber is closed
+        """
+        self._subscriber_count += 1
+        return BroadcastSubscriber(self, release, replay)
+
+    def subscriber_count(self) -> int:
+        return self._subscriber_count
+
+class BroadcastSubscriber(AsyncIterator[YieldType]):
+    """
+    Cursor of one subscriber of a BroadcastChannel
+    """
+    dropped: int
+
+    def __init__(self, channel: BroadcastChannel, release: Callable[['BroadcastSubscriber'], None], replay: List[YieldType] = None):
+        self._channel = channel
+        self._cursor = channel._seq
+        self._release = release
+        self._replay = list(reversed(replay)) if replay else None
+        self._closed = False
+        self.dropped = 0
+
+    def qsize(self) -> int:
+        replayed = len(self._replay) if self._replay else 0
+        return replayed + min(self._channel._seq - self._cursor, self._channel.capacity)
+
+    async def __anext__(self) -> YieldType:
+        if self._replay:
+            if self._closed:
+                raise StopAsyncIteration
+            return self._replay.pop()
+        c = self._channel
+        while self._cursor == c._seq:
+            if self._closed or c._closed:
+                raise StopAsyncIteration
+            if c._published is None:
+                c._published = c._loop.create_future()
+            await asyncio.shield(c._published)
+        if self._closed:
+            raise StopAsyncIteration
+        oldest = c._seq - c.capacity
+        if self._cursor < oldest:
+            self.dropped += oldest - self._cursor
+            self._cursor = oldest
+        val = c._buffer[self._cursor % c.capacity]
+        self._cursor += 1
+        return val
+
+    def __aiter__(self):
+        return self
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._channel._subscriber_count -= 1
+        if self._release is not None:
+            self._release(self)
+
+    async def aclose(self):
+        self.close()
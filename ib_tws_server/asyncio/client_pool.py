@@ -0,0 +1,126 @@
+import asyncio
+import functools
+from ib_tws_server.api_definition import REQUEST_DEFINITIONS
+from ib_tws_server.asyncio.backoff import ExponentialBackoff
+from ib_tws_server.asyncio.historical_pacing import HistoricalPacingGovernor
+from ib_tws_server.asyncio.request_priority import RequestPriority
+from typing import Callable, FrozenSet, List
+
+# Requests that operate on the orders of a connection. TWS only reports and modifies orders on the
+# connection that placed them, and auto open orders are only bound to the connection with client id 0
+ORDER_REQUESTS: FrozenSet[str] = frozenset([ d.request_method.__name__ for d in REQUEST_DEFINITIONS if d.request_method is not None and d.priority == RequestPriority.ORDER ] + [
+    'cancelOrder',
+    'reqAllOpenOrders',
+    'reqAutoOpenOrders',
+    'reqCompletedOrders',
+    'reqExecutions',
+    'reqGlobalCancel',
+    'reqOpenOrders'
+])
+
+# Suffixes of the generated variants of a request
+_VARIANT_SUFFIXES = [ 'AsSubscription', 'AsStream', 'AsOrderBook', 'AsQuotes', 'Columnar' ]
+
+class ClientPoolStats():
+    """
+    Number of calls routed to each connection
+    """
+    routed: List[int]
+
+    def __init__(self, size: int):
+        self.routed = [ 0 ] * size
+
+class AsyncioClientPool():
+    """
+    Spreads requests over several connections to the same TWS/Gateway with consecutive client ids.
+    Each connection has its own socket, reader thread and message rate limit, so the aggregate
+    message rate grows with the number of connections.
+
+    The pool has the same request methods as AsyncioClient. Order requests (ORDER_REQUESTS) are
+    always sent on the first connection, which owns the orders. Other requests are sent on the
+    connection with the least load, measured as its calls in progress, queued messages and active
+    subscriptions. Subscriptions and streams are cancelled on the connection that opened them.
+
+    `client_factory` creates the clients of the pool. By default the clients share a
+    HistoricalPacingGovernor since TWS applies the historical data pacing rules to all connections
+    """
+    stats: ClientPoolStats
+
+    def __init__(self, size: int, client_factory: Callable[[], 'AsyncioClient'] = None):
+        if size < 1:
+            raise ValueError("A client pool needs at least one connection")
+        if client_factory is None:
+            from ib_tws_server.gen.asyncio_client import AsyncioClient
+            historical_pacing = HistoricalPacingGovernor()
+            client_factory = lambda: AsyncioClient(historical_pacing=historical_pacing)
+        self._clients = [ client_factory() for _ in range(size) ]
+        self._in_flight = [ 0 ] * size
+        self.stats = ClientPoolStats(size)
+
+    @property
+    def clients(self) -> List['AsyncioClient']:
+        return list(self._clients)
+
+    @property
+    def order_client(self) -> 'AsyncioClient':
+        return self._clients[0]
+
+    def start(self, host: str, port: int, client_id: int, connection_retry_interval: int):
+        """
+        Connects the clients with the client ids client_id, client_id + 1, ...
+        """
+        for i,c in enumerate(self._clients):
+            c.start(host, port, client_id + i, connection_retry_interval)
+
+    async def connect(self, host: str, port: int, client_id: int, backoff: ExponentialBackoff = None, max_attempts: int = 0, reconnect: bool = True):
+        """
+        Connects the clients concurrently with the client ids client_id, client_id + 1, ...
+        See AsyncioClient.connect
+        """
+        await asyncio.gather(*[ c.connect(host, port, client_id + i, backoff, max_attempts, reconnect) for i,c in enumerate(self._clients) ])
+
+    def disconnect(self, clean=False):
+        for c in self._clients:
+            c.disconnect(clean)
+
+    def active_request_count(self):
+        return sum([ c.active_request_count() for c in self._clients ])
+
+    def active_subscription_count(self):
+        return sum([ c.active_subscription_count() for c in self._clients ])
+
+    @staticmethod
+    def request_name(method_name: str) -> str:
+        for s in _VARIANT_SUFFIXES:
+            if method_name.endswith(s):
+                return method_name[:-len(s)]
+        return method_name
+
+    def load(self, index: int) -> int:
+        c = self._clients[index]
+        return self._in_flight[index] + c.queued_message_count() + c.active_subscription_count()
+
+    def route(self, method_name: str) -> int:
+        """
+        Returns the index of the connection that the request is sent on
+        """
+        if AsyncioClientPool.request_name(method_name) in ORDER_REQUESTS:
+            return 0
+        return min(range(len(self._clients)), key=self.load)
+
+    async def _call(self, method_name: str, *args, **kwargs):
+        i = self.route(method_name)
+        self.stats.routed[i] += 1
+        self._in_flight[i] += 1
+        try:
+            return await getattr(self._clients[i], method_name)(*args, **kwargs)
+        finally:
+            self._in_flight[i] -= 1
+
+    def __getattr__(self, name: str):
+        # Only called for attributes the pool doesn't define, i.e. the request methods of AsyncioClient
+        if name.startswith('_') or not asyncio.iscoroutinefunction(getattr(type(self._clients[0]), name, None)):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        method = functools.partial(self._call, name)
+        setattr(self, name, method)
+        return method
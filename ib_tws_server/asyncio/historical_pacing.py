@@ -0,0 +1,232 @@
+import asyncio
+from collections import deque
+import heapq
+import itertools
+from ib_tws_server.util.request_key import canonical_key
+from typing import Deque, Dict, Hashable, List, Tuple
+
+class PacingStats():
+    """
+    Time requests spent waiting for admission. Times are in seconds
+    """
+    admitted: int
+    delayed: int
+    total_wait: float
+    max_wait: float
+
+    def __init__(self):
+        self.admitted = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float):
+        self.admitted += 1
+        if wait > 0:
+            self.delayed += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+class _PacingTicket():
+    request_key: Hashable
+    contract_key: Hashable
+    weight: int
+    enqueued_at: float
+    future: asyncio.Future
+
+    def __init__(self, request_key: Hashable, contract_key: Hashable, weight: int, enqueued_at: float, future: asyncio.Future):
+        self.request_key = request_key
+        self.contract_key = contract_key
+        self.weight = weight
+        self.enqueued_at = enqueued_at
+        self.future = future
+
+# A pending request in the admission heap: a lower bound of its admission time, a sequence number
+# that orders requests by age, and the request
+_PendingEntry = Tuple[float, int, _PacingTicket]
+
+class _PacingHistory():
+    """
+    Admission times of recent requests for each of the pacing rules
+    """
+    identical: Dict[Hashable, float]
+    contract: Dict[Hashable, Deque[float]]
+    all: Deque[float]
+
+    def __init__(self):
+        self.identical = {}
+        self.contract = {}
+        self.all = deque()
+
+    def copy(self):
+        ret = _PacingHistory()
+        ret.identical = dict(self.identical)
+        ret.contract = { k: deque(v) for k,v in self.contract.items() }
+        ret.all = deque(self.all)
+        return ret
+
+class HistoricalPacingGovernor():
+    """
+    Admission scheduler for historical data requests that enforces the TWS pacing rules
+    (https://interactivebrokers.github.io/tws-api/historical_limitations.html):
+
+    1. Identical requests within `identical_interval` seconds
+    2. `contract_max_requests` or more requests for the same contract, exchange and tick type
+       within `contract_window` seconds. TWS counts six requests as a violation so at most five are admitted
+    3. More than `max_requests` requests within `window` seconds. BID_ASK requests count twice
+
+    Requests wait in a queue until they can be sent without violating any of the rules. A request
+    that is eligible is admitted ahead of older requests that are still blocked, e.g. by a
+    request for another contract.
+    """
+    IDENTICAL_INTERVAL = 15
+    CONTRACT_WINDOW = 2
+    CONTRACT_MAX_REQUESTS = 5
+    WINDOW = 600
+    MAX_REQUESTS = 60
+
+    stats: PacingStats
+
+    def __init__(self,
+        identical_interval: float = IDENTICAL_INTERVAL,
+        contract_window: float = CONTRACT_WINDOW,
+        contract_max_requests: int = CONTRACT_MAX_REQUESTS,
+        window: float = WINDOW,
+        max_requests: int = MAX_REQUESTS):
+        self._identical_interval = identical_interval
+        self._contract_window = contract_window
+        self._contract_max_requests = contract_max_requests
+        self._window = window
+        self._max_requests = max_requests
+        self._history = _PacingHistory()
+        self._pending: List[_PendingEntry] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle = None
+        self._loop: asyncio.AbstractEventLoop = None
+        self.stats = PacingStats()
+
+    @staticmethod
+    def request_weight(what_to_show: str) -> int:
+        return 2 if what_to_show == "BID_ASK" else 1
+
+    @staticmethod
+    def keys(request: Tuple, contract: object, what_to_show: str) -> Tuple[Hashable, Hashable]:
+        # The contract key includes the exchange since it's a member of the contract
+        return canonical_key(request), canonical_key((contract, what_to_show))
+
+    def _now(self) -> float:
+        return self._loop.time() if self._loop is not None else asyncio.get_running_loop().time()
+
+    def _expire(self, history: _PacingHistory, now: float):
+        while len(history.all) > 0 and history.all[0] <= now - self._window:
+            history.all.popleft()
+        for k in [ k for k,t in history.identical.items() if t <= now - self._identical_interval ]:
+            del history.identical[k]
+        for k in list(history.contract.keys()):
+            times = history.contract[k]
+            while len(times) > 0 and times[0] <= now - self._contract_window:
+                times.popleft()
+            if len(times) == 0:
+                del history.contract[k]
+
+    def _earliest_admission(self, history: _PacingHistory, t: _PacingTicket, now: float) -> float:
+        ret = now
+        if t.request_key in history.identical:
+            ret = max(ret, history.identical[t.request_key] + self._identical_interval)
+        times = history.contract.get(t.contract_key)
+        if times is not None and len(times) >= self._contract_max_requests:
+            ret = max(ret, times[len(times) - self._contract_max_requests] + self._contract_window)
+        excess = len(history.all) + t.weight - self._max_requests
+        if excess > 0:
+            ret = max(ret, history.all[min(excess, len(history.all)) - 1] + self._window)
+        return ret
+
+    def _record(self, history: _PacingHistory, t: _PacingTicket, now: float):
+        history.identical[t.request_key] = now
+        history.contract.setdefault(t.contract_key, deque()).append(now)
+        for _ in range(t.weight):
+            history.all.append(now)
+
+    def _next(self, history: _PacingHistory, pending: List[_PendingEntry], now: float) -> _PendingEntry:
+        """
+        Returns the request in the heap that is admitted next, and its admission time. Admitting a
+        request only delays the others, so the admission time in the heap is a lower bound and only
+        the head of the heap has to be re-evaluated
+        """
+        while True:
+            at,seq,t = pending[0]
+            earliest = self._earliest_admission(history, t, now)
+            if earliest <= at:
+                return pending[0]
+            heapq.heapreplace(pending, (earliest, seq, t))
+
+    def _simulate(self, history: _PacingHistory, pending: List[_PendingEntry], now: float, until: _PacingTicket = None) -> float:
+        """
+        Admits the pending requests in order of eligibility, and returns the admission time of `until`
+        """
+        pending = list(pending)
+        while len(pending) > 0:
+            self._expire(history, now)
+            now,_,t = self._next(history, pending, now)
+            heapq.heappop(pending)
+            if t is until:
+                return now
+            self._record(history, t, now)
+        return now
+
+    def expected_wait(self, request: Tuple, contract: object, what_to_show: str) -> float:
+        """
+        Returns the time in seconds a request would wait for admission if it was issued now
+        """
+        now = self._now()
+        request_key,contract_key = HistoricalPacingGovernor.keys(request, contract, what_to_show)
+        ticket = _PacingTicket(request_key, contract_key, HistoricalPacingGovernor.request_weight(what_to_show), now, None)
+        pending = list(self._pending)
+        heapq.heappush(pending, (now, next(self._sequence), ticket))
+        return self._simulate(self._history.copy(), pending, now, ticket) - now
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def acquire(self, request: Tuple, contract: object, what_to_show: str) -> float:
+        """
+        Waits until the request can be sent to TWS without violating the pacing rules.
+        Returns the time spent waiting in seconds
+        """
+        self._loop = asyncio.get_running_loop()
+        now = self._now()
+        request_key,contract_key = HistoricalPacingGovernor.keys(request, contract, what_to_show)
+        ticket = _PacingTicket(request_key, contract_key, HistoricalPacingGovernor.request_weight(what_to_show), now, self._loop.create_future())
+        heapq.heappush(self._pending, (now, next(self._sequence), ticket))
+        self._schedule(now)
+        try:
+            return await ticket.future
+        except asyncio.CancelledError:
+            index = next((i for i,(_,_,t) in enumerate(self._pending) if t is ticket), None)
+            if index is not None:
+                # Cancelled requests are rare, so the heap is rebuilt
+                self._pending.pop(index)
+                heapq.heapify(self._pending)
+                self._schedule()
+            raise
+
+    def _schedule(self, now: float = None):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if now is None:
+            now = self._now()
+        self._expire(self._history, now)
+        while len(self._pending) > 0:
+            at,_,t = self._next(self._history, self._pending, now)
+            if at > now:
+                self._timer = self._loop.call_at(at, self._schedule)
+                return
+            heapq.heappop(self._pending)
+            self._record(self._history, t, now)
+            wait = now - t.enqueued_at
+            self.stats.record(wait)
+            if not t.future.done():
+                t.future.set_result(wait)
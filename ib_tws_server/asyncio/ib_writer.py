@@ -1,42 +1,119 @@
 from ibapi.client import EClient
-import math
-from queue import Queue
-from threading import Thread
-import time
+from ib_tws_server.asyncio.rate_limiter import RateLimiter, TokenBucketRateLimiter
+from ib_tws_server.asyncio.request_priority import RequestPriority
+import itertools
+from queue import Empty, PriorityQueue
+from threading import Lock, Thread
+from typing import Callable, List, Tuple
+
+class QueuedRequest():
+    """
+    A message queued to the IBWriter that can be withdrawn until the writer sends it, e.g. when the
+    caller of a query stops waiting for its response. Withdrawn messages are skipped by the writer.
+    `on_sent` is called with the request on the writer thread once it was sent
+    """
+    __slots__ = ('_req', '_on_sent', '_lock', 'sent', 'withdrawn')
+
+    def __init__(self, req: Callable[[], None], on_sent: Callable[['QueuedRequest'], None] = None):
+        self._req = req
+        self._on_sent = on_sent
+        self._lock = Lock()
+        self.sent = False
+        self.withdrawn = False
+
+    def withdraw(self) -> bool:
+        """
+        Prevents the message from being sent. Returns False if it was already sent
+        """
+        with self._lock:
+            if self.sent:
+                return False
+            self.withdrawn = True
+            return True
+
+    def __call__(self):
+        with self._lock:
+            if self.withdrawn:
+                return
+            self.sent = True
+        self._req()
+        if self._on_sent is not None:
+            self._on_sent(self)
 
 class IBWriter(Thread):
-    MAX_REQS_PER_SECOND = 30
+    MAX_REQS_PER_SECOND = 50
 
     """
     Sends messages to TWS in a dedicated thread to avoid blocking the asyncio thread
-    Also enforces message throttling
+    Also enforces message throttling via a pluggable rate limiter
+    Messages are sent in order of their RequestPriority, and in FIFO order within a priority
     """
-    def __init__(self, client: EClient):
+    def __init__(self, client: EClient, rate_limiter: RateLimiter = None):
         super().__init__()
-        self.queue = Queue()
+        self.queue = PriorityQueue()
         self._client = client
-        self._last_msg_time_sec = math.floor(time.time())
-        self._enable_message_throttling = True
-        self._requests_in_last_sec = 0
-    
-    def enforce_msg_rate(self):
-        if not self._enable_message_throttling:
-            return
-
-        cur_time_sec = math.floor(time.time())
-        if (cur_time_sec == self._last_msg_time_sec):
-            if self._requests_in_last_sec > IBWriter.MAX_REQS_PER_SECOND:
-                time.sleep(1)
-                self.enforce_msg_rate()
-                return
-            else:
-                self._requests_in_last_sec += 1
-        else:
-            self._last_msg_time_sec = cur_time_sec
-            self._requests_in_last_sec = 1
+        self._sequence = itertools.count()
+        self._stopped = False
+        if rate_limiter is None:
+            rate_limiter = TokenBucketRateLimiter(IBWriter.MAX_REQS_PER_SECOND)
+        self.rate_limiter = rate_limiter
+
+    def successor(self) -> 'IBWriter':
+        """
+        Returns a new writer that sends the messages queued in this one, since a thread can only be
+        started once. Used to resume sending after reconnecting
+        """
+        w = IBWriter(self._client, self.rate_limiter)
+        w.queue = self.queue
+        w._sequence = self._sequence
+        return w
+
+    def put(self, req: Callable[[], None], priority: RequestPriority = RequestPriority.INTERACTIVE):
+        # The sequence number keeps FIFO order within a priority and avoids comparing the requests
+        self.queue.put((priority, next(self._sequence), req))
+
+    def enforce_msg_rate(self) -> float:
+        return self.rate_limiter.acquire()
+
+    def stop(self):
+        """
+        Stops the thread after the message being sent. Queued messages are left for a successor
+        """
+        self._stopped = True
+        if self.is_alive():
+            # Wake up the thread
+            self.queue.put((RequestPriority.CANCEL, next(self._sequence), None))
+
+    def clear(self) -> List[Tuple[RequestPriority, Callable[[], None]]]:
+        """
+        Removes the queued messages and returns their priority and request. A stopped thread that
+        hasn't exited yet is still woken up
+        """
+        dropped = []
+        while True:
+            try:
+                priority,_,req = self.queue.get_nowait()
+            except Empty:
+                break
+            if req is not None:
+                dropped.append((priority, req))
+        if self._stopped and self.is_alive():
+            self.queue.put((RequestPriority.CANCEL, next(self._sequence), None))
+        return dropped
 
     def run(self):
-        while self._client.isConnected():
-            req = self.queue.get()
-            self.enforce_msg_rate()
+        while not self._stopped and self._client.isConnected():
+            item = self.queue.get()
+            if isinstance(item[2], QueuedRequest) and item[2].withdrawn:
+                continue
+            if item[2] is not None and self.enforce_msg_rate() > 0 and not self.queue.empty():
+                # A more urgent message may have been queued while waiting for the rate limiter
+                self.queue.put(item)
+                item = self.queue.get()
+            priority,seq,req = item
+            if req is None:
+                continue
+            if self._stopped:
+                self.queue.put(item)
+                break
             req()
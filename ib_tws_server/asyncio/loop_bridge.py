@@ -0,0 +1,65 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Tuple
+
+class LoopBridgeStats():
+    """
+    Number of callbacks delivered and number of times the event loop was woken up to deliver them
+    """
+    delivered: int
+    batches: int
+
+    def __init__(self):
+        self.delivered = 0
+        self.batches = 0
+
+    def average_batch_size(self) -> float:
+        return self.delivered / self.batches if self.batches > 0 else 0.0
+
+class LoopBridge():
+    """
+    Delivers callbacks from the TWS reader thread to an event loop in batches. loop.call_soon_threadsafe
+    wakes up the loop for every call, which dominates the CPU time at high tick rates. Instead,
+    callbacks are appended to a buffer and at most one wake up is scheduled until the buffer is drained.
+
+    When `interval` is greater than 0, the buffer is drained `interval` seconds after the first
+    callback of a batch, which trades latency for larger batches.
+    """
+    loop: asyncio.AbstractEventLoop
+    interval: float
+    stats: LoopBridgeStats
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, interval: float = 0):
+        self.loop = loop
+        self.interval = interval
+        # deque.append and deque.popleft are atomic, so the buffer is shared without a lock
+        self._buffer: Deque[Tuple[Callable[[Any], None], Any]] = deque()
+        self._scheduled = False
+        self.stats = LoopBridgeStats()
+
+    def call_soon(self, cb: Callable[[Any], None], arg: Any):
+        """
+        Schedules cb(arg) on the event loop. Callbacks are called in the order they were scheduled
+        """
+        self._buffer.append((cb, arg))
+        if not self._scheduled:
+            self._scheduled = True
+            if self.interval > 0:
+                self.loop.call_soon_threadsafe(self.loop.call_later, self.interval, self._drain)
+            else:
+                self.loop.call_soon_threadsafe(self._drain)
+
+    def _drain(self):
+        # Clear the flag before taking the batch. Callbacks appended after this either belong
+        # to this batch or schedule the next drain
+        self._scheduled = False
+        buffer = self._buffer
+        count = len(buffer)
+        self.stats.batches += 1
+        self.stats.delivered += count
+        for _ in range(count):
+            cb,arg = buffer.popleft()
+            try:
+                cb(arg)
+            except Exception as e:
+                self.loop.call_exception_handler({ "message": "Exception in LoopBridge callback", "exception": e })
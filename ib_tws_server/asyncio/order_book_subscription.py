@@ -0,0 +1,78 @@
+import asyncio
+from ib_tws_server.util.order_book import OrderBook
+from typing import AsyncIterator, Callable, List
+
+class OrderBookSubscription(AsyncIterator[OrderBook]):
+    """
+    Market depth subscription that applies the updates to an OrderBook when they are delivered to
+    the event loop, instead of queueing them. Returned by AsyncioClient.reqMktDepthAsOrderBook.
+
+    The book can be read at any time. Iterating yields the book whenever its version changed
+    since the previous iteration, so consumers that fall behind skip intermediate versions
+    """
+    book: OrderBook
+
+    def __init__(self, cancel_cb: Callable[[], None], num_rows: int):
+        self._cancel_cb = cancel_cb
+        self._loop = asyncio.get_running_loop()
+        self._waiters: List[asyncio.Future] = []
+        self._closed = False
+        self._yielded_version = 0
+        self.book = OrderBook(num_rows)
+
+    def reserve(self) -> bool:
+        """
+        Called by the TWS reader thread before an update is handed to the event loop
+        """
+        return not self._closed
+
+    def add_to_queue(self, val: object):
+        if self._closed:
+            return
+        self.book.apply(val)
+        self._wake_waiters()
+
+    def reset(self):
+        """
+        Clears the book before the subscription is re-issued after reconnecting, since TWS sends the rows again
+        """
+        self.book.clear()
+
+    def _wake_waiters(self):
+        if len(self._waiters) == 0:
+            return
+        waiters = self._waiters
+        self._waiters = []
+        for w in waiters:
+            if not w.done():
+                w.set_result(None)
+
+    async def wait_for_update(self, version: int = None) -> OrderBook:
+        """
+        Waits until the version of the book is greater than `version`, by default its current version.
+        Returns early if the subscription is closed
+        """
+        if version is None:
+            version = self.book.version
+        while self.book.version <= version and not self._closed:
+            w = self._loop.create_future()
+            self._waiters.append(w)
+            await w
+        return self.book
+
+    async def __anext__(self) -> OrderBook:
+        await self.wait_for_update(self._yielded_version)
+        if self._closed:
+            raise StopAsyncIteration
+        self._yielded_version = self.book.version
+        return self.book
+
+    def __aiter__(self):
+        return self
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake_waiters()
+        self._cancel_cb()
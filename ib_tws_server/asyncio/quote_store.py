@@ -0,0 +1,220 @@
+from array import array
+from ib_tws_server.asyncio.response_cache import CacheStats
+from ib_tws_server.asyncio.subscription_generator import OverflowPolicy, SubscriptionGenerator, SubscriptionQueueOptions
+from ib_tws_server.util.request_key import canonical_key
+from ib_tws_server.util.tuple_response import TupleResponse
+from ibapi.ticktype import TickTypeEnum
+import math
+from operator import itemgetter
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+
+NUM_TICK_TYPES = TickTypeEnum.NOT_SET + 1
+
+class Quote(TupleResponse):
+    """
+    Level 1 quote of a contract at a version of its QuoteState. Prices and sizes that haven't
+    been received are nan. Delayed ticks are used for values without a live tick
+    """
+    __slots__ = ()
+    _fields = ('time', 'version', 'bid', 'ask', 'last', 'bid_size', 'ask_size', 'last_size', 'open', 'high', 'low', 'close', 'volume')
+
+    def __new__(cls, time: float, version: int, bid: float, ask: float, last: float, bid_size: float, ask_size: float, last_size: float, open: float, high: float, low: float, close: float, volume: float):
+        return tuple.__new__(cls, (time, version, bid, ask, last, bid_size, ask_size, last_size, open, high, low, close, volume))
+
+    time = property(itemgetter(0))
+    version = property(itemgetter(1))
+    bid = property(itemgetter(2))
+    ask = property(itemgetter(3))
+    last = property(itemgetter(4))
+    bid_size = property(itemgetter(5))
+    ask_size = property(itemgetter(6))
+    last_size = property(itemgetter(7))
+    open = property(itemgetter(8))
+    high = property(itemgetter(9))
+    low = property(itemgetter(10))
+    close = property(itemgetter(11))
+    volume = property(itemgetter(12))
+
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2
+
+# (live, delayed) tick types of the Quote fields after time and version
+_QUOTE_TICK_TYPES = [
+    (TickTypeEnum.BID, TickTypeEnum.DELAYED_BID),
+    (TickTypeEnum.ASK, TickTypeEnum.DELAYED_ASK),
+    (TickTypeEnum.LAST, TickTypeEnum.DELAYED_LAST),
+    (TickTypeEnum.BID_SIZE, TickTypeEnum.DELAYED_BID_SIZE),
+    (TickTypeEnum.ASK_SIZE, TickTypeEnum.DELAYED_ASK_SIZE),
+    (TickTypeEnum.LAST_SIZE, TickTypeEnum.DELAYED_LAST_SIZE),
+    (TickTypeEnum.OPEN, TickTypeEnum.DELAYED_OPEN),
+    (TickTypeEnum.HIGH, TickTypeEnum.DELAYED_HIGH),
+    (TickTypeEnum.LOW, TickTypeEnum.DELAYED_LOW),
+    (TickTypeEnum.CLOSE, TickTypeEnum.DELAYED_CLOSE),
+    (TickTypeEnum.VOLUME, TickTypeEnum.DELAYED_VOLUME)
+]
+
+def tick_value(tick: object) -> Optional[float]:
+    """
+    Returns the value of a TickPrice, TickSize or TickEFP response
+    """
+    for a in ('price', 'size', 'basisPoints'):
+        v = getattr(tick, a, None)
+        if v is not None:
+            return v
+    return None
+
+class QuoteState():
+    """
+    Latest value of every tick type of one contract, in an array indexed by tick type, and the
+    latest tick of every tick type to answer snapshot requests
+    """
+    values: array
+    ticks: List[object]
+    version: int
+    updated: float
+    # Number of open subscriptions that update the state
+    live: int
+
+    def __init__(self):
+        self.values = array('d', [ math.nan ]) * NUM_TICK_TYPES
+        self.ticks = [ None ] * NUM_TICK_TYPES
+        self.version = 0
+        self.updated = None
+        self.live = 0
+        self._quote: Quote = None
+
+    def apply(self, tick: object, now: float) -> bool:
+        """
+        Stores the value of a tick. Returns False for responses without a tick type, like TickReqParams
+        """
+        t = getattr(tick, 'tickType', None)
+        if t is None or t < 0 or t >= NUM_TICK_TYPES:
+            return False
+        v = tick_value(tick)
+        if v is not None:
+            self.values[t] = v
+        self.ticks[t] = tick
+        self.version += 1
+        self.updated = now
+        return True
+
+    def value(self, tick_type: int) -> float:
+        return self.values[tick_type]
+
+    def quote(self) -> Quote:
+        """
+        Returns the current quote, which is shared by callers until the state changes
+        """
+        q = self._quote
+        if q is not None and q.version == self.version:
+            return q
+        v = self.values
+        fields = [ v[l] if not math.isnan(v[l]) else v[d] for l,d in _QUOTE_TICK_TYPES ]
+        q = self._quote = Quote(self.updated, self.version, *fields)
+        return q
+
+    def snapshot_ticks(self) -> List[object]:
+        return [ t for t in self.ticks if t is not None ]
+
+def _quote_key(q: Quote) -> Hashable:
+    return None
+
+class QuoteSubscription(SubscriptionGenerator):
+    """
+    Market data subscription that applies its ticks to a QuoteState. It yields the ticks, or with
+    `conflate` set, Quote snapshots of which at most one is queued, so a slow consumer always
+    receives the latest quote
+    """
+    state: QuoteState
+
+    def __init__(self, state: QuoteState, conflate: bool, cancel_cb: SubscriptionGenerator.CancelCbType, reqId: int, options: SubscriptionQueueOptions = None, clock: Callable[[], float] = time.time):
+        if conflate:
+            options = SubscriptionQueueOptions(0, OverflowPolicy.CONFLATE, _quote_key)
+        super().__init__(cancel_cb, reqId, options)
+        self.state = state
+        self._conflate = conflate
+        self._clock = clock
+        state.live += 1
+
+    def add_to_queue(self, val: object):
+        applied = self.state.apply(val, self._clock())
+        if not self._conflate:
+            super().add_to_queue(val)
+        elif applied:
+            super().add_to_queue(self.state.quote())
+
+    async def aclose(self):
+        if not self._closed:
+            self.state.live -= 1
+        await super().aclose()
+
+class QuoteStore():
+    """
+    Latest quotes of the contracts with market data subscriptions, keyed by contract, when passed
+    to AsyncioClient. Every reqMktData subscription updates the QuoteState of its contract, so
+    quote(contract) is a dict lookup. Snapshot reqMktData queries without generic ticks are
+    answered from the state if a subscription is open or the state was updated within
+    `max_age` seconds, and update the state otherwise.
+
+    States without open subscriptions are dropped once there are more than `max_entries` contracts
+    """
+    MAX_ENTRIES = 10000
+
+    stats: CacheStats
+
+    def __init__(self, max_age: float = 1.0, max_entries: int = MAX_ENTRIES, clock: Callable[[], float] = time.time):
+        self.max_age = max_age
+        self.clock = clock
+        self._max_entries = max_entries
+        self._states: Dict[Hashable, QuoteState] = {}
+        self.stats = CacheStats()
+
+    def __len__(self):
+        return len(self._states)
+
+    def state(self, contract: 'ibapi.contract.Contract') -> QuoteState:
+        """
+        Returns the state of a contract, creating it if needed
+        """
+        key = canonical_key(contract)
+        s = self._states.get(key)
+        if s is None:
+            if len(self._states) >= self._max_entries:
+                self._evict()
+            s = self._states[key] = QuoteState()
+        return s
+
+    def quote(self, contract: 'ibapi.contract.Contract') -> Optional[Quote]:
+        s = self._states.get(canonical_key(contract))
+        if s is None or s.version == 0:
+            return None
+        return s.quote()
+
+    def subscription(self, contract: 'ibapi.contract.Contract', conflate: bool, cancel_cb: SubscriptionGenerator.CancelCbType, reqId: int, options: SubscriptionQueueOptions = None) -> QuoteSubscription:
+        return QuoteSubscription(self.state(contract), conflate, cancel_cb, reqId, options, self.clock)
+
+    def fresh_ticks(self, contract: 'ibapi.contract.Contract') -> Optional[List[object]]:
+        """
+        Returns the ticks of a snapshot of the contract, or None if the state isn't fresh enough
+        """
+        s = self._states.get(canonical_key(contract))
+        if s is None or s.version == 0 or (s.live == 0 and self.clock() - s.updated > self.max_age):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return s.snapshot_ticks()
+
+    def record_snapshot(self, contract: 'ibapi.contract.Contract', ticks: List[object]):
+        s = self.state(contract)
+        now = self.clock()
+        for t in ticks:
+            s.apply(t, now)
+
+    def _evict(self):
+        now = self.clock()
+        stale = [ k for k,s in self._states.items() if s.live == 0 and (s.updated is None or now - s.updated > self.max_age) ]
+        if len(stale) == 0:
+            stale = [ k for k,s in self._states.items() if s.live == 0 ]
+        for k in stale:
+            del self._states[k]
@@ -0,0 +1,103 @@
+from abc import ABC, abstractmethod
+from threading import Lock
+import time
+from typing import Callable
+
+class RateLimiterStats():
+    """
+    Wait time reported by a rate limiter. Times are in seconds
+    """
+    acquired: int
+    delayed: int
+    total_wait: float
+    max_wait: float
+    last_wait: float
+
+    def __init__(self):
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def record(self, wait: float):
+        self.acquired += 1
+        self.last_wait = wait
+        if wait > 0:
+            self.delayed += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+    def average_wait(self) -> float:
+        return self.total_wait / self.acquired if self.acquired > 0 else 0.0
+
+class RateLimiter(ABC):
+    """
+    Throttles messages sent to TWS. acquire is called by the IBWriter thread before each
+    message is sent
+    """
+    stats: RateLimiterStats
+
+    def __init__(self):
+        self.stats = RateLimiterStats()
+
+    @abstractmethod
+    def acquire(self) -> float:
+        """
+        Block until the next message can be sent. Returns the time spent waiting in seconds
+        """
+
+class UnlimitedRateLimiter(RateLimiter):
+    """
+    Does not throttle messages
+    """
+    def acquire(self) -> float:
+        self.stats.record(0.0)
+        return 0.0
+
+class TokenBucketRateLimiter(RateLimiter):
+    """
+    Token bucket that refills continuously at `rate` tokens per second and holds at most `burst` tokens.
+    With the default burst of 1 this behaves as a leaky bucket, and messages are spaced evenly
+    1/rate seconds apart instead of being sent in bursts followed by a stall.
+    """
+    rate: float
+    burst: float
+
+    def __init__(self, rate: float, burst: float = 1, clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        super().__init__()
+        if rate <= 0:
+            raise ValueError(f"Rate should be positive {rate}")
+        if burst < 1:
+            raise ValueError(f"Burst should be at least 1 {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = Lock()
+        self._tokens = burst
+        self._last_refill = clock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def wait_time(self) -> float:
+        """
+        Time in seconds until the next message can be sent without waiting
+        """
+        with self._lock:
+            self._refill(self._clock())
+            return max(0.0, (1 - self._tokens) / self.rate)
+
+    def acquire(self) -> float:
+        with self._lock:
+            self._refill(self._clock())
+            # Reserve the token up front so the wait is computed once, even if the sleep overshoots
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+            self.stats.record(wait)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
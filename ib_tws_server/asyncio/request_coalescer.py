@@ -0,0 +1,76 @@
+import asyncio
+from ib_tws_server.error import RequestTimeoutError
+from ib_tws_server.util.request_key import canonical_key
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class CoalescerStats():
+    """
+    Number of requests issued to TWS and number of calls that shared an in-flight request
+    """
+    issued: int
+    coalesced: int
+
+    def __init__(self):
+        self.issued = 0
+        self.coalesced = 0
+
+class RequestCoalescer():
+    """
+    Shares a single in-flight request between concurrent calls with equal arguments. Used by
+    AsyncioClient for requests whose ApiDefinition is marked as idempotent.
+
+    All callers receive the same response object, so responses should be treated as read only.
+    Cancelling one caller or its timeout expiring doesn't cancel the request for the other callers.
+    The request is cancelled once no caller waits for it anymore.
+    """
+    stats: CoalescerStats
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        # Number of callers waiting for each in-flight request
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self.stats = CoalescerStats()
+
+    def in_flight_count(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self, request: Tuple, send: Callable[[], Awaitable[Any]], timeout: float = None) -> Any:
+        """
+        Awaits the in-flight request equal to `request`, or starts a new one by calling `send`.
+        `request` is a tuple of the request name and its arguments. The caller waits for at most
+        `timeout` seconds, after which RequestTimeoutError is raised. `send` should therefore not
+        apply a timeout of its own, since the request is shared with callers that have other timeouts
+        """
+        key = (id(asyncio.get_running_loop()), canonical_key(request))
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.issued += 1
+            future = asyncio.ensure_future(send())
+            self._in_flight[key] = future
+            self._waiters[future] = 0
+            def done(f: asyncio.Future):
+                if self._in_flight.get(key) is f:
+                    del self._in_flight[key]
+                del self._waiters[f]
+                # Avoid 'exception was never retrieved' when every caller was cancelled
+                if not f.cancelled():
+                    f.exception()
+            future.add_done_callback(done)
+        self._waiters[future] += 1
+        try:
+            if timeout is None or timeout <= 0:
+                return await asyncio.shield(future)
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if future.done():
+                raise
+            raise RequestTimeoutError(request[0], timeout) from None
+        finally:
+            if not future.done():
+                self._waiters[future] -= 1
+                if self._waiters[future] == 0:
+                    # Nobody waits for the response, so abandon the request
+                    future.cancel()
+                    await asyncio.wait([ future ])
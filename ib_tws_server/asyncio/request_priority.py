@@ -0,0 +1,10 @@
+from enum import IntEnum
+
+class RequestPriority(IntEnum):
+    """
+    Send priority of messages queued in the IBWriter. Lower values are sent first
+    """
+    CANCEL = 0
+    ORDER = 1
+    INTERACTIVE = 2
+    BULK = 3
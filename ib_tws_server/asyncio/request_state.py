@@ -1,8 +1,36 @@
-from typing import Union
+from itertools import count
+from typing import Callable, Dict, Tuple, Union
 
 RequestId = Union[int, str]
 
 class RequestState():
+    def __init__(self, cb: Callable = None, response: object = None):
+        self.cb = cb
+        # Responses are appended to a list, or to a preset accumulator such as HistoricalBarColumns
+        self.response = response
+
+class RequestStateRegistry():
+    """
+    State of the pending requests and active subscriptions, shared by the asyncio threads and
+    the TWS reader thread. Request ids come from an itertools.count and the state is kept in
+    separate maps for requests and subscriptions. Every access is a single dict operation,
+    which is atomic, so no lock is needed. A request is completed by popping its state, so
+    only one of its response, an error or a cancellation calls its callback.
+    """
+    requests: Dict[RequestId, RequestState]
+    subscriptions: Dict[RequestId, 'SubscriptionGenerator']
+    # Bound request and priority of the active subscriptions, to re-issue them after reconnecting
+    subscription_requests: Dict[RequestId, Tuple[Callable[[], None], 'RequestPriority']]
+    # Queued requests of the subscriptions, orders and streams until they're sent, so cancelling
+    # them before then withdraws the request instead of sending a cancel that would overtake it
+    queued: Dict[RequestId, 'QueuedRequest']
+
     def __init__(self):
-        self.cb = None
-        self.response = None
+        self._request_ids = count(1)
+        self.requests = {}
+        self.subscriptions = {}
+        self.subscription_requests = {}
+        self.queued = {}
+
+    def next_request_id(self) -> int:
+        return next(self._request_ids)
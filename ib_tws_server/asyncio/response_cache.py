@@ -0,0 +1,216 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from ib_tws_server.util.request_key import canonical_key, serialize_key
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class CacheStats():
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+class SqliteResponseStore():
+    """
+    Persists cached responses in a SQLite database so the cache stays warm across restarts.
+    Responses are pickled, so the database should only be shared between trusted processes.
+
+    The database is only accessed from a worker thread, so disk I/O doesn't block the event
+    loop. Writes are queued without waiting for them, and are committed together once the
+    worker has no more queued writes
+    """
+    def __init__(self, path: str):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SqliteResponseStore")
+        # Opening the database is the worker's first task, so it's done before any other access
+        self._opened = self._executor.submit(SqliteResponseStore._open, path)
+        # Writes queued to the worker that it hasn't executed yet
+        self._queued_writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _open(path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, request TEXT NOT NULL, expires REAL NOT NULL, value BLOB NOT NULL)")
+        db.commit()
+        return db
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Only called by the worker, which has opened the database by then. Raises the error if opening failed
+        return self._opened.result()
+
+    def _get(self, key: str) -> Tuple[float, Any]:
+        row = self._db.execute("SELECT expires, value FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], pickle.loads(row[1])
+
+    async def get(self, key: str) -> Tuple[float, Any]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get, key)
+
+    def _write(self, sql: str, params: Callable[[], Tuple]):
+        with self._lock:
+            self._queued_writes += 1
+        def write():
+            self._db.execute(sql, params())
+            with self._lock:
+                self._queued_writes -= 1
+                last = self._queued_writes == 0
+            if last:
+                self._db.commit()
+        self._executor.submit(write)
+
+    def put(self, key: str, request: str, expires: float, value: Any):
+        self._write("INSERT OR REPLACE INTO responses (key, request, expires, value) VALUES (?, ?, ?, ?)", lambda: (key, request, expires, pickle.dumps(value)))
+
+    def delete(self, key: str):
+        self._write("DELETE FROM responses WHERE key = ?", lambda: (key,))
+
+    def clear(self, request: str = None, expired_before: float = None):
+        if request is None and expired_before is None:
+            self._write("DELETE FROM responses", lambda: ())
+        elif expired_before is not None:
+            self._write("DELETE FROM responses WHERE expires <= ?", lambda: (expired_before,))
+        else:
+            self._write("DELETE FROM responses WHERE request = ?", lambda: (request,))
+
+    def _commit(self):
+        self._db.commit()
+
+    async def flush(self):
+        """
+        Waits until the queued writes are committed
+        """
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._commit)
+
+    def close(self):
+        """
+        Commits the queued writes and closes the database
+        """
+        self._executor.submit(self._commit)
+        self._executor.submit(lambda: self._db.close())
+        self._executor.shutdown(wait=True)
+
+class _CacheEntry():
+    __slots__ = ('expires', 'value')
+
+    def __init__(self, expires: float, value: Any):
+        self.expires = expires
+        self.value = value
+
+class ResponseCache():
+    """
+    Caches responses of requests with a cache_ttl in their ApiDefinition, such as contract
+    details and market rules. Entries are keyed by the request name and its arguments, with
+    contracts compared by value, and are evicted in LRU order once `max_entries` is reached.
+
+    `ttls` overrides the TTL in seconds of a request by name. A TTL of 0 disables caching for
+    the request. When a `store` is given, responses are also written to it and read back on
+    a miss, e.g. after a restart.
+
+    All callers receive the same response object, so responses should be treated as read only.
+    """
+    MAX_ENTRIES = 10000
+
+    stats: CacheStats
+
+    def __init__(self, ttls: Dict[str, float] = None, max_entries: int = MAX_ENTRIES, store: SqliteResponseStore = None, clock: Callable[[], float] = time.time):
+        self._ttls = ttls if ttls is not None else {}
+        self._max_entries = max_entries
+        self._store = store
+        # Wall clock time since expiry times are persisted
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, _CacheEntry]' = OrderedDict()
+        self.stats = CacheStats()
+
+    def ttl(self, request: Tuple, default_ttl: float) -> float:
+        return self._ttls.get(request[0], default_ttl)
+
+    @staticmethod
+    def _store_key(key: Hashable) -> str:
+        return serialize_key(key)
+
+    async def get(self, request: Tuple) -> Tuple[bool, Any]:
+        """
+        Returns whether the response of the request is cached, and the response
+        """
+        key = canonical_key(request)
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires > now:
+                self._entries.move_to_end(key)
+                return True, entry.value
+            del self._entries[key]
+        if self._store is not None:
+            stored = await self._store.get(ResponseCache._store_key(key))
+            if stored is not None:
+                expires,value = stored
+                if expires > now:
+                    self._insert(key, _CacheEntry(expires, value))
+                    return True, value
+                self._store.delete(ResponseCache._store_key(key))
+        return False, None
+
+    def put(self, request: Tuple, value: Any, ttl: float):
+        if ttl <= 0:
+            return
+        key = canonical_key(request)
+        entry = _CacheEntry(self._clock() + ttl, value)
+        self._insert(key, entry)
+        if self._store is not None:
+            self._store.put(ResponseCache._store_key(key), request[0], entry.expires, value)
+
+    def _insert(self, key: Hashable, entry: _CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, request_name: str = None):
+        """
+        Removes the cached responses of a request, or all cached responses
+        """
+        if request_name is None:
+            self._entries.clear()
+        else:
+            for k in [ k for k in self._entries if k[0] == request_name ]:
+                del self._entries[k]
+        if self._store is not None:
+            self._store.clear(request_name)
+
+    def purge_expired(self):
+        now = self._clock()
+        for k in [ k for k,e in self._entries.items() if e.expires <= now ]:
+            del self._entries[k]
+        if self._store is not None:
+            self._store.clear(expired_before=now)
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def run(self, request: Tuple, send: Callable[[], Awaitable[Any]], default_ttl: float) -> Any:
+        """
+        Returns the cached response of `request`, or calls `send` and caches its response.
+        `request` is a tuple of the request name and its arguments
+        """
+        ttl = self.ttl(request, default_ttl)
+        if ttl <= 0:
+            return await send()
+        hit,value = await self.get(request)
+        if hit:
+            self.stats.hits += 1
+            return value
+        self.stats.misses += 1
+        value = await send()
+        self.put(request, value, ttl)
+        return value
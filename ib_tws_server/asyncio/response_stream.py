@@ -0,0 +1,82 @@
+import asyncio
+from collections import deque
+from ib_tws_server.asyncio.loop_bridge import LoopBridge
+from ib_tws_server.error import IbError
+from typing import AsyncIterator, Callable, Deque, TypeVar
+
+YieldType = TypeVar("YieldType")
+
+class ResponseStream(AsyncIterator[YieldType]):
+    """
+    Yields the responses of a query with a list of responses as they arrive, instead of
+    returning the list once the end marker is received. Returned by the AsStream variants
+    of AsyncioClient queries.
+
+    The stream ends after the end marker, or raises the IbError of the request once the
+    responses received before the error have been yielded. aclose cancels the request.
+    """
+    def __init__(self, bridge: LoopBridge, cancel_cb: Callable[[], None]):
+        self._bridge = bridge
+        self._loop = bridge.loop
+        self._cancel_cb = cancel_cb
+        self._queue: Deque[YieldType] = deque()
+        self._waiter: asyncio.Future = None
+        self._done = False
+        self._error: IbError = None
+
+    def append(self, val: YieldType):
+        """
+        Called by the wrapper on the TWS reader thread for every response
+        """
+        self._bridge.call_soon(self._add, val)
+
+    def finish(self, res: object):
+        """
+        Called on the TWS reader thread when the request completes, fails or is cancelled.
+        Goes through the same bridge as the responses so it can't overtake them
+        """
+        self._bridge.call_soon(self._finish, res)
+
+    def _add(self, val: YieldType):
+        if self._done:
+            return
+        self._queue.append(val)
+        self._wake_waiter()
+
+    def _finish(self, res: object):
+        if isinstance(res, IbError):
+            self._error = res
+        self._done = True
+        self._wake_waiter()
+
+    def _wake_waiter(self):
+        w = self._waiter
+        if w is not None and not w.done():
+            w.set_result(None)
+
+    async def __anext__(self) -> YieldType:
+        while len(self._queue) == 0:
+            if self._done:
+                if self._error is not None:
+                    e = self._error
+                    self._error = None
+                    raise e
+                raise StopAsyncIteration
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._queue.popleft()
+
+    def __aiter__(self):
+        return self
+
+    def qsize(self) -> int:
+        return len(self._queue)
+
+    async def aclose(self):
+        if not self._done:
+            self._done = True
+            self._queue.clear()
+            self._cancel_cb()
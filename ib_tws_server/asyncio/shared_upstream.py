@@ -0,0 +1,146 @@
+from abc import ABC, abstractmethod
+import asyncio
+from ib_tws_server.util.request_key import canonical_key
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+ConsumerType = TypeVar("ConsumerType")
+
+class SharedUpstreamStats():
+    """
+    Number of upstream subscriptions opened and number of consumers that joined one
+    """
+    upstream_subscriptions: int
+    shared_subscriptions: int
+
+    def __init__(self):
+        self.upstream_subscriptions = 0
+        self.shared_subscriptions = 0
+
+class _OpenCancelled(Exception):
+    """
+    Set on the ready future when the consumer opening the upstream was cancelled, so the
+    consumers waiting for it open it again instead of being cancelled
+    """
+
+class SharedUpstream(ABC):
+    """
+    An upstream subscription and its consumers. Subclasses deliver the updates to the consumers
+    """
+    key: Hashable
+    upstream: AsyncIterator
+    ready: asyncio.Future
+    pump: asyncio.Task
+
+    def __init__(self, key: Hashable, ready: asyncio.Future):
+        self.key = key
+        self.upstream = None
+        self.ready = ready
+        self.pump = None
+
+    @abstractmethod
+    def consumer_count(self) -> int:
+        pass
+
+    @abstractmethod
+    def publish(self, val: Any):
+        pass
+
+    def close(self):
+        """
+        Called when the upstream subscription ended
+        """
+        pass
+
+class SharedUpstreams(ABC, Generic[ConsumerType]):
+    """
+    Keeps one upstream subscription per event loop and request, keyed by the request name and
+    its arguments with contracts compared by value. The first consumer opens the upstream and
+    the others wait until it is open. Updates are forwarded to the consumers by a pump task,
+    and the upstream is closed once its last consumer leaves.
+
+    Subclasses create the SharedUpstream and its consumers, and call _release when a consumer leaves
+    """
+    stats: SharedUpstreamStats
+
+    def __init__(self):
+        self._shared: Dict[Hashable, SharedUpstream] = {}
+        self.stats = SharedUpstreamStats()
+
+    def upstream_count(self) -> int:
+        return len(self._shared)
+
+    def _get(self, request: Tuple) -> SharedUpstream:
+        return self._shared.get((id(asyncio.get_running_loop()), canonical_key(request)))
+
+    @abstractmethod
+    def _create(self, key: Hashable, ready: asyncio.Future, *args) -> SharedUpstream:
+        pass
+
+    @abstractmethod
+    def _add_consumer(self, s: SharedUpstream, *args) -> ConsumerType:
+        pass
+
+    @abstractmethod
+    def _discard_consumer(self, s: SharedUpstream, consumer: ConsumerType):
+        pass
+
+    async def _join(self, request: Tuple, subscribe: Callable[[], Awaitable[AsyncIterator]], *args) -> ConsumerType:
+        """
+        Returns a consumer of the upstream subscription equal to `request`, or opens it by calling
+        `subscribe`. `args` are passed to _create and _add_consumer
+        """
+        loop = asyncio.get_running_loop()
+        key = (id(loop), canonical_key(request))
+        s = self._shared.get(key)
+        while s is not None:
+            consumer = self._add_consumer(s, *args)
+            try:
+                await asyncio.shield(s.ready)
+                self.stats.shared_subscriptions += 1
+                return consumer
+            except _OpenCancelled:
+                self._discard_consumer(s, consumer)
+                s = self._shared.get(key)
+            except BaseException:
+                self._discard_consumer(s, consumer)
+                raise
+
+        s = self._create(key, loop.create_future(), *args)
+        consumer = self._add_consumer(s, *args)
+        self._shared[key] = s
+        try:
+            s.upstream = await subscribe()
+        except BaseException as e:
+            if self._shared.get(key) is s:
+                del self._shared[key]
+            s.ready.set_exception(_OpenCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            # Avoid 'exception was never retrieved' when there are no other consumers
+            s.ready.exception()
+            raise
+        self.stats.upstream_subscriptions += 1
+        s.pump = asyncio.create_task(self._pump(s))
+        s.ready.set_result(None)
+        return consumer
+
+    async def _pump(self, s: SharedUpstream):
+        try:
+            async for val in s.upstream:
+                s.publish(val)
+        finally:
+            # The subscription ended, so consumers that join later open a new one
+            if self._shared.get(s.key) is s:
+                del self._shared[s.key]
+            s.close()
+
+    def _release(self, s: SharedUpstream):
+        if s.consumer_count() > 0 or self._shared.get(s.key) is not s:
+            return
+        # Remove the subscription right away so new consumers open a new one
+        del self._shared[s.key]
+        if s.upstream is not None:
+            asyncio.ensure_future(self._close_upstream(s))
+
+    async def _close_upstream(self, s: SharedUpstream):
+        if s.pump is not None:
+            s.pump.cancel()
+        await s.upstream.aclose()
@@ -1,40 +1,201 @@
 import asyncio
-from asyncio.queues import Queue
+from collections import deque
+from enum import Enum
 from ib_tws_server.asyncio.request_state import RequestId
-from typing import AsyncGenerator, Awaitable, Callable, TypeVar, Union
+from threading import Condition
+from typing import AsyncGenerator, Awaitable, Callable, Deque, Dict, Hashable, List, TypeVar, Union
 
 YieldType = TypeVar("YieldType")
 
+class OverflowPolicy(Enum):
+    """
+    What a subscription does with updates that arrive when its queue is full
+
+    BLOCK: The TWS reader thread waits for the consumer. This stalls all other requests
+        and subscriptions until there is space, so use it for consumers that must not miss updates
+    DROP_OLDEST: The oldest queued update is dropped
+    DROP_NEWEST: The arriving update is dropped
+    CONFLATE: Updates with the same conflation key replace the queued update in place, so at most
+        one update per key is queued. The oldest key is dropped if there are more keys than max_size
+    """
+    BLOCK = 0
+    DROP_OLDEST = 1
+    DROP_NEWEST = 2
+    CONFLATE = 3
+
+def conflate_by(*attributes: str) -> Callable[[object], Hashable]:
+    """
+    Returns a conflation key of the update type and the given attributes, e.g.
+    conflate_by('tickType') for market data or conflate_by('side', 'position') for market depth
+    """
+    def key(val: object):
+        return (val.__class__, *[ getattr(val, a, None) for a in attributes ])
+    return key
+
+class SubscriptionQueueOptions():
+    """
+    Queue bounds of a subscription. A max_size of 0 leaves the queue unbounded
+    """
+    max_size: int
+    overflow_policy: OverflowPolicy
+    conflation_key: Callable[[object], Hashable]
+
+    def __init__(self, max_size: int = 0, overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST, conflation_key: Callable[[object], Hashable] = None):
+        if overflow_policy == OverflowPolicy.CONFLATE and conflation_key is None:
+            raise ValueError("CONFLATE requires a conflation key")
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.conflation_key = conflation_key
+
+class SubscriptionStats():
+    received: int
+    dropped: int
+    conflated: int
+    max_queued: int
+
+    def __init__(self):
+        self.received = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_queued = 0
+
 class SubscriptionGenerator(AsyncGenerator[YieldType, None]):
     CancelCbType = Union[Callable[[RequestId],None],Callable[[],None]]
     _req_id: RequestId
     _cancel_cb: CancelCbType
-    _queue: asyncio.Queue[YieldType]
+    _queue: Deque[YieldType]
+    _options: SubscriptionQueueOptions
+    stats: SubscriptionStats
 
-    def __init__(self, cancel_cb: CancelCbType, reqId: RequestId):
+    def __init__(self, cancel_cb: CancelCbType, reqId: RequestId, options: SubscriptionQueueOptions = None):
         self._cancel_cb = cancel_cb
         self._req_id = reqId
         self._loop = asyncio.get_running_loop()
-        self._queue = asyncio.Queue()
+        self._queue = deque()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._options = options if options is not None else SubscriptionQueueOptions()
+        # Queued slots by conflation key. A slot is a [key, value] list so values can be replaced in place
+        self._slots: Dict[Hashable, List] = {}
+        # Updates accepted by reserve that haven't been queued yet
+        self._in_flight = 0
+        self._space = Condition()
+        self._closed = False
+        self._error: Exception = None
+        self.stats = SubscriptionStats()
+
+    def reserve(self) -> bool:
+        """
+        Called by the TWS reader thread before an update is handed to the event loop. With the
+        BLOCK policy this waits until the queue has space. Returns False if the subscription was closed
+        """
+        o = self._options
+        if o.max_size <= 0 or o.overflow_policy != OverflowPolicy.BLOCK:
+            return not self._closed
+        with self._space:
+            while len(self._queue) + self._in_flight >= o.max_size and not self._closed:
+                self._space.wait()
+            if self._closed:
+                return False
+            self._in_flight += 1
+            return True
 
     def add_to_queue(self, val: YieldType):
-        self._queue.put_nowait(val)
-        super().asend
+        o = self._options
+        self.stats.received += 1
+        if o.overflow_policy == OverflowPolicy.BLOCK and o.max_size > 0:
+            with self._space:
+                self._in_flight = max(0, self._in_flight - 1)
+                self._queue.append(val)
+        elif o.overflow_policy == OverflowPolicy.CONFLATE:
+            key = o.conflation_key(val)
+            slot = self._slots.get(key)
+            if slot is not None:
+                slot[1] = val
+                self.stats.conflated += 1
+                return
+            if o.max_size > 0 and len(self._queue) >= o.max_size:
+                del self._slots[self._queue.popleft()[0]]
+                self.stats.dropped += 1
+            slot = [ key, val ]
+            self._slots[key] = slot
+            self._queue.append(slot)
+        elif o.max_size > 0 and len(self._queue) >= o.max_size:
+            self.stats.dropped += 1
+            if o.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                return
+            self._queue.popleft()
+            self._queue.append(val)
+        else:
+            self._queue.append(val)
+
+        if len(self._queue) > self.stats.max_queued:
+            self.stats.max_queued = len(self._queue)
+        self._wake_waiter()
+
+    def _wake_waiter(self):
+        while len(self._waiters) > 0:
+            w = self._waiters.popleft()
+            if not w.done():
+                w.set_result(None)
+                break
+
+    def qsize(self) -> int:
+        return len(self._queue)
 
     async def __anext__(self) -> YieldType:
-        return await self._queue.get()
-        
+        while len(self._queue) == 0:
+            if self._error is not None:
+                raise self._error
+            w = self._loop.create_future()
+            self._waiters.append(w)
+            try:
+                await w
+            except asyncio.CancelledError:
+                # Pass on a wake up that this waiter received but can't consume
+                if not w.cancelled() and len(self._queue) > 0:
+                    self._wake_waiter()
+                raise
+        val = self._queue.popleft()
+        o = self._options
+        if o.overflow_policy == OverflowPolicy.CONFLATE:
+            del self._slots[val[0]]
+            val = val[1]
+        elif o.overflow_policy == OverflowPolicy.BLOCK and o.max_size > 0:
+            with self._space:
+                self._space.notify()
+        return val
+
     def __aiter__(self):
         return self
-     
+
+    def _close_queue(self):
+        with self._space:
+            self._closed = True
+            self._space.notify_all()
+
+    def abort(self, error: Exception):
+        """
+        Ends a subscription whose request was never sent. `error` is raised once the queued updates
+        were consumed, and aclose doesn't cancel the request
+        """
+        self._error = error
+        self._close_queue()
+        for w in self._waiters:
+            if not w.done():
+                w.set_result(None)
+        self._waiters.clear()
+
     async def aclose(self) -> Awaitable[None]:
+        self._close_queue()
+        if self._error is not None:
+            return
         if (self._req_id is None):
             self._cancel_cb()
         else:
             self._cancel_cb(self._req_id)
 
     async def asend(self, value: YieldType) -> Awaitable[YieldType]:
-        pass 
+        pass
 
     async def athrow(self, type: BaseException) -> Awaitable[YieldType]:
         raise type
@@ -0,0 +1,66 @@
+import asyncio
+from ib_tws_server.asyncio.shared_upstream import SharedUpstream, SharedUpstreams
+from ib_tws_server.asyncio.subscription_generator import SubscriptionGenerator, SubscriptionQueueOptions
+from itertools import count
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+class _SharedSubscription(SharedUpstream):
+    """
+    An upstream subscription and the consumers its updates are forwarded to
+    """
+    consumers: Dict[int, SubscriptionGenerator]
+
+    def __init__(self, key: Hashable, ready: asyncio.Future):
+        super().__init__(key, ready)
+        self.consumers = {}
+
+    def consumer_count(self) -> int:
+        return len(self.consumers)
+
+    def publish(self, val: object):
+        for c in list(self.consumers.values()):
+            c.add_to_queue(val)
+
+class SubscriptionMultiplexer(SharedUpstreams[SubscriptionGenerator]):
+    """
+    Shares a single TWS subscription between consumers that subscribe with equal arguments,
+    which saves market data lines. Used by AsyncioClient for requests whose ApiDefinition is
+    marked as shareable.
+
+    Each consumer receives its own SubscriptionGenerator. The upstream subscription is
+    cancelled when the last consumer calls aclose. Consumers that join an active subscription
+    only receive the updates sent after they joined. Consumer queues are bounded by their own
+    SubscriptionQueueOptions, except for the BLOCK policy which can't stall the other consumers
+    and leaves the queue unbounded.
+    """
+    def __init__(self):
+        super().__init__()
+        self._consumer_ids = count(1)
+
+    def consumer_count(self, request: Tuple) -> int:
+        s = self._get(request)
+        return s.consumer_count() if s is not None else 0
+
+    async def subscribe(self, request: Tuple, subscribe: Callable[[], Awaitable[SubscriptionGenerator]], queue_options: SubscriptionQueueOptions = None) -> SubscriptionGenerator:
+        """
+        Returns a consumer of the active subscription equal to `request`, or opens a new
+        subscription by calling `subscribe`. `request` is a tuple of the request name and its arguments
+        """
+        return await self._join(request, subscribe, queue_options)
+
+    def _create(self, key: Hashable, ready: asyncio.Future, queue_options: SubscriptionQueueOptions) -> _SharedSubscription:
+        return _SharedSubscription(key, ready)
+
+    def _add_consumer(self, s: _SharedSubscription, queue_options: SubscriptionQueueOptions) -> SubscriptionGenerator:
+        consumer_id = next(self._consumer_ids)
+        consumer = SubscriptionGenerator(self._release_consumer, (s, consumer_id), queue_options)
+        s.consumers[consumer_id] = consumer
+        return consumer
+
+    def _discard_consumer(self, s: _SharedSubscription, consumer: SubscriptionGenerator):
+        self._release_consumer(consumer._req_id)
+
+    def _release_consumer(self, consumer_key: Tuple[_SharedSubscription, int]):
+        s,consumer_id = consumer_key
+        if s.consumers.pop(consumer_id, None) is not None:
+            self._release(s)
@@ -0,0 +1,262 @@
+import asyncio
+from ibapi.message import OUT
+from ib_tws_server.asyncio.backoff import ExponentialBackoff
+from ib_tws_server.asyncio.historical_pacing import HistoricalPacingGovernor
+from ib_tws_server.asyncio.ib_writer import IBWriter, QueuedRequest
+from ib_tws_server.asyncio.rate_limiter import UnlimitedRateLimiter
+from ib_tws_server.asyncio.request_priority import RequestPriority
+from ib_tws_server.error import *
+from ib_tws_server.ib_imports import *
+from ib_tws_server.mock.contracts import contract_for_symbol
+from ib_tws_server.mock.tws_server import MockTwsConfig, MockTwsServer
+import sys
+from unittest import IsolatedAsyncioTestCase, skipIf
+
+try:
+    from ib_tws_server.gen.asyncio_client import AsyncioClient
+    from ib_tws_server.gen.client_responses import UpdateMktDepth
+except ImportError:
+    AsyncioClient = None
+
+def create_client() -> 'AsyncioClient':
+    # The mock server doesn't enforce the TWS limits
+    return AsyncioClient(UnlimitedRateLimiter(), HistoricalPacingGovernor(0, 0, sys.maxsize, 0, sys.maxsize))
+
+def queued_messages(c: 'AsyncioClient'):
+    return sorted(c._writer.queue.queue)
+
+async def wait_until(condition, timeout: float = 5):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(0.01)
+
+def historical_data(c: 'AsyncioClient', timeout: float = None):
+    return c.reqHistoricalData(contract_for_symbol("AMZN"), "", "1 D", "1 min", "TRADES", 0, 2, [], timeout=timeout)
+
+class RecordingClient():
+    """
+    Stands in for the EClient of a client and records the messages sent by an IBWriter
+    """
+    def __init__(self):
+        self.sent = []
+        self.connected = True
+
+    def isConnected(self):
+        return self.connected
+
+    def __getattr__(self, name: str):
+        def send(*args):
+            self.sent.append((name, *args[:1]))
+        send.__name__ = name
+        return send
+
+def send_queued_messages(c: 'AsyncioClient') -> list:
+    """
+    Sends the queued messages of the client to its RecordingClient
+    """
+    writer = IBWriter(c._client, UnlimitedRateLimiter())
+    writer.queue = c._writer.queue
+    def stop():
+        c._client.connected = False
+    writer.put(stop, RequestPriority.BULK)
+    c._client.connected = True
+    writer.run()
+    sent = c._client.sent
+    c._client.sent = []
+    return sent
+
+@skipIf(AsyncioClient is None, "The code hasn't been generated")
+class TestCancelOrdering(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # A client whose writer isn't running, so the messages stay queued
+        self.c = create_client()
+        self.c._client = RecordingClient()
+        self.c._connected = True
+
+    async def test_queued_order_is_withdrawn_instead_of_cancelled(self):
+        """A cancelOrder queued before run() would be sent ahead of its placeOrder, so the order is withdrawn"""
+        order = await self.c.placeOrder(1, contract_for_symbol("AMZN"), ibapi.order.Order())
+        other = await self.c.placeOrder(2, contract_for_symbol("MSFT"), ibapi.order.Order())
+        await order.aclose()
+        self.assertEqual(send_queued_messages(self.c), [ ('placeOrder', 2) ])
+        self.assertEqual(self.c.active_subscription_count(), 1)
+        await other.aclose()
+        self.assertEqual(send_queued_messages(self.c), [ ('cancelOrder', 2) ])
+        self.assertEqual(self.c._queued_requests, {})
+
+    async def test_queued_subscription_is_withdrawn_instead_of_cancelled(self):
+        sub = await self.c.reqMktDataAsSubscription(contract_for_symbol("AMZN"), "", False, [])
+        await sub.aclose()
+        self.assertEqual(send_queued_messages(self.c), [])
+        sub = await self.c.reqMktDataAsSubscription(contract_for_symbol("AMZN"), "", False, [])
+        self.assertEqual([ name for name,*_ in send_queued_messages(self.c) ], [ 'reqMktData' ])
+        await sub.aclose()
+        self.assertEqual([ name for name,*_ in send_queued_messages(self.c) ], [ 'cancelMktData' ])
+
+@skipIf(AsyncioClient is None, "The code hasn't been generated")
+class TestQueryDeadlines(IsolatedAsyncioTestCase):
+    async def test_queued_request_is_withdrawn_on_timeout(self):
+        """A request that wasn't sent yet is withdrawn instead of being overtaken by its cancel"""
+        c = create_client()
+        with self.assertRaises(RequestTimeoutError):
+            await historical_data(c, 0.05)
+        self.assertEqual(c.active_request_count(), 0)
+        queued = queued_messages(c)
+        self.assertEqual(len(queued), 1)
+        priority,_,req = queued[0]
+        self.assertEqual(priority, RequestPriority.BULK)
+        self.assertTrue(req.withdrawn)
+
+    async def test_pacing_wait_counts_towards_the_deadline(self):
+        """A query that the pacing governor doesn't admit before its deadline is never queued"""
+        c = AsyncioClient(UnlimitedRateLimiter(), HistoricalPacingGovernor(0, 60, 1, 0, sys.maxsize))
+        await c.historical_pacing.acquire(("reqHistoricalData",), contract_for_symbol("AMZN"), "TRADES")
+        with self.assertRaises(RequestTimeoutError) as e:
+            await historical_data(c, 0.05)
+        self.assertEqual(e.exception.request, 'reqHistoricalData')
+        self.assertEqual(c.historical_pacing.pending_count(), 0)
+        self.assertEqual(c.active_request_count(), 0)
+        self.assertEqual(queued_messages(c), [])
+
+    async def test_queued_request_is_withdrawn_when_cancelled(self):
+        c = create_client()
+        task = asyncio.create_task(c.reqContractDetails(contract_for_symbol("AMZN")))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(c.active_request_count(), 0)
+        self.assertEqual([ req.withdrawn for _,_,req in queued_messages(c) ], [ True ])
+
+    async def test_response_arriving_while_timing_out_is_returned(self):
+        """The response is returned if the reader thread completed the request before it was abandoned"""
+        c = create_client()
+        future = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(0.1, future.set_result, "response")
+        req = QueuedRequest(lambda: None)
+        req()
+        cancels = []
+        # No request state, as if the reader thread had removed it
+        res = await c._wait_for_response(future, 1, 'reqContractDetails', 0.05, req, lambda: cancels.append(1))
+        self.assertEqual(res, "response")
+        self.assertEqual(cancels, [])
+        self.assertEqual(queued_messages(c), [])
+
+    async def test_sent_request_is_cancelled_on_timeout(self):
+        server = MockTwsServer(MockTwsConfig(bars_per_request=20, response_delay=0.5))
+        server.start_in_thread()
+        c = create_client()
+        try:
+            await c.connect("127.0.0.1", server.port, 0)
+            with self.assertRaises(RequestTimeoutError) as e:
+                await historical_data(c, 0.2)
+            self.assertEqual(e.exception.request, 'reqHistoricalData')
+            self.assertEqual(c.active_request_count(), 0)
+            await wait_until(lambda: server.messages_received[OUT.CANCEL_HISTORICAL_DATA] == 1)
+            self.assertEqual(server.messages_received[OUT.REQ_HISTORICAL_DATA], 1)
+            # The late response is ignored and later queries are answered
+            await asyncio.sleep(0.5)
+            server.config.response_delay = 0
+            self.assertEqual(len(await historical_data(c, 5)), 20)
+        finally:
+            c.disconnect(True)
+            server.stop_thread()
+
+@skipIf(AsyncioClient is None, "The code hasn't been generated")
+class TestReconnect(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = MockTwsServer(MockTwsConfig(tick_rate=100, bars_per_request=20))
+        self.server.start_in_thread()
+        self.c = create_client()
+        await self.c.connect("127.0.0.1", self.server.port, 0, ExponentialBackoff(0.05, 0.2, jitter=0))
+
+    async def asyncTearDown(self):
+        self.c.disconnect(True)
+        self.server.stop_thread()
+
+    def restart_server(self, response_delay: float = 0):
+        self.server.stop_thread()
+        self.server = MockTwsServer(MockTwsConfig(tick_rate=100, bars_per_request=20, response_delay=response_delay), port=self.server.port)
+        self.server.start_in_thread()
+
+    async def test_queries_in_flight_fail(self):
+        self.server.config.response_delay = 5
+        task = asyncio.create_task(historical_data(self.c))
+        await wait_until(lambda: self.server.messages_received[OUT.REQ_HISTORICAL_DATA] == 1)
+        self.server.stop_thread()
+        with self.assertRaises(ConnectionLostError):
+            await task
+        self.assertEqual(self.c.active_request_count(), 0)
+        self.server.start_in_thread()
+
+    async def test_subscriptions_are_reissued(self):
+        """The subscriptions of the lost connection are sent on the new one and keep yielding"""
+        sub = await self.c.reqTickByTickData(contract_for_symbol("AMZN"), "BidAsk", 0, False)
+        await asyncio.wait_for(sub.__anext__(), 5)
+        self.restart_server()
+        await wait_until(lambda: self.server.messages_received[OUT.REQ_TICK_BY_TICK_DATA] == 1)
+        while sub.qsize() > 0:
+            await sub.__anext__()
+        await asyncio.wait_for(sub.__anext__(), 5)
+        self.assertEqual(len(await historical_data(self.c, 5)), 20)
+        await sub.aclose()
+
+    async def test_order_book_is_reset(self):
+        sub = await self.c.reqMktDepthAsOrderBook(contract_for_symbol("AMZN"), 5, False, [])
+        sub.add_to_queue(UpdateMktDepth(0, 0, 1, 100.0, 10))
+        self.assertEqual(sub.book.best_bid(), 100.0)
+        self.restart_server()
+        await wait_until(lambda: self.server.messages_received[OUT.REQ_MKT_DEPTH] == 1)
+        self.assertIsNone(sub.book.best_bid())
+
+    async def test_orders_are_not_sent_again(self):
+        await self.c.placeOrder(1, contract_for_symbol("AMZN"), ibapi.order.Order())
+        await wait_until(lambda: self.server.messages_received[OUT.PLACE_ORDER] == 1)
+        self.restart_server()
+        await wait_until(lambda: self.c.is_connected() and self.server.messages_received[OUT.START_API] == 1)
+        self.assertEqual(len(await historical_data(self.c, 5)), 20)
+        self.assertEqual(self.server.messages_received[OUT.PLACE_ORDER], 0)
+
+    async def test_orders_fail_while_disconnected(self):
+        self.server.stop_thread()
+        await wait_until(lambda: not self.c._connected)
+        with self.assertRaises(ConnectionLostError):
+            await self.c.placeOrder(1, contract_for_symbol("AMZN"), ibapi.order.Order())
+        self.server.start_in_thread()
+
+    async def test_queued_orders_are_dropped_when_the_connection_is_lost(self):
+        """The subscription of an order that wasn't sent ends with ConnectionLostError"""
+        c = create_client()
+        c._client = RecordingClient()
+        c._connected = True
+        order = await c.placeOrder(1, contract_for_symbol("AMZN"), ibapi.order.Order())
+        await c.exerciseOptions(contract_for_symbol("AMZN"), 1, 1, "", 0)
+        self.assertEqual(c.queued_message_count(), 2)
+        with self.assertLogs("ib_tws_server.gen.asyncio_client", "ERROR") as logs:
+            c._connection_lost()
+        self.assertEqual(len(logs.records), 2)
+        with self.assertRaises(ConnectionLostError):
+            await asyncio.wait_for(order.__anext__(), 5)
+        await order.aclose()
+        self.assertEqual(send_queued_messages(c), [])
+        self.assertEqual(c.active_subscription_count(), 0)
+        self.assertEqual(c._lost_subscriptions, [])
+
+    async def test_order_cancels_are_kept_when_the_connection_is_lost(self):
+        """Orders stay live in TWS, so their cancels are sent on the next connection"""
+        c = create_client()
+        c._client = RecordingClient()
+        c._connected = True
+        order = await c.placeOrder(1, contract_for_symbol("AMZN"), ibapi.order.Order())
+        send_queued_messages(c)
+        await order.aclose()
+        await c.reqGlobalCancel()
+        query = asyncio.create_task(c.reqCurrentTime())
+        await asyncio.sleep(0)
+        c._connection_lost()
+        with self.assertRaises(ConnectionLostError):
+            await query
+        self.assertEqual(send_queued_messages(c), [ ('cancelOrder', 1), ('reqGlobalCancel',) ])
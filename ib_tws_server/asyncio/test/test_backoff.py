@@ -0,0 +1,15 @@
+from ib_tws_server.asyncio.backoff import ExponentialBackoff
+import random
+from unittest import TestCase
+
+class TestExponentialBackoff(TestCase):
+    def test_delay_grows_exponentially_up_to_maximum(self):
+        b = ExponentialBackoff(initial=1, maximum=10, multiplier=2, jitter=0)
+        self.assertEqual([ b.delay(n) for n in range(1, 7) ], [ 1, 2, 4, 8, 10, 10 ])
+        self.assertEqual(b.delay(10000), 10)
+
+    def test_jitter_stays_within_bounds(self):
+        b = ExponentialBackoff(initial=4, maximum=4, jitter=0.25, rng=random.Random(1))
+        delays = [ b.delay(1) for _ in range(100) ]
+        self.assertTrue(all([ 3 <= d <= 5 for d in delays ]))
+        self.assertGreater(len(set(delays)), 1)
@@ -0,0 +1,52 @@
+import asyncio
+from ib_tws_server.asyncio.bar_engine import BarEngine
+from ib_tws_server.util.bar_aggregator import BarKind
+from unittest import IsolatedAsyncioTestCase
+
+class Tick():
+    def __init__(self, price: float, size: float):
+        self.price = price
+        self.size = size
+
+class Ticks():
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    async def aclose(self):
+        self.closed = True
+
+class TestBarEngine(IsolatedAsyncioTestCase):
+    async def test_series_share_the_ticks(self):
+        ticks = Ticks()
+        now = [ 0.0 ]
+        engine = BarEngine(ticks, lambda: now[0])
+        by_ticks = engine.bars(BarKind.TICKS, 2)
+        by_volume = engine.bars(BarKind.VOLUME, 30)
+        for p in [ 1.0, 2.0, 3.0 ]:
+            ticks.queue.put_nowait(Tick(p, 10))
+        b = await asyncio.wait_for(by_ticks.__anext__(), 1)
+        self.assertEqual((b.open, b.close, b.count), (1.0, 2.0, 2))
+        b = await asyncio.wait_for(by_volume.__anext__(), 1)
+        self.assertEqual((b.open, b.close, b.volume), (1.0, 3.0, 30))
+        await engine.aclose()
+        self.assertTrue(ticks.closed)
+        self.assertEqual(engine.series_count(), 0)
+
+    async def test_time_bars_end_without_a_later_tick(self):
+        ticks = Ticks()
+        loop = asyncio.get_running_loop()
+        engine = BarEngine(ticks, loop.time)
+        bars = engine.bars(BarKind.TIME, 0.05)
+        ticks.queue.put_nowait(Tick(5.0, 1))
+        b = await asyncio.wait_for(bars.__anext__(), 1)
+        self.assertEqual((b.close, b.count), (5.0, 1))
+        await bars.aclose()
+        self.assertEqual(engine.series_count(), 0)
+        await engine.aclose()
@@ -0,0 +1,62 @@
+import asyncio
+from ib_tws_server.asyncio.broadcast_channel import BroadcastChannel
+from unittest import IsolatedAsyncioTestCase
+
+async def take(it, n: int):
+    return [ await it.__anext__() for _ in range(n) ]
+
+class TestBroadcastChannel(IsolatedAsyncioTestCase):
+    async def test_subscribers_receive_values_published_after_subscribing(self):
+        c = BroadcastChannel(8)
+        c.publish(0)
+        a = c.subscribe()
+        c.publish(1)
+        b = c.subscribe()
+        c.publish(2)
+        self.assertEqual(await take(a, 2), [ 1, 2 ])
+        self.assertEqual(await take(b, 1), [ 2 ])
+        self.assertEqual(c.subscriber_count(), 2)
+
+    async def test_waiting_subscribers_are_woken_up(self):
+        c = BroadcastChannel()
+        subs = [ c.subscribe() for _ in range(3) ]
+        tasks = [ asyncio.ensure_future(take(s, 2)) for s in subs ]
+        await asyncio.sleep(0)
+        c.publish("a")
+        await asyncio.sleep(0)
+        c.publish("b")
+        self.assertEqual(await asyncio.gather(*tasks), [ [ "a", "b" ] ] * 3)
+
+    async def test_lapped_subscriber_skips_to_oldest_value(self):
+        c = BroadcastChannel(4)
+        s = c.subscribe()
+        for i in range(10):
+            c.publish(i)
+        self.assertEqual(s.qsize(), 4)
+        self.assertEqual(await take(s, 4), [ 6, 7, 8, 9 ])
+        self.assertEqual(s.dropped, 6)
+
+    async def test_replay_values_come_first(self):
+        c = BroadcastChannel()
+        s = c.subscribe(replay=[ "x", "y" ])
+        c.publish("z")
+        self.assertEqual(s.qsize(), 3)
+        self.assertEqual(await take(s, 3), [ "x", "y", "z" ])
+
+    async def test_close_ends_iteration_after_buffered_values(self):
+        c = BroadcastChannel()
+        s = c.subscribe()
+        c.publish(1)
+        c.close()
+        self.assertEqual([ v async for v in s ], [ 1 ])
+
+    async def test_aclose_releases_subscriber(self):
+        c = BroadcastChannel()
+        released = []
+        s = c.subscribe(released.append)
+        await s.aclose()
+        await s.aclose()
+        self.assertEqual(released, [ s ])
+        self.assertEqual(c.subscriber_count(), 0)
+        with self.assertRaises(StopAsyncIteration):
+            await s.__anext__()
@@ -0,0 +1,87 @@
+import asyncio
+from ib_tws_server.asyncio.client_pool import AsyncioClientPool
+from unittest import IsolatedAsyncioTestCase
+
+class FakeClient():
+    def __init__(self):
+        self.calls = []
+        self.subscriptions = 0
+        self.queued = 0
+        self.client_id = None
+        self.release = None
+
+    def start(self, host: str, port: int, client_id: int, connection_retry_interval: int):
+        self.client_id = client_id
+
+    async def connect(self, host: str, port: int, client_id: int, backoff=None, max_attempts: int = 0, reconnect: bool = True):
+        self.client_id = client_id
+
+    def disconnect(self, clean=False):
+        pass
+
+    def active_request_count(self):
+        return 0
+
+    def active_subscription_count(self):
+        return self.subscriptions
+
+    def queued_message_count(self):
+        return self.queued
+
+    async def reqContractDetails(self, contract: str):
+        self.calls.append(('reqContractDetails', contract))
+        if self.release is not None:
+            await self.release
+        return contract
+
+    async def reqMktDataAsSubscription(self, contract: str):
+        self.calls.append(('reqMktDataAsSubscription', contract))
+        self.subscriptions += 1
+
+    async def placeOrder(self, orderId: int):
+        self.calls.append(('placeOrder', orderId))
+
+    async def reqOpenOrders(self):
+        self.calls.append(('reqOpenOrders',))
+
+class TestClientPool(IsolatedAsyncioTestCase):
+    async def test_start_uses_consecutive_client_ids(self):
+        pool = AsyncioClientPool(3, FakeClient)
+        pool.start("127.0.0.1", 7496, 10, 0)
+        self.assertEqual([ c.client_id for c in pool.clients ], [ 10, 11, 12 ])
+
+    async def test_connect_uses_consecutive_client_ids(self):
+        pool = AsyncioClientPool(3, FakeClient)
+        await pool.connect("127.0.0.1", 7496, 10)
+        self.assertEqual([ c.client_id for c in pool.clients ], [ 10, 11, 12 ])
+
+    async def test_order_requests_are_pinned_to_the_first_connection(self):
+        pool = AsyncioClientPool(3, FakeClient)
+        pool.clients[0].queued = 100
+        await pool.placeOrder(1)
+        await pool.reqOpenOrders()
+        self.assertEqual(pool.clients[0].calls, [ ('placeOrder', 1), ('reqOpenOrders',) ])
+        self.assertEqual(pool.stats.routed, [ 2, 0, 0 ])
+
+    async def test_requests_are_routed_by_load(self):
+        pool = AsyncioClientPool(3, FakeClient)
+        release = asyncio.get_running_loop().create_future()
+        for c in pool.clients:
+            c.release = release
+        calls = [ asyncio.ensure_future(pool.reqContractDetails(s)) for s in [ "AMZN", "MSFT", "AAPL" ] ]
+        await asyncio.sleep(0)
+        self.assertEqual([ len(c.calls) for c in pool.clients ], [ 1, 1, 1 ])
+        release.set_result(None)
+        self.assertEqual(await asyncio.gather(*calls), [ "AMZN", "MSFT", "AAPL" ])
+
+        for s in [ "AMZN", "MSFT" ]:
+            await pool.reqMktDataAsSubscription(s)
+        self.assertEqual(pool.active_subscription_count(), 2)
+        self.assertEqual([ c.subscriptions for c in pool.clients ], [ 1, 1, 0 ])
+
+    async def test_unknown_attributes(self):
+        pool = AsyncioClientPool(2, FakeClient)
+        with self.assertRaises(AttributeError):
+            pool.calls
+        with self.assertRaises(AttributeError):
+            pool.reqUnknown
@@ -0,0 +1,68 @@
+import asyncio
+from ib_tws_server.asyncio.historical_pacing import HistoricalPacingGovernor
+from unittest import IsolatedAsyncioTestCase
+
+class TestHistoricalPacingGovernor(IsolatedAsyncioTestCase):
+    def governor(self):
+        return HistoricalPacingGovernor(identical_interval=0.3, contract_window=0.2, contract_max_requests=2, window=0.5, max_requests=4)
+
+    async def test_identical_requests_are_delayed(self):
+        g = self.governor()
+        self.assertEqual(await g.acquire(("req", 1), "AMZN", "TRADES"), 0)
+        self.assertAlmostEqual(g.expected_wait(("req", 1), "AMZN", "TRADES"), 0.3, delta=0.05)
+        wait = await g.acquire(("req", 1), "AMZN", "TRADES")
+        self.assertAlmostEqual(wait, 0.3, delta=0.05)
+        self.assertEqual(g.stats.delayed, 1)
+
+    async def test_blocked_requests_do_not_block_other_contracts(self):
+        g = self.governor()
+        loop = asyncio.get_running_loop()
+        admitted = []
+
+        async def request(n: int, sym: str):
+            await g.acquire(("req", n), sym, "TRADES")
+            admitted.append((n, loop.time()))
+
+        start = loop.time()
+        await asyncio.gather(request(1, "AMZN"), request(2, "AMZN"), request(3, "AMZN"), request(4, "MSFT"))
+        order = [ n for n,_ in admitted ]
+        self.assertEqual(order, [1, 2, 4, 3])
+        self.assertGreaterEqual(admitted[-1][1] - start, 0.19)
+
+    async def test_requests_in_window_are_limited(self):
+        g = self.governor()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i in range(4):
+            self.assertEqual(await g.acquire(("req", i), f"SYM{i}", "TRADES"), 0)
+        self.assertAlmostEqual(g.expected_wait(("req", 4), "SYM4", "TRADES"), 0.5, delta=0.05)
+        await g.acquire(("req", 4), "SYM4", "BID_ASK")
+        self.assertGreaterEqual(loop.time() - start, 0.49)
+        self.assertEqual(g.pending_count(), 0)
+
+    async def test_cancelled_requests_are_removed(self):
+        g = self.governor()
+        await g.acquire(("req", 1), "AMZN", "TRADES")
+        task = asyncio.create_task(g.acquire(("req", 1), "AMZN", "TRADES"))
+        await asyncio.sleep(0)
+        self.assertEqual(g.pending_count(), 1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(g.pending_count(), 0)
+
+    async def test_requests_after_a_cancelled_request_keep_their_order(self):
+        g = self.governor()
+        admitted = []
+
+        async def request(n: int):
+            await g.acquire(("req", n), "AMZN", "TRADES")
+            admitted.append(n)
+
+        tasks = [ asyncio.create_task(request(n)) for n in range(5) ]
+        await asyncio.sleep(0)
+        self.assertEqual(g.pending_count(), 3)
+        tasks[3].cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.assertEqual(admitted, [0, 1, 2, 4])
+        self.assertEqual(g.pending_count(), 0)
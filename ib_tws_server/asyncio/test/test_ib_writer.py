@@ -0,0 +1,83 @@
+from ib_tws_server.asyncio.ib_writer import IBWriter, QueuedRequest
+from ib_tws_server.asyncio.rate_limiter import UnlimitedRateLimiter
+from ib_tws_server.asyncio.request_priority import RequestPriority
+from unittest import TestCase
+
+class FakeClient:
+    def __init__(self, num_messages: int):
+        self.remaining = num_messages
+
+    def isConnected(self):
+        return self.remaining > 0
+
+class TestIBWriter(TestCase):
+    def test_messages_are_sent_in_priority_order(self):
+        sent = []
+        client = FakeClient(6)
+        writer = IBWriter(client, UnlimitedRateLimiter())
+
+        def send(name: str):
+            def f():
+                client.remaining -= 1
+                sent.append(name)
+            return f
+
+        writer.put(send("bulk1"), RequestPriority.BULK)
+        writer.put(send("query1"))
+        writer.put(send("bulk2"), RequestPriority.BULK)
+        writer.put(send("order"), RequestPriority.ORDER)
+        writer.put(send("query2"))
+        writer.put(send("cancel"), RequestPriority.CANCEL)
+        writer.run()
+        self.assertEqual(sent, [ "cancel", "order", "query1", "query2", "bulk1", "bulk2" ])
+
+    def test_successor_sends_the_remaining_messages(self):
+        sent = []
+        client = FakeClient(2)
+        writer = IBWriter(client, UnlimitedRateLimiter())
+
+        def send(name: str):
+            def f():
+                client.remaining -= 1
+                sent.append(name)
+                if name == "first":
+                    writer.stop()
+            return f
+
+        writer.put(send("first"))
+        writer.put(send("second"))
+        writer.run()
+        self.assertEqual(sent, [ "first" ])
+        writer.successor().run()
+        self.assertEqual(sent, [ "first", "second" ])
+
+    def test_withdrawn_requests_are_skipped(self):
+        sent = []
+        client = FakeClient(1)
+        writer = IBWriter(client, UnlimitedRateLimiter())
+
+        def send(name: str):
+            def f():
+                client.remaining -= 1
+                sent.append(name)
+            return f
+
+        withdrawn = QueuedRequest(send("withdrawn"))
+        queued = QueuedRequest(send("queued"))
+        writer.put(withdrawn)
+        writer.put(queued)
+        self.assertTrue(withdrawn.withdraw())
+        writer.run()
+        self.assertEqual(sent, [ "queued" ])
+        self.assertTrue(queued.sent)
+        self.assertFalse(queued.withdraw())
+
+    def test_clear_keeps_the_wake_up_of_a_stopped_thread(self):
+        client = FakeClient(1)
+        writer = IBWriter(client, UnlimitedRateLimiter())
+        writer.start()
+        writer.put(lambda: None, RequestPriority.ORDER)
+        writer.stop()
+        writer.clear()
+        writer.join(5)
+        self.assertFalse(writer.is_alive())
@@ -0,0 +1,50 @@
+import asyncio
+from ib_tws_server.asyncio.loop_bridge import LoopBridge
+from threading import Thread
+from unittest import IsolatedAsyncioTestCase
+
+class TestLoopBridge(IsolatedAsyncioTestCase):
+    async def test_callbacks_are_delivered_in_order_and_batched(self):
+        loop = asyncio.get_running_loop()
+        bridge = LoopBridge(loop)
+        received = []
+        done = loop.create_future()
+
+        def cb(i: int):
+            received.append(i)
+            if i == 9999:
+                done.set_result(None)
+
+        t = Thread(target=lambda: [ bridge.call_soon(cb, i) for i in range(10000) ])
+        t.start()
+        await asyncio.wait_for(done, 5)
+        t.join()
+        self.assertEqual(received, list(range(10000)))
+        self.assertEqual(bridge.stats.delivered, 10000)
+        self.assertLess(bridge.stats.batches, 10000)
+
+    async def test_interval_delays_delivery(self):
+        loop = asyncio.get_running_loop()
+        bridge = LoopBridge(loop, 0.05)
+        received = []
+        bridge.call_soon(received.append, 1)
+        bridge.call_soon(received.append, 2)
+        await asyncio.sleep(0.01)
+        self.assertEqual(received, [])
+        await asyncio.sleep(0.1)
+        self.assertEqual(received, [ 1, 2 ])
+        self.assertEqual(bridge.stats.batches, 1)
+
+    async def test_exceptions_do_not_stop_the_batch(self):
+        loop = asyncio.get_running_loop()
+        errors = []
+        loop.set_exception_handler(lambda l, ctx: errors.append(ctx["exception"]))
+        bridge = LoopBridge(loop)
+        received = []
+        def fail(_):
+            raise RuntimeError("failed")
+        bridge.call_soon(fail, 1)
+        bridge.call_soon(received.append, 2)
+        await asyncio.sleep(0.01)
+        self.assertEqual(received, [ 2 ])
+        self.assertEqual(len(errors), 1)
@@ -0,0 +1,35 @@
+import asyncio
+from ib_tws_server.asyncio.order_book_subscription import OrderBookSubscription
+from ib_tws_server.util.order_book import OPERATION_INSERT, SIDE_BID
+from unittest import IsolatedAsyncioTestCase
+
+class Update():
+    def __init__(self, position: int, price: float):
+        self.position = position
+        self.operation = OPERATION_INSERT
+        self.side = SIDE_BID
+        self.price = price
+        self.size = 1
+
+class TestOrderBookSubscription(IsolatedAsyncioTestCase):
+    async def test_iteration_skips_intermediate_versions(self):
+        s = OrderBookSubscription(lambda: None, 5)
+        s.add_to_queue(Update(0, 1.0))
+        s.add_to_queue(Update(0, 2.0))
+        book = await s.__anext__()
+        self.assertEqual((book.version, book.best_bid()), (2, 2.0))
+        loop = asyncio.get_running_loop()
+        loop.call_soon(s.add_to_queue, Update(0, 3.0))
+        book = await asyncio.wait_for(s.__anext__(), 1)
+        self.assertEqual((book.version, book.best_bid()), (3, 3.0))
+
+    async def test_aclose_cancels_and_ends_iteration(self):
+        cancelled = []
+        s = OrderBookSubscription(lambda: cancelled.append(True), 5)
+        t = asyncio.ensure_future(s.__anext__())
+        await asyncio.sleep(0)
+        await s.aclose()
+        with self.assertRaises(StopAsyncIteration):
+            await t
+        self.assertEqual(cancelled, [ True ])
+        self.assertFalse(s.reserve())
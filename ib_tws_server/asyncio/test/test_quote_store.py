@@ -0,0 +1,70 @@
+import asyncio
+from ib_tws_server.asyncio.quote_store import QuoteState, QuoteStore
+from ib_tws_server.mock.contracts import contract_for_symbol
+from ibapi.ticktype import TickTypeEnum
+import math
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+class TickPrice():
+    def __init__(self, tickType: int, price: float):
+        self.tickType = tickType
+        self.price = price
+        self.attrib = None
+
+class TickSize():
+    def __init__(self, tickType: int, size: int):
+        self.tickType = tickType
+        self.size = size
+
+class TestQuoteState(TestCase):
+    def test_latest_value_per_tick_type(self):
+        s = QuoteState()
+        s.apply(TickPrice(TickTypeEnum.BID, 10.0), 1)
+        s.apply(TickPrice(TickTypeEnum.BID, 10.5), 2)
+        s.apply(TickSize(TickTypeEnum.BID_SIZE, 300), 2)
+        s.apply(TickPrice(TickTypeEnum.DELAYED_ASK, 11.0), 3)
+        self.assertFalse(s.apply(object(), 4))
+        q = s.quote()
+        self.assertEqual((q.time, q.version, q.bid, q.bid_size, q.ask), (3, 4, 10.5, 300, 11.0))
+        self.assertTrue(math.isnan(q.last))
+        self.assertIs(s.quote(), q)
+        self.assertEqual(len(s.snapshot_ticks()), 3)
+
+class TestQuoteStore(IsolatedAsyncioTestCase):
+    async def test_conflated_quotes(self):
+        store = QuoteStore()
+        cancelled = []
+        sub = store.subscription(contract_for_symbol("AMZN"), True, cancelled.append, 1)
+        sub.add_to_queue(TickPrice(TickTypeEnum.BID, 10.0))
+        sub.add_to_queue(TickPrice(TickTypeEnum.ASK, 10.2))
+        self.assertEqual(sub.qsize(), 1)
+        q = await asyncio.wait_for(sub.__anext__(), 1)
+        self.assertEqual((q.bid, q.ask, q.mid()), (10.0, 10.2, 10.1))
+        self.assertIs(store.quote(contract_for_symbol("AMZN")), q)
+        await sub.aclose()
+        self.assertEqual(cancelled, [ 1 ])
+        self.assertEqual(store.state(contract_for_symbol("AMZN")).live, 0)
+
+    async def test_fresh_ticks(self):
+        now = [ 100.0 ]
+        store = QuoteStore(max_age=1, clock=lambda: now[0])
+        self.assertIsNone(store.fresh_ticks(contract_for_symbol("AMZN")))
+        store.record_snapshot(contract_for_symbol("AMZN"), [ TickPrice(TickTypeEnum.LAST, 10.0) ])
+        now[0] = 100.5
+        self.assertEqual(len(store.fresh_ticks(contract_for_symbol("AMZN"))), 1)
+        now[0] = 102
+        self.assertIsNone(store.fresh_ticks(contract_for_symbol("AMZN")))
+        # Subscribed states are fresh regardless of age
+        sub = store.subscription(contract_for_symbol("AMZN"), False, lambda id: None, 1)
+        self.assertIsNotNone(store.fresh_ticks(contract_for_symbol("AMZN")))
+        self.assertEqual((store.stats.hits, store.stats.misses), (2, 2))
+        await sub.aclose()
+
+    async def test_eviction_keeps_subscribed_states(self):
+        store = QuoteStore(max_entries=2)
+        sub = store.subscription(contract_for_symbol("A"), False, lambda id: None, 1)
+        store.state(contract_for_symbol("B"))
+        store.state(contract_for_symbol("C"))
+        self.assertEqual(len(store), 2)
+        self.assertIs(store.state(contract_for_symbol("A")), sub.state)
+        await sub.aclose()
@@ -0,0 +1,52 @@
+from ib_tws_server.asyncio.rate_limiter import *
+from unittest import TestCase
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, t: float):
+        self.now += t
+
+class TestTokenBucketRateLimiter(TestCase):
+    def test_messages_are_spaced_evenly(self):
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(50, clock=clock.time, sleep=clock.sleep)
+        send_times = []
+        for _ in range(100):
+            limiter.acquire()
+            send_times.append(clock.now)
+        gaps = [ b - a for a,b in zip(send_times, send_times[1:]) ]
+        for g in gaps:
+            self.assertAlmostEqual(g, 0.02)
+        self.assertEqual(limiter.stats.acquired, 100)
+        self.assertEqual(limiter.stats.delayed, 99)
+        self.assertAlmostEqual(limiter.stats.max_wait, 0.02)
+
+    def test_idle_time_refills_up_to_burst(self):
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(10, burst=3, clock=clock.time, sleep=clock.sleep)
+        for _ in range(3):
+            self.assertEqual(limiter.acquire(), 0.0)
+        self.assertAlmostEqual(limiter.acquire(), 0.1)
+        clock.now += 10
+        for _ in range(3):
+            self.assertEqual(limiter.acquire(), 0.0)
+        self.assertAlmostEqual(limiter.wait_time(), 0.1)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(0)
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(10, burst=0.5)
+
+class TestRateLimiter(TestCase):
+    def test_acquire_must_be_implemented(self):
+        class Incomplete(RateLimiter):
+            pass
+        with self.assertRaises(TypeError):
+            Incomplete()
+        self.assertEqual(UnlimitedRateLimiter().acquire(), 0.0)
@@ -0,0 +1,84 @@
+import asyncio
+from ib_tws_server.asyncio.request_coalescer import RequestCoalescer
+from ib_tws_server.error import RequestTimeoutError
+from ib_tws_server.mock.contracts import contract_for_symbol
+from unittest import IsolatedAsyncioTestCase
+
+class TestRequestCoalescer(IsolatedAsyncioTestCase):
+    async def test_concurrent_equal_requests_are_shared(self):
+        c = RequestCoalescer()
+        sent = []
+
+        async def send(sym: str):
+            sent.append(sym)
+            await asyncio.sleep(0.01)
+            return [ sym ]
+
+        def request(sym: str):
+            return c.run(("reqContractDetails", contract_for_symbol(sym)), lambda: send(sym))
+
+        res = await asyncio.gather(request("AMZN"), request("AMZN"), request("MSFT"))
+        self.assertEqual(sent, [ "AMZN", "MSFT" ])
+        self.assertIs(res[0], res[1])
+        self.assertEqual(res[2], [ "MSFT" ])
+        self.assertEqual(c.stats.issued, 2)
+        self.assertEqual(c.stats.coalesced, 1)
+        self.assertEqual(c.in_flight_count(), 0)
+
+        # Completed requests are not shared
+        await request("AMZN")
+        self.assertEqual(sent, [ "AMZN", "MSFT", "AMZN" ])
+
+    async def test_errors_are_raised_for_every_caller(self):
+        c = RequestCoalescer()
+
+        async def send():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("failed")
+
+        res = await asyncio.gather(c.run(("req", 1), send), c.run(("req", 1), send), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in res))
+        self.assertEqual(c.stats.issued, 1)
+
+    async def test_cancelling_a_caller_does_not_cancel_the_request(self):
+        c = RequestCoalescer()
+
+        async def send():
+            await asyncio.sleep(0.01)
+            return 1
+
+        first = asyncio.create_task(c.run(("req",), send))
+        second = asyncio.create_task(c.run(("req",), send))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, 1)
+        self.assertTrue(first.cancelled())
+
+    async def test_timeouts_apply_to_each_caller(self):
+        c = RequestCoalescer()
+
+        async def send():
+            await asyncio.sleep(0.1)
+            return 1
+
+        res = await asyncio.gather(c.run(("req",), send, 0.01), c.run(("req",), send, 1), c.run(("req",), send), return_exceptions=True)
+        self.assertIsInstance(res[0], RequestTimeoutError)
+        self.assertEqual(res[0].request, "req")
+        self.assertEqual(res[1:], [ 1, 1 ])
+        self.assertEqual(c.stats.issued, 1)
+
+    async def test_request_is_cancelled_when_no_caller_waits(self):
+        c = RequestCoalescer()
+        cancelled = []
+
+        async def send():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        res = await asyncio.gather(c.run(("req",), send, 0.01), c.run(("req",), send, 0.02), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, RequestTimeoutError) for r in res))
+        self.assertEqual(cancelled, [ 1 ])
+        self.assertEqual(c.in_flight_count(), 0)
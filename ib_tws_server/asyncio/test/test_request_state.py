@@ -0,0 +1,29 @@
+from ib_tws_server.asyncio.request_state import RequestState, RequestStateRegistry
+from threading import Thread
+from unittest import TestCase
+
+class TestRequestStateRegistry(TestCase):
+    def test_request_ids_are_unique_across_threads(self):
+        r = RequestStateRegistry()
+        ids = []
+
+        def allocate():
+            ids.extend([ r.next_request_id() for _ in range(10000) ])
+
+        threads = [ Thread(target=allocate) for _ in range(4) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(sorted(ids), list(range(1, 40001)))
+
+    def test_request_is_completed_once(self):
+        r = RequestStateRegistry()
+        calls = []
+        id = r.next_request_id()
+        r.requests[id] = RequestState(calls.append)
+        for res in [ "response", "error" ]:
+            s = r.requests.pop(id, None)
+            if s is not None:
+                s.cb(res)
+        self.assertEqual(calls, [ "response" ])
@@ -0,0 +1,116 @@
+from ib_tws_server.asyncio.response_cache import ResponseCache, SqliteResponseStore
+from ib_tws_server.mock.contracts import contract_for_symbol
+import os
+import sqlite3
+import tempfile
+import threading
+from unittest import IsolatedAsyncioTestCase, mock
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class RecordingThread:
+    def __init__(self):
+        self.pickled_on = None
+
+    def __getstate__(self):
+        self.pickled_on = threading.get_ident()
+        return {}
+
+class TestResponseCache(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sent = []
+
+    def send(self, sym: str):
+        async def f():
+            self.sent.append(sym)
+            return [ sym ]
+        return f
+
+    async def request(self, cache: ResponseCache, sym: str, ttl: float = 60):
+        return await cache.run(("reqContractDetails", contract_for_symbol(sym)), self.send(sym), ttl)
+
+    async def test_responses_expire(self):
+        cache = ResponseCache(clock=self.clock)
+        self.assertEqual(await self.request(cache, "AMZN"), [ "AMZN" ])
+        self.assertEqual(await self.request(cache, "AMZN"), [ "AMZN" ])
+        self.assertEqual(self.sent, [ "AMZN" ])
+        self.clock.now += 61
+        await self.request(cache, "AMZN")
+        self.assertEqual(self.sent, [ "AMZN", "AMZN" ])
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 2))
+
+    async def test_ttl_overrides(self):
+        cache = ResponseCache(ttls={ "reqContractDetails": 0 }, clock=self.clock)
+        await self.request(cache, "AMZN")
+        await self.request(cache, "AMZN")
+        self.assertEqual(self.sent, [ "AMZN", "AMZN" ])
+        self.assertEqual(len(cache), 0)
+
+    async def test_least_recently_used_entries_are_evicted(self):
+        cache = ResponseCache(max_entries=2, clock=self.clock)
+        await self.request(cache, "AMZN")
+        await self.request(cache, "MSFT")
+        await self.request(cache, "AMZN")
+        await self.request(cache, "GOOG")
+        self.assertEqual(cache.stats.evictions, 1)
+        await self.request(cache, "AMZN")
+        await self.request(cache, "MSFT")
+        self.assertEqual(self.sent, [ "AMZN", "MSFT", "GOOG", "MSFT" ])
+
+    async def test_errors_are_not_cached(self):
+        cache = ResponseCache(clock=self.clock)
+        async def fail():
+            raise RuntimeError("failed")
+        with self.assertRaises(RuntimeError):
+            await cache.run(("reqMarketRule", 26), fail, 60)
+        self.assertEqual(len(cache), 0)
+
+    async def test_store_keeps_cache_warm_across_restarts(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "cache.db")
+            store = SqliteResponseStore(path)
+            await self.request(ResponseCache(store=store, clock=self.clock), "AMZN")
+            store.close()
+
+            store = SqliteResponseStore(path)
+            cache = ResponseCache(store=store, clock=self.clock)
+            self.assertEqual(await self.request(cache, "AMZN"), [ "AMZN" ])
+            self.assertEqual(self.sent, [ "AMZN" ])
+
+            cache.invalidate("reqContractDetails")
+            await self.request(cache, "AMZN")
+            self.assertEqual(self.sent, [ "AMZN", "AMZN" ])
+            store.close()
+
+    async def test_store_opens_database_on_worker_thread(self):
+        connected_on = []
+        connect = sqlite3.connect
+        def record_connect(*args, **kwargs):
+            connected_on.append(threading.get_ident())
+            return connect(*args, **kwargs)
+        with tempfile.TemporaryDirectory() as d, mock.patch("sqlite3.connect", record_connect):
+            store = SqliteResponseStore(os.path.join(d, "cache.db"))
+            self.assertEqual(await store.get("key"), None)
+            self.assertEqual(len(connected_on), 1)
+            self.assertNotEqual(connected_on[0], threading.get_ident())
+            store.close()
+
+    async def test_store_writes_on_worker_thread(self):
+        with tempfile.TemporaryDirectory() as d:
+            store = SqliteResponseStore(os.path.join(d, "cache.db"))
+            cache = ResponseCache(store=store, clock=self.clock)
+            value = RecordingThread()
+            for i in range(100):
+                cache.put(("reqMarketRule", i), value, 60)
+            await store.flush()
+            self.assertIsNotNone(value.pickled_on)
+            self.assertNotEqual(value.pickled_on, threading.get_ident())
+            hit,_ = await ResponseCache(store=store, clock=self.clock).get(("reqMarketRule", 99))
+            self.assertTrue(hit)
+            store.close()
@@ -0,0 +1,57 @@
+import asyncio
+from ib_tws_server.asyncio.loop_bridge import LoopBridge
+from ib_tws_server.asyncio.response_stream import ResponseStream
+from ib_tws_server.error import IbError
+from threading import Thread
+from unittest import IsolatedAsyncioTestCase
+
+class TestResponseStream(IsolatedAsyncioTestCase):
+    def stream(self, cancel_cb = lambda: None) -> ResponseStream:
+        return ResponseStream(LoopBridge(asyncio.get_running_loop()), cancel_cb)
+
+    async def test_yields_responses_until_the_end_marker(self):
+        s = self.stream()
+        def respond():
+            for i in range(1000):
+                s.append(i)
+            s.finish(s)
+        t = Thread(target=respond)
+        t.start()
+        received = [ i async for i in s ]
+        t.join()
+        self.assertEqual(received, list(range(1000)))
+
+    async def test_yields_responses_as_they_arrive(self):
+        s = self.stream()
+        s.append(1)
+        self.assertEqual(await asyncio.wait_for(s.__anext__(), 1), 1)
+        next = asyncio.ensure_future(s.__anext__())
+        await asyncio.sleep(0.01)
+        self.assertFalse(next.done())
+        s.append(2)
+        self.assertEqual(await asyncio.wait_for(next, 1), 2)
+
+    async def test_error_is_raised_after_received_responses(self):
+        s = self.stream()
+        s.append(1)
+        s.finish(IbError("No security definition has been found for the request", 200))
+        self.assertEqual(await s.__anext__(), 1)
+        with self.assertRaises(IbError):
+            await s.__anext__()
+        with self.assertRaises(StopAsyncIteration):
+            await s.__anext__()
+
+    async def test_aclose_cancels_the_request(self):
+        cancelled = []
+        s = self.stream(lambda: cancelled.append(True))
+        s.append(1)
+        await asyncio.sleep(0)
+        await s.aclose()
+        s.append(2)
+        await asyncio.sleep(0)
+        self.assertEqual(cancelled, [ True ])
+        self.assertEqual(s.qsize(), 0)
+        with self.assertRaises(StopAsyncIteration):
+            await s.__anext__()
+        await s.aclose()
+        self.assertEqual(cancelled, [ True ])
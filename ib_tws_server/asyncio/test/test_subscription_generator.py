@@ -0,0 +1,108 @@
+import asyncio
+from ib_tws_server.asyncio.subscription_generator import *
+from threading import Thread
+from unittest import IsolatedAsyncioTestCase
+
+class Tick:
+    def __init__(self, tickType: int, price: float):
+        self.tickType = tickType
+        self.price = price
+
+class TestSubscriptionGenerator(IsolatedAsyncioTestCase):
+    def generator(self, options: SubscriptionQueueOptions = None):
+        self.cancelled = []
+        return SubscriptionGenerator(self.cancelled.append, 1, options)
+
+    async def take(self, g: SubscriptionGenerator, n: int):
+        return [ await g.__anext__() for _ in range(n) ]
+
+    async def test_unbounded_by_default(self):
+        g = self.generator()
+        for i in range(100):
+            g.add_to_queue(i)
+        self.assertEqual(await self.take(g, 100), list(range(100)))
+        self.assertEqual(g.stats.dropped, 0)
+        await g.aclose()
+        self.assertEqual(self.cancelled, [ 1 ])
+
+    async def test_drop_oldest(self):
+        g = self.generator(SubscriptionQueueOptions(3, OverflowPolicy.DROP_OLDEST))
+        for i in range(5):
+            g.add_to_queue(i)
+        self.assertEqual(await self.take(g, 3), [ 2, 3, 4 ])
+        self.assertEqual((g.stats.received, g.stats.dropped, g.stats.max_queued), (5, 2, 3))
+
+    async def test_drop_newest(self):
+        g = self.generator(SubscriptionQueueOptions(3, OverflowPolicy.DROP_NEWEST))
+        for i in range(5):
+            g.add_to_queue(i)
+        self.assertEqual(await self.take(g, 3), [ 0, 1, 2 ])
+        self.assertEqual(g.stats.dropped, 2)
+
+    async def test_conflate(self):
+        g = self.generator(SubscriptionQueueOptions(2, OverflowPolicy.CONFLATE, conflate_by('tickType')))
+        g.add_to_queue(Tick(1, 10))
+        g.add_to_queue(Tick(2, 11))
+        g.add_to_queue(Tick(1, 12))
+        self.assertEqual([ (t.tickType, t.price) for t in await self.take(g, 2) ], [ (1, 12), (2, 11) ])
+        self.assertEqual(g.stats.conflated, 1)
+        g.add_to_queue(Tick(1, 13))
+        g.add_to_queue(Tick(2, 14))
+        g.add_to_queue(Tick(4, 15))
+        self.assertEqual([ t.price for t in await self.take(g, 2) ], [ 14, 15 ])
+        self.assertEqual(g.stats.dropped, 1)
+
+    async def test_conflate_requires_key(self):
+        with self.assertRaises(ValueError):
+            SubscriptionQueueOptions(2, OverflowPolicy.CONFLATE)
+
+    async def test_block_waits_for_consumer(self):
+        g = self.generator(SubscriptionQueueOptions(2, OverflowPolicy.BLOCK))
+        loop = asyncio.get_running_loop()
+
+        def produce():
+            for i in range(10):
+                if g.reserve():
+                    loop.call_soon_threadsafe(g.add_to_queue, i)
+
+        t = Thread(target=produce)
+        t.start()
+        res = []
+        for _ in range(10):
+            res.append(await g.__anext__())
+            self.assertLessEqual(g.qsize(), 2)
+        await loop.run_in_executor(None, t.join)
+        self.assertEqual(res, list(range(10)))
+        self.assertEqual(g.stats.max_queued, 2)
+
+    async def test_closing_releases_blocked_producer(self):
+        g = self.generator(SubscriptionQueueOptions(1, OverflowPolicy.BLOCK))
+        self.assertTrue(g.reserve())
+        g.add_to_queue(0)
+        t = Thread(target=g.reserve)
+        t.start()
+        await g.aclose()
+        await asyncio.get_running_loop().run_in_executor(None, t.join, 5)
+        self.assertFalse(t.is_alive())
+        self.assertFalse(g.reserve())
+
+    async def test_cancelled_consumer_does_not_lose_updates(self):
+        g = self.generator()
+        first = asyncio.create_task(g.__anext__())
+        second = asyncio.create_task(g.__anext__())
+        await asyncio.sleep(0)
+        first.cancel()
+        g.add_to_queue(1)
+        self.assertEqual(await second, 1)
+
+    async def test_abort_raises_after_queued_updates(self):
+        g = self.generator()
+        waiter = asyncio.create_task(g.__anext__())
+        await asyncio.sleep(0)
+        g.add_to_queue(1)
+        g.abort(ValueError("not sent"))
+        self.assertEqual(await waiter, 1)
+        with self.assertRaises(ValueError):
+            await g.__anext__()
+        await g.aclose()
+        self.assertEqual(self.cancelled, [])
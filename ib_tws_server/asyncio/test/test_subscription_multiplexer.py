@@ -0,0 +1,90 @@
+import asyncio
+from ib_tws_server.asyncio.shared_upstream import SharedUpstream, SharedUpstreams
+from ib_tws_server.asyncio.subscription_generator import SubscriptionGenerator
+from ib_tws_server.asyncio.subscription_multiplexer import SubscriptionMultiplexer
+from ib_tws_server.mock.contracts import contract_for_symbol
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+class TestSubscriptionMultiplexer(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.upstreams = {}
+        self.cancelled = []
+
+    def subscribe(self, m: SubscriptionMultiplexer, sym: str):
+        async def open_upstream():
+            await asyncio.sleep(0)
+            g = SubscriptionGenerator(self.cancelled.append, sym)
+            self.upstreams[sym] = g
+            return g
+        return m.subscribe(("reqTickByTickData", contract_for_symbol(sym), "BidAsk"), open_upstream)
+
+    async def test_consumers_share_upstream_subscription(self):
+        m = SubscriptionMultiplexer()
+        a,b,c = await asyncio.gather(self.subscribe(m, "AMZN"), self.subscribe(m, "AMZN"), self.subscribe(m, "MSFT"))
+        self.assertEqual(len(self.upstreams), 2)
+        self.assertEqual(m.stats.upstream_subscriptions, 2)
+        self.assertEqual(m.stats.shared_subscriptions, 1)
+
+        self.upstreams["AMZN"].add_to_queue(1)
+        self.upstreams["AMZN"].add_to_queue(2)
+        self.assertEqual([ await a.__anext__(), await a.__anext__() ], [ 1, 2 ])
+        self.assertEqual([ await b.__anext__(), await b.__anext__() ], [ 1, 2 ])
+
+        await a.aclose()
+        await asyncio.sleep(0)
+        self.assertEqual(self.cancelled, [])
+        await b.aclose()
+        await asyncio.sleep(0)
+        self.assertEqual(self.cancelled, [ "AMZN" ])
+        self.assertEqual(m.upstream_count(), 1)
+        await c.aclose()
+        await asyncio.sleep(0)
+        self.assertEqual(self.cancelled, [ "AMZN", "MSFT" ])
+        self.assertEqual(m.upstream_count(), 0)
+
+    async def test_resubscribing_opens_new_upstream(self):
+        m = SubscriptionMultiplexer()
+        a = await self.subscribe(m, "AMZN")
+        await a.aclose()
+        b = await self.subscribe(m, "AMZN")
+        self.assertEqual(m.stats.upstream_subscriptions, 2)
+        await b.aclose()
+
+    async def test_failed_subscription_is_raised_for_every_consumer(self):
+        m = SubscriptionMultiplexer()
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("failed")
+        res = await asyncio.gather(m.subscribe(("req",), fail), m.subscribe(("req",), fail), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in res))
+        self.assertEqual(m.upstream_count(), 0)
+
+    async def test_cancelled_opener_doesnt_cancel_other_consumers(self):
+        """Consumers waiting for a subscription whose opener was cancelled open it again"""
+        m = SubscriptionMultiplexer()
+        opened = []
+        async def open_upstream():
+            opened.append(1)
+            await asyncio.sleep(0.01)
+            return SubscriptionGenerator(self.cancelled.append, "AMZN")
+        opener = asyncio.create_task(m.subscribe(("req",), open_upstream))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(m.subscribe(("req",), open_upstream))
+        await asyncio.sleep(0)
+        opener.cancel()
+        consumer = await waiter
+        self.assertTrue(opener.cancelled())
+        self.assertEqual(len(opened), 2)
+        self.assertEqual(m.consumer_count(("req",)), 1)
+        await consumer.aclose()
+
+class TestSharedUpstreams(TestCase):
+    def test_subclasses_must_implement_the_abstract_methods(self):
+        class Incomplete(SharedUpstreams):
+            def _create(self, key, ready, *args):
+                pass
+        with self.assertRaises(TypeError):
+            Incomplete()
+        with self.assertRaises(TypeError):
+            SharedUpstream(("req",), None)
+        self.assertEqual(SubscriptionMultiplexer().upstream_count(), 0)
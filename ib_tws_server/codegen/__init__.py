@@ -1,5 +1,6 @@
 from ib_tws_server.codegen.asyncio_client_generator import AsyncioClientGenerator
-from ib_tws_server.codegen.response_types_generator import ResponseTypesGenerator
+from ib_tws_server.codegen.response_types_generator import ResponseClassStyle, ResponseTypesGenerator
 from ib_tws_server.codegen.graphql_schema_generator import GraphQLSchemaGenerator
 from ib_tws_server.codegen.graphql_resolver_generator import GraphQLResolverGenerator
+from ib_tws_server.codegen.serializer_generator import SerializerGenerator
 
@@ -3,8 +3,8 @@ from ib_tws_server.api_definition import *
 from ib_tws_server.codegen.generator_utils import *
 import inspect
 
-def forward_method_parameters_dict_style(params: List[inspect.Parameter]) -> str:
-    return ",".join([ f"{v.name} = {v.name}" for v in params ])
+def forward_method_parameters_positional(params: List[inspect.Parameter]) -> str:
+    return ",".join([ v.name for v in params ])
 
 def request_state_member_name(d: ApiDefinition):
     return f"_req_state"       
@@ -15,22 +15,26 @@ def subscription_member_name(d: ApiDefinition):
 def response_instance(d: ApiDefinition, m: Callable):
     callback_type,is_wrapper = GeneratorUtils.callback_type(d, m)
     if is_wrapper:
-        return f"{callback_type}({forward_method_parameters_dict_style(GeneratorUtils.data_class_members(d, [m], False))})"
+        # Response classes take their members positionally in both styles, which is faster than keywords
+        return f"{callback_type}({forward_method_parameters_positional(GeneratorUtils.data_class_members(d, [m], False))})"
     else:
         return GeneratorUtils.data_class_members(d, [m], False)[0].name
 
 def streaming_instance(d: ApiDefinition, m: Callable):
     callback_type,is_wrapper = GeneratorUtils.callback_type(d, m)
     if is_wrapper:
-        return f"{callback_type}({forward_method_parameters_dict_style(GeneratorUtils.data_class_members(d, [m], True))})"
+        return f"{callback_type}({forward_method_parameters_positional(GeneratorUtils.data_class_members(d, [m], True))})"
     else:
         return GeneratorUtils.data_class_members(d, [m], False)[0].name
 
 def request_id(d: ApiDefinition, m: Callable):
-    if not d.uses_req_id:
-        return f"'{d.request_method.__name__}'"
-    else:
+    if d.uses_req_id:
         return GeneratorUtils.req_id_param_name(m)
+    elif is_order(d):
+        # Every order has its own subscription. Order ids aren't request ids, so they're paired with the request name
+        return f"('{d.request_method.__name__}',{GeneratorUtils.req_id_param_name(m)})"
+    else:
+        return f"'{d.request_method.__name__}'"
 
 def current_request_state(d: ApiDefinition, m: Callable):
     return f"self.{request_state_member_name(d)}[{request_id(d, m)}]"
@@ -39,70 +43,275 @@ def bind_method(d: ApiDefinition, m: Callable, param_values: List[str]) -> str:
     param_values[0] = f"self._client.{m.__name__}"
     return f"functools.partial({','.join(param_values)})"
 
+def request_priority(d: ApiDefinition):
+    return f"RequestPriority.{d.priority.name} if priority is None else priority"
+
+def request_parameter_names(signature: inspect.Signature) -> List[str]:
+    return [ p.name for p in signature.parameters.values() if p.name != 'self' and p.kind != inspect.Parameter.KEYWORD_ONLY ]
+
+def acquire_historical_pacing(d: ApiDefinition, method_name: str, signature: inspect.Signature, timeout: str = None):
+    if not d.uses_historical_pacing:
+        return ""
+    params = request_parameter_names(signature)
+    if timeout is not None:
+        return f"await self._acquire_historical_pacing(('{method_name}',{','.join(params)}), contract, whatToShow, {timeout})"
+    return f"await self._historical_pacing.acquire(('{method_name}',{','.join(params)}), contract, whatToShow)"
+
+def is_coalesced(d: ApiDefinition, is_subscription: bool):
+    return d.idempotent and not is_subscription and (d.callback_methods is not None or d.done_method is not None)
+
+def coalesced_request_method(d: ApiDefinition, method_name: str, signature: inspect.Signature):
+    params = request_parameter_names(signature)
+    forward = ",".join(params + [ "priority=priority" ])
+    cache = ""
+    if d.cache_ttl is not None:
+        cache = f"""
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, {d.cache_ttl})"""
+    return f"""
+
+    async def {method_name}{signature}:
+        {GeneratorUtils.doc_string(d.request_method)}
+        request = ('{method_name}',{','.join(params)})
+        send = lambda: self.__{method_name}({forward}, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__{method_name}({forward}, timeout=0), {request_timeout(d)}){cache}
+        return await send()"""
+
+def init_request_id(d: ApiDefinition, u: Callable):
+    if d.uses_req_id:
+        return f"{GeneratorUtils.req_id_param_name(d.request_method)} = self.next_request_id()"
+    else:
+        return ""
+
+def columnar_request_method(d: ApiDefinition, method_name: str, signature: inspect.Signature, param_values: List[str]):
+    if d.columnar_response is None:
+        return ""
+    return f"""
+
+    async def {method_name}Columnar{signature.replace(return_annotation=d.columnar_response)}:
+        \"\"\"Same as {method_name}, but accumulates the responses into the columns of a {d.columnar_response}
+        as they arrive instead of returning a list of objects\"\"\"
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        {acquire_historical_pacing(d, method_name, signature, request_timeout(d))}
+        future = loop.create_future()
+        def cb(res: {d.columnar_response}):
+            loop.call_soon_threadsafe(future.set_result, res)
+        {init_request_id(d, d.request_method)}
+        {current_request_state(d, d.request_method)} = RequestState(cb, {d.columnar_response}())
+        req = QueuedRequest({bind_method(d, d.request_method, param_values)})
+        self._writer.put(req, {request_priority(d)})
+        res = await self._wait_for_response(future, {request_id(d, d.request_method)}, '{method_name}', {request_timeout(d)}, req, {tws_cancel(d)}, started)
+        if isinstance(res, IbError):
+            raise res
+        return res"""
+
+def has_cancel_method(d: ApiDefinition):
+    return d.cancel_method is not None and (d.is_subscription or d.subscription_flag_name is not None or GeneratorUtils.response_is_list(d))
+
+def stream_request_method(d: ApiDefinition, method_name: str, signature: inspect.Signature, param_values: List[str]):
+    if not GeneratorUtils.response_is_list(d):
+        return ""
+    if has_cancel_method(d):
+        cancel_params = [ request_id(d, d.request_method) ] if d.uses_req_id else []
+        cancel = f"functools.partial({','.join([ f'self.__{d.cancel_method.__name__}' ] + cancel_params)})"
+    else:
+        cancel = f"functools.partial(self.cancel_request, {request_id(d, d.request_method)})"
+    return f"""
+
+    async def {method_name}AsStream{client_request_signature(d, False, True).replace(return_annotation='ResponseStream')}:
+        \"\"\"Same as {method_name}, but returns a ResponseStream that yields the responses as they arrive\"\"\"
+        {acquire_historical_pacing(d, method_name, signature)}
+        {init_request_id(d, d.request_method)}
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), {cancel})
+        {current_request_state(d, d.request_method)} = RequestState(stream.finish, stream)
+        self._put_request({request_id(d, d.request_method)}, {bind_method(d, d.request_method, param_values)}, {request_priority(d)})
+        return stream"""
+
+def order_book_request_method(d: ApiDefinition, method_name: str, signature: inspect.Signature, param_values: List[str]):
+    if d.order_book_rows_param is None:
+        return ""
+    signature = signature.replace(parameters=[ p for p in signature.parameters.values() if p.name != 'queue_options' ], return_annotation='OrderBookSubscription')
+    cancel_params = [ f"self.__{d.cancel_method.__name__}" ] + list(GeneratorUtils.signature(d.cancel_method).parameters)[1:]
+    return f"""
+
+    async def {method_name}AsOrderBook{signature}:
+        \"\"\"Same as {method_name}, but applies the updates to the OrderBook of the returned
+        OrderBookSubscription as they arrive instead of queueing them\"\"\"
+        {init_request_id(d, d.request_method)}
+        ret = self.{subscription_member_name(d)}[{request_id(d, d.request_method)}] = OrderBookSubscription(functools.partial({','.join(cancel_params)}), {d.order_book_rows_param})
+        self._subscribe({request_id(d, d.request_method)}, {bind_method(d, d.request_method, param_values)}, {request_priority(d)})
+        return ret"""
+
+def quotes_request_method(d: ApiDefinition, signature: inspect.Signature, param_values: List[str]):
+    if not d.quotes:
+        return ""
+    signature = signature.replace(parameters=[ p for p in signature.parameters.values() if p.name != 'queue_options' ], return_annotation='QuoteSubscription')
+    return f"""
+
+    async def {d.request_method.__name__}AsQuotes{signature}:
+        \"\"\"Same as {GeneratorUtils.request_method_name(d, True)}, but yields Quote snapshots of the QuoteState of the
+        contract instead of the ticks. At most one quote is queued\"\"\"
+        {init_request_id(d, d.request_method)}
+        ret = self.{subscription_member_name(d)}[{request_id(d, d.request_method)}] = QuoteSubscription(self._quote_state(contract), True, self.__{d.cancel_method.__name__}, {GeneratorUtils.req_id_param_name(d.request_method)})
+        self._subscribe({request_id(d, d.request_method)}, {bind_method(d, d.request_method, param_values)}, {request_priority(d)})
+        return ret"""
+
+def quote_lookup(d: ApiDefinition):
+    if not d.quotes:
+        return ""
+    return """
+        if self._quote_store is not None and genericTickList == "" and not regulatorySnapshot:
+            ticks = self._quote_store.fresh_ticks(contract)
+            if ticks is not None:
+                return ticks"""
+
+def record_quotes(d: ApiDefinition):
+    if not d.quotes:
+        return ""
+    return """
+        if self._quote_store is not None:
+            self._quote_store.record_snapshot(contract, res)"""
+
+def is_shared(d: ApiDefinition, is_subscription: bool):
+    return d.shareable and is_subscription
+
+def shared_subscription_method(d: ApiDefinition, method_name: str, signature: inspect.Signature):
+    params = request_parameter_names(signature)
+    forward = ",".join(params + [ "priority=priority" ])
+    return f"""
+
+    async def {method_name}{signature}:
+        {GeneratorUtils.doc_string(d.request_method)}
+        if self._multiplexer is None:
+            return await self.__{method_name}({forward},queue_options=queue_options)
+        return await self._multiplexer.subscribe(('{method_name}',{','.join(params)}), lambda: self.__{method_name}({forward}), queue_options)"""
+
+def request_timeout(d: ApiDefinition):
+    if d.timeout is None:
+        return "timeout"
+    return f"{d.timeout} if timeout is None else timeout"
+
+def tws_cancel(d: ApiDefinition):
+    if d.cancel_method is None:
+        return "None"
+    cancel_params = [ f"self._client.{d.cancel_method.__name__}" ]
+    if len(GeneratorUtils.signature(d.cancel_method).parameters) > 1:
+        cancel_params.append(request_id(d, d.request_method))
+    return f"functools.partial({','.join(cancel_params)})"
+
+def has_response(d: ApiDefinition):
+    return d.callback_methods is not None or d.done_method is not None
+
+def sends_order(d: ApiDefinition):
+    # Requests that place or exercise orders, which must not be sent again or late on a new connection
+    return d.priority == RequestPriority.ORDER and (d.is_subscription or not has_response(d))
+
+def is_order(d: ApiDefinition):
+    # Orders with a subscription to their status
+    return sends_order(d) and d.is_subscription
+
+def order_cancels() -> List[str]:
+    # Messages that cancel orders, which outlive the connection in TWS
+    return [ d.cancel_method.__name__ for d in REQUEST_DEFINITIONS if d.request_method is not None and is_order(d) ] + \
+        [ d.request_method.__name__ for d in REQUEST_DEFINITIONS if d.request_method is not None and d.priority == RequestPriority.CANCEL and not has_response(d) ]
+
+def unconfirmed_orders() -> List[str]:
+    # Requests that send orders without a subscription to their status
+    return [ d.request_method.__name__ for d in REQUEST_DEFINITIONS if d.request_method is not None and sends_order(d) and not is_order(d) ]
+
+def require_connection(d: ApiDefinition):
+    if not sends_order(d):
+        return ""
+    return """
+        if not self._connected:
+            raise ConnectionLostError()"""
+
+def subscribe(d: ApiDefinition, param_values: List[str]):
+    if sends_order(d):
+        # Orders aren't re-issued when reconnecting
+        return f"self._put_request({request_id(d, d.request_method)}, {bind_method(d, d.request_method, param_values)}, {request_priority(d)})"
+    return f"self._subscribe({request_id(d, d.request_method)}, {bind_method(d, d.request_method, param_values)}, {request_priority(d)})"
+
+def client_request_signature(d: ApiDefinition, is_subscription: bool, is_stream: bool = False):
+    signature = GeneratorUtils.request_signature(d, is_subscription)
+    params = list(signature.parameters.values())
+    params.append(inspect.Parameter('priority', inspect.Parameter.KEYWORD_ONLY, default=None, annotation='RequestPriority'))
+    if is_subscription:
+        params.append(inspect.Parameter('queue_options', inspect.Parameter.KEYWORD_ONLY, default=None, annotation='SubscriptionQueueOptions'))
+    elif has_response(d) and not is_stream:
+        params.append(inspect.Parameter('timeout', inspect.Parameter.KEYWORD_ONLY, default=None, annotation='float'))
+    return signature.replace(parameters=params)
+
 class AsyncioClientGenerator:
     @staticmethod
     def generate(filename):
         def init_callback(d: ApiDefinition, m: Callable, cb: str):
             if d.callback_methods is not None or d.done_method is not None:
-                return f"{current_request_state(d,m)}.{cb} = {cb}"
+                return f"{current_request_state(d,m)} = RequestState({cb})"
             return ""
 
-        def init_request_id(d: ApiDefinition, u: Callable):
-            if d.uses_req_id:
-                return f"{GeneratorUtils.req_id_param_name(d.request_method)} = self.next_request_id()"
-            else:
-                return ""
-
         def init_subscription(d: ApiDefinition):
             if d.cancel_method is None:
                 raise RuntimeError(f"Request does not support cancellation {d.request_method.__name__}")
 
             current_subscription = f"self.{subscription_member_name(d)}[{request_id(d, d.request_method)}]"
 
-            return f"{current_subscription}= SubscriptionGenerator(self.__{d.cancel_method.__name__}, {GeneratorUtils.req_id_param_name(d.request_method)})"
+            generator = f"SubscriptionGenerator(self.__{d.cancel_method.__name__}, {GeneratorUtils.req_id_param_name(d.request_method)}, queue_options)"
+            if d.quotes:
+                # Ticks also update the QuoteStore
+                generator = f"QuoteSubscription(self._quote_store.state(contract), False, self.__{d.cancel_method.__name__}, {GeneratorUtils.req_id_param_name(d.request_method)}, queue_options, self._quote_store.clock) if self._quote_store is not None else {generator}"
+            return f"{current_subscription} = {generator}"
 
         def async_request_method(d: ApiDefinition, is_subscription: bool):
             method_name = GeneratorUtils.request_method_name(d, is_subscription)
             original_sig = GeneratorUtils.signature(d.request_method)
-            signature = GeneratorUtils.request_signature(d, is_subscription)
+            signature = client_request_signature(d, is_subscription)
             param_values = [ p.name if p.name != d.subscription_flag_name else f"{d.subscription_flag_value if is_subscription else not d.subscription_flag_value}" for p in original_sig.parameters.values() ]
             
             if is_subscription:
+                # Shared subscriptions are implemented by a private method that opens the upstream subscription
+                impl_name = f"__{method_name}" if is_shared(d, is_subscription) else method_name
                 return f"""
 
-    async def {method_name}{signature}:
-        {GeneratorUtils.doc_string(d.request_method)}
+    async def {impl_name}{signature}:
+        {GeneratorUtils.doc_string(d.request_method)}{require_connection(d)}
+        {acquire_historical_pacing(d, method_name, signature)}
         {init_request_id(d, d.request_method)}
-        ret: SubscriptionGenerator = None
-        with self._lock:
-            ret = {init_subscription(d)}
-        self._writer.queue.put({bind_method(d, d.request_method, param_values)})
-        return ret"""
+        ret = {init_subscription(d)}
+        {subscribe(d, param_values)}
+        return ret{shared_subscription_method(d, method_name, signature) if is_shared(d, is_subscription) else ""}{order_book_request_method(d, method_name, signature, param_values)}{quotes_request_method(d, signature, param_values)}"""
             if d.callback_methods is not None or d.done_method is not None:
+                # Coalesced requests are implemented by a private method that is shared by concurrent callers
+                impl_name = f"__{method_name}" if is_coalesced(d, is_subscription) else method_name
                 return f"""
 
-    async def {method_name}{signature}:
-        {GeneratorUtils.doc_string(d.request_method)}
+    async def {impl_name}{signature}:
+        {GeneratorUtils.doc_string(d.request_method)}{quote_lookup(d)}
         loop = asyncio.get_running_loop()
+        started = loop.time()
+        {acquire_historical_pacing(d, method_name, signature, request_timeout(d))}
         future = loop.create_future()
         def cb(res: {GeneratorUtils.request_return_type(d, is_subscription)}):
             loop.call_soon_threadsafe(future.set_result, res)
         {init_request_id(d, d.request_method)}
-        with self._lock:
-            {init_callback(d, d.request_method, 'cb')}
-        self._writer.queue.put({bind_method(d, d.request_method, param_values)})
-        res = (await future)
+        {init_callback(d, d.request_method, 'cb')}
+        req = QueuedRequest({bind_method(d, d.request_method, param_values)})
+        self._writer.put(req, {request_priority(d)})
+        res = await self._wait_for_response(future, {request_id(d, d.request_method)}, '{method_name}', {request_timeout(d)}, req, {tws_cancel(d)}, started)
         if isinstance(res, IbError):
-            raise res
-        return res"""
+            raise res{record_quotes(d)}
+        return res{coalesced_request_method(d, method_name, signature) if is_coalesced(d, is_subscription) else ""}{columnar_request_method(d, method_name, signature, param_values)}{stream_request_method(d, method_name, signature, param_values)}"""
 
             else:
                 return f"""
 
     async def {method_name}{signature}:
-        {GeneratorUtils.doc_string(d.request_method)}
+        {GeneratorUtils.doc_string(d.request_method)}{require_connection(d)}
         {init_request_id(d, d.request_method)}
-        self._writer.queue.put({bind_method(d, d.request_method, param_values)})
+        self._writer.put({bind_method(d, d.request_method, param_values)}, {request_priority(d)})
         return None"""
 
         def cancel_method(d: ApiDefinition):
@@ -110,90 +319,308 @@ class AsyncioClientGenerator:
 
     def __{GeneratorUtils.method_declaration(d.cancel_method)}:
         {GeneratorUtils.doc_string(d.cancel_method)}
-        self.cancel_request({request_id(d,d.cancel_method)})
-        self._writer.queue.put({bind_method(d, d.cancel_method, list(GeneratorUtils.signature(d.cancel_method).parameters))})"""
+        if self.cancel_request({request_id(d,d.cancel_method)}):
+            return
+        self._writer.put({bind_method(d, d.cancel_method, list(GeneratorUtils.signature(d.cancel_method).parameters))}, RequestPriority.CANCEL)"""
 
         with open(filename, "w") as f:
             f.write(f"""
 import asyncio
 import functools
-from collections import defaultdict
 from ibapi.client import EClient
-from ib_tws_server.asyncio.ib_writer import IBWriter
+from ib_tws_server.asyncio.backoff import ExponentialBackoff
+from ib_tws_server.asyncio.historical_pacing import HistoricalPacingGovernor
+from ib_tws_server.asyncio.ib_writer import IBWriter, QueuedRequest
+from ib_tws_server.asyncio.order_book_subscription import OrderBookSubscription
+from ib_tws_server.asyncio.quote_store import QuoteState, QuoteStore, QuoteSubscription
+from ib_tws_server.asyncio.rate_limiter import RateLimiter
+from ib_tws_server.asyncio.request_coalescer import RequestCoalescer
+from ib_tws_server.asyncio.request_priority import RequestPriority
 from ib_tws_server.asyncio.request_state import *
-from ib_tws_server.asyncio.subscription_generator import SubscriptionGenerator
+from ib_tws_server.asyncio.response_cache import ResponseCache
+from ib_tws_server.asyncio.response_stream import ResponseStream
+from ib_tws_server.asyncio.subscription_generator import SubscriptionGenerator, SubscriptionQueueOptions
+from ib_tws_server.asyncio.subscription_multiplexer import SubscriptionMultiplexer
 from ib_tws_server.error import *
 from ib_tws_server.gen.client_responses import *
 from ib_tws_server.gen.asyncio_wrapper import *
 from ib_tws_server.ib_imports import *
-from threading import Lock, Thread
+from ib_tws_server.util.historical_columns import HistoricalBarColumns, HistoricalTickColumns
+import logging
+from threading import Thread
 import time
 from typing import Callable, Dict, List, Tuple
 
+logger = logging.getLogger(__name__)
+
 class AsyncioClient():
-    _lock: Lock
-    _req_state: Dict[str, RequestState]
-    _subscriptions: Dict[int, SubscriptionGenerator]
+    _registry: RequestStateRegistry
+    _req_state: Dict[RequestId, RequestState]
+    _subscriptions: Dict[RequestId, SubscriptionGenerator]
     _wrapper: AsyncioWrapper
     _client: EClient
 
-    def __init__(self):
-        self._lock = Lock()
-        self._current_request_id = 0
-        self._req_state = defaultdict(RequestState)
-        self._subscriptions = defaultdict(SubscriptionGenerator)
+    def __init__(self, rate_limiter: RateLimiter = None, historical_pacing: HistoricalPacingGovernor = None, coalescer: RequestCoalescer = None, response_cache: ResponseCache = None, multiplexer: SubscriptionMultiplexer = None, delivery_interval: float = 0, quote_store: QuoteStore = None):
+        self._registry = RequestStateRegistry()
+        self._req_state = self._registry.requests
+        self._subscriptions = self._registry.subscriptions
+        self._subscription_requests = self._registry.subscription_requests
+        self._queued_requests = self._registry.queued
 
-        self._wrapper = AsyncioWrapper(self._lock, self._req_state, self._subscriptions)
+        # Subscription updates are delivered to the event loop in batches, at most every delivery_interval seconds
+        self._wrapper = AsyncioWrapper(self._registry, delivery_interval)
         self._client = EClient(self._wrapper)
-        self._writer = IBWriter(self._client)
+        self._writer = IBWriter(self._client, rate_limiter)
         self._wrapper._writer = self._writer
+        self._historical_pacing = historical_pacing if historical_pacing is not None else HistoricalPacingGovernor()
+        # Coalescing is opt-in since callers share response objects
+        self._coalescer = coalescer
+        self._response_cache = response_cache
+        self._multiplexer = multiplexer
+        self._quote_store = quote_store
+        self._wrapper._on_disconnect = self._connection_lost
+        self._connected = False
+        # (loop, host, port, client_id, backoff) of the connection to restore when it is lost
+        self._reconnect_args = None
+        self._reconnect_task: asyncio.Task = None
+        self._lost_subscriptions: List[RequestId] = []
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._writer.rate_limiter
+
+    @property
+    def historical_pacing(self) -> HistoricalPacingGovernor:
+        return self._historical_pacing
+
+    @property
+    def coalescer(self) -> RequestCoalescer:
+        return self._coalescer
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        return self._response_cache
+
+    @property
+    def multiplexer(self) -> SubscriptionMultiplexer:
+        return self._multiplexer
+
+    @property
+    def quote_store(self) -> QuoteStore:
+        return self._quote_store
+
+    def _quote_state(self, contract: 'ibapi.contract.Contract') -> QuoteState:
+        return self._quote_store.state(contract) if self._quote_store is not None else QuoteState()
 
     def run(self):
         self._writer.start()
         self._client.run()
 
     def next_request_id(self):
-        with self._lock:
-            self._current_request_id += 1
-            return self._current_request_id
+        return self._registry.next_request_id()
 
     def disconnect(self, clean=False):
         self._wrapper._expecting_disconnect = clean
+        self._connected = False
+        self._reconnect_args = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
         return self._client.disconnect()
 
-    def cancel_request(self, id: RequestId):
-        response_cb = None
-        with self._lock:
-            if id in self._req_state:
-                response_cb = self._req_state[id].cb
-                del self._req_state[id]
-            if id in self._subscriptions:
-                del self._subscriptions[id]
-        if response_cb is not None:
-            response_cb(None)
-
-    def start(self, host: str, port: int, client_id: int, connection_retry_interval: int):
-        while True:
-            try:
-                self._client.connect(host, port, client_id)
-                break
-            except ConnectionError as e:
-                if connection_retry_interval > 0:
-                    time.sleep(connection_retry_interval)
-                else:
-                    raise e
-
+    def is_connected(self) -> bool:
+        return self._client.isConnected()
+
+    def cancel_request(self, id: RequestId) -> bool:
+        \"\"\"
+        Removes the state of a request or subscription. Returns True if its request was still queued
+        and was withdrawn, so it mustn't be cancelled in TWS: the cancel would overtake the request
+        \"\"\"
+        s = self._req_state.pop(id, None)
+        self._subscriptions.pop(id, None)
+        self._subscription_requests.pop(id, None)
+        req = self._queued_requests.pop(id, None)
+        if s is not None and s.cb is not None:
+            s.cb(None)
+        return req is not None and req.withdraw()
+
+    async def _acquire_historical_pacing(self, request: Tuple, contract: object, whatToShow: str, timeout: float):
+        \"\"\"
+        Waits for the historical pacing governor to admit a query. The wait counts towards the
+        query's `timeout`, so it's abandoned when the deadline expires
+        \"\"\"
+        if timeout is None or timeout <= 0:
+            await self._historical_pacing.acquire(request, contract, whatToShow)
+            return
+        try:
+            await asyncio.wait_for(self._historical_pacing.acquire(request, contract, whatToShow), timeout)
+        except asyncio.TimeoutError:
+            raise RequestTimeoutError(request[0], timeout) from None
+
+    async def _wait_for_response(self, future: asyncio.Future, id: RequestId, request: str, timeout: float, req: QueuedRequest, cancel: Callable[[], None], started: float = None):
+        \"\"\"
+        Waits for the response of a query until `timeout` seconds after `started`, or after now if it's
+        None. When the deadline expires or the caller is cancelled, the request state is removed and
+        the request is withdrawn if it is still queued, or else `cancel` is sent to TWS if the request
+        can be cancelled, so no state is kept for callers that stopped waiting
+        \"\"\"
+        try:
+            if timeout is None or timeout <= 0:
+                return await future
+            left = timeout if started is None else started + timeout - asyncio.get_running_loop().time()
+            # Shield the future so a response that arrives while timing out isn't lost
+            return await asyncio.wait_for(asyncio.shield(future), left)
+        except asyncio.TimeoutError:
+            if not self._abandon_request(id, req, cancel):
+                return await future
+            raise RequestTimeoutError(request, timeout) from None
+        except asyncio.CancelledError:
+            self._abandon_request(id, req, cancel)
+            raise
+
+    def _abandon_request(self, id: RequestId, req: QueuedRequest, cancel: Callable[[], None]) -> bool:
+        # The reader thread has completed the request if its state was already removed
+        if self._req_state.pop(id, None) is None:
+            return False
+        # A cancel would overtake a request that is still queued, so TWS would run it anyway
+        if not req.withdraw() and cancel is not None:
+            self._writer.put(cancel, RequestPriority.CANCEL)
+        return True
+
+    def _subscribe(self, id: RequestId, req: Callable[[], None], priority: RequestPriority):
+        self._subscription_requests[id] = (req, priority)
+        self._put_request(id, req, priority)
+
+    def _put_request(self, id: RequestId, req: Callable[[], None], priority: RequestPriority):
+        \"\"\"
+        Queues the request of a subscription, order or stream, keeping it until it's sent so
+        cancel_request can withdraw it
+        \"\"\"
+        q = self._queued_requests[id] = QueuedRequest(req, functools.partial(self._request_sent, id))
+        self._writer.put(q, priority)
+
+    def _request_sent(self, id: RequestId, req: QueuedRequest):
+        if self._queued_requests.get(id) is req:
+            self._queued_requests.pop(id, None)
+
+    def _try_connect(self, host: str, port: int, client_id: int) -> bool:
+        self._wrapper._expecting_disconnect = False
+        try:
+            self._client.connect(host, port, client_id)
+        except ConnectionError:
+            return False
+        return self._client.isConnected()
+
+    def _start_threads(self):
+        # A writer thread can only be started once, so every connection gets a new writer for the queue
+        self._writer = self._writer.successor()
+        self._wrapper._writer = self._writer
+        self._connected = True
         thread = Thread(target = self.run)
         thread.start()
         setattr(thread, "_thread", thread)
 
+    def start(self, host: str, port: int, client_id: int, connection_retry_interval: int):
+        \"\"\"
+        Connects to TWS, blocking the calling thread until connected. connect() doesn't block the
+        event loop and restores the connection when it is lost
+        \"\"\"
+        while not self._try_connect(host, port, client_id):
+            if connection_retry_interval > 0:
+                time.sleep(connection_retry_interval)
+            else:
+                raise ConnectionError(f"Could not connect to {{host}}:{{port}}")
+        self._start_threads()
+
+    async def connect(self, host: str, port: int, client_id: int, backoff: ExponentialBackoff = None, max_attempts: int = 0, reconnect: bool = True):
+        \"\"\"
+        Connects to TWS, waiting backoff.delay(n) seconds after the nth failed attempt. Raises
+        ConnectionError after max_attempts failed attempts, or retries forever if max_attempts is 0.
+
+        If `reconnect` is set, the connection is restored in the background when it is lost:
+        queries in flight fail with ConnectionLostError, requests made while disconnected are
+        sent once connected and the active subscriptions are re-issued
+        \"\"\"
+        backoff = backoff if backoff is not None else ExponentialBackoff()
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        # EClient.connect blocks on the socket and the handshake, so it runs in an executor
+        while not await loop.run_in_executor(None, self._try_connect, host, port, client_id):
+            attempt += 1
+            if max_attempts > 0 and attempt >= max_attempts:
+                raise ConnectionError(f"Could not connect to {{host}}:{{port}} after {{attempt}} attempts")
+            await asyncio.sleep(backoff.delay(attempt))
+        self._reconnect_args = (loop, host, port, client_id, backoff) if reconnect else None
+        self._start_threads()
+        # Subscriptions made while disconnected are still queued, only the ones of the lost connection are re-issued
+        lost = self._lost_subscriptions
+        self._lost_subscriptions = []
+        for id in lost:
+            r = self._subscription_requests.get(id)
+            if r is not None:
+                if isinstance(self._subscriptions.get(id), OrderBookSubscription):
+                    self._subscriptions[id].reset()
+                self._put_request(id, *r)
+
+    def _connection_lost(self):
+        \"\"\"
+        Called on the reader thread when the connection is closed without calling disconnect
+        \"\"\"
+        if not self._connected:
+            # A failed connection attempt
+            return
+        self._connected = False
+        # Drop the messages queued for the lost connection. Subscriptions are re-issued and the queries
+        # are failed below. Orders are never sent on a later connection, since TWS may have received them,
+        # but order cancels are kept for it since the orders stay live in TWS
+        for priority,req in self._writer.clear():
+            if not isinstance(req, functools.partial):
+                continue
+            if req.func.__name__ in {tuple(order_cancels())}:
+                self._writer.put(req, priority)
+            elif req.func.__name__ in {tuple(unconfirmed_orders())}:
+                logger.error(f"Dropped {{req.func.__name__}} {{req.args[0]}} queued when the connection was lost")
+        self._lost_subscriptions = list(self._subscription_requests)
+        error = ConnectionLostError()
+        # The requests that weren't sent. The subscriptions of the orders among them end with the error
+        for id,req in list(self._queued_requests.items()):
+            self._queued_requests.pop(id, None)
+            s = self._subscriptions.get(id)
+            if s is None or id in self._subscription_requests:
+                continue
+            self._subscriptions.pop(id, None)
+            logger.error(f"Dropped {{id[0]}} {{id[1]}} queued when the connection was lost")
+            self._wrapper.loop_bridge(s._loop).call_soon(s.abort, error)
+        for id in list(self._req_state):
+            s = self._req_state.pop(id, None)
+            if s is not None and s.cb is not None:
+                s.cb(error)
+        if self._reconnect_args is not None:
+            loop = self._reconnect_args[0]
+            loop.call_soon_threadsafe(self._schedule_reconnect)
+
+    def _schedule_reconnect(self):
+        if self._reconnect_args is None or self._reconnect_task is not None:
+            return
+        loop, host, port, client_id, backoff = self._reconnect_args
+        self._reconnect_task = loop.create_task(self._reconnect(host, port, client_id, backoff))
+
+    async def _reconnect(self, host: str, port: int, client_id: int, backoff: ExponentialBackoff):
+        try:
+            # The lost connection counts as the first failed attempt
+            await asyncio.sleep(backoff.delay(1))
+            await self.connect(host, port, client_id, backoff)
+        finally:
+            self._reconnect_task = None
+
     def active_request_count(self):
-        with self._lock:
-            return len(self._req_state) 
+        return len(self._req_state)
 
     def active_subscription_count(self):
-        with self._lock:
-            return len(self._subscriptions) 
+        return len(self._subscriptions)
+
+    def queued_message_count(self):
+        return self._writer.queue.qsize()
 """
             )
             for d in REQUEST_DEFINITIONS:
@@ -203,7 +630,7 @@ class AsyncioClient():
                         f.write(async_request_method(d, True))
                     else:
                         f.write(async_request_method(d, d.is_subscription))
-                    if d.cancel_method is not None and (d.is_subscription or d.subscription_flag_name is not None):
+                    if has_cancel_method(d):
                         f.write(cancel_method(d))
 
 class AsyncioWrapperGenerator:
@@ -212,17 +639,16 @@ class AsyncioWrapperGenerator:
         def update_response(d: ApiDefinition, m:Callable):
             if GeneratorUtils.response_is_list(d):
                 return f"""
-            if {request_id(d, m)} in self._req_state:
-                req_state = {current_request_state(d, m)}
-                if req_state.response is None:
-                    req_state.response = []
-                req_state.response.append({response_instance(d, m)})"""
+        req_state = self._req_state.get({request_id(d, m)})
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append({response_instance(d, m)})"""
             else:
                 return f"""
-            if {request_id(d, m)} in self._req_state:
-                req_state = {current_request_state(d, m)}
-                if req_state is not None:
-                    req_state.response = {response_instance(d, m)}"""
+        req_state = self._req_state.get({request_id(d, m)})
+        if req_state is not None:
+            req_state.response = {response_instance(d, m)}"""
 
         def call_response_cb(d: ApiDefinition, m: Callable):
             if d.callback_methods is not None:
@@ -247,21 +673,17 @@ class AsyncioWrapperGenerator:
 
     def {GeneratorUtils.method_declaration(m)}:
         {GeneratorUtils.doc_string(m)}
-        is_subscription: bool = False
-        with self._lock:
-            is_subscription = {request_id(d, m)} in self._subscriptions
-            {update_response(d, m)}
-        if is_subscription:
+        if {request_id(d, m)} in self._subscriptions:
             self.call_streaming_cb({request_id(d,m)}, {streaming_instance(d,m)})
             return
+        {update_response(d, m)}
         {call_response_cb_if_done(d, m)}"""
 
             elif not d.is_subscription:
                 return f"""
     def {GeneratorUtils.method_declaration(m)}:
         {GeneratorUtils.doc_string(m)}
-        with self._lock:
-            {update_response(d, m)}
+        {update_response(d, m)}
         {call_response_cb_if_done(d, m)}"""
             else:
                 return f"""
@@ -278,75 +700,69 @@ class AsyncioWrapperGenerator:
         {call_response_cb(d,d.done_method)}"""
         with open(filename, "w") as f:
             f.write(f"""
+import asyncio
 from ibapi.wrapper import EWrapper
 from ib_tws_server.asyncio.ib_writer import IBWriter
+from ib_tws_server.asyncio.loop_bridge import LoopBridge
+from ib_tws_server.asyncio.request_priority import RequestPriority
 from ib_tws_server.asyncio.request_state import *
 from ib_tws_server.asyncio.subscription_generator import SubscriptionGenerator
 from ib_tws_server.error import *
 from ib_tws_server.gen.client_responses import *
 from ib_tws_server.ib_imports import *
-from threading import Lock
 from typing import Dict, List
 
 class AsyncioWrapper(EWrapper):
-    _lock: Lock
-    _req_state: Dict[str, RequestState]
-    _subscriptions: Dict[int, SubscriptionGenerator]
+    _req_state: Dict[RequestId, RequestState]
+    _subscriptions: Dict[RequestId, SubscriptionGenerator]
     _expecting_disconnect: bool
     _writer: IBWriter
+    _bridges: Dict[asyncio.AbstractEventLoop, LoopBridge]
 
-    def __init__(self, lock: Lock, req_state: Dict[str, RequestState], subscriptions: Dict[int, SubscriptionGenerator]):
-        self._lock = lock
-        self._req_state = req_state
-        self._subscriptions = subscriptions
+    def __init__(self, registry: RequestStateRegistry, delivery_interval: float = 0):
+        self._req_state = registry.requests
+        self._subscriptions = registry.subscriptions
+        self._delivery_interval = delivery_interval
+        self._bridges = dict()
         EWrapper.__init__(self)
         self._expecting_disconnect = False
+        # Called on the reader thread when the connection is lost
+        self._on_disconnect: Callable[[], None] = None
 
     def connectionClosed(self):
-        if self._expecting_disconnect:
-            # Wake up writer
-            self._writer.queue.put(lambda *a, **k: None)
-        else:
-            raise ConnectionError("Unexpected disconnect")
+        self._writer.stop()
+        if not self._expecting_disconnect:
+            if self._on_disconnect is None:
+                raise ConnectionError("Unexpected disconnect")
+            self._on_disconnect()
 
     def call_response_cb(self, id: RequestId, res=None):
-        cb = None
-        with self._lock:
-            if not id in self._req_state:
-                return
-
-            s = self._req_state[id]
-            cb = s.cb
-            if res is None:
-                res = s.response
-            del self._req_state[id]
-
-        if cb is not None:
-            cb(res)
+        s = self._req_state.pop(id, None)
+        if s is None:
+            return
+        if res is None:
+            res = s.response
+        if s.cb is not None:
+            s.cb(res)
 
     def error(self, reqId: int, errorCode: int, errorString: str):
-        cb = None
-        if reqId is not None:
-            with self._lock:
-                if reqId in self._req_state:
-                    s = self._req_state[reqId]
-                    cb = s.cb
-                    del self._req_state[reqId]
-        if cb is not None:
-            cb(IbError(errorString, errorCode))
+        s = self._req_state.pop(reqId, None) if reqId is not None else None
+        if s is not None and s.cb is not None:
+            s.cb(IbError(errorString, errorCode))
         else:
             super().error(reqId, errorCode, errorString)
         
     def call_streaming_cb(self, id: RequestId, res: any):
-        cb = None
-        loop = None
-        with self._lock:
-            if id in self._subscriptions:
-                s = self._subscriptions[id]
-                cb = s.add_to_queue
-                loop = s._loop
-        if loop is not None:
-            loop.call_soon_threadsafe(cb, res)
+        s = self._subscriptions.get(id)
+        # Reserving space can block for subscriptions with the BLOCK overflow policy
+        if s is not None and s.reserve():
+            self.loop_bridge(s._loop).call_soon(s.add_to_queue, res)
+
+    def loop_bridge(self, loop: asyncio.AbstractEventLoop) -> LoopBridge:
+        b = self._bridges.get(loop)
+        if b is None:
+            b = self._bridges.setdefault(loop, LoopBridge(loop, self._delivery_interval))
+        return b
 """)
             for d in REQUEST_DEFINITIONS:
                 if d.request_method is not None:
@@ -1,5 +1,4 @@
-from typing import Generator
-from ib_tws_server.util.dict_to_object import dict_to_object
+from typing import Dict, Generator, List, Tuple
 from ib_tws_server.util.type_util import *
 from ib_tws_server.api_definition import *
 from ib_tws_server.codegen.generator_utils import *
@@ -11,10 +10,50 @@ logger = logging.getLogger()
 
 class GraphQLResolverGenerator:
     @staticmethod
-    def generate(filename):
+    def generate(filename, input_types: Dict[str, List[Tuple[str, str]]]):
+        """
+        Generates the resolvers, and a function per input type of the schema that converts the
+        dict of an input value into the python type, from the members returned by
+        GraphQLSchemaGenerator.generate
+        """
         container_re = re.compile("(?:typing\.)?List\[([^\]]+)\]")
         union_types = []
 
+        def converter_name(type_str: str):
+            if type_str not in input_types:
+                raise RuntimeError(f"Could not find input type for {type_str}")
+            return f"convert_{GeneratorUtils.unqualified_type_name(type_str)}Input"
+
+        def member_conversion(type_str: str, value_str: str):
+            m = container_re.match(type_str)
+            if m is not None and m.group(1) in input_types:
+                return f"None if {value_str} is None else [ None if i is None else {converter_name(m.group(1))}(i) for i in {value_str} ]"
+            elif type_str in input_types:
+                return f"None if {value_str} is None else {converter_name(type_str)}({value_str})"
+            return value_str
+
+        def create_object(type_str: str):
+            if type_str not in POLYMORPHIC_TYPES:
+                return f"""
+    o = {type_str}()"""
+            # The subclass is created by the factory from the type member
+            type_member,factory = POLYMORPHIC_TYPES[type_str]
+            return f"""
+    o = {factory}(d['{type_member}'])
+    if o is None:
+        raise GraphQLError(f"Unknown {type_member} {{d['{type_member}']}} of {GeneratorUtils.graphql_public_name(GeneratorUtils.unqualified_type_name(type_str))}Input")"""
+
+        def input_converter(type_str: str, members: List[Tuple[str, str]]):
+            # Inputs only have the members given by the client, the others keep the default of the object
+            type_member = POLYMORPHIC_TYPES[type_str][0] if type_str in POLYMORPHIC_TYPES else None
+            converted = "".join([ f"""
+    if '{n}' in d:
+        o.{n} = {member_conversion(t, f"d['{n}']")}""" for n,t in members if n != type_member ])
+            return f"""
+def {converter_name(type_str)}(d: dict) -> '{type_str}':{create_object(type_str)}{converted}
+    return o
+"""
+
         def transform_param_if_needed(type_str: str, value_str: str):
             if is_builtin_type_str(type_str):
                 return ""
@@ -23,13 +62,10 @@ class GraphQLResolverGenerator:
             if (m is not None):
                 item_type_str = m.group(1)
                 return f"""
-    {value_str} = [  dict_to_object(val, {item_type_str}) for val in {value_str} ]"""
+    {value_str} = [ {converter_name(item_type_str)}(val) for val in {value_str} ]"""
 
-            cls = find_sym_from_full_name_or_module(type_str, ibapi)
-            if cls is None:
-                raise RuntimeError(f"Could not find symbol for {type_str}")
             return f"""
-    {value_str} = dict_to_object({value_str}, {type_str})"""
+    {value_str} = {converter_name(type_str)}({value_str})"""
 
         def query_resolver(d: ApiDefinition):
             query_name = d.request_method.__name__
@@ -40,12 +76,16 @@ class GraphQLResolverGenerator:
             query_resolver_params.insert(1, 'info')
             forwarded_params = [ p.name for p in params ]
             transformed_params = "".join([transform_param_if_needed(p.annotation, p.name) for p in params])
+            request = ','.join([ f"'{query_name}'" ] + forwarded_params)
+            load = f"request_loader(info, g_client).load({request})"
+            if d.cache_stale_ttl is not None:
+                load = f"g_field_cache.load(({request},), lambda: {load})"
 
             return f"""
 @query.field("{public_query_name}")
 async def resolve_{public_query_name}({','.join(query_resolver_params)}):
     {transformed_params}
-    return await g_client.{query_name}({','.join(forwarded_params)})"""
+    return await {load}"""
 
         def subscription_source_and_resolver(d: ApiDefinition):
             sub_name = d.request_method.__name__
@@ -58,12 +98,19 @@ async def resolve_{public_query_name}({','.join(query_resolver_params)}):
             decl_params_str = ','.join(decl_params)
             forwarded_params = [ p.name for p in params ]
             transformed_params = "".join([transform_param_if_needed(p.annotation, p.name) for p in params])
+            subscribe = f"g_client.{api_sub_name}({','.join(forwarded_params)})"
+            # Websocket subscribers with equal arguments share one subscription of the client. Market
+            # depth isn't shared since its updates are relative to the rows received before
+            if d.shareable and d.order_book_rows_param is None:
+                request = ','.join([ f"'{api_sub_name}'" ] + forwarded_params)
+                replay_key = ", tick_type_key" if d.quotes else ""
+                subscribe = f"g_subscriptions.subscribe(({request}), lambda: {subscribe}{replay_key})"
 
             return f"""
 @subscription.source("{public_sub_name}")
 async def source_{public_sub_name}({decl_params_str}) -> AsyncGenerator:
     {transformed_params}
-    return await g_client.{api_sub_name}({','.join(forwarded_params)})
+    return await {subscribe}
 
 @subscription.field("{public_sub_name}")
 async def resolve_{public_sub_name}({decl_params_str}):
@@ -97,13 +144,18 @@ def resolve_{union_type}(obj, *_):"""
         with open(filename, "w") as f:
             f.write("""
 from ariadne import QueryType, SubscriptionType, UnionType
-from ib_tws_server.util.dict_to_object import *
+from graphql import GraphQLError
 from ib_tws_server.gen.asyncio_client import AsyncioClient
 from ib_tws_server.gen.client_responses import *
+from ib_tws_server.graphql.field_cache import FieldCache
+from ib_tws_server.graphql.request_loader import request_loader
+from ib_tws_server.graphql.subscription_registry import SubscriptionRegistry, tick_type_key
 from ib_tws_server.ib_imports import *
 from typing import AsyncGenerator
 
 g_client: AsyncioClient = None
+g_subscriptions = SubscriptionRegistry()
+g_field_cache = FieldCache()
 query = QueryType()
 subscription = SubscriptionType()
 
@@ -111,6 +163,8 @@ def graphql_resolver_set_client(client: AsyncioClient):
     global g_client
     g_client = client
 """)
+            for type_str,members in input_types.items():
+                f.write(input_converter(type_str, members))
             for d in REQUEST_DEFINITIONS:
                 if d.request_method is not None and d.callback_methods is not None:
                     if not d.is_subscription:
@@ -1,4 +1,4 @@
-from typing import Generator
+from typing import Dict, Generator, List, Tuple
 from ib_tws_server.api_definition import *
 from ib_tws_server.codegen.generator_utils import *
 from ib_tws_server.ib_imports import *
@@ -10,9 +10,23 @@ import re
 
 logger = logging.getLogger()
 
+class SchemaTypeMembers:
+    """
+    Members of the object and input types of the schema and their python types, by the python type
+    """
+    object_types: Dict[str, List[Tuple[str, str]]]
+    input_types: Dict[str, List[Tuple[str, str]]]
+
+    def __init__(self):
+        self.object_types = {}
+        self.input_types = {}
+
 class GraphQLSchemaGenerator:
     @staticmethod
-    def generate(filename):
+    def generate(filename) -> SchemaTypeMembers:
+        """
+        Writes the schema and returns the members of its types
+        """
         builtin_type_mappings = {
             'str': 'String',
             'bool': 'Boolean',
@@ -26,12 +40,10 @@ class GraphQLSchemaGenerator:
         scalars: Set[str] = set()
         enums: Set[str] = set()
         union_types: Set[str] = set()
+        type_members = SchemaTypeMembers()
         container_re = re.compile("(?:typing\.)?(Set|List)\[([^\]]+)\]")
         dict_re = re.compile("(?:typing\.)?Dict\[[\s]*([a-zA-Z\.]+)[\s]*,[\s]*([a-zA-Z\.]+)\]")
 
-        # TODO: revisit
-        enums.add('ibapi.order_condition.OrderCondition')
-
         def graphql_custom_type_name(s:str, is_input: bool):
             return GeneratorUtils.graphql_public_name(f"{GeneratorUtils.unqualified_type_name(s)}{'Input' if is_input else ''}")
 
@@ -107,16 +119,30 @@ class GraphQLSchemaGenerator:
                 else:
                     raise RuntimeError(f"Could not determine type for {t}")
 
-        def object_member_type(obj:object, member_name: str, val: any, is_input: bool):
+        def object_member_python_type(obj:object, member_name: str, val: any):
             if obj.__class__.__name__ in OVERRIDDEN_MEMBER_TYPE_HINTS :
                 hints = OVERRIDDEN_MEMBER_TYPE_HINTS[obj.__class__.__name__]
                 if member_name in hints:
-                    return graphql_type(hints[member_name], is_input)
+                    return hints[member_name]
             if val is not None:
-                return graphql_type(full_class_name(type(val)), is_input)
+                return full_class_name(type(val))
             else:
                 raise RuntimeError(f"Could not determine type {obj.__class__.__name__} for member {member_name}")
 
+        def polymorphic_type_members(cls: type) -> List[Tuple[str, str]]:
+            # The members of every subclass, typed by the hints of the base class
+            hints = OVERRIDDEN_MEMBER_TYPE_HINTS[cls.__name__]
+            names = {}
+            subclasses = list(cls.__subclasses__())
+            while len(subclasses) > 0:
+                c = subclasses.pop(0)
+                subclasses += c.__subclasses__()
+                names.update(dict.fromkeys(vars(c())))
+            missing = [ n for n in names if n not in hints ]
+            if len(missing) > 0:
+                raise RuntimeError(f"Missing type hints for {missing} of {cls.__name__}")
+            return [ (n, hints[n]) for n in names ]
+
         def generate_global_type(type_name: str, is_input: bool):
             if check_if_processed(type_name, is_input) or type_name in enums:
                 return ""
@@ -129,15 +155,22 @@ class GraphQLSchemaGenerator:
                 raise RuntimeError(f"Could not find symbol for {type_name}")
             cls_dict = cls.__dict__
             processed_types[public_name] = type_name
-            if ('__annotations__' in cls_dict):
-                members = [ (k,graphql_type(v)) for k,v in cls_dict['__annotations__']  ]
+            if type_name in POLYMORPHIC_TYPES:
+                python_members = polymorphic_type_members(cls)
+            elif ('__annotations__' in cls_dict):
+                python_members = list(cls_dict['__annotations__'].items())
             else:
                 obj = cls()
-                members = [ (n, object_member_type(obj, n, t, is_input)) for n,t in inspect.getmembers(obj) if not n.startswith("__")  ]
+                python_members = [ (n, object_member_python_type(obj, n, t)) for n,t in inspect.getmembers(obj) if not n.startswith("__")  ]
+            members = [ (n, graphql_type(t, is_input)) for n,t in python_members ]
             for m,t in members:
                 if t is None:
                     add_scalar(GeneratorUtils.graphql_public_name(cls.__name__), f"Could not find type for member '{m}'' for class '{cls.__name__}'", True)
                     return ""
+            if is_input:
+                type_members.input_types[type_name] = python_members
+            else:
+                type_members.object_types[type_name] = python_members
 
             if type_name in REQUIRED_FIELDS:
                 required_fields = REQUIRED_FIELDS[type_name]
@@ -154,8 +187,8 @@ class GraphQLSchemaGenerator:
             return code
 
         def generate_callback_type(d: ApiDefinition, m: Callable):
-            type_name,is_wrapper = GeneratorUtils.callback_type(d, m)
-            type_name = GeneratorUtils.graphql_public_name(type_name)
+            python_type_name,is_wrapper = GeneratorUtils.callback_type(d, m)
+            type_name = GeneratorUtils.graphql_public_name(python_type_name)
 
             if not is_wrapper:
                 return ""
@@ -175,6 +208,7 @@ class GraphQLSchemaGenerator:
                     return ""
 
             processed_types[type_name] = type_name
+            type_members.object_types[python_type_name] = [ (p.name, p.annotation) for p in params ]
             code = f"""
 
 type {type_name} {{"""
@@ -274,4 +308,5 @@ schema {
     query: Query
     subscription: Subscription
 }
-""")
\ No newline at end of file
+""")
+        return type_members
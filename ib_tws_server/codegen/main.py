@@ -10,12 +10,13 @@ import sys
 
 logging.basicConfig(stream=sys.stdout, level=logging.ERROR)
 
-def generate(output_dir: str):
+def generate(output_dir: str, response_class_style: ResponseClassStyle = ResponseClassStyle.DATACLASS):
     response_class_fname = os.path.join(output_dir, "client_responses.py")
     asyncio_client_fname = os.path.join(output_dir, "asyncio_client.py")
     asyncio_wrapper_fname = os.path.join(output_dir, "asyncio_wrapper.py")
     graphql_schema_fname = os.path.join(output_dir, "schema.graphql")
     graphql_resolver_fname = os.path.join(output_dir, "graphql_resolver.py")
+    serializers_fname = os.path.join(output_dir, "serializers.py")
 
     shutil.rmtree(output_dir, ignore_errors=True)
     os.mkdir(output_dir)
@@ -23,14 +24,16 @@ def generate(output_dir: str):
     print(f"Generating code for TWS API Version {ibapi.get_version_string()}")
 
     d = ApiDefinition.verify()
-    ResponseTypesGenerator.generate(response_class_fname)
+    ResponseTypesGenerator.generate(response_class_fname, response_class_style)
     AsyncioClientGenerator.generate(asyncio_client_fname)
     AsyncioWrapperGenerator.generate(asyncio_wrapper_fname)
-    GraphQLSchemaGenerator.generate(graphql_schema_fname)
-    GraphQLResolverGenerator.generate(graphql_resolver_fname)
+    type_members = GraphQLSchemaGenerator.generate(graphql_schema_fname)
+    GraphQLResolverGenerator.generate(graphql_resolver_fname, type_members.input_types)
+    SerializerGenerator.generate(serializers_fname, type_members.object_types, response_class_style)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Generate wrapper classes from the request definitions")
     parser.add_argument('--output-dir', '-o', dest="output_dir", required=True, help='The output directory')
+    parser.add_argument('--response-classes', dest="response_classes", choices=[ s.value for s in ResponseClassStyle ], default=ResponseClassStyle.DATACLASS.value, help='The style of the generated response classes')
     args  = parser.parse_args()
-    generate(args.output_dir)
+    generate(args.output_dir, ResponseClassStyle(args.response_classes))
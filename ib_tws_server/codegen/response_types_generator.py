@@ -1,3 +1,4 @@
+from enum import Enum
 from inspect import Parameter
 from ib_tws_server.api_definition import *
 from ib_tws_server.codegen.generator_utils import *
@@ -5,26 +6,59 @@ from ib_tws_server.util.type_util import *
 import os
 from typing import List
 
+class ResponseClassStyle(str, Enum):
+    """
+    DATACLASS: Frozen dataclasses with an instance __dict__
+    TUPLE: Immutable tuple subclasses with no instance __dict__, which are faster to
+        construct and smaller for high rate callbacks like TickPrice and UpdateMktDepth.
+        Members are read only properties and can also be passed positionally
+    """
+    DATACLASS = "dataclass"
+    TUPLE = "tuple"
+
 class ResponseTypesGenerator:
     @staticmethod
-    def generate(filename):
+    def generate(filename, style: ResponseClassStyle = ResponseClassStyle.DATACLASS):
         def default_params(params: List[Parameter]):
             return ", ".join([f"{p}= None" for p in params])
 
         def init_members(params: List[Parameter]):
             return "        ".join([f"object.__setattr__(self, '{p.name}', {p.name}){os.linesep}" for p in params])
 
-        def callback_class(d: ApiDefinition, u: Callable):
-            params = GeneratorUtils.data_class_members(d, [u], False)
-            cb_type,cb_type_is_wrapper = GeneratorUtils.callback_type(d, u)
-            if not cb_type_is_wrapper:
-                return ""
+        def dataclass_body(cb_type: str, params: List[Parameter]):
             ret = f"""
 @dataclass(frozen=True)
 class { cb_type }:
     def __init__(self, {default_params(params)}):
         {init_members(params)}"""
             ret += os.linesep.join([f"    {p}" for p in params])
+            return ret
+
+        def tuple_body(cb_type: str, params: List[Parameter]):
+            names = [ p.name for p in params ]
+            fields = "".join([ f"'{n}', " for n in names ])
+            values = "".join([ f"{n}, " for n in names ])
+            ret = f"""
+class { cb_type }(TupleResponse):
+    __slots__ = ()
+    _fields = ({fields})
+
+    def __new__(cls, {default_params(params)}):
+        return _tuple_new(cls, ({values}))
+
+"""
+            ret += os.linesep.join([f"    {p} = property(_itemgetter({i}))" for i,p in enumerate(params)])
+            return ret
+
+        def callback_class(d: ApiDefinition, u: Callable):
+            params = GeneratorUtils.data_class_members(d, [u], False)
+            cb_type,cb_type_is_wrapper = GeneratorUtils.callback_type(d, u)
+            if not cb_type_is_wrapper:
+                return ""
+            if style == ResponseClassStyle.TUPLE:
+                ret = tuple_body(cb_type, params)
+            else:
+                ret = dataclass_body(cb_type, params)
             ret += os.linesep
             return ret
 
@@ -33,8 +67,14 @@ class { cb_type }:
 from dataclasses import dataclass
 from ib_tws_server.ib_imports import *
 from typing import Dict, List, Union
+""")
+            if style == ResponseClassStyle.TUPLE:
+                f.write("""from ib_tws_server.util.tuple_response import TupleResponse
+from operator import itemgetter as _itemgetter
 
+_tuple_new = tuple.__new__
 """)
+            f.write(os.linesep)
 
             for d in REQUEST_DEFINITIONS:
                 if d.request_method is None or d.callback_methods is None:
@@ -0,0 +1,104 @@
+from ib_tws_server.codegen.generator_utils import *
+from ib_tws_server.codegen.response_types_generator import ResponseClassStyle
+from ib_tws_server.util.type_util import *
+import os
+import re
+from typing import Dict, List, Tuple
+
+class SerializerGenerator:
+    @staticmethod
+    def generate(filename, object_types: Dict[str, List[Tuple[str, str]]], response_class_style: ResponseClassStyle = ResponseClassStyle.DATACLASS):
+        """
+        Generates a function per object type of the GraphQL schema that converts an object into a
+        dict of its members, from the members returned by GraphQLSchemaGenerator.generate.
+
+        Objects with an instance __dict__ are converted from it, which the json module encodes
+        without calling back into python. Only members that may not be JSON values (nested objects,
+        lists, sets) are converted, into a copy of the __dict__, and the __dict__ is
+        returned as is when they are all None or empty. Lists and sets are converted by to_json_value
+        since the types of their items aren't checked. Objects without a __dict__, i.e. tuple
+        response classes, are converted from their field list
+        """
+        container_re = re.compile("(?:typing\.)?(Set|List)\[([^\]]+)\]")
+
+        def serializer_name(type_name: str):
+            return f"serialize_{GeneratorUtils.unqualified_type_name(type_name)}"
+
+        def member_value(member: str, type_str: str):
+            val = f"o.{member}"
+            if is_builtin_type_str(type_str):
+                return val
+            m = container_re.match(type_str)
+            if m is not None:
+                container,item_type = m.groups()
+                if is_builtin_type_str(item_type):
+                    # The items can be objects regardless of the hint, e.g. ContractDetails.secIdList holds TagValues
+                    return f"to_json_value({val})"
+                if item_type in object_types:
+                    return f"None if {val} is None else [ {serializer_name(item_type)}(v) for v in {val} ]"
+            elif type_str in object_types:
+                return f"None if {val} is None else {serializer_name(type_str)}({val})"
+            # Enums, scalars and members of unknown type
+            return f"to_json_value({val})"
+
+        def is_json_value_check(member: str, type_str: str):
+            # Empty sets aren't JSON values, empty lists are
+            val = f"o.{member}"
+            m = container_re.match(type_str)
+            if m is not None and m.group(1) == 'List':
+                return f"not {val}"
+            return f"{val} is None"
+
+        def has_instance_dict(type_name: str):
+            # ibapi classes and dataclass response classes
+            return '.' in type_name or response_class_style == ResponseClassStyle.DATACLASS
+
+        def serializer(type_name: str, members: List[Tuple[str, str]]):
+            if has_instance_dict(type_name):
+                converted = [ (n, member_value(n, t)) for n,t in members if member_value(n, t) != f"o.{n}" ]
+                if len(converted) == 0:
+                    body = "o.__dict__"
+                else:
+                    checks = " and ".join([ is_json_value_check(n, t) for n,t in members if member_value(n, t) != f"o.{n}" ])
+                    body = f"""o.__dict__ if {checks} else {{ **o.__dict__,""" + "".join([ f"""
+        '{n}': {v},""" for n,v in converted ]) + """
+    }"""
+            else:
+                body = "{" + "".join([ f"""
+        '{n}': {member_value(n, t)},""" for n,t in members ]) + """
+    }"""
+            return f"""
+def {serializer_name(type_name)}(o: '{type_name}') -> dict:
+    return {body}
+"""
+
+        with open(filename, "w") as f:
+            f.write("""
+from ib_tws_server.gen.client_responses import *
+from ib_tws_server.ib_imports import *
+from ib_tws_server.util.object_to_json import to_json_value
+from typing import Callable, Dict, Tuple
+
+# Serializers return the __dict__ of objects whose members are all JSON values instead of a copy,
+# so their results must be treated as read only
+""")
+            for type_name,members in object_types.items():
+                f.write(serializer(type_name, members))
+
+            f.write(f"""
+# Members of the object types of the GraphQL schema by class
+FIELDS: Dict[type, Tuple[str, ...]] = {{""")
+            for type_name,members in object_types.items():
+                f.write(f"""
+    {type_name}: ({"".join([ f"'{n}', " for n,_ in members ])}),""")
+            f.write(f"""
+}}
+
+# Serializers of the object types by class, used by ib_tws_server.util.object_to_json
+SERIALIZERS: Dict[type, Callable[[object], dict]] = {{""")
+            for type_name in object_types:
+                f.write(f"""
+    {type_name}: {serializer_name(type_name)},""")
+            f.write("""
+}
+""")
@@ -1,3 +1,5 @@
+import asyncio
+
 class IbError(Exception):
     reason: str
     code: int
@@ -10,3 +12,24 @@ class IbError(Exception):
 class ConnectionError(RuntimeError):
     def __init__(self, e: str):
         super().__init__(e)
+
+class RequestTimeoutError(asyncio.TimeoutError):
+    """
+    Raised when TWS doesn't respond to a request before its deadline
+    """
+    request: str
+    timeout: float
+
+    def __init__(self, request: str, timeout: float):
+        self.request = request
+        self.timeout = timeout
+        super().__init__(f"{request} timed out after {timeout} seconds")
+
+class ConnectionLostError(IbError):
+    """
+    Raised by queries that were in flight when the connection to TWS was lost
+    """
+    NOT_CONNECTED = 504
+
+    def __init__(self):
+        super().__init__("Not connected", ConnectionLostError.NOT_CONNECTED)
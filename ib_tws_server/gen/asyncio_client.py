@@ -0,0 +1,2038 @@
+
+import asyncio
+import functools
+from ibapi.client import EClient
+from ib_tws_server.asyncio.backoff import ExponentialBackoff
+from ib_tws_server.asyncio.historical_pacing import HistoricalPacingGovernor
+from ib_tws_server.asyncio.ib_writer import IBWriter, QueuedRequest
+from ib_tws_server.asyncio.order_book_subscription import OrderBookSubscription
+from ib_tws_server.asyncio.quote_store import QuoteState, QuoteStore, QuoteSubscription
+from ib_tws_server.asyncio.rate_limiter import RateLimiter
+from ib_tws_server.asyncio.request_coalescer import RequestCoalescer
+from ib_tws_server.asyncio.request_priority import RequestPriority
+from ib_tws_server.asyncio.request_state import *
+from ib_tws_server.asyncio.response_cache import ResponseCache
+from ib_tws_server.asyncio.response_stream import ResponseStream
+from ib_tws_server.asyncio.subscription_generator import SubscriptionGenerator, SubscriptionQueueOptions
+from ib_tws_server.asyncio.subscription_multiplexer import SubscriptionMultiplexer
+from ib_tws_server.error import *
+from ib_tws_server.gen.client_responses import *
+from ib_tws_server.gen.asyncio_wrapper import *
+from ib_tws_server.ib_imports import *
+from ib_tws_server.util.historical_columns import HistoricalBarColumns, HistoricalTickColumns
+import logging
+from threading import Thread
+import time
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class AsyncioClient():
+    _registry: RequestStateRegistry
+    _req_state: Dict[RequestId, RequestState]
+    _subscriptions: Dict[RequestId, SubscriptionGenerator]
+    _wrapper: AsyncioWrapper
+    _client: EClient
+
+    def __init__(self, rate_limiter: RateLimiter = None, historical_pacing: HistoricalPacingGovernor = None, coalescer: RequestCoalescer = None, response_cache: ResponseCache = None, multiplexer: SubscriptionMultiplexer = None, delivery_interval: float = 0, quote_store: QuoteStore = None):
+        self._registry = RequestStateRegistry()
+        self._req_state = self._registry.requests
+        self._subscriptions = self._registry.subscriptions
+        self._subscription_requests = self._registry.subscription_requests
+        self._queued_requests = self._registry.queued
+
+        # Subscription updates are delivered to the event loop in batches, at most every delivery_interval seconds
+        self._wrapper = AsyncioWrapper(self._registry, delivery_interval)
+        self._client = EClient(self._wrapper)
+        self._writer = IBWriter(self._client, rate_limiter)
+        self._wrapper._writer = self._writer
+        self._historical_pacing = historical_pacing if historical_pacing is not None else HistoricalPacingGovernor()
+        # Coalescing is opt-in since callers share response objects
+        self._coalescer = coalescer
+        self._response_cache = response_cache
+        self._multiplexer = multiplexer
+        self._quote_store = quote_store
+        self._wrapper._on_disconnect = self._connection_lost
+        self._connected = False
+        # (loop, host, port, client_id, backoff) of the connection to restore when it is lost
+        self._reconnect_args = None
+        self._reconnect_task: asyncio.Task = None
+        self._lost_subscriptions: List[RequestId] = []
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._writer.rate_limiter
+
+    @property
+    def historical_pacing(self) -> HistoricalPacingGovernor:
+        return self._historical_pacing
+
+    @property
+    def coalescer(self) -> RequestCoalescer:
+        return self._coalescer
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        return self._response_cache
+
+    @property
+    def multiplexer(self) -> SubscriptionMultiplexer:
+        return self._multiplexer
+
+    @property
+    def quote_store(self) -> QuoteStore:
+        return self._quote_store
+
+    def _quote_state(self, contract: 'ibapi.contract.Contract') -> QuoteState:
+        return self._quote_store.state(contract) if self._quote_store is not None else QuoteState()
+
+    def run(self):
+        self._writer.start()
+        self._client.run()
+
+    def next_request_id(self):
+        return self._registry.next_request_id()
+
+    def disconnect(self, clean=False):
+        self._wrapper._expecting_disconnect = clean
+        self._connected = False
+        self._reconnect_args = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        return self._client.disconnect()
+
+    def is_connected(self) -> bool:
+        return self._client.isConnected()
+
+    def cancel_request(self, id: RequestId) -> bool:
+        """
+        Removes the state of a request or subscription. Returns True if its request was still queued
+        and was withdrawn, so it mustn't be cancelled in TWS: the cancel would overtake the request
+        """
+        s = self._req_state.pop(id, None)
+        self._subscriptions.pop(id, None)
+        self._subscription_requests.pop(id, None)
+        req = self._queued_requests.pop(id, None)
+        if s is not None and s.cb is not None:
+            s.cb(None)
+        return req is not None and req.withdraw()
+
+    async def _acquire_historical_pacing(self, request: Tuple, contract: object, whatToShow: str, timeout: float):
+        """
+        Waits for the historical pacing governor to admit a query. The wait counts towards the
+        query's `timeout`, so it's abandoned when the deadline expires
+        """
+        if timeout is None or timeout <= 0:
+            await self._historical_pacing.acquire(request, contract, whatToShow)
+            return
+        try:
+            await asyncio.wait_for(self._historical_pacing.acquire(request, contract, whatToShow), timeout)
+        except asyncio.TimeoutError:
+            raise RequestTimeoutError(request[0], timeout) from None
+
+    async def _wait_for_response(self, future: asyncio.Future, id: RequestId, request: str, timeout: float, req: QueuedRequest, cancel: Callable[[], None], started: float = None):
+        """
+        Waits for the response of a query until `timeout` seconds after `started`, or after now if it's
+        None. When the deadline expires or the caller is cancelled, the request state is removed and
+        the request is withdrawn if it is still queued, or else `cancel` is sent to TWS if the request
+        can be cancelled, so no state is kept for callers that stopped waiting
+        """
+        try:
+            if timeout is None or timeout <= 0:
+                return await future
+            left = timeout if started is None else started + timeout - asyncio.get_running_loop().time()
+            # Shield the future so a response that arrives while timing out isn't lost
+            return await asyncio.wait_for(asyncio.shield(future), left)
+        except asyncio.TimeoutError:
+            if not self._abandon_request(id, req, cancel):
+                return await future
+            raise RequestTimeoutError(request, timeout) from None
+        except asyncio.CancelledError:
+            self._abandon_request(id, req, cancel)
+            raise
+
+    def _abandon_request(self, id: RequestId, req: QueuedRequest, cancel: Callable[[], None]) -> bool:
+        # The reader thread has completed the request if its state was already removed
+        if self._req_state.pop(id, None) is None:
+            return False
+        # A cancel would overtake a request that is still queued, so TWS would run it anyway
+        if not req.withdraw() and cancel is not None:
+            self._writer.put(cancel, RequestPriority.CANCEL)
+        return True
+
+    def _subscribe(self, id: RequestId, req: Callable[[], None], priority: RequestPriority):
+        self._subscription_requests[id] = (req, priority)
+        self._put_request(id, req, priority)
+
+    def _put_request(self, id: RequestId, req: Callable[[], None], priority: RequestPriority):
+        """
+        Queues the request of a subscription, order or stream, keeping it until it's sent so
+        cancel_request can withdraw it
+        """
+        q = self._queued_requests[id] = QueuedRequest(req, functools.partial(self._request_sent, id))
+        self._writer.put(q, priority)
+
+    def _request_sent(self, id: RequestId, req: QueuedRequest):
+        if self._queued_requests.get(id) is req:
+            self._queued_requests.pop(id, None)
+
+    def _try_connect(self, host: str, port: int, client_id: int) -> bool:
+        self._wrapper._expecting_disconnect = False
+        try:
+            self._client.connect(host, port, client_id)
+        except ConnectionError:
+            return False
+        return self._client.isConnected()
+
+    def _start_threads(self):
+        # A writer thread can only be started once, so every connection gets a new writer for the queue
+        self._writer = self._writer.successor()
+        self._wrapper._writer = self._writer
+        self._connected = True
+        thread = Thread(target = self.run)
+        thread.start()
+        setattr(thread, "_thread", thread)
+
+    def start(self, host: str, port: int, client_id: int, connection_retry_interval: int):
+        """
+        Connects to TWS, blocking the calling thread until connected. connect() doesn't block the
+        event loop and restores the connection when it is lost
+        """
+        while not self._try_connect(host, port, client_id):
+            if connection_retry_interval > 0:
+                time.sleep(connection_retry_interval)
+            else:
+                raise ConnectionError(f"Could not connect to {host}:{port}")
+        self._start_threads()
+
+    async def connect(self, host: str, port: int, client_id: int, backoff: ExponentialBackoff = None, max_attempts: int = 0, reconnect: bool = True):
+        """
+        Connects to TWS, waiting backoff.delay(n) seconds after the nth failed attempt. Raises
+        ConnectionError after max_attempts failed attempts, or retries forever if max_attempts is 0.
+
+        If `reconnect` is set, the connection is restored in the background when it is lost:
+        queries in flight fail with ConnectionLostError, requests made while disconnected are
+        sent once connected and the active subscriptions are re-issued
+        """
+        backoff = backoff if backoff is not None else ExponentialBackoff()
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        # EClient.connect blocks on the socket and the handshake, so it runs in an executor
+        while not await loop.run_in_executor(None, self._try_connect, host, port, client_id):
+            attempt += 1
+            if max_attempts > 0 and attempt >= max_attempts:
+                raise ConnectionError(f"Could not connect to {host}:{port} after {attempt} attempts")
+            await asyncio.sleep(backoff.delay(attempt))
+        self._reconnect_args = (loop, host, port, client_id, backoff) if reconnect else None
+        self._start_threads()
+        # Subscriptions made while disconnected are still queued, only the ones of the lost connection are re-issued
+        lost = self._lost_subscriptions
+        self._lost_subscriptions = []
+        for id in lost:
+            r = self._subscription_requests.get(id)
+            if r is not None:
+                if isinstance(self._subscriptions.get(id), OrderBookSubscription):
+                    self._subscriptions[id].reset()
+                self._put_request(id, *r)
+
+    def _connection_lost(self):
+        """
+        Called on the reader thread when the connection is closed without calling disconnect
+        """
+        if not self._connected:
+            # A failed connection attempt
+            return
+        self._connected = False
+        # Drop the messages queued for the lost connection. Subscriptions are re-issued and the queries
+        # are failed below. Orders are never sent on a later connection, since TWS may have received them,
+        # but order cancels are kept for it since the orders stay live in TWS
+        for priority,req in self._writer.clear():
+            if not isinstance(req, functools.partial):
+                continue
+            if req.func.__name__ in ('cancelOrder', 'reqGlobalCancel'):
+                self._writer.put(req, priority)
+            elif req.func.__name__ in ('exerciseOptions',):
+                logger.error(f"Dropped {req.func.__name__} {req.args[0]} queued when the connection was lost")
+        self._lost_subscriptions = list(self._subscription_requests)
+        error = ConnectionLostError()
+        # The requests that weren't sent. The subscriptions of the orders among them end with the error
+        for id,req in list(self._queued_requests.items()):
+            self._queued_requests.pop(id, None)
+            s = self._subscriptions.get(id)
+            if s is None or id in self._subscription_requests:
+                continue
+            self._subscriptions.pop(id, None)
+            logger.error(f"Dropped {id[0]} {id[1]} queued when the connection was lost")
+            self._wrapper.loop_bridge(s._loop).call_soon(s.abort, error)
+        for id in list(self._req_state):
+            s = self._req_state.pop(id, None)
+            if s is not None and s.cb is not None:
+                s.cb(error)
+        if self._reconnect_args is not None:
+            loop = self._reconnect_args[0]
+            loop.call_soon_threadsafe(self._schedule_reconnect)
+
+    def _schedule_reconnect(self):
+        if self._reconnect_args is None or self._reconnect_task is not None:
+            return
+        loop, host, port, client_id, backoff = self._reconnect_args
+        self._reconnect_task = loop.create_task(self._reconnect(host, port, client_id, backoff))
+
+    async def _reconnect(self, host: str, port: int, client_id: int, backoff: ExponentialBackoff):
+        try:
+            # The lost connection counts as the first failed attempt
+            await asyncio.sleep(backoff.delay(1))
+            await self.connect(host, port, client_id, backoff)
+        finally:
+            self._reconnect_task = None
+
+    def active_request_count(self):
+        return len(self._req_state)
+
+    def active_subscription_count(self):
+        return len(self._subscriptions)
+
+    def queued_message_count(self):
+        return self._writer.queue.qsize()
+
+
+    async def queryDisplayGroups(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """API requests used to integrate with TWS color-grouped windows (display groups).
+        TWS color-grouped windows are identified by an integer number. Currently that number ranges from 1 to 7 and are mapped to specific colors, as indicated in TWS.
+
+        reqId:int - The unique number that will be associated with the
+            response """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: str):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.queryDisplayGroups,reqId))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'queryDisplayGroups', timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def exerciseOptions(self, contract: 'ibapi.contract.Contract', exerciseAction: 'int', exerciseQuantity: 'int', account: 'str', override: 'int', *, priority: 'RequestPriority' = None) -> 'None':
+        """reqId:TickerId - The ticker id. multipleust be a unique value.
+        contract:Contract - This structure contains a description of the
+            contract to be exercised
+        exerciseAction:int - Specifies whether you want the option to lapse
+            or be exercised.
+            Values are 1 = exercise, 2 = lapse.
+        exerciseQuantity:int - The quantity you want to exercise.
+        account:str - destination account
+        override:int - Specifies whether your setting will override the system's
+            natural action. For example, if your action is "exercise" and the
+            option is not in-the-money, by natural action the option would not
+            exercise. If you have override set to "yes" the natural action would
+             be overridden and the out-of-the money option would be exercised.
+            Values are: 0 = no, 1 = yes."""
+        if not self._connected:
+            raise ConnectionLostError()
+        reqId = self.next_request_id()
+        self._writer.put(functools.partial(self._client.exerciseOptions,reqId,contract,exerciseAction,exerciseQuantity,account,override), RequestPriority.ORDER if priority is None else priority)
+        return None
+
+    async def calculateImpliedVolatility(self, contract: 'ibapi.contract.Contract', optionPrice: 'float', underPrice: 'float', implVolOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call this function to calculate volatility for a supplied
+        option price and underlying price. Result will be delivered
+        via EWrapper.tickOptionComputation()
+
+        reqId:TickerId -  The request id.
+        contract:Contract -  Describes the contract.
+        optionPrice:double - The price of the option.
+        underPrice:double - Price of the underlying."""
+        
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = SubscriptionGenerator(self.__cancelCalculateImpliedVolatility, reqId, queue_options)
+        self._subscribe(reqId, functools.partial(self._client.calculateImpliedVolatility,reqId,contract,optionPrice,underPrice,implVolOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    def __cancelCalculateImpliedVolatility(self, reqId: 'int'):
+        """Call this function to cancel a request to calculate
+        volatility for a supplied option price and underlying price.
+
+        reqId:TickerId - The request ID.  """
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelCalculateImpliedVolatility,reqId), RequestPriority.CANCEL)
+
+    async def calculateOptionPrice(self, contract: 'ibapi.contract.Contract', volatility: 'float', underPrice: 'float', optPrcOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call this function to calculate option price and greek values
+        for a supplied volatility and underlying price.
+
+        reqId:TickerId -    The ticker ID.
+        contract:Contract - Describes the contract.
+        volatility:double - The volatility.
+        underPrice:double - Price of the underlying."""
+        
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = SubscriptionGenerator(self.__cancelCalculateOptionPrice, reqId, queue_options)
+        self._subscribe(reqId, functools.partial(self._client.calculateOptionPrice,reqId,contract,volatility,underPrice,optPrcOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    def __cancelCalculateOptionPrice(self, reqId: 'int'):
+        """Call this function to cancel a request to calculate the option
+        price and greek values for a supplied volatility and underlying price.
+
+        reqId:TickerId - The request ID.  """
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelCalculateOptionPrice,reqId), RequestPriority.CANCEL)
+
+    async def reqAccountSummary(self, groupName: 'str', tags: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[AccountSummary]':
+        """Call this method to request and keep up to date the data that appears
+        on the TWS Account Window Summary tab. The data is returned by
+        accountSummary().
+
+        Note:   This request is designed for an FA managed account but can be
+        used for any multi-account structure.
+
+        reqId:int - The ID of the data request. Ensures that responses are matched
+            to requests If several requests are in process.
+        groupName:str - Set to All to returnrn account summary data for all
+            accounts, or set to a specific Advisor Account Group name that has
+            already been created in TWS Global Configuration.
+        tags:str - A comma-separated list of account tags.  Available tags are:
+            accountountType
+            NetLiquidation,
+            TotalCashValue - Total cash including futures pnl
+            SettledCash - For cash accounts, this is the same as
+            TotalCashValue
+            AccruedCash - Net accrued interest
+            BuyingPower - The maximum amount of marginable US stocks the
+                account can buy
+            EquityWithLoanValue - Cash + stocks + bonds + mutual funds
+            PreviousDayEquityWithLoanValue,
+            GrossPositionValue - The sum of the absolute value of all stock
+                and equity option positions
+            RegTEquity,
+            RegTMargin,
+            SMA - Special Memorandum Account
+            InitMarginReq,
+            MaintMarginReq,
+            AvailableFunds,
+            ExcessLiquidity,
+            Cushion - Excess liquidity as a percentage of net liquidation value
+            FullInitMarginReq,
+            FullMaintMarginReq,
+            FullAvailableFunds,
+            FullExcessLiquidity,
+            LookAheadNextChange - Time when look-ahead values take effect
+            LookAheadInitMarginReq,
+            LookAheadMaintMarginReq,
+            LookAheadAvailableFunds,
+            LookAheadExcessLiquidity,
+            HighestSeverity - A measure of how close the account is to liquidation
+            DayTradesRemaining - The Number of Open/Close trades a user
+                could put on before Pattern Day Trading is detected. A value of "-1"
+                means that the user can put on unlimited day trades.
+            Leverage - GrossPositionValue / NetLiquidation
+            $LEDGER - Single flag to relay all cash balance tags*, only in base
+                currency.
+            $LEDGER:CURRENCY - Single flag to relay all cash balance tags*, only in
+                the specified currency.
+            $LEDGER:ALL - Single flag to relay all cash balance tags* in all
+            currencies."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[AccountSummary]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqAccountSummary,reqId,groupName,tags))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqAccountSummary', timeout, req, functools.partial(self._client.cancelAccountSummary,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqAccountSummaryAsStream(self, groupName: 'str', tags: 'str', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqAccountSummary, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.__cancelAccountSummary,reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqAccountSummary,reqId,groupName,tags), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    def __cancelAccountSummary(self, reqId: 'int'):
+        """Cancels the request for Account Window Summary tab data.
+
+        reqId:int - The ID of the data request being canceled."""
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelAccountSummary,reqId), RequestPriority.CANCEL)
+
+    async def reqAccountUpdatesMulti(self, account: 'str', modelCode: 'str', ledgerAndNLV: 'bool', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[AccountUpdateMulti]':
+        """Requests account updates for account and/or model."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[AccountUpdateMulti]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqAccountUpdatesMulti,reqId,account,modelCode,ledgerAndNLV))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqAccountUpdatesMulti', timeout, req, functools.partial(self._client.cancelAccountUpdatesMulti,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqAccountUpdatesMultiAsStream(self, account: 'str', modelCode: 'str', ledgerAndNLV: 'bool', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqAccountUpdatesMulti, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.__cancelAccountUpdatesMulti,reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqAccountUpdatesMulti,reqId,account,modelCode,ledgerAndNLV), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    def __cancelAccountUpdatesMulti(self, reqId: 'int'):
+        """"""
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelAccountUpdatesMulti,reqId), RequestPriority.CANCEL)
+
+    async def __reqFundamentalData(self, contract: 'ibapi.contract.Contract', reportType: 'str', fundamentalDataOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """Call this function to receive fundamental data for
+        stocks. The appropriate market data subscription must be set up in
+        Account Management before you can receive this data.
+        Fundamental data will be returned at EWrapper.fundamentalData().
+
+        reqFundamentalData() can handle conid specified in the Contract object,
+        but not tradingClass or multiplier. This is because reqFundamentalData()
+        is used only for stocks and stocks do not have a multiplier and
+        trading class.
+
+        reqId:tickerId - The ID of the data request. Ensures that responses are
+             matched to requests if several requests are in process.
+        contract:Contract - This structure contains a description of the
+            contract for which fundamental data is being requested.
+        reportType:str - One of the following XML reports:
+            ReportSnapshot (company overview)
+            ReportsFinSummary (financial summary)
+            ReportRatios (financial ratios)
+            ReportsFinStatements (financial statements)
+            RESC (analyst estimates) """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: str):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqFundamentalData,reqId,contract,reportType,fundamentalDataOptions))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqFundamentalData', 60 if timeout is None else timeout, req, functools.partial(self._client.cancelFundamentalData,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqFundamentalData(self, contract: 'ibapi.contract.Contract', reportType: 'str', fundamentalDataOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """Call this function to receive fundamental data for
+        stocks. The appropriate market data subscription must be set up in
+        Account Management before you can receive this data.
+        Fundamental data will be returned at EWrapper.fundamentalData().
+
+        reqFundamentalData() can handle conid specified in the Contract object,
+        but not tradingClass or multiplier. This is because reqFundamentalData()
+        is used only for stocks and stocks do not have a multiplier and
+        trading class.
+
+        reqId:tickerId - The ID of the data request. Ensures that responses are
+             matched to requests if several requests are in process.
+        contract:Contract - This structure contains a description of the
+            contract for which fundamental data is being requested.
+        reportType:str - One of the following XML reports:
+            ReportSnapshot (company overview)
+            ReportsFinSummary (financial summary)
+            ReportRatios (financial ratios)
+            ReportsFinStatements (financial statements)
+            RESC (analyst estimates) """
+        request = ('reqFundamentalData',contract,reportType,fundamentalDataOptions)
+        send = lambda: self.__reqFundamentalData(contract,reportType,fundamentalDataOptions,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqFundamentalData(contract,reportType,fundamentalDataOptions,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        return await send()
+
+    async def __reqHeadTimeStamp(self, contract: 'ibapi.contract.Contract', whatToShow: 'str', useRTH: 'int', formatDate: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await self._acquire_historical_pacing(('reqHeadTimeStamp',contract,whatToShow,useRTH,formatDate), contract, whatToShow, 600 if timeout is None else timeout)
+        future = loop.create_future()
+        def cb(res: str):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqHeadTimeStamp,reqId,contract,whatToShow,useRTH,formatDate))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqHeadTimeStamp', 600 if timeout is None else timeout, req, functools.partial(self._client.cancelHeadTimeStamp,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqHeadTimeStamp(self, contract: 'ibapi.contract.Contract', whatToShow: 'str', useRTH: 'int', formatDate: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """"""
+        request = ('reqHeadTimeStamp',contract,whatToShow,useRTH,formatDate)
+        send = lambda: self.__reqHeadTimeStamp(contract,whatToShow,useRTH,formatDate,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqHeadTimeStamp(contract,whatToShow,useRTH,formatDate,priority=priority, timeout=0), 600 if timeout is None else timeout)
+        return await send()
+
+    async def __reqHistogramData(self, contract: 'ibapi.contract.Contract', useRTH: 'bool', timePeriod: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'ibapi.common.HistogramData':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: ibapi.common.HistogramData):
+            loop.call_soon_threadsafe(future.set_result, res)
+        tickerId = self.next_request_id()
+        self._req_state[tickerId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqHistogramData,tickerId,contract,useRTH,timePeriod))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, tickerId, 'reqHistogramData', 60 if timeout is None else timeout, req, functools.partial(self._client.cancelHistogramData,tickerId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqHistogramData(self, contract: 'ibapi.contract.Contract', useRTH: 'bool', timePeriod: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'ibapi.common.HistogramData':
+        """"""
+        request = ('reqHistogramData',contract,useRTH,timePeriod)
+        send = lambda: self.__reqHistogramData(contract,useRTH,timePeriod,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqHistogramData(contract,useRTH,timePeriod,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        return await send()
+
+    async def __reqHistoricalData(self, contract: 'ibapi.contract.Contract', endDateTime: 'str', durationStr: 'str', barSizeSetting: 'str', whatToShow: 'str', useRTH: 'int', formatDate: 'int', chartOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.common.BarData]':
+        """Requests contracts' historical data. When requesting historical data, a
+        finishing time and date is required along with a duration string. The
+        resulting bars will be returned in EWrapper.historicalData()
+
+        reqId:TickerId - The id of the request. Must be a unique value. When the
+            market data returns, it whatToShowill be identified by this tag. This is also
+            used when canceling the market data.
+        contract:Contract - This object contains a description of the contract for which
+            market data is being requested.
+        endDateTime:str - Defines a query end date and time at any point during the past 6 mos.
+            Valid values include any date/time within the past six months in the format:
+            yyyymmdd HH:mm:ss ttt
+
+            where "ttt" is the optional time zone.
+        durationStr:str - Set the query duration up to one week, using a time unit
+            of seconds, days or weeks. Valid values include any integer followed by a space
+            and then S (seconds), D (days) or W (week). If no unit is specified, seconds is used.
+        barSizeSetting:str - Specifies the size of the bars that will be returned (within IB/TWS listimits).
+            Valid values include:
+            1 sec
+            5 secs
+            15 secs
+            30 secs
+            1 min
+            2 mins
+            3 mins
+            5 mins
+            15 mins
+            30 mins
+            1 hour
+            1 day
+        whatToShow:str - Determines the nature of data beinging extracted. Valid values include:
+
+            TRADES
+            MIDPOINT
+            BID
+            ASK
+            BID_ASK
+            HISTORICAL_VOLATILITY
+            OPTION_IMPLIED_VOLATILITY
+        useRTH:int - Determines whether to return all data available during the requested time span,
+            or only data that falls within regular trading hours. Valid values include:
+
+            0 - all data is returned even where the market in question was outside of its
+            regular trading hours.
+            1 - only data within the regular trading hours is returned, even if the
+            requested time span falls partially or completely outside of the RTH.
+        formatDate: int - Determines the date format applied to returned bars. validd values include:
+
+            1 - dates applying to bars returned in the format: yyyymmdd{space}{space}hh:mm:dd
+            2 - dates are returned as a long integer specifying the number of seconds since
+                1/1/1970 GMT.
+        chartOptions:TagValueList - For internal use only. Use default value XYZ. """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await self._acquire_historical_pacing(('reqHistoricalData',contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions), contract, whatToShow, 600 if timeout is None else timeout)
+        future = loop.create_future()
+        def cb(res: List[ibapi.common.BarData]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqHistoricalData,reqId,contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,False,chartOptions))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqHistoricalData', 600 if timeout is None else timeout, req, functools.partial(self._client.cancelHistoricalData,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqHistoricalData(self, contract: 'ibapi.contract.Contract', endDateTime: 'str', durationStr: 'str', barSizeSetting: 'str', whatToShow: 'str', useRTH: 'int', formatDate: 'int', chartOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.common.BarData]':
+        """Requests contracts' historical data. When requesting historical data, a
+        finishing time and date is required along with a duration string. The
+        resulting bars will be returned in EWrapper.historicalData()
+
+        reqId:TickerId - The id of the request. Must be a unique value. When the
+            market data returns, it whatToShowill be identified by this tag. This is also
+            used when canceling the market data.
+        contract:Contract - This object contains a description of the contract for which
+            market data is being requested.
+        endDateTime:str - Defines a query end date and time at any point during the past 6 mos.
+            Valid values include any date/time within the past six months in the format:
+            yyyymmdd HH:mm:ss ttt
+
+            where "ttt" is the optional time zone.
+        durationStr:str - Set the query duration up to one week, using a time unit
+            of seconds, days or weeks. Valid values include any integer followed by a space
+            and then S (seconds), D (days) or W (week). If no unit is specified, seconds is used.
+        barSizeSetting:str - Specifies the size of the bars that will be returned (within IB/TWS listimits).
+            Valid values include:
+            1 sec
+            5 secs
+            15 secs
+            30 secs
+            1 min
+            2 mins
+            3 mins
+            5 mins
+            15 mins
+            30 mins
+            1 hour
+            1 day
+        whatToShow:str - Determines the nature of data beinging extracted. Valid values include:
+
+            TRADES
+            MIDPOINT
+            BID
+            ASK
+            BID_ASK
+            HISTORICAL_VOLATILITY
+            OPTION_IMPLIED_VOLATILITY
+        useRTH:int - Determines whether to return all data available during the requested time span,
+            or only data that falls within regular trading hours. Valid values include:
+
+            0 - all data is returned even where the market in question was outside of its
+            regular trading hours.
+            1 - only data within the regular trading hours is returned, even if the
+            requested time span falls partially or completely outside of the RTH.
+        formatDate: int - Determines the date format applied to returned bars. validd values include:
+
+            1 - dates applying to bars returned in the format: yyyymmdd{space}{space}hh:mm:dd
+            2 - dates are returned as a long integer specifying the number of seconds since
+                1/1/1970 GMT.
+        chartOptions:TagValueList - For internal use only. Use default value XYZ. """
+        request = ('reqHistoricalData',contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions)
+        send = lambda: self.__reqHistoricalData(contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqHistoricalData(contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions,priority=priority, timeout=0), 600 if timeout is None else timeout)
+        return await send()
+
+    async def reqHistoricalDataColumnar(self, contract: 'ibapi.contract.Contract', endDateTime: 'str', durationStr: 'str', barSizeSetting: 'str', whatToShow: 'str', useRTH: 'int', formatDate: 'int', chartOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'HistoricalBarColumns':
+        """Same as reqHistoricalData, but accumulates the responses into the columns of a HistoricalBarColumns
+        as they arrive instead of returning a list of objects"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await self._acquire_historical_pacing(('reqHistoricalData',contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions), contract, whatToShow, 600 if timeout is None else timeout)
+        future = loop.create_future()
+        def cb(res: HistoricalBarColumns):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb, HistoricalBarColumns())
+        req = QueuedRequest(functools.partial(self._client.reqHistoricalData,reqId,contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,False,chartOptions))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqHistoricalData', 600 if timeout is None else timeout, req, functools.partial(self._client.cancelHistoricalData,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqHistoricalDataAsStream(self, contract: 'ibapi.contract.Contract', endDateTime: 'str', durationStr: 'str', barSizeSetting: 'str', whatToShow: 'str', useRTH: 'int', formatDate: 'int', chartOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqHistoricalData, but returns a ResponseStream that yields the responses as they arrive"""
+        await self._historical_pacing.acquire(('reqHistoricalData',contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions), contract, whatToShow)
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.__cancelHistoricalData,reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqHistoricalData,reqId,contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,False,chartOptions), RequestPriority.BULK if priority is None else priority)
+        return stream
+
+    async def reqHistoricalDataAsSubscription(self, contract: 'ibapi.contract.Contract', endDateTime: 'str', durationStr: 'str', barSizeSetting: 'str', whatToShow: 'str', useRTH: 'int', formatDate: 'int', chartOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Requests contracts' historical data. When requesting historical data, a
+        finishing time and date is required along with a duration string. The
+        resulting bars will be returned in EWrapper.historicalData()
+
+        reqId:TickerId - The id of the request. Must be a unique value. When the
+            market data returns, it whatToShowill be identified by this tag. This is also
+            used when canceling the market data.
+        contract:Contract - This object contains a description of the contract for which
+            market data is being requested.
+        endDateTime:str - Defines a query end date and time at any point during the past 6 mos.
+            Valid values include any date/time within the past six months in the format:
+            yyyymmdd HH:mm:ss ttt
+
+            where "ttt" is the optional time zone.
+        durationStr:str - Set the query duration up to one week, using a time unit
+            of seconds, days or weeks. Valid values include any integer followed by a space
+            and then S (seconds), D (days) or W (week). If no unit is specified, seconds is used.
+        barSizeSetting:str - Specifies the size of the bars that will be returned (within IB/TWS listimits).
+            Valid values include:
+            1 sec
+            5 secs
+            15 secs
+            30 secs
+            1 min
+            2 mins
+            3 mins
+            5 mins
+            15 mins
+            30 mins
+            1 hour
+            1 day
+        whatToShow:str - Determines the nature of data beinging extracted. Valid values include:
+
+            TRADES
+            MIDPOINT
+            BID
+            ASK
+            BID_ASK
+            HISTORICAL_VOLATILITY
+            OPTION_IMPLIED_VOLATILITY
+        useRTH:int - Determines whether to return all data available during the requested time span,
+            or only data that falls within regular trading hours. Valid values include:
+
+            0 - all data is returned even where the market in question was outside of its
+            regular trading hours.
+            1 - only data within the regular trading hours is returned, even if the
+            requested time span falls partially or completely outside of the RTH.
+        formatDate: int - Determines the date format applied to returned bars. validd values include:
+
+            1 - dates applying to bars returned in the format: yyyymmdd{space}{space}hh:mm:dd
+            2 - dates are returned as a long integer specifying the number of seconds since
+                1/1/1970 GMT.
+        chartOptions:TagValueList - For internal use only. Use default value XYZ. """
+        await self._historical_pacing.acquire(('reqHistoricalDataAsSubscription',contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions), contract, whatToShow)
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = SubscriptionGenerator(self.__cancelHistoricalData, reqId, queue_options)
+        self._subscribe(reqId, functools.partial(self._client.reqHistoricalData,reqId,contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,True,chartOptions), RequestPriority.BULK if priority is None else priority)
+        return ret
+
+    def __cancelHistoricalData(self, reqId: 'int'):
+        """Used if an internet disconnect has occurred or the results of a query
+        are otherwise delayed and the application is no longer interested in receiving
+        the data.
+
+        reqId:TickerId - The ticker ID. Must be a unique value."""
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelHistoricalData,reqId), RequestPriority.CANCEL)
+
+    async def reqMktData(self, contract: 'ibapi.contract.Contract', genericTickList: 'str', regulatorySnapshot: 'bool', mktDataOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[Union[TickNews,TickEFP,RerouteMktDataReq,DeltaNeutralValidation,TickReqParams,TickPrice,RerouteMktDepthReq,TickSize]]':
+        """Call this function to request market data. The market data
+        will be returned by the tickPrice and tickSize events.
+
+        reqId: TickerId - The ticker id. Must be a unique value. When the
+            market data returns, it will be identified by this tag. This is
+            also used when canceling the market data.
+        contract:Contract - This structure contains a description of the
+            Contractt for which market data is being requested.
+        genericTickList:str - A commma delimited list of generic tick types.
+            Tick types can be found in the Generic Tick Types page.
+            Prefixing w/ 'mdoff' indicates that top mkt data shouldn't tick.
+            You can specify the news source by postfixing w/ ':<source>.
+            Example: "mdoff,292:FLY+BRF"
+        snapshot:bool - Check to return a single snapshot of Market data and
+            have the market data subscription cancel. Do not enter any
+            genericTicklist values if you use snapshots.
+        regulatorySnapshot: bool - With the US Value Snapshot Bundle for stocks,
+            regulatory snapshots are available for 0.01 USD each.
+        mktDataOptions:TagValueList - For internal use only.
+            Use default value XYZ. """
+        if self._quote_store is not None and genericTickList == "" and not regulatorySnapshot:
+            ticks = self._quote_store.fresh_ticks(contract)
+            if ticks is not None:
+                return ticks
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[Union[TickNews,TickEFP,RerouteMktDataReq,DeltaNeutralValidation,TickReqParams,TickPrice,RerouteMktDepthReq,TickSize]]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqMktData,reqId,contract,genericTickList,True,regulatorySnapshot,mktDataOptions))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqMktData', 60 if timeout is None else timeout, req, functools.partial(self._client.cancelMktData,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        if self._quote_store is not None:
+            self._quote_store.record_snapshot(contract, res)
+        return res
+
+    async def reqMktDataAsStream(self, contract: 'ibapi.contract.Contract', genericTickList: 'str', regulatorySnapshot: 'bool', mktDataOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqMktData, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.__cancelMktData,reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqMktData,reqId,contract,genericTickList,True,regulatorySnapshot,mktDataOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    async def __reqMktDataAsSubscription(self, contract: 'ibapi.contract.Contract', genericTickList: 'str', regulatorySnapshot: 'bool', mktDataOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call this function to request market data. The market data
+        will be returned by the tickPrice and tickSize events.
+
+        reqId: TickerId - The ticker id. Must be a unique value. When the
+            market data returns, it will be identified by this tag. This is
+            also used when canceling the market data.
+        contract:Contract - This structure contains a description of the
+            Contractt for which market data is being requested.
+        genericTickList:str - A commma delimited list of generic tick types.
+            Tick types can be found in the Generic Tick Types page.
+            Prefixing w/ 'mdoff' indicates that top mkt data shouldn't tick.
+            You can specify the news source by postfixing w/ ':<source>.
+            Example: "mdoff,292:FLY+BRF"
+        snapshot:bool - Check to return a single snapshot of Market data and
+            have the market data subscription cancel. Do not enter any
+            genericTicklist values if you use snapshots.
+        regulatorySnapshot: bool - With the US Value Snapshot Bundle for stocks,
+            regulatory snapshots are available for 0.01 USD each.
+        mktDataOptions:TagValueList - For internal use only.
+            Use default value XYZ. """
+        
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = QuoteSubscription(self._quote_store.state(contract), False, self.__cancelMktData, reqId, queue_options, self._quote_store.clock) if self._quote_store is not None else SubscriptionGenerator(self.__cancelMktData, reqId, queue_options)
+        self._subscribe(reqId, functools.partial(self._client.reqMktData,reqId,contract,genericTickList,False,regulatorySnapshot,mktDataOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    async def reqMktDataAsSubscription(self, contract: 'ibapi.contract.Contract', genericTickList: 'str', regulatorySnapshot: 'bool', mktDataOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call this function to request market data. The market data
+        will be returned by the tickPrice and tickSize events.
+
+        reqId: TickerId - The ticker id. Must be a unique value. When the
+            market data returns, it will be identified by this tag. This is
+            also used when canceling the market data.
+        contract:Contract - This structure contains a description of the
+            Contractt for which market data is being requested.
+        genericTickList:str - A commma delimited list of generic tick types.
+            Tick types can be found in the Generic Tick Types page.
+            Prefixing w/ 'mdoff' indicates that top mkt data shouldn't tick.
+            You can specify the news source by postfixing w/ ':<source>.
+            Example: "mdoff,292:FLY+BRF"
+        snapshot:bool - Check to return a single snapshot of Market data and
+            have the market data subscription cancel. Do not enter any
+            genericTicklist values if you use snapshots.
+        regulatorySnapshot: bool - With the US Value Snapshot Bundle for stocks,
+            regulatory snapshots are available for 0.01 USD each.
+        mktDataOptions:TagValueList - For internal use only.
+            Use default value XYZ. """
+        if self._multiplexer is None:
+            return await self.__reqMktDataAsSubscription(contract,genericTickList,regulatorySnapshot,mktDataOptions,priority=priority,queue_options=queue_options)
+        return await self._multiplexer.subscribe(('reqMktDataAsSubscription',contract,genericTickList,regulatorySnapshot,mktDataOptions), lambda: self.__reqMktDataAsSubscription(contract,genericTickList,regulatorySnapshot,mktDataOptions,priority=priority), queue_options)
+
+    async def reqMktDataAsQuotes(self, contract: 'ibapi.contract.Contract', genericTickList: 'str', regulatorySnapshot: 'bool', mktDataOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None) -> 'QuoteSubscription':
+        """Same as reqMktDataAsSubscription, but yields Quote snapshots of the QuoteState of the
+        contract instead of the ticks. At most one quote is queued"""
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = QuoteSubscription(self._quote_state(contract), True, self.__cancelMktData, reqId)
+        self._subscribe(reqId, functools.partial(self._client.reqMktData,reqId,contract,genericTickList,False,regulatorySnapshot,mktDataOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    def __cancelMktData(self, reqId: 'int'):
+        """After calling this function, market data for the specified id
+        will stop flowing.
+
+        reqId: TickerId - The ID that was specified in the call to
+            reqMktData(). """
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelMktData,reqId), RequestPriority.CANCEL)
+
+    async def __reqMktDepth(self, contract: 'ibapi.contract.Contract', numRows: 'int', isSmartDepth: 'bool', mktDepthOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call this function to request market depth for a specific
+        contract. The market depth will be returned by the updateMktDepth() and
+        updateMktDepthL2() events.
+
+        Requests the contract's market depth (order book). Note this request must be
+        direct-routed to an exchange and not smart-routed. The number of simultaneous
+        market depth requests allowed in an account is calculated based on a formula
+        that looks at an accounts equity, commissions, and quote booster packs.
+
+        reqId:TickerId - The ticker id. Must be a unique value. When the market
+            depth data returns, it will be identified by this tag. This is
+            also used when canceling the market depth
+        contract:Contact - This structure contains a description of the contract
+            for which market depth data is being requested.
+        numRows:int - Specifies the numRowsumber of market depth rows to display.
+        isSmartDepth:bool - specifies SMART depth request
+        mktDepthOptions:TagValueList - For internal use only. Use default value
+            XYZ."""
+        
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = SubscriptionGenerator(self.__cancelMktDepth, reqId, queue_options)
+        self._subscribe(reqId, functools.partial(self._client.reqMktDepth,reqId,contract,numRows,isSmartDepth,mktDepthOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    async def reqMktDepth(self, contract: 'ibapi.contract.Contract', numRows: 'int', isSmartDepth: 'bool', mktDepthOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call this function to request market depth for a specific
+        contract. The market depth will be returned by the updateMktDepth() and
+        updateMktDepthL2() events.
+
+        Requests the contract's market depth (order book). Note this request must be
+        direct-routed to an exchange and not smart-routed. The number of simultaneous
+        market depth requests allowed in an account is calculated based on a formula
+        that looks at an accounts equity, commissions, and quote booster packs.
+
+        reqId:TickerId - The ticker id. Must be a unique value. When the market
+            depth data returns, it will be identified by this tag. This is
+            also used when canceling the market depth
+        contract:Contact - This structure contains a description of the contract
+            for which market depth data is being requested.
+        numRows:int - Specifies the numRowsumber of market depth rows to display.
+        isSmartDepth:bool - specifies SMART depth request
+        mktDepthOptions:TagValueList - For internal use only. Use default value
+            XYZ."""
+        if self._multiplexer is None:
+            return await self.__reqMktDepth(contract,numRows,isSmartDepth,mktDepthOptions,priority=priority,queue_options=queue_options)
+        return await self._multiplexer.subscribe(('reqMktDepth',contract,numRows,isSmartDepth,mktDepthOptions), lambda: self.__reqMktDepth(contract,numRows,isSmartDepth,mktDepthOptions,priority=priority), queue_options)
+
+    async def reqMktDepthAsOrderBook(self, contract: 'ibapi.contract.Contract', numRows: 'int', isSmartDepth: 'bool', mktDepthOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None) -> 'OrderBookSubscription':
+        """Same as reqMktDepth, but applies the updates to the OrderBook of the returned
+        OrderBookSubscription as they arrive instead of queueing them"""
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = OrderBookSubscription(functools.partial(self.__cancelMktDepth,reqId,isSmartDepth), numRows)
+        self._subscribe(reqId, functools.partial(self._client.reqMktDepth,reqId,contract,numRows,isSmartDepth,mktDepthOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    def __cancelMktDepth(self, reqId: 'int', isSmartDepth: 'bool'):
+        """After calling this function, market depth data for the specified id
+        will stop flowing.
+
+        reqId:TickerId - The ID that was specified in the call to
+            reqMktDepth().
+        isSmartDepth:bool - specifies SMART depth request"""
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelMktDepth,reqId,isSmartDepth), RequestPriority.CANCEL)
+
+    async def reqNewsBulletins(self, allMsgs: 'bool', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call this function to start receiving news bulletins. Each bulletin
+        will be returned by the updateNewsBulletin() event.
+
+        allMsgs:bool - If set to TRUE, returns all the existing bulletins for
+        the currencyent day and any new ones. If set to FALSE, will only
+        return new bulletins. """
+        
+        
+        ret = self._subscriptions['reqNewsBulletins'] = SubscriptionGenerator(self.__cancelNewsBulletins, allMsgs, queue_options)
+        self._subscribe('reqNewsBulletins', functools.partial(self._client.reqNewsBulletins,allMsgs), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    def __cancelNewsBulletins(self):
+        """Call this function to stop receiving news bulletins."""
+        if self.cancel_request('reqNewsBulletins'):
+            return
+        self._writer.put(functools.partial(self._client.cancelNewsBulletins), RequestPriority.CANCEL)
+
+    async def placeOrder(self, orderId: 'int', contract: 'ibapi.contract.Contract', order: 'ibapi.order.Order', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call this function to place an order. The order status will
+        be returned by the orderStatus event.
+
+        orderId:OrderId - The order id. You must specify a unique value. When the
+            order START_APItus returns, it will be identified by this tag.
+            This tag is also used when canceling the order.
+        contract:Contract - This structure contains a description of the
+            contract which is being traded.
+        order:Order - This structure contains the details of tradedhe order.
+            Note: Each client MUST connect with a unique clientId."""
+        if not self._connected:
+            raise ConnectionLostError()
+        
+        
+        ret = self._subscriptions[('placeOrder',orderId)] = SubscriptionGenerator(self.__cancelOrder, orderId, queue_options)
+        self._put_request(('placeOrder',orderId), functools.partial(self._client.placeOrder,orderId,contract,order), RequestPriority.ORDER if priority is None else priority)
+        return ret
+
+    def __cancelOrder(self, orderId: 'int'):
+        """Call this function to cancel an order.
+
+        orderId:OrderId - The order ID that was specified previously in the call
+            to placeOrder()"""
+        if self.cancel_request(('placeOrder',orderId)):
+            return
+        self._writer.put(functools.partial(self._client.cancelOrder,orderId), RequestPriority.CANCEL)
+
+    async def reqPnL(self, account: 'str', modelCode: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'Pnl':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: Pnl):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqPnL,reqId,account,modelCode))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqPnL', timeout, req, functools.partial(self._client.cancelPnL,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqPnLSingle(self, account: 'str', modelCode: 'str', conid: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'PnlSingle':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: PnlSingle):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqPnLSingle,reqId,account,modelCode,conid))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqPnLSingle', timeout, req, functools.partial(self._client.cancelPnLSingle,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqPositions(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[Position]':
+        """Requests real-time position data for all accounts."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[Position]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqPositions'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqPositions))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqPositions', 'reqPositions', timeout, req, functools.partial(self._client.cancelPositions), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqPositionsAsStream(self, *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqPositions, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.__cancelPositions))
+        self._req_state['reqPositions'] = RequestState(stream.finish, stream)
+        self._put_request('reqPositions', functools.partial(self._client.reqPositions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    def __cancelPositions(self):
+        """Cancels real-time position updates."""
+        if self.cancel_request('reqPositions'):
+            return
+        self._writer.put(functools.partial(self._client.cancelPositions), RequestPriority.CANCEL)
+
+    async def reqPositionsMulti(self, account: 'str', modelCode: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[PositionMulti]':
+        """Requests positions for account and/or model.
+        Results are delivered via EWrapper.positionMulti() and
+        EWrapper.positionMultiEnd() """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[PositionMulti]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqPositionsMulti,reqId,account,modelCode))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqPositionsMulti', timeout, req, functools.partial(self._client.cancelPositionsMulti,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqPositionsMultiAsStream(self, account: 'str', modelCode: 'str', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqPositionsMulti, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.__cancelPositionsMulti,reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqPositionsMulti,reqId,account,modelCode), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    def __cancelPositionsMulti(self, reqId: 'int'):
+        """"""
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelPositionsMulti,reqId), RequestPriority.CANCEL)
+
+    async def reqRealTimeBars(self, contract: 'ibapi.contract.Contract', barSize: 'int', whatToShow: 'str', useRTH: 'bool', realTimeBarsOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """Call the reqRealTimeBars() function to start receiving real time bar
+        results through the realtimeBar() EWrapper function.
+
+        reqId:TickerId - The Id for the request. Must be a unique value. When the
+            data is received, it will be identified by this Id. This is also
+            used when canceling the request.
+        contract:Contract - This object contains a description of the contract
+            for which real time bars are being requested
+        barSize:int - Currently only 5 second bars are supported, if any other
+            value is used, an exception will be thrown.
+        whatToShow:str - Determines the nature of the data extracted. Valid
+            values include:
+            TRADES
+            BID
+            ASK
+            MIDPOINT
+        useRTH:bool - Regular Trading Hours only. Valid values include:
+            0 = all data available during the time span requested is returned,
+                including time intervals when the market in question was
+                outside of regular trading hours.
+            1 = only data within the regular trading hours for the product
+                requested is returned, even if the time time span falls
+                partially or completely outside.
+        realTimeBarOptions:TagValueList - For internal use only. Use default value XYZ."""
+        
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = SubscriptionGenerator(self.__cancelRealTimeBars, reqId, queue_options)
+        self._subscribe(reqId, functools.partial(self._client.reqRealTimeBars,reqId,contract,barSize,whatToShow,useRTH,realTimeBarsOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    def __cancelRealTimeBars(self, reqId: 'int'):
+        """Call the cancelRealTimeBars() function to stop receiving real time bar results.
+
+        reqId:TickerId - The Id that was specified in the call to reqRealTimeBars(). """
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelRealTimeBars,reqId), RequestPriority.CANCEL)
+
+    async def reqScannerSubscription(self, subscription: 'ibapi.scanner.ScannerSubscription', scannerSubscriptionOptions: 'List[ibapi.tag_value.TagValue]', scannerSubscriptionFilterOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ScannerData]':
+        """reqId:int - The ticker ID. Must be a unique value.
+        scannerSubscription:ScannerSubscription - This structure contains
+            possible parameters used to filter results.
+        scannerSubscriptionOptions:TagValueList - For internal use only.
+            Use default value XYZ."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[ScannerData]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqScannerSubscription,reqId,subscription,scannerSubscriptionOptions,scannerSubscriptionFilterOptions))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqScannerSubscription', timeout, req, functools.partial(self._client.cancelScannerSubscription,reqId), started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqScannerSubscriptionAsStream(self, subscription: 'ibapi.scanner.ScannerSubscription', scannerSubscriptionOptions: 'List[ibapi.tag_value.TagValue]', scannerSubscriptionFilterOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqScannerSubscription, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.__cancelScannerSubscription,reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqScannerSubscription,reqId,subscription,scannerSubscriptionOptions,scannerSubscriptionFilterOptions), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    def __cancelScannerSubscription(self, reqId: 'int'):
+        """reqId:int - The ticker ID. Must be a unique value."""
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelScannerSubscription,reqId), RequestPriority.CANCEL)
+
+    async def __reqTickByTickData(self, contract: 'ibapi.contract.Contract', tickType: 'str', numberOfTicks: 'int', ignoreSize: 'bool', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """"""
+        
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = SubscriptionGenerator(self.__cancelTickByTickData, reqId, queue_options)
+        self._subscribe(reqId, functools.partial(self._client.reqTickByTickData,reqId,contract,tickType,numberOfTicks,ignoreSize), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    async def reqTickByTickData(self, contract: 'ibapi.contract.Contract', tickType: 'str', numberOfTicks: 'int', ignoreSize: 'bool', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """"""
+        if self._multiplexer is None:
+            return await self.__reqTickByTickData(contract,tickType,numberOfTicks,ignoreSize,priority=priority,queue_options=queue_options)
+        return await self._multiplexer.subscribe(('reqTickByTickData',contract,tickType,numberOfTicks,ignoreSize), lambda: self.__reqTickByTickData(contract,tickType,numberOfTicks,ignoreSize,priority=priority), queue_options)
+
+    def __cancelTickByTickData(self, reqId: 'int'):
+        """"""
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.cancelTickByTickData,reqId), RequestPriority.CANCEL)
+
+    async def replaceFA(self, faData: 'int', cxml: 'str', *, priority: 'RequestPriority' = None) -> 'None':
+        """Call this function to modify FA configuration information from the
+        API. Note that this can also be done manually in TWS itself.
+
+        reqId:TickerId - request id
+        faData:FaDataType - Specifies the type of Financial Advisor
+            configuration data beingingg requested. Valid values include:
+            1 = GROUPS
+            2 = PROFILE
+            3 = ACCOUNT ALIASES
+        cxml: str - The XML string containing the new FA configuration
+            information.  """
+        reqId = self.next_request_id()
+        self._writer.put(functools.partial(self._client.replaceFA,reqId,faData,cxml), RequestPriority.INTERACTIVE if priority is None else priority)
+        return None
+
+    async def reqAccountUpdates(self, subscribe: 'bool', acctCode: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[Union[UpdateAccountTime,UpdatePortfolio,UpdateAccountValue]]':
+        """Call this function to start getting account values, portfolio,
+        and last update time information via EWrapper.updateAccountValue(),
+        EWrapperi.updatePortfolio() and Wrapper.updateAccountTime().
+
+        subscribe:bool - If set to TRUE, the client will start receiving account
+            and Portfoliolio updates. If set to FALSE, the client will stop
+            receiving this information.
+        acctCode:str -The account code for which to receive account and
+            portfolio updates."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[Union[UpdateAccountTime,UpdatePortfolio,UpdateAccountValue]]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqAccountUpdates'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqAccountUpdates,subscribe,acctCode))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqAccountUpdates', 'reqAccountUpdates', timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqAccountUpdatesAsStream(self, subscribe: 'bool', acctCode: 'str', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqAccountUpdates, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.cancel_request, 'reqAccountUpdates'))
+        self._req_state['reqAccountUpdates'] = RequestState(stream.finish, stream)
+        self._put_request('reqAccountUpdates', functools.partial(self._client.reqAccountUpdates,subscribe,acctCode), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    async def reqOpenOrders(self, *, priority: 'RequestPriority' = None) -> 'None':
+        """Call this function to request the open orders that were
+        placed from this client. Each open order will be fed back through the
+        openOrder() and orderStatus() functions on the EWrapper.
+
+        Note:  The client with a clientId of 0 will also receive the TWS-owned
+        open orders. These orders will be associated with the client and a new
+        orderId will be generated. This association will persist over multiple
+        API and TWS sessions.  """
+        
+        self._writer.put(functools.partial(self._client.reqOpenOrders), RequestPriority.INTERACTIVE if priority is None else priority)
+        return None
+
+    async def reqAllOpenOrders(self, *, priority: 'RequestPriority' = None) -> 'None':
+        """Call this function to request the open orders placed from all
+        clients and also from TWS. Each open order will be fed back through the
+        openOrder() and orderStatus() functions on the EWrapper.
+
+        Note:  No association is made between the returned orders and the
+        requesting client."""
+        
+        self._writer.put(functools.partial(self._client.reqAllOpenOrders), RequestPriority.INTERACTIVE if priority is None else priority)
+        return None
+
+    async def reqAutoOpenOrders(self, bAutoBind: 'bool', *, priority: 'RequestPriority' = None) -> 'None':
+        """Call this function to request that newly created TWS orders
+        be implicitly associated with the client. When a new TWS order is
+        created, the order will be associated with the client, and fed back
+        through the openOrder() and orderStatus() functions on the EWrapper.
+
+        Note:  This request can only be made from a client with clientId of 0.
+
+        bAutoBind: If set to TRUE, newly created TWS orders will be implicitly
+        associated with the client. If set to FALSE, no association will be
+        made."""
+        
+        self._writer.put(functools.partial(self._client.reqAutoOpenOrders,bAutoBind), RequestPriority.INTERACTIVE if priority is None else priority)
+        return None
+
+    async def __reqContractDetails(self, contract: 'ibapi.contract.Contract', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.contract.ContractDetails]':
+        """Call this function to download all details for a particular
+        underlying. The contract details will be received via the contractDetails()
+        function on the EWrapper.
+
+        reqId:int - The ID of the data request. Ensures that responses are
+            make_fieldatched to requests if several requests are in process.
+        contract:Contract - The summary description of the contract being looked
+            up."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[ibapi.contract.ContractDetails]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqContractDetails,reqId,contract))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqContractDetails', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqContractDetails(self, contract: 'ibapi.contract.Contract', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.contract.ContractDetails]':
+        """Call this function to download all details for a particular
+        underlying. The contract details will be received via the contractDetails()
+        function on the EWrapper.
+
+        reqId:int - The ID of the data request. Ensures that responses are
+            make_fieldatched to requests if several requests are in process.
+        contract:Contract - The summary description of the contract being looked
+            up."""
+        request = ('reqContractDetails',contract)
+        send = lambda: self.__reqContractDetails(contract,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqContractDetails(contract,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, 86400)
+        return await send()
+
+    async def reqContractDetailsAsStream(self, contract: 'ibapi.contract.Contract', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqContractDetails, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.cancel_request, reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqContractDetails,reqId,contract), RequestPriority.BULK if priority is None else priority)
+        return stream
+
+    async def __reqCurrentTime(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'int':
+        """Asks the current system time on the server side."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: int):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqCurrentTime'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqCurrentTime))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqCurrentTime', 'reqCurrentTime', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqCurrentTime(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'int':
+        """Asks the current system time on the server side."""
+        request = ('reqCurrentTime',)
+        send = lambda: self.__reqCurrentTime(priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqCurrentTime(priority=priority, timeout=0), 60 if timeout is None else timeout)
+        return await send()
+
+    async def reqCompletedOrders(self, apiOnly: 'bool', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[CompletedOrder]':
+        """Call this function to request the completed orders. If apiOnly parameter 
+        is true, then only completed orders placed from API are requested. 
+        Each completed order will be fed back through the
+        completedOrder() function on the EWrapper."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[CompletedOrder]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqCompletedOrders'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqCompletedOrders,apiOnly))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqCompletedOrders', 'reqCompletedOrders', timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqCompletedOrdersAsStream(self, apiOnly: 'bool', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqCompletedOrders, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.cancel_request, 'reqCompletedOrders'))
+        self._req_state['reqCompletedOrders'] = RequestState(stream.finish, stream)
+        self._put_request('reqCompletedOrders', functools.partial(self._client.reqCompletedOrders,apiOnly), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    async def reqExecutions(self, execFilter: 'ibapi.execution.ExecutionFilter', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ExecDetails]':
+        """When this function is called, the execution reports that meet the
+        filter criteria are downloaded to the client via the execDetails()
+        function. To view executions beyond the past 24 hours, open the
+        Trade Log in TWS and, while the Trade Log is displayed, request
+        the executions again from the API.
+
+        reqId:int - The ID of the data request. Ensures that responses are
+            matched to requests if several requests are in process.
+        execFilter:ExecutionFilter - This object contains attributes that
+            describe the filter criteria used to determine which execution
+            reports are returned.
+
+        NOTE: Time format must be 'yyyymmdd-hh:mm:ss' Eg: '20030702-14:55'"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[ExecDetails]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqExecutions,reqId,execFilter))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqExecutions', timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqExecutionsAsStream(self, execFilter: 'ibapi.execution.ExecutionFilter', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqExecutions, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.cancel_request, reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqExecutions,reqId,execFilter), RequestPriority.INTERACTIVE if priority is None else priority)
+        return stream
+
+    async def __reqFamilyCodes(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.common.FamilyCode]':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[ibapi.common.FamilyCode]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqFamilyCodes'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqFamilyCodes))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqFamilyCodes', 'reqFamilyCodes', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqFamilyCodes(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.common.FamilyCode]':
+        """"""
+        request = ('reqFamilyCodes',)
+        send = lambda: self.__reqFamilyCodes(priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqFamilyCodes(priority=priority, timeout=0), 60 if timeout is None else timeout)
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, 3600)
+        return await send()
+
+    async def reqGlobalCancel(self, *, priority: 'RequestPriority' = None) -> 'None':
+        """Use this function to cancel all open orders globally. It
+        cancels both API and TWS open orders.
+
+        If the order was created in TWS, it also gets canceled. If the order
+        was initiated in the API, it also gets canceled."""
+        
+        self._writer.put(functools.partial(self._client.reqGlobalCancel), RequestPriority.CANCEL if priority is None else priority)
+        return None
+
+    async def __reqHistoricalNews(self, conId: 'int', providerCodes: 'str', startDateTime: 'str', endDateTime: 'str', totalResults: 'int', historicalNewsOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[HistoricalNews]':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[HistoricalNews]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqHistoricalNews,reqId,conId,providerCodes,startDateTime,endDateTime,totalResults,historicalNewsOptions))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqHistoricalNews', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqHistoricalNews(self, conId: 'int', providerCodes: 'str', startDateTime: 'str', endDateTime: 'str', totalResults: 'int', historicalNewsOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[HistoricalNews]':
+        """"""
+        request = ('reqHistoricalNews',conId,providerCodes,startDateTime,endDateTime,totalResults,historicalNewsOptions)
+        send = lambda: self.__reqHistoricalNews(conId,providerCodes,startDateTime,endDateTime,totalResults,historicalNewsOptions,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqHistoricalNews(conId,providerCodes,startDateTime,endDateTime,totalResults,historicalNewsOptions,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        return await send()
+
+    async def reqHistoricalNewsAsStream(self, conId: 'int', providerCodes: 'str', startDateTime: 'str', endDateTime: 'str', totalResults: 'int', historicalNewsOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqHistoricalNews, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.cancel_request, reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqHistoricalNews,reqId,conId,providerCodes,startDateTime,endDateTime,totalResults,historicalNewsOptions), RequestPriority.BULK if priority is None else priority)
+        return stream
+
+    async def __reqHistoricalTicks(self, contract: 'ibapi.contract.Contract', startDateTime: 'str', endDateTime: 'str', numberOfTicks: 'int', whatToShow: 'str', useRth: 'int', ignoreSize: 'bool', miscOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[Union[HistoricalTicksBidAsk,HistoricalTicksLast,HistoricalTicks]]':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await self._acquire_historical_pacing(('reqHistoricalTicks',contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions), contract, whatToShow, 600 if timeout is None else timeout)
+        future = loop.create_future()
+        def cb(res: List[Union[HistoricalTicksBidAsk,HistoricalTicksLast,HistoricalTicks]]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqHistoricalTicks,reqId,contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqHistoricalTicks', 600 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqHistoricalTicks(self, contract: 'ibapi.contract.Contract', startDateTime: 'str', endDateTime: 'str', numberOfTicks: 'int', whatToShow: 'str', useRth: 'int', ignoreSize: 'bool', miscOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[Union[HistoricalTicksBidAsk,HistoricalTicksLast,HistoricalTicks]]':
+        """"""
+        request = ('reqHistoricalTicks',contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions)
+        send = lambda: self.__reqHistoricalTicks(contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqHistoricalTicks(contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions,priority=priority, timeout=0), 600 if timeout is None else timeout)
+        return await send()
+
+    async def reqHistoricalTicksColumnar(self, contract: 'ibapi.contract.Contract', startDateTime: 'str', endDateTime: 'str', numberOfTicks: 'int', whatToShow: 'str', useRth: 'int', ignoreSize: 'bool', miscOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'HistoricalTickColumns':
+        """Same as reqHistoricalTicks, but accumulates the responses into the columns of a HistoricalTickColumns
+        as they arrive instead of returning a list of objects"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await self._acquire_historical_pacing(('reqHistoricalTicks',contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions), contract, whatToShow, 600 if timeout is None else timeout)
+        future = loop.create_future()
+        def cb(res: HistoricalTickColumns):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb, HistoricalTickColumns())
+        req = QueuedRequest(functools.partial(self._client.reqHistoricalTicks,reqId,contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqHistoricalTicks', 600 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqHistoricalTicksAsStream(self, contract: 'ibapi.contract.Contract', startDateTime: 'str', endDateTime: 'str', numberOfTicks: 'int', whatToShow: 'str', useRth: 'int', ignoreSize: 'bool', miscOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqHistoricalTicks, but returns a ResponseStream that yields the responses as they arrive"""
+        await self._historical_pacing.acquire(('reqHistoricalTicks',contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions), contract, whatToShow)
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.cancel_request, reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqHistoricalTicks,reqId,contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions), RequestPriority.BULK if priority is None else priority)
+        return stream
+
+    async def reqIds(self, numIds: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'int':
+        """Call this function to request from TWS the next valid ID that
+        can be used when placing an order.  After calling this function, the
+        nextValidId() event will be triggered, and the id returned is that next
+        valid ID. That ID will reflect any autobinding that has occurred (which
+        generates new IDs and increments the next valid ID therein).
+
+        numIds:int - deprecated"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: int):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqIds'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqIds,numIds))
+        self._writer.put(req, RequestPriority.ORDER if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqIds', 'reqIds', timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def __reqManagedAccts(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """Call this function to request the list of managed accounts. The list
+        will be returned by the managedAccounts() function on the EWrapper.
+
+        Note:  This request can only be made when connected to a FA managed account."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: str):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqManagedAccts'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqManagedAccts))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqManagedAccts', 'reqManagedAccts', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqManagedAccts(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """Call this function to request the list of managed accounts. The list
+        will be returned by the managedAccounts() function on the EWrapper.
+
+        Note:  This request can only be made when connected to a FA managed account."""
+        request = ('reqManagedAccts',)
+        send = lambda: self.__reqManagedAccts(priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqManagedAccts(priority=priority, timeout=0), 60 if timeout is None else timeout)
+        return await send()
+
+    async def reqMarketDataType(self, marketDataType: 'int', *, priority: 'RequestPriority' = None) -> 'None':
+        """The API can receive frozen market data from Trader
+        Workstation. Frozen market data is the last data recorded in our system.
+        During normal trading hours, the API receives real-time market data. If
+        you use this function, you are telling TWS to automatically switch to
+        frozen market data after the close. Then, before the opening of the next
+        trading day, market data will automatically switch back to real-time
+        market data.
+
+        marketDataType:int - 1 for real-time streaming market data or 2 for
+            frozen market data"""
+        
+        self._writer.put(functools.partial(self._client.reqMarketDataType,marketDataType), RequestPriority.INTERACTIVE if priority is None else priority)
+        return None
+
+    async def __reqMarketRule(self, marketRuleId: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'MarketRule':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: MarketRule):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqMarketRule'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqMarketRule,marketRuleId))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqMarketRule', 'reqMarketRule', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqMarketRule(self, marketRuleId: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'MarketRule':
+        """"""
+        request = ('reqMarketRule',marketRuleId)
+        send = lambda: self.__reqMarketRule(marketRuleId,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqMarketRule(marketRuleId,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, 86400)
+        return await send()
+
+    async def __reqMatchingSymbols(self, pattern: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.contract.ContractDescription]':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[ibapi.contract.ContractDescription]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqMatchingSymbols,reqId,pattern))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqMatchingSymbols', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqMatchingSymbols(self, pattern: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.contract.ContractDescription]':
+        """"""
+        request = ('reqMatchingSymbols',pattern)
+        send = lambda: self.__reqMatchingSymbols(pattern,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqMatchingSymbols(pattern,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, 3600)
+        return await send()
+
+    async def __reqMktDepthExchanges(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.common.DepthMktDataDescription]':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[ibapi.common.DepthMktDataDescription]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqMktDepthExchanges'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqMktDepthExchanges))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqMktDepthExchanges', 'reqMktDepthExchanges', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqMktDepthExchanges(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.common.DepthMktDataDescription]':
+        """"""
+        request = ('reqMktDepthExchanges',)
+        send = lambda: self.__reqMktDepthExchanges(priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqMktDepthExchanges(priority=priority, timeout=0), 60 if timeout is None else timeout)
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, 3600)
+        return await send()
+
+    async def __reqNewsArticle(self, reqId: 'int', providerCode: 'str', articleId: 'str', newsArticleOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'NewsArticle':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: NewsArticle):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqNewsArticle'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqNewsArticle,reqId,providerCode,articleId,newsArticleOptions))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqNewsArticle', 'reqNewsArticle', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqNewsArticle(self, reqId: 'int', providerCode: 'str', articleId: 'str', newsArticleOptions: 'List[ibapi.tag_value.TagValue]', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'NewsArticle':
+        """"""
+        request = ('reqNewsArticle',reqId,providerCode,articleId,newsArticleOptions)
+        send = lambda: self.__reqNewsArticle(reqId,providerCode,articleId,newsArticleOptions,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqNewsArticle(reqId,providerCode,articleId,newsArticleOptions,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        return await send()
+
+    async def __reqNewsProviders(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.common.NewsProvider]':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[ibapi.common.NewsProvider]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqNewsProviders'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqNewsProviders))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqNewsProviders', 'reqNewsProviders', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqNewsProviders(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.common.NewsProvider]':
+        """"""
+        request = ('reqNewsProviders',)
+        send = lambda: self.__reqNewsProviders(priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqNewsProviders(priority=priority, timeout=0), 60 if timeout is None else timeout)
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, 3600)
+        return await send()
+
+    async def __reqScannerParameters(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """Requests an XML string that describes all possible scanner queries."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: str):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['reqScannerParameters'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqScannerParameters))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, 'reqScannerParameters', 'reqScannerParameters', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqScannerParameters(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'str':
+        """Requests an XML string that describes all possible scanner queries."""
+        request = ('reqScannerParameters',)
+        send = lambda: self.__reqScannerParameters(priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqScannerParameters(priority=priority, timeout=0), 60 if timeout is None else timeout)
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, 86400)
+        return await send()
+
+    async def __reqSecDefOptParams(self, underlyingSymbol: 'str', futFopExchange: 'str', underlyingSecType: 'str', underlyingConId: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[SecurityDefinitionOptionParameter]':
+        """Requests security definition option parameters for viewing a
+        contract's option chain reqId the ID chosen for the request
+        underlyingSymbol futFopExchange The exchange on which the returned
+        options are trading. Can be set to the empty string "" for all
+        exchanges. underlyingSecType The type of the underlying security,
+        i.e. STK underlyingConId the contract ID of the underlying security.
+        Response comes via EWrapper.securityDefinitionOptionParameter()"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[SecurityDefinitionOptionParameter]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqSecDefOptParams,reqId,underlyingSymbol,futFopExchange,underlyingSecType,underlyingConId))
+        self._writer.put(req, RequestPriority.BULK if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqSecDefOptParams', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqSecDefOptParams(self, underlyingSymbol: 'str', futFopExchange: 'str', underlyingSecType: 'str', underlyingConId: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[SecurityDefinitionOptionParameter]':
+        """Requests security definition option parameters for viewing a
+        contract's option chain reqId the ID chosen for the request
+        underlyingSymbol futFopExchange The exchange on which the returned
+        options are trading. Can be set to the empty string "" for all
+        exchanges. underlyingSecType The type of the underlying security,
+        i.e. STK underlyingConId the contract ID of the underlying security.
+        Response comes via EWrapper.securityDefinitionOptionParameter()"""
+        request = ('reqSecDefOptParams',underlyingSymbol,futFopExchange,underlyingSecType,underlyingConId)
+        send = lambda: self.__reqSecDefOptParams(underlyingSymbol,futFopExchange,underlyingSecType,underlyingConId,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqSecDefOptParams(underlyingSymbol,futFopExchange,underlyingSecType,underlyingConId,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        if self._response_cache is not None:
+            return await self._response_cache.run(request, send, 86400)
+        return await send()
+
+    async def reqSecDefOptParamsAsStream(self, underlyingSymbol: 'str', futFopExchange: 'str', underlyingSecType: 'str', underlyingConId: 'int', *, priority: 'RequestPriority' = None) -> 'ResponseStream':
+        """Same as reqSecDefOptParams, but returns a ResponseStream that yields the responses as they arrive"""
+        
+        reqId = self.next_request_id()
+        stream = ResponseStream(self._wrapper.loop_bridge(asyncio.get_running_loop()), functools.partial(self.cancel_request, reqId))
+        self._req_state[reqId] = RequestState(stream.finish, stream)
+        self._put_request(reqId, functools.partial(self._client.reqSecDefOptParams,reqId,underlyingSymbol,futFopExchange,underlyingSecType,underlyingConId), RequestPriority.BULK if priority is None else priority)
+        return stream
+
+    async def __reqSmartComponents(self, bboExchange: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'Dict[str, ibapi.common.SmartComponent]':
+        """"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: Dict[str, ibapi.common.SmartComponent]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqSmartComponents,reqId,bboExchange))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqSmartComponents', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqSmartComponents(self, bboExchange: 'str', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'Dict[str, ibapi.common.SmartComponent]':
+        """"""
+        request = ('reqSmartComponents',bboExchange)
+        send = lambda: self.__reqSmartComponents(bboExchange,priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqSmartComponents(bboExchange,priority=priority, timeout=0), 60 if timeout is None else timeout)
+        return await send()
+
+    async def __reqSoftDollarTiers(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.order.SoftDollarTier]':
+        """Requests pre-defined Soft Dollar Tiers. This is only supported for
+        registered professional advisors and hedge and mutual funds who have
+        configured Soft Dollar Tiers in Account Management."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: List[ibapi.order.SoftDollarTier]):
+            loop.call_soon_threadsafe(future.set_result, res)
+        reqId = self.next_request_id()
+        self._req_state[reqId] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.reqSoftDollarTiers,reqId))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, reqId, 'reqSoftDollarTiers', 60 if timeout is None else timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def reqSoftDollarTiers(self, *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'List[ibapi.order.SoftDollarTier]':
+        """Requests pre-defined Soft Dollar Tiers. This is only supported for
+        registered professional advisors and hedge and mutual funds who have
+        configured Soft Dollar Tiers in Account Management."""
+        request = ('reqSoftDollarTiers',)
+        send = lambda: self.__reqSoftDollarTiers(priority=priority, timeout=timeout)
+        if self._coalescer is not None:
+            # Every caller waits for the shared request with its own timeout
+            send = functools.partial(self._coalescer.run, request, lambda: self.__reqSoftDollarTiers(priority=priority, timeout=0), 60 if timeout is None else timeout)
+        return await send()
+
+    async def requestFA(self, faData: 'int', *, priority: 'RequestPriority' = None, timeout: 'float' = None) -> 'ReceiveFA':
+        """Call this function to request FA configuration information from TWS.
+        The data returns in an XML string via a "receiveFA" ActiveX event.
+
+        faData:FaDataType - Specifies the type of Financial Advisor
+            configuration data beingingg requested. Valid values include:
+            1 = GROUPS
+            2 = PROFILE
+            3 = ACCOUNT ALIASES"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        future = loop.create_future()
+        def cb(res: ReceiveFA):
+            loop.call_soon_threadsafe(future.set_result, res)
+        
+        self._req_state['requestFA'] = RequestState(cb)
+        req = QueuedRequest(functools.partial(self._client.requestFA,faData))
+        self._writer.put(req, RequestPriority.INTERACTIVE if priority is None else priority)
+        res = await self._wait_for_response(future, 'requestFA', 'requestFA', timeout, req, None, started)
+        if isinstance(res, IbError):
+            raise res
+        return res
+
+    async def setServerLogLevel(self, logLevel: 'int', *, priority: 'RequestPriority' = None) -> 'None':
+        """The default detail level is ERROR. For more details, see API
+        Logging."""
+        
+        self._writer.put(functools.partial(self._client.setServerLogLevel,logLevel), RequestPriority.INTERACTIVE if priority is None else priority)
+        return None
+
+    async def subscribeToGroupEvents(self, groupId: 'int', *, priority: 'RequestPriority' = None, queue_options: 'SubscriptionQueueOptions' = None) -> 'SubscriptionGenerator':
+        """reqId:int - The unique number associated with the notification.
+        groupId:int - The ID of the group, currently it is a number from 1 to 7.
+            This is the display group subscription request sent by the API to TWS."""
+        
+        reqId = self.next_request_id()
+        ret = self._subscriptions[reqId] = SubscriptionGenerator(self.__unsubscribeFromGroupEvents, reqId, queue_options)
+        self._subscribe(reqId, functools.partial(self._client.subscribeToGroupEvents,reqId,groupId), RequestPriority.INTERACTIVE if priority is None else priority)
+        return ret
+
+    def __unsubscribeFromGroupEvents(self, reqId: 'int'):
+        """reqId:int - The requestId specified in subscribeToGroupEvents()."""
+        if self.cancel_request(reqId):
+            return
+        self._writer.put(functools.partial(self._client.unsubscribeFromGroupEvents,reqId), RequestPriority.CANCEL)
+
+    async def updateDisplayGroup(self, reqId: 'int', contractInfo: 'str', *, priority: 'RequestPriority' = None) -> 'None':
+        """reqId:int - The requestId specified in subscribeToGroupEvents().
+        contractInfo:str - The encoded value that uniquely represents the
+            contract in IB. Possible values include:
+
+            none = empty selection
+            contractID@exchange - any non-combination contract.
+                Examples: 8314@SMART for IBM SMART; 8314@ARCA for IBM @ARCA.
+            combo = if any combo is selected."""
+        
+        self._writer.put(functools.partial(self._client.updateDisplayGroup,reqId,contractInfo), RequestPriority.INTERACTIVE if priority is None else priority)
+        return None
\ No newline at end of file
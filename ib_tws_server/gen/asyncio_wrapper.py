@@ -0,0 +1,772 @@
+
+import asyncio
+from ibapi.wrapper import EWrapper
+from ib_tws_server.asyncio.ib_writer import IBWriter
+from ib_tws_server.asyncio.loop_bridge import LoopBridge
+from ib_tws_server.asyncio.request_priority import RequestPriority
+from ib_tws_server.asyncio.request_state import *
+from ib_tws_server.asyncio.subscription_generator import SubscriptionGenerator
+from ib_tws_server.error import *
+from ib_tws_server.gen.client_responses import *
+from ib_tws_server.ib_imports import *
+from typing import Dict, List
+
+class AsyncioWrapper(EWrapper):
+    _req_state: Dict[RequestId, RequestState]
+    _subscriptions: Dict[RequestId, SubscriptionGenerator]
+    _expecting_disconnect: bool
+    _writer: IBWriter
+    _bridges: Dict[asyncio.AbstractEventLoop, LoopBridge]
+
+    def __init__(self, registry: RequestStateRegistry, delivery_interval: float = 0):
+        self._req_state = registry.requests
+        self._subscriptions = registry.subscriptions
+        self._delivery_interval = delivery_interval
+        self._bridges = dict()
+        EWrapper.__init__(self)
+        self._expecting_disconnect = False
+        # Called on the reader thread when the connection is lost
+        self._on_disconnect: Callable[[], None] = None
+
+    def connectionClosed(self):
+        self._writer.stop()
+        if not self._expecting_disconnect:
+            if self._on_disconnect is None:
+                raise ConnectionError("Unexpected disconnect")
+            self._on_disconnect()
+
+    def call_response_cb(self, id: RequestId, res=None):
+        s = self._req_state.pop(id, None)
+        if s is None:
+            return
+        if res is None:
+            res = s.response
+        if s.cb is not None:
+            s.cb(res)
+
+    def error(self, reqId: int, errorCode: int, errorString: str):
+        s = self._req_state.pop(reqId, None) if reqId is not None else None
+        if s is not None and s.cb is not None:
+            s.cb(IbError(errorString, errorCode))
+        else:
+            super().error(reqId, errorCode, errorString)
+        
+    def call_streaming_cb(self, id: RequestId, res: any):
+        s = self._subscriptions.get(id)
+        # Reserving space can block for subscriptions with the BLOCK overflow policy
+        if s is not None and s.reserve():
+            self.loop_bridge(s._loop).call_soon(s.add_to_queue, res)
+
+    def loop_bridge(self, loop: asyncio.AbstractEventLoop) -> LoopBridge:
+        b = self._bridges.get(loop)
+        if b is None:
+            b = self._bridges.setdefault(loop, LoopBridge(loop, self._delivery_interval))
+        return b
+
+    def displayGroupList(self, reqId: 'int', groups: 'str'):
+        """This callback is a one-time response to queryDisplayGroups().
+
+        reqId - The requestId specified in queryDisplayGroups().
+        groups - A list of integers representing visible group ID separated by
+            the | character, and sorted by most used group first. This list will
+             not change during TWS session (in other words, user cannot add a
+            new group; sorting can change though)."""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = groups
+        
+        self.call_response_cb(reqId)
+
+    def tickOptionComputation(self, reqId: 'int', tickType: 'int', tickAttrib: 'int', impliedVol: 'float', delta: 'float', optPrice: 'float', pvDividend: 'float', gamma: 'float', vega: 'float', theta: 'float', undPrice: 'float'):
+        """This function is called when the market in an option or its
+        underlier moves. TWS's option model volatilities, prices, and
+        deltas, along with the present value of dividends expected on that
+        options underlier are received."""
+        self.call_streaming_cb(reqId, TickOptionComputation(tickType,tickAttrib,impliedVol,delta,optPrice,pvDividend,gamma,vega,theta,undPrice))
+
+    def tickOptionComputation(self, reqId: 'int', tickType: 'int', tickAttrib: 'int', impliedVol: 'float', delta: 'float', optPrice: 'float', pvDividend: 'float', gamma: 'float', vega: 'float', theta: 'float', undPrice: 'float'):
+        """This function is called when the market in an option or its
+        underlier moves. TWS's option model volatilities, prices, and
+        deltas, along with the present value of dividends expected on that
+        options underlier are received."""
+        self.call_streaming_cb(reqId, TickOptionComputation(tickType,tickAttrib,impliedVol,delta,optPrice,pvDividend,gamma,vega,theta,undPrice))
+    def accountSummary(self, reqId: 'int', account: 'str', tag: 'str', value: 'str', currency: 'str'):
+        """Returns the data from the TWS Account Window Summary tab in
+        response to reqAccountSummary()."""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(AccountSummary(account,tag,value,currency))
+        
+
+    def accountSummaryEnd(self, reqId: 'int'):
+        """This method is called once all account summary data for a
+        given request are received."""
+        self.call_response_cb(reqId)
+    def accountUpdateMulti(self, reqId: 'int', account: 'str', modelCode: 'str', key: 'str', value: 'str', currency: 'str'):
+        """same as updateAccountValue() except it can be for a certain
+        account/model"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(AccountUpdateMulti(account,modelCode,key,value,currency))
+        
+
+    def accountUpdateMultiEnd(self, reqId: 'int'):
+        """same as accountDownloadEnd() except it can be for a certain
+        account/model"""
+        self.call_response_cb(reqId)
+    def fundamentalData(self, reqId: 'int', data: 'str'):
+        """This function is called to receive fundamental
+        market data. The appropriate market data subscription must be set
+        up in Account Management before you can receive this data."""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = data
+        
+        self.call_response_cb(reqId)
+    def headTimestamp(self, reqId: 'int', headTimestamp: 'str'):
+        """returns earliest available data of a type of data for a particular contract"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = headTimestamp
+        
+        self.call_response_cb(reqId)
+    def histogramData(self, reqId: 'int', items: 'ibapi.common.HistogramData'):
+        """returns histogram data for a contract"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = items
+        
+        self.call_response_cb(reqId)
+
+    def historicalData(self, reqId: 'int', bar: 'ibapi.common.BarData'):
+        """ returns the requested historical data bars
+
+        reqId - the request's identifier
+        date  - the bar's date and time (either as a yyyymmss hh:mm:ssformatted
+             string or as system time according to the request)
+        open  - the bar's open point
+        high  - the bar's high point
+        low   - the bar's low point
+        close - the bar's closing point
+        volume - the bar's traded volume if available
+        count - the number of trades during the bar's timespan (only available
+            for TRADES).
+        WAP -   the bar's Weighted Average Price
+        hasGaps  -indicates if the data has gaps or not. """
+        if reqId in self._subscriptions:
+            self.call_streaming_cb(reqId, bar)
+            return
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(bar)
+        
+
+    def historicalDataUpdate(self, reqId: 'int', bar: 'ibapi.common.BarData'):
+        """returns updates in real time when keepUpToDate is set to True"""
+        if reqId in self._subscriptions:
+            self.call_streaming_cb(reqId, bar)
+            return
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(bar)
+        
+
+    def historicalDataEnd(self, reqId: 'int', start: 'str', end: 'str'):
+        """ Marks the ending of the historical bars reception. """
+        self.call_response_cb(reqId)
+
+    def tickPrice(self, reqId: 'int', tickType: 'int', price: 'float', attrib: 'ibapi.common.TickAttrib'):
+        """Market data tick price callback. Handles all price related ticks."""
+        if reqId in self._subscriptions:
+            self.call_streaming_cb(reqId, TickPrice(tickType,price,attrib))
+            return
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(TickPrice(tickType,price,attrib))
+        
+
+    def tickSize(self, reqId: 'int', tickType: 'int', size: 'int'):
+        """Market data tick size callback. Handles all size-related ticks."""
+        if reqId in self._subscriptions:
+            self.call_streaming_cb(reqId, TickSize(tickType,size))
+            return
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(TickSize(tickType,size))
+        
+
+    def tickEFP(self, reqId: 'int', tickType: 'int', basisPoints: 'float', formattedBasisPoints: 'str', totalDividends: 'float', holdDays: 'int', futureLastTradeDate: 'str', dividendImpact: 'float', dividendsToLastTradeDate: 'float'):
+        """"""
+        if reqId in self._subscriptions:
+            self.call_streaming_cb(reqId, TickEFP(tickType,basisPoints,formattedBasisPoints,totalDividends,holdDays,futureLastTradeDate,dividendImpact,dividendsToLastTradeDate))
+            return
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(TickEFP(tickType,basisPoints,formattedBasisPoints,totalDividends,holdDays,futureLastTradeDate,dividendImpact,dividendsToLastTradeDate))
+        
+
+    def tickNews(self, tickerId: 'int', timeStamp: 'int', providerCode: 'str', articleId: 'str', headline: 'str', extraData: 'str'):
+        """ returns news headlines"""
+        if tickerId in self._subscriptions:
+            self.call_streaming_cb(tickerId, TickNews(timeStamp,providerCode,articleId,headline,extraData))
+            return
+        
+        req_state = self._req_state.get(tickerId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(TickNews(timeStamp,providerCode,articleId,headline,extraData))
+        
+
+    def rerouteMktDataReq(self, reqId: 'int', conId: 'int', exchange: 'str'):
+        """returns reroute CFD contract information for market data request"""
+        if reqId in self._subscriptions:
+            self.call_streaming_cb(reqId, RerouteMktDataReq(conId,exchange))
+            return
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(RerouteMktDataReq(conId,exchange))
+        
+
+    def rerouteMktDepthReq(self, reqId: 'int', conId: 'int', exchange: 'str'):
+        """returns reroute CFD contract information for market depth request"""
+        if reqId in self._subscriptions:
+            self.call_streaming_cb(reqId, RerouteMktDepthReq(conId,exchange))
+            return
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(RerouteMktDepthReq(conId,exchange))
+        
+
+    def tickReqParams(self, tickerId: 'int', minTick: 'float', bboExchange: 'str', snapshotPermissions: 'int'):
+        """returns exchange map of a particular contract"""
+        if tickerId in self._subscriptions:
+            self.call_streaming_cb(tickerId, TickReqParams(minTick,bboExchange,snapshotPermissions))
+            return
+        
+        req_state = self._req_state.get(tickerId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(TickReqParams(minTick,bboExchange,snapshotPermissions))
+        
+
+    def deltaNeutralValidation(self, reqId: 'int', deltaNeutralContract: 'ibapi.contract.DeltaNeutralContract'):
+        """Upon accepting a Delta-Neutral RFQ(request for quote), the
+        server sends a deltaNeutralValidation() message with the DeltaNeutralContract
+        structure. If the delta and price fields are empty in the original
+        request, the confirmation will contain the current values from the
+        server. These values are locked when the RFQ is processed and remain
+        locked until the RFQ is canceled."""
+        if reqId in self._subscriptions:
+            self.call_streaming_cb(reqId, DeltaNeutralValidation(deltaNeutralContract))
+            return
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(DeltaNeutralValidation(deltaNeutralContract))
+        
+
+    def tickSnapshotEnd(self, reqId: 'int'):
+        """When requesting market data snapshots, this market will indicate the
+        snapshot reception is finished. """
+        self.call_response_cb(reqId)
+
+    def updateMktDepth(self, reqId: 'int', position: 'int', operation: 'int', side: 'int', price: 'float', size: 'int'):
+        """Returns the order book.
+
+        tickerId -  the request's identifier
+        position -  the order book's row being updated
+        operation - how to refresh the row:
+            0 = insert (insert this new order into the row identified by 'position')
+            1 = update (update the existing order in the row identified by 'position')
+            2 = delete (delete the existing order at the row identified by 'position').
+        side -  0 for ask, 1 for bid
+        price - the order's price
+        size -  the order's size"""
+        self.call_streaming_cb(reqId, UpdateMktDepth(position,operation,side,price,size))
+
+    def updateMktDepthL2(self, reqId: 'int', position: 'int', marketMaker: 'str', operation: 'int', side: 'int', price: 'float', size: 'int', isSmartDepth: 'bool'):
+        """Returns the order book.
+
+        tickerId -  the request's identifier
+        position -  the order book's row being updated
+        marketMaker - the exchange holding the order
+        operation - how to refresh the row:
+            0 = insert (insert this new order into the row identified by 'position')
+            1 = update (update the existing order in the row identified by 'position')
+            2 = delete (delete the existing order at the row identified by 'position').
+        side -  0 for ask, 1 for bid
+        price - the order's price
+        size -  the order's size
+        isSmartDepth - is SMART Depth request"""
+        self.call_streaming_cb(reqId, UpdateMktDepthL2(position,marketMaker,operation,side,price,size,isSmartDepth))
+
+    def updateNewsBulletin(self, msgId: 'int', msgType: 'int', newsMessage: 'str', originExch: 'str'):
+        """ provides IB's bulletins
+        msgId - the bulletin's identifier
+        msgType - one of: 1 - Regular news bulletin 2 - Exchange no longer
+            available for trading 3 - Exchange is available for trading
+        message - the message
+        origExchange -    the exchange where the message comes from.  """
+        self.call_streaming_cb('reqNewsBulletins', UpdateNewsBulletin(msgId,msgType,newsMessage,originExch))
+
+    def orderStatus(self, orderId: 'int', status: 'str', filled: 'float', remaining: 'float', avgFillPrice: 'float', permId: 'int', parentId: 'int', lastFillPrice: 'float', clientId: 'int', whyHeld: 'str', mktCapPrice: 'float'):
+        """This event is called whenever the status of an order changes. It is
+        also fired after reconnecting to TWS if the client has any open orders.
+
+        orderId: OrderId - The order ID that was specified previously in the
+            call to placeOrder()
+        status:str - The order status. Possible values include:
+            PendingSubmit - indicates that you have transmitted the order, but have not  yet received confirmation that it has been accepted by the order destination. NOTE: This order status is not sent by TWS and should be explicitly set by the API developer when an order is submitted.
+            PendingCancel - indicates that you have sent a request to cancel the order but have not yet received cancel confirmation from the order destination. At this point, your order is not confirmed canceled. You may still receive an execution while your cancellation request is pending. NOTE: This order status is not sent by TWS and should be explicitly set by the API developer when an order is canceled.
+            PreSubmitted - indicates that a simulated order type has been accepted by the IB system and that this order has yet to be elected. The order is held in the IB system until the election criteria are met. At that time the order is transmitted to the order destination as specified.
+            Submitted - indicates that your order has been accepted at the order destination and is working.
+            Cancelled - indicates that the balance of your order has been confirmed canceled by the IB system. This could occur unexpectedly when IB or the destination has rejected your order.
+            Filled - indicates that the order has been completely filled.
+            Inactive - indicates that the order has been accepted by the system (simulated orders) or an exchange (native orders) but that currently the order is inactive due to system, exchange or other issues.
+        filled:int - Specifies the number of shares that have been executed.
+            For more information about partial fills, see Order Status for Partial Fills.
+        remaining:int -   Specifies the number of shares still outstanding.
+        avgFillPrice:float - The average price of the shares that have been executed. This parameter is valid only if the filled parameter value is greater than zero. Otherwise, the price parameter will be zero.
+        permId:int -  The TWS id used to identify orders. Remains the same over TWS sessions.
+        parentId:int - The order ID of the parent order, used for bracket and auto trailing stop orders.
+        lastFilledPrice:float - The last price of the shares that have been executed. This parameter is valid only if the filled parameter value is greater than zero. Otherwise, the price parameter will be zero.
+        clientId:int - The ID of the client (or TWS) that placed the order. Note that TWS orders have a fixed clientId and orderId of 0 that distinguishes them from API orders.
+        whyHeld:str - This field is used to identify an order held when TWS is trying to locate shares for a short sell. The value used to indicate this is 'locate'.
+
+        """
+        self.call_streaming_cb(('placeOrder',orderId), OrderStatus(orderId,status,filled,remaining,avgFillPrice,permId,parentId,lastFillPrice,clientId,whyHeld,mktCapPrice))
+    def pnl(self, reqId: 'int', dailyPnL: 'float', unrealizedPnL: 'float', realizedPnL: 'float'):
+        """returns the daily PnL for the account"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = Pnl(dailyPnL,unrealizedPnL,realizedPnL)
+        
+        self.call_response_cb(reqId)
+    def pnlSingle(self, reqId: 'int', pos: 'int', dailyPnL: 'float', unrealizedPnL: 'float', realizedPnL: 'float', value: 'float'):
+        """returns the daily PnL for a single position in the account"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = PnlSingle(pos,dailyPnL,unrealizedPnL,realizedPnL,value)
+        
+        self.call_response_cb(reqId)
+    def position(self, account: 'str', contract: 'ibapi.contract.Contract', position: 'float', avgCost: 'float'):
+        """This event returns real-time positions for all accounts in
+        response to the reqPositions() method."""
+        
+        req_state = self._req_state.get('reqPositions')
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(Position(account,contract,position,avgCost))
+        
+
+    def positionEnd(self):
+        """This is called once all position data for a given request are
+        received and functions as an end marker for the position() data. """
+        self.call_response_cb('reqPositions')
+    def positionMulti(self, reqId: 'int', account: 'str', modelCode: 'str', contract: 'ibapi.contract.Contract', pos: 'float', avgCost: 'float'):
+        """same as position() except it can be for a certain
+        account/model"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(PositionMulti(account,modelCode,contract,pos,avgCost))
+        
+
+    def positionMultiEnd(self, reqId: 'int'):
+        """same as positionEnd() except it can be for a certain
+        account/model"""
+        self.call_response_cb(reqId)
+
+    def realtimeBar(self, reqId: 'int', time: 'int', open_: 'float', high: 'float', low: 'float', close: 'float', volume: 'int', wap: 'float', count: 'int'):
+        """ Updates the real time 5 seconds bars
+
+        reqId - the request's identifier
+        bar.time  - start of bar in unix (or 'epoch') time
+        bar.endTime - for synthetic bars, the end time (requires TWS v964). Otherwise -1.
+        bar.open_  - the bar's open value
+        bar.high  - the bar's high value
+        bar.low   - the bar's low value
+        bar.close - the bar's closing value
+        bar.volume - the bar's traded volume if available
+        bar.WAP   - the bar's Weighted Average Price
+        bar.count - the number of trades during the bar's timespan (only available
+            for TRADES)."""
+        self.call_streaming_cb(reqId, RealtimeBar(time,open_,high,low,close,volume,wap,count))
+    def scannerData(self, reqId: 'int', rank: 'int', contractDetails: 'ibapi.contract.ContractDetails', distance: 'str', benchmark: 'str', projection: 'str', legsStr: 'str'):
+        """ Provides the data resulting from the market scanner request.
+
+        reqid - the request's identifier.
+        rank -  the ranking within the response of this bar.
+        contractDetails - the data's ContractDetails
+        distance -      according to query.
+        benchmark -     according to query.
+        projection -    according to query.
+        legStr - describes the combo legs when the scanner is returning EFP"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(ScannerData(rank,contractDetails,distance,benchmark,projection,legsStr))
+        
+
+    def scannerDataEnd(self, reqId: 'int'):
+        """ Indicates the scanner data reception has terminated.
+
+        reqId - the request's identifier"""
+        self.call_response_cb(reqId)
+
+    def tickByTickAllLast(self, reqId: 'int', tickType: 'int', time: 'int', price: 'float', size: 'int', tickAttribLast: 'ibapi.common.TickAttribLast', exchange: 'str', specialConditions: 'str'):
+        """returns tick-by-tick data for tickType = "Last" or "AllLast" """
+        self.call_streaming_cb(reqId, TickByTickAllLast(tickType,time,price,size,tickAttribLast,exchange,specialConditions))
+
+    def tickByTickBidAsk(self, reqId: 'int', time: 'int', bidPrice: 'float', askPrice: 'float', bidSize: 'int', askSize: 'int', tickAttribBidAsk: 'ibapi.common.TickAttribBidAsk'):
+        """returns tick-by-tick data for tickType = "BidAsk" """
+        self.call_streaming_cb(reqId, TickByTickBidAsk(time,bidPrice,askPrice,bidSize,askSize,tickAttribBidAsk))
+
+    def tickByTickMidPoint(self, reqId: 'int', time: 'int', midPoint: 'float'):
+        """returns tick-by-tick data for tickType = "MidPoint" """
+        self.call_streaming_cb(reqId, TickByTickMidPoint(time,midPoint))
+    def updateAccountValue(self, key: 'str', val: 'str', currency: 'str', accountName: 'str'):
+        """ This function is called only when ReqAccountUpdates on
+        EEClientSocket object has been called. """
+        
+        req_state = self._req_state.get('reqAccountUpdates')
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(UpdateAccountValue(key,val,currency,accountName))
+        
+    def updateAccountTime(self, timeStamp: 'str'):
+        """"""
+        
+        req_state = self._req_state.get('reqAccountUpdates')
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(UpdateAccountTime(timeStamp))
+        
+    def updatePortfolio(self, contract: 'ibapi.contract.Contract', position: 'float', marketPrice: 'float', marketValue: 'float', averageCost: 'float', unrealizedPNL: 'float', realizedPNL: 'float', accountName: 'str'):
+        """This function is called only when reqAccountUpdates on
+        EEClientSocket object has been called."""
+        
+        req_state = self._req_state.get('reqAccountUpdates')
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(UpdatePortfolio(contract,position,marketPrice,marketValue,averageCost,unrealizedPNL,realizedPNL,accountName))
+        
+
+    def accountDownloadEnd(self, accountName: 'str'):
+        """This is called after a batch updateAccountValue() and
+        updatePortfolio() is sent."""
+        self.call_response_cb('reqAccountUpdates')
+    def contractDetails(self, reqId: 'int', contractDetails: 'ibapi.contract.ContractDetails'):
+        """Receives the full contract's definitions. This method will return all
+        contracts matching the requested via EEClientSocket::reqContractDetails.
+        For example, one can obtain the whole option chain with it."""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(contractDetails)
+        
+    def bondContractDetails(self, reqId: 'int', contractDetails: 'ibapi.contract.ContractDetails'):
+        """This function is called when reqContractDetails function
+        has been called for bonds."""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(contractDetails)
+        
+
+    def contractDetailsEnd(self, reqId: 'int'):
+        """This function is called once all contract details for a given
+        request are received. This helps to define the end of an option
+        chain."""
+        self.call_response_cb(reqId)
+    def currentTime(self, time: 'int'):
+        """ Server's current time. This method will receive IB server's system
+        time resulting after the invokation of reqCurrentTime. """
+        
+        req_state = self._req_state.get('reqCurrentTime')
+        if req_state is not None:
+            req_state.response = time
+        
+        self.call_response_cb('reqCurrentTime')
+    def completedOrder(self, contract: 'ibapi.contract.Contract', order: 'ibapi.order.Order', orderState: 'ibapi.order_state.OrderState'):
+        """This function is called to feed in completed orders.
+
+        contract: Contract - The Contract class attributes describe the contract.
+        order: Order - The Order class gives the details of the completed order.
+        orderState: OrderState - The orderState class includes completed order status details."""
+        
+        req_state = self._req_state.get('reqCompletedOrders')
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(CompletedOrder(contract,order,orderState))
+        
+
+    def completedOrdersEnd(self):
+        """This is called at the end of a given request for completed orders."""
+        self.call_response_cb('reqCompletedOrders')
+    def execDetails(self, reqId: 'int', contract: 'ibapi.contract.Contract', execution: 'ibapi.execution.Execution'):
+        """This event is fired when the reqExecutions() functions is
+        invoked, or when an order is filled.  """
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(ExecDetails(contract,execution))
+        
+
+    def execDetailsEnd(self, reqId: 'int'):
+        """This function is called once all executions have been sent to
+        a client in response to reqExecutions()."""
+        self.call_response_cb(reqId)
+    def familyCodes(self, familyCodes: 'List[ibapi.common.FamilyCode]'):
+        """ returns array of family codes """
+        
+        req_state = self._req_state.get('reqFamilyCodes')
+        if req_state is not None:
+            req_state.response = familyCodes
+        
+        self.call_response_cb('reqFamilyCodes')
+    def historicalNews(self, requestId: 'int', time: 'str', providerCode: 'str', articleId: 'str', headline: 'str'):
+        """returns historical news headlines"""
+        
+        req_state = self._req_state.get(requestId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(HistoricalNews(time,providerCode,articleId,headline))
+        
+
+    def historicalNewsEnd(self, requestId: 'int', hasMore: 'bool'):
+        """signals end of historical news"""
+        self.call_response_cb(requestId)
+    def historicalTicks(self, reqId: 'int', ticks: 'List[ibapi.common.HistoricalTick]', done: 'bool'):
+        """returns historical tick data when whatToShow=MIDPOINT"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(HistoricalTicks(ticks))
+        
+        if (done):
+            self.call_response_cb(reqId)
+    def historicalTicksBidAsk(self, reqId: 'int', ticks: 'List[ibapi.common.HistoricalTickBidAsk]', done: 'bool'):
+        """returns historical tick data when whatToShow=BID_ASK"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(HistoricalTicksBidAsk(ticks))
+        
+        if (done):
+            self.call_response_cb(reqId)
+    def historicalTicksLast(self, reqId: 'int', ticks: 'List[ibapi.common.HistoricalTickLast]', done: 'bool'):
+        """returns historical tick data when whatToShow=TRADES"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(HistoricalTicksLast(ticks))
+        
+        if (done):
+            self.call_response_cb(reqId)
+    def nextValidId(self, orderId: 'int'):
+        """ Receives next valid order id."""
+        
+        req_state = self._req_state.get('reqIds')
+        if req_state is not None:
+            req_state.response = orderId
+        
+        self.call_response_cb('reqIds')
+    def managedAccounts(self, accountsList: 'str'):
+        """Receives a comma-separated string with the managed account ids."""
+        
+        req_state = self._req_state.get('reqManagedAccts')
+        if req_state is not None:
+            req_state.response = accountsList
+        
+        self.call_response_cb('reqManagedAccts')
+    def marketRule(self, marketRuleId: 'int', priceIncrements: 'List[ibapi.common.PriceIncrement]'):
+        """returns minimum price increment structure for a particular market rule ID"""
+        
+        req_state = self._req_state.get('reqMarketRule')
+        if req_state is not None:
+            req_state.response = MarketRule(marketRuleId,priceIncrements)
+        
+        self.call_response_cb('reqMarketRule')
+    def symbolSamples(self, reqId: 'int', contractDescriptions: 'List[ibapi.contract.ContractDescription]'):
+        """ returns array of sample contract descriptions """
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = contractDescriptions
+        
+        self.call_response_cb(reqId)
+    def mktDepthExchanges(self, depthMktDataDescriptions: 'List[ibapi.common.DepthMktDataDescription]'):
+        """ returns array of exchanges which return depth to UpdateMktDepthL2"""
+        
+        req_state = self._req_state.get('reqMktDepthExchanges')
+        if req_state is not None:
+            req_state.response = depthMktDataDescriptions
+        
+        self.call_response_cb('reqMktDepthExchanges')
+    def newsArticle(self, requestId: 'int', articleType: 'int', articleText: 'str'):
+        """returns body of news article"""
+        
+        req_state = self._req_state.get('reqNewsArticle')
+        if req_state is not None:
+            req_state.response = NewsArticle(requestId,articleType,articleText)
+        
+        self.call_response_cb('reqNewsArticle')
+    def newsProviders(self, newsProviders: 'List[ibapi.common.NewsProvider]'):
+        """returns available, subscribed API news providers"""
+        
+        req_state = self._req_state.get('reqNewsProviders')
+        if req_state is not None:
+            req_state.response = newsProviders
+        
+        self.call_response_cb('reqNewsProviders')
+    def scannerParameters(self, xml: 'str'):
+        """ Provides the xml-formatted parameters available to create a market
+        scanner.
+
+        xml -   the xml-formatted string with the available parameters."""
+        
+        req_state = self._req_state.get('reqScannerParameters')
+        if req_state is not None:
+            req_state.response = xml
+        
+        self.call_response_cb('reqScannerParameters')
+    def securityDefinitionOptionParameter(self, reqId: 'int', exchange: 'str', underlyingConId: 'int', tradingClass: 'str', multiplier: 'str', expirations: 'Set[str]', strikes: 'Set[float]'):
+        """ Returns the option chain for an underlying on an exchange
+        specified in reqSecDefOptParams There will be multiple callbacks to
+        securityDefinitionOptionParameter if multiple exchanges are specified
+        in reqSecDefOptParams
+
+        reqId - ID of the request initiating the callback
+        underlyingConId - The conID of the underlying security
+        tradingClass -  the option trading class
+        multiplier -    the option multiplier
+        expirations - a list of the expiries for the options of this underlying
+             on this exchange
+        strikes - a list of the possible strikes for options of this underlying
+             on this exchange """
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            if req_state.response is None:
+                req_state.response = []
+            req_state.response.append(SecurityDefinitionOptionParameter(exchange,underlyingConId,tradingClass,multiplier,expirations,strikes))
+        
+
+    def securityDefinitionOptionParameterEnd(self, reqId: 'int'):
+        """ Called when all callbacks to securityDefinitionOptionParameter are
+        complete
+
+        reqId - the ID used in the call to securityDefinitionOptionParameter """
+        self.call_response_cb(reqId)
+    def smartComponents(self, reqId: 'int', smartComponentMap: 'Dict[str, ibapi.common.SmartComponent]'):
+        """returns exchange component mapping"""
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = smartComponentMap
+        
+        self.call_response_cb(reqId)
+    def softDollarTiers(self, reqId: 'int', tiers: 'List[ibapi.order.SoftDollarTier]'):
+        """ Called when receives Soft Dollar Tier configuration information
+
+        reqId - The request ID used in the call to EEClient::reqSoftDollarTiers
+        tiers - Stores a list of SoftDollarTier that contains all Soft Dollar
+            Tiers information """
+        
+        req_state = self._req_state.get(reqId)
+        if req_state is not None:
+            req_state.response = tiers
+        
+        self.call_response_cb(reqId)
+    def receiveFA(self, faData: 'int', cxml: 'str'):
+        """ receives the Financial Advisor's configuration available in the TWS
+
+        faDataType - one of:
+            Groups: offer traders a way to create a group of accounts and apply
+                 a single allocation method to all accounts in the group.
+            Profiles: let you allocate shares on an account-by-account basis
+                using a predefined calculation value.
+            Account Aliases: let you easily identify the accounts by meaningful
+                 names rather than account numbers.
+        faXmlData -  the xml-formatted configuration """
+        
+        req_state = self._req_state.get('requestFA')
+        if req_state is not None:
+            req_state.response = ReceiveFA(faData,cxml)
+        
+        self.call_response_cb('requestFA')
+
+    def displayGroupUpdated(self, reqId: 'int', contractInfo: 'str'):
+        """This is sent by TWS to the API client once after receiving
+        the subscription request subscribeToGroupEvents(), and will be sent
+        again if the selected contract in the subscribed display group has
+        changed.
+
+        requestId - The requestId specified in subscribeToGroupEvents().
+        contractInfo - The encoded value that uniquely represents the contract
+            in IB. Possible values include:
+            none = empty selection
+            contractID@exchange = any non-combination contract.
+                Examples: 8314@SMART for IBM SMART; 8314@ARCA for IBM @ARCA.
+            combo = if any combo is selected.  """
+        self.call_streaming_cb(reqId, contractInfo)
\ No newline at end of file
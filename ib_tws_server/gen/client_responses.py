@@ -0,0 +1,489 @@
+
+from dataclasses import dataclass
+from ib_tws_server.ib_imports import *
+from typing import Dict, List, Union
+
+
+@dataclass(frozen=True)
+class TickOptionComputation:
+    def __init__(self, tickType: 'int'= None, tickAttrib: 'int'= None, impliedVol: 'float'= None, delta: 'float'= None, optPrice: 'float'= None, pvDividend: 'float'= None, gamma: 'float'= None, vega: 'float'= None, theta: 'float'= None, undPrice: 'float'= None):
+        object.__setattr__(self, 'tickType', tickType)
+        object.__setattr__(self, 'tickAttrib', tickAttrib)
+        object.__setattr__(self, 'impliedVol', impliedVol)
+        object.__setattr__(self, 'delta', delta)
+        object.__setattr__(self, 'optPrice', optPrice)
+        object.__setattr__(self, 'pvDividend', pvDividend)
+        object.__setattr__(self, 'gamma', gamma)
+        object.__setattr__(self, 'vega', vega)
+        object.__setattr__(self, 'theta', theta)
+        object.__setattr__(self, 'undPrice', undPrice)
+    tickType: 'int'
+    tickAttrib: 'int'
+    impliedVol: 'float'
+    delta: 'float'
+    optPrice: 'float'
+    pvDividend: 'float'
+    gamma: 'float'
+    vega: 'float'
+    theta: 'float'
+    undPrice: 'float'
+
+@dataclass(frozen=True)
+class TickOptionComputation:
+    def __init__(self, tickType: 'int'= None, tickAttrib: 'int'= None, impliedVol: 'float'= None, delta: 'float'= None, optPrice: 'float'= None, pvDividend: 'float'= None, gamma: 'float'= None, vega: 'float'= None, theta: 'float'= None, undPrice: 'float'= None):
+        object.__setattr__(self, 'tickType', tickType)
+        object.__setattr__(self, 'tickAttrib', tickAttrib)
+        object.__setattr__(self, 'impliedVol', impliedVol)
+        object.__setattr__(self, 'delta', delta)
+        object.__setattr__(self, 'optPrice', optPrice)
+        object.__setattr__(self, 'pvDividend', pvDividend)
+        object.__setattr__(self, 'gamma', gamma)
+        object.__setattr__(self, 'vega', vega)
+        object.__setattr__(self, 'theta', theta)
+        object.__setattr__(self, 'undPrice', undPrice)
+    tickType: 'int'
+    tickAttrib: 'int'
+    impliedVol: 'float'
+    delta: 'float'
+    optPrice: 'float'
+    pvDividend: 'float'
+    gamma: 'float'
+    vega: 'float'
+    theta: 'float'
+    undPrice: 'float'
+
+@dataclass(frozen=True)
+class AccountSummary:
+    def __init__(self, account: 'str'= None, tag: 'str'= None, value: 'str'= None, currency: 'str'= None):
+        object.__setattr__(self, 'account', account)
+        object.__setattr__(self, 'tag', tag)
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'currency', currency)
+    account: 'str'
+    tag: 'str'
+    value: 'str'
+    currency: 'str'
+
+@dataclass(frozen=True)
+class AccountUpdateMulti:
+    def __init__(self, account: 'str'= None, modelCode: 'str'= None, key: 'str'= None, value: 'str'= None, currency: 'str'= None):
+        object.__setattr__(self, 'account', account)
+        object.__setattr__(self, 'modelCode', modelCode)
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'currency', currency)
+    account: 'str'
+    modelCode: 'str'
+    key: 'str'
+    value: 'str'
+    currency: 'str'
+
+@dataclass(frozen=True)
+class TickPrice:
+    def __init__(self, tickType: 'int'= None, price: 'float'= None, attrib: 'ibapi.common.TickAttrib'= None):
+        object.__setattr__(self, 'tickType', tickType)
+        object.__setattr__(self, 'price', price)
+        object.__setattr__(self, 'attrib', attrib)
+    tickType: 'int'
+    price: 'float'
+    attrib: 'ibapi.common.TickAttrib'
+
+@dataclass(frozen=True)
+class TickSize:
+    def __init__(self, tickType: 'int'= None, size: 'int'= None):
+        object.__setattr__(self, 'tickType', tickType)
+        object.__setattr__(self, 'size', size)
+    tickType: 'int'
+    size: 'int'
+
+@dataclass(frozen=True)
+class TickEFP:
+    def __init__(self, tickType: 'int'= None, basisPoints: 'float'= None, formattedBasisPoints: 'str'= None, totalDividends: 'float'= None, holdDays: 'int'= None, futureLastTradeDate: 'str'= None, dividendImpact: 'float'= None, dividendsToLastTradeDate: 'float'= None):
+        object.__setattr__(self, 'tickType', tickType)
+        object.__setattr__(self, 'basisPoints', basisPoints)
+        object.__setattr__(self, 'formattedBasisPoints', formattedBasisPoints)
+        object.__setattr__(self, 'totalDividends', totalDividends)
+        object.__setattr__(self, 'holdDays', holdDays)
+        object.__setattr__(self, 'futureLastTradeDate', futureLastTradeDate)
+        object.__setattr__(self, 'dividendImpact', dividendImpact)
+        object.__setattr__(self, 'dividendsToLastTradeDate', dividendsToLastTradeDate)
+    tickType: 'int'
+    basisPoints: 'float'
+    formattedBasisPoints: 'str'
+    totalDividends: 'float'
+    holdDays: 'int'
+    futureLastTradeDate: 'str'
+    dividendImpact: 'float'
+    dividendsToLastTradeDate: 'float'
+
+@dataclass(frozen=True)
+class TickNews:
+    def __init__(self, timeStamp: 'int'= None, providerCode: 'str'= None, articleId: 'str'= None, headline: 'str'= None, extraData: 'str'= None):
+        object.__setattr__(self, 'timeStamp', timeStamp)
+        object.__setattr__(self, 'providerCode', providerCode)
+        object.__setattr__(self, 'articleId', articleId)
+        object.__setattr__(self, 'headline', headline)
+        object.__setattr__(self, 'extraData', extraData)
+    timeStamp: 'int'
+    providerCode: 'str'
+    articleId: 'str'
+    headline: 'str'
+    extraData: 'str'
+
+@dataclass(frozen=True)
+class RerouteMktDataReq:
+    def __init__(self, conId: 'int'= None, exchange: 'str'= None):
+        object.__setattr__(self, 'conId', conId)
+        object.__setattr__(self, 'exchange', exchange)
+    conId: 'int'
+    exchange: 'str'
+
+@dataclass(frozen=True)
+class RerouteMktDepthReq:
+    def __init__(self, conId: 'int'= None, exchange: 'str'= None):
+        object.__setattr__(self, 'conId', conId)
+        object.__setattr__(self, 'exchange', exchange)
+    conId: 'int'
+    exchange: 'str'
+
+@dataclass(frozen=True)
+class TickReqParams:
+    def __init__(self, minTick: 'float'= None, bboExchange: 'str'= None, snapshotPermissions: 'int'= None):
+        object.__setattr__(self, 'minTick', minTick)
+        object.__setattr__(self, 'bboExchange', bboExchange)
+        object.__setattr__(self, 'snapshotPermissions', snapshotPermissions)
+    minTick: 'float'
+    bboExchange: 'str'
+    snapshotPermissions: 'int'
+
+@dataclass(frozen=True)
+class DeltaNeutralValidation:
+    def __init__(self, deltaNeutralContract: 'ibapi.contract.DeltaNeutralContract'= None):
+        object.__setattr__(self, 'deltaNeutralContract', deltaNeutralContract)
+    deltaNeutralContract: 'ibapi.contract.DeltaNeutralContract'
+
+@dataclass(frozen=True)
+class UpdateMktDepth:
+    def __init__(self, position: 'int'= None, operation: 'int'= None, side: 'int'= None, price: 'float'= None, size: 'int'= None):
+        object.__setattr__(self, 'position', position)
+        object.__setattr__(self, 'operation', operation)
+        object.__setattr__(self, 'side', side)
+        object.__setattr__(self, 'price', price)
+        object.__setattr__(self, 'size', size)
+    position: 'int'
+    operation: 'int'
+    side: 'int'
+    price: 'float'
+    size: 'int'
+
+@dataclass(frozen=True)
+class UpdateMktDepthL2:
+    def __init__(self, position: 'int'= None, marketMaker: 'str'= None, operation: 'int'= None, side: 'int'= None, price: 'float'= None, size: 'int'= None, isSmartDepth: 'bool'= None):
+        object.__setattr__(self, 'position', position)
+        object.__setattr__(self, 'marketMaker', marketMaker)
+        object.__setattr__(self, 'operation', operation)
+        object.__setattr__(self, 'side', side)
+        object.__setattr__(self, 'price', price)
+        object.__setattr__(self, 'size', size)
+        object.__setattr__(self, 'isSmartDepth', isSmartDepth)
+    position: 'int'
+    marketMaker: 'str'
+    operation: 'int'
+    side: 'int'
+    price: 'float'
+    size: 'int'
+    isSmartDepth: 'bool'
+
+@dataclass(frozen=True)
+class UpdateNewsBulletin:
+    def __init__(self, msgId: 'int'= None, msgType: 'int'= None, newsMessage: 'str'= None, originExch: 'str'= None):
+        object.__setattr__(self, 'msgId', msgId)
+        object.__setattr__(self, 'msgType', msgType)
+        object.__setattr__(self, 'newsMessage', newsMessage)
+        object.__setattr__(self, 'originExch', originExch)
+    msgId: 'int'
+    msgType: 'int'
+    newsMessage: 'str'
+    originExch: 'str'
+
+@dataclass(frozen=True)
+class OrderStatus:
+    def __init__(self, orderId: 'int'= None, status: 'str'= None, filled: 'float'= None, remaining: 'float'= None, avgFillPrice: 'float'= None, permId: 'int'= None, parentId: 'int'= None, lastFillPrice: 'float'= None, clientId: 'int'= None, whyHeld: 'str'= None, mktCapPrice: 'float'= None):
+        object.__setattr__(self, 'orderId', orderId)
+        object.__setattr__(self, 'status', status)
+        object.__setattr__(self, 'filled', filled)
+        object.__setattr__(self, 'remaining', remaining)
+        object.__setattr__(self, 'avgFillPrice', avgFillPrice)
+        object.__setattr__(self, 'permId', permId)
+        object.__setattr__(self, 'parentId', parentId)
+        object.__setattr__(self, 'lastFillPrice', lastFillPrice)
+        object.__setattr__(self, 'clientId', clientId)
+        object.__setattr__(self, 'whyHeld', whyHeld)
+        object.__setattr__(self, 'mktCapPrice', mktCapPrice)
+    orderId: 'int'
+    status: 'str'
+    filled: 'float'
+    remaining: 'float'
+    avgFillPrice: 'float'
+    permId: 'int'
+    parentId: 'int'
+    lastFillPrice: 'float'
+    clientId: 'int'
+    whyHeld: 'str'
+    mktCapPrice: 'float'
+
+@dataclass(frozen=True)
+class Pnl:
+    def __init__(self, dailyPnL: 'float'= None, unrealizedPnL: 'float'= None, realizedPnL: 'float'= None):
+        object.__setattr__(self, 'dailyPnL', dailyPnL)
+        object.__setattr__(self, 'unrealizedPnL', unrealizedPnL)
+        object.__setattr__(self, 'realizedPnL', realizedPnL)
+    dailyPnL: 'float'
+    unrealizedPnL: 'float'
+    realizedPnL: 'float'
+
+@dataclass(frozen=True)
+class PnlSingle:
+    def __init__(self, pos: 'int'= None, dailyPnL: 'float'= None, unrealizedPnL: 'float'= None, realizedPnL: 'float'= None, value: 'float'= None):
+        object.__setattr__(self, 'pos', pos)
+        object.__setattr__(self, 'dailyPnL', dailyPnL)
+        object.__setattr__(self, 'unrealizedPnL', unrealizedPnL)
+        object.__setattr__(self, 'realizedPnL', realizedPnL)
+        object.__setattr__(self, 'value', value)
+    pos: 'int'
+    dailyPnL: 'float'
+    unrealizedPnL: 'float'
+    realizedPnL: 'float'
+    value: 'float'
+
+@dataclass(frozen=True)
+class Position:
+    def __init__(self, account: 'str'= None, contract: 'ibapi.contract.Contract'= None, position: 'float'= None, avgCost: 'float'= None):
+        object.__setattr__(self, 'account', account)
+        object.__setattr__(self, 'contract', contract)
+        object.__setattr__(self, 'position', position)
+        object.__setattr__(self, 'avgCost', avgCost)
+    account: 'str'
+    contract: 'ibapi.contract.Contract'
+    position: 'float'
+    avgCost: 'float'
+
+@dataclass(frozen=True)
+class PositionMulti:
+    def __init__(self, account: 'str'= None, modelCode: 'str'= None, contract: 'ibapi.contract.Contract'= None, pos: 'float'= None, avgCost: 'float'= None):
+        object.__setattr__(self, 'account', account)
+        object.__setattr__(self, 'modelCode', modelCode)
+        object.__setattr__(self, 'contract', contract)
+        object.__setattr__(self, 'pos', pos)
+        object.__setattr__(self, 'avgCost', avgCost)
+    account: 'str'
+    modelCode: 'str'
+    contract: 'ibapi.contract.Contract'
+    pos: 'float'
+    avgCost: 'float'
+
+@dataclass(frozen=True)
+class RealtimeBar:
+    def __init__(self, time: 'int'= None, open_: 'float'= None, high: 'float'= None, low: 'float'= None, close: 'float'= None, volume: 'int'= None, wap: 'float'= None, count: 'int'= None):
+        object.__setattr__(self, 'time', time)
+        object.__setattr__(self, 'open_', open_)
+        object.__setattr__(self, 'high', high)
+        object.__setattr__(self, 'low', low)
+        object.__setattr__(self, 'close', close)
+        object.__setattr__(self, 'volume', volume)
+        object.__setattr__(self, 'wap', wap)
+        object.__setattr__(self, 'count', count)
+    time: 'int'
+    open_: 'float'
+    high: 'float'
+    low: 'float'
+    close: 'float'
+    volume: 'int'
+    wap: 'float'
+    count: 'int'
+
+@dataclass(frozen=True)
+class ScannerData:
+    def __init__(self, rank: 'int'= None, contractDetails: 'ibapi.contract.ContractDetails'= None, distance: 'str'= None, benchmark: 'str'= None, projection: 'str'= None, legsStr: 'str'= None):
+        object.__setattr__(self, 'rank', rank)
+        object.__setattr__(self, 'contractDetails', contractDetails)
+        object.__setattr__(self, 'distance', distance)
+        object.__setattr__(self, 'benchmark', benchmark)
+        object.__setattr__(self, 'projection', projection)
+        object.__setattr__(self, 'legsStr', legsStr)
+    rank: 'int'
+    contractDetails: 'ibapi.contract.ContractDetails'
+    distance: 'str'
+    benchmark: 'str'
+    projection: 'str'
+    legsStr: 'str'
+
+@dataclass(frozen=True)
+class TickByTickAllLast:
+    def __init__(self, tickType: 'int'= None, time: 'int'= None, price: 'float'= None, size: 'int'= None, tickAttribLast: 'ibapi.common.TickAttribLast'= None, exchange: 'str'= None, specialConditions: 'str'= None):
+        object.__setattr__(self, 'tickType', tickType)
+        object.__setattr__(self, 'time', time)
+        object.__setattr__(self, 'price', price)
+        object.__setattr__(self, 'size', size)
+        object.__setattr__(self, 'tickAttribLast', tickAttribLast)
+        object.__setattr__(self, 'exchange', exchange)
+        object.__setattr__(self, 'specialConditions', specialConditions)
+    tickType: 'int'
+    time: 'int'
+    price: 'float'
+    size: 'int'
+    tickAttribLast: 'ibapi.common.TickAttribLast'
+    exchange: 'str'
+    specialConditions: 'str'
+
+@dataclass(frozen=True)
+class TickByTickBidAsk:
+    def __init__(self, time: 'int'= None, bidPrice: 'float'= None, askPrice: 'float'= None, bidSize: 'int'= None, askSize: 'int'= None, tickAttribBidAsk: 'ibapi.common.TickAttribBidAsk'= None):
+        object.__setattr__(self, 'time', time)
+        object.__setattr__(self, 'bidPrice', bidPrice)
+        object.__setattr__(self, 'askPrice', askPrice)
+        object.__setattr__(self, 'bidSize', bidSize)
+        object.__setattr__(self, 'askSize', askSize)
+        object.__setattr__(self, 'tickAttribBidAsk', tickAttribBidAsk)
+    time: 'int'
+    bidPrice: 'float'
+    askPrice: 'float'
+    bidSize: 'int'
+    askSize: 'int'
+    tickAttribBidAsk: 'ibapi.common.TickAttribBidAsk'
+
+@dataclass(frozen=True)
+class TickByTickMidPoint:
+    def __init__(self, time: 'int'= None, midPoint: 'float'= None):
+        object.__setattr__(self, 'time', time)
+        object.__setattr__(self, 'midPoint', midPoint)
+    time: 'int'
+    midPoint: 'float'
+
+@dataclass(frozen=True)
+class UpdateAccountValue:
+    def __init__(self, key: 'str'= None, val: 'str'= None, currency: 'str'= None, accountName: 'str'= None):
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'val', val)
+        object.__setattr__(self, 'currency', currency)
+        object.__setattr__(self, 'accountName', accountName)
+    key: 'str'
+    val: 'str'
+    currency: 'str'
+    accountName: 'str'
+
+@dataclass(frozen=True)
+class UpdateAccountTime:
+    def __init__(self, timeStamp: 'str'= None):
+        object.__setattr__(self, 'timeStamp', timeStamp)
+    timeStamp: 'str'
+
+@dataclass(frozen=True)
+class UpdatePortfolio:
+    def __init__(self, contract: 'ibapi.contract.Contract'= None, position: 'float'= None, marketPrice: 'float'= None, marketValue: 'float'= None, averageCost: 'float'= None, unrealizedPNL: 'float'= None, realizedPNL: 'float'= None, accountName: 'str'= None):
+        object.__setattr__(self, 'contract', contract)
+        object.__setattr__(self, 'position', position)
+        object.__setattr__(self, 'marketPrice', marketPrice)
+        object.__setattr__(self, 'marketValue', marketValue)
+        object.__setattr__(self, 'averageCost', averageCost)
+        object.__setattr__(self, 'unrealizedPNL', unrealizedPNL)
+        object.__setattr__(self, 'realizedPNL', realizedPNL)
+        object.__setattr__(self, 'accountName', accountName)
+    contract: 'ibapi.contract.Contract'
+    position: 'float'
+    marketPrice: 'float'
+    marketValue: 'float'
+    averageCost: 'float'
+    unrealizedPNL: 'float'
+    realizedPNL: 'float'
+    accountName: 'str'
+
+@dataclass(frozen=True)
+class CompletedOrder:
+    def __init__(self, contract: 'ibapi.contract.Contract'= None, order: 'ibapi.order.Order'= None, orderState: 'ibapi.order_state.OrderState'= None):
+        object.__setattr__(self, 'contract', contract)
+        object.__setattr__(self, 'order', order)
+        object.__setattr__(self, 'orderState', orderState)
+    contract: 'ibapi.contract.Contract'
+    order: 'ibapi.order.Order'
+    orderState: 'ibapi.order_state.OrderState'
+
+@dataclass(frozen=True)
+class ExecDetails:
+    def __init__(self, contract: 'ibapi.contract.Contract'= None, execution: 'ibapi.execution.Execution'= None):
+        object.__setattr__(self, 'contract', contract)
+        object.__setattr__(self, 'execution', execution)
+    contract: 'ibapi.contract.Contract'
+    execution: 'ibapi.execution.Execution'
+
+@dataclass(frozen=True)
+class HistoricalNews:
+    def __init__(self, time: 'str'= None, providerCode: 'str'= None, articleId: 'str'= None, headline: 'str'= None):
+        object.__setattr__(self, 'time', time)
+        object.__setattr__(self, 'providerCode', providerCode)
+        object.__setattr__(self, 'articleId', articleId)
+        object.__setattr__(self, 'headline', headline)
+    time: 'str'
+    providerCode: 'str'
+    articleId: 'str'
+    headline: 'str'
+
+@dataclass(frozen=True)
+class HistoricalTicks:
+    def __init__(self, ticks: 'List[ibapi.common.HistoricalTick]'= None):
+        object.__setattr__(self, 'ticks', ticks)
+    ticks: 'List[ibapi.common.HistoricalTick]'
+
+@dataclass(frozen=True)
+class HistoricalTicksBidAsk:
+    def __init__(self, ticks: 'List[ibapi.common.HistoricalTickBidAsk]'= None):
+        object.__setattr__(self, 'ticks', ticks)
+    ticks: 'List[ibapi.common.HistoricalTickBidAsk]'
+
+@dataclass(frozen=True)
+class HistoricalTicksLast:
+    def __init__(self, ticks: 'List[ibapi.common.HistoricalTickLast]'= None):
+        object.__setattr__(self, 'ticks', ticks)
+    ticks: 'List[ibapi.common.HistoricalTickLast]'
+
+@dataclass(frozen=True)
+class MarketRule:
+    def __init__(self, marketRuleId: 'int'= None, priceIncrements: 'List[ibapi.common.PriceIncrement]'= None):
+        object.__setattr__(self, 'marketRuleId', marketRuleId)
+        object.__setattr__(self, 'priceIncrements', priceIncrements)
+    marketRuleId: 'int'
+    priceIncrements: 'List[ibapi.common.PriceIncrement]'
+
+@dataclass(frozen=True)
+class NewsArticle:
+    def __init__(self, requestId: 'int'= None, articleType: 'int'= None, articleText: 'str'= None):
+        object.__setattr__(self, 'requestId', requestId)
+        object.__setattr__(self, 'articleType', articleType)
+        object.__setattr__(self, 'articleText', articleText)
+    requestId: 'int'
+    articleType: 'int'
+    articleText: 'str'
+
+@dataclass(frozen=True)
+class SecurityDefinitionOptionParameter:
+    def __init__(self, exchange: 'str'= None, underlyingConId: 'int'= None, tradingClass: 'str'= None, multiplier: 'str'= None, expirations: 'Set[str]'= None, strikes: 'Set[float]'= None):
+        object.__setattr__(self, 'exchange', exchange)
+        object.__setattr__(self, 'underlyingConId', underlyingConId)
+        object.__setattr__(self, 'tradingClass', tradingClass)
+        object.__setattr__(self, 'multiplier', multiplier)
+        object.__setattr__(self, 'expirations', expirations)
+        object.__setattr__(self, 'strikes', strikes)
+    exchange: 'str'
+    underlyingConId: 'int'
+    tradingClass: 'str'
+    multiplier: 'str'
+    expirations: 'Set[str]'
+    strikes: 'Set[float]'
+
+@dataclass(frozen=True)
+class ReceiveFA:
+    def __init__(self, faData: 'int'= None, cxml: 'str'= None):
+        object.__setattr__(self, 'faData', faData)
+        object.__setattr__(self, 'cxml', cxml)
+    faData: 'int'
+    cxml: 'str'
@@ -0,0 +1,809 @@
+
+from ariadne import QueryType, SubscriptionType, UnionType
+from graphql import GraphQLError
+from ib_tws_server.gen.asyncio_client import AsyncioClient
+from ib_tws_server.gen.client_responses import *
+from ib_tws_server.graphql.field_cache import FieldCache
+from ib_tws_server.graphql.request_loader import request_loader
+from ib_tws_server.graphql.subscription_registry import SubscriptionRegistry, tick_type_key
+from ib_tws_server.ib_imports import *
+from typing import AsyncGenerator
+
+g_client: AsyncioClient = None
+g_subscriptions = SubscriptionRegistry()
+g_field_cache = FieldCache()
+query = QueryType()
+subscription = SubscriptionType()
+
+def graphql_resolver_set_client(client: AsyncioClient):
+    global g_client
+    g_client = client
+
+def convert_ExecutionFilterInput(d: dict) -> 'ibapi.execution.ExecutionFilter':
+    o = ibapi.execution.ExecutionFilter()
+    if 'acctCode' in d:
+        o.acctCode = d['acctCode']
+    if 'clientId' in d:
+        o.clientId = d['clientId']
+    if 'exchange' in d:
+        o.exchange = d['exchange']
+    if 'secType' in d:
+        o.secType = d['secType']
+    if 'side' in d:
+        o.side = d['side']
+    if 'symbol' in d:
+        o.symbol = d['symbol']
+    if 'time' in d:
+        o.time = d['time']
+    return o
+
+def convert_ContractInput(d: dict) -> 'ibapi.contract.Contract':
+    o = ibapi.contract.Contract()
+    if 'comboLegs' in d:
+        o.comboLegs = None if d['comboLegs'] is None else [ None if i is None else convert_ComboLegInput(i) for i in d['comboLegs'] ]
+    if 'comboLegsDescrip' in d:
+        o.comboLegsDescrip = d['comboLegsDescrip']
+    if 'conId' in d:
+        o.conId = d['conId']
+    if 'currency' in d:
+        o.currency = d['currency']
+    if 'deltaNeutralContract' in d:
+        o.deltaNeutralContract = None if d['deltaNeutralContract'] is None else convert_DeltaNeutralContractInput(d['deltaNeutralContract'])
+    if 'exchange' in d:
+        o.exchange = d['exchange']
+    if 'includeExpired' in d:
+        o.includeExpired = d['includeExpired']
+    if 'lastTradeDateOrContractMonth' in d:
+        o.lastTradeDateOrContractMonth = d['lastTradeDateOrContractMonth']
+    if 'localSymbol' in d:
+        o.localSymbol = d['localSymbol']
+    if 'multiplier' in d:
+        o.multiplier = d['multiplier']
+    if 'primaryExchange' in d:
+        o.primaryExchange = d['primaryExchange']
+    if 'right' in d:
+        o.right = d['right']
+    if 'secId' in d:
+        o.secId = d['secId']
+    if 'secIdType' in d:
+        o.secIdType = d['secIdType']
+    if 'secType' in d:
+        o.secType = d['secType']
+    if 'strike' in d:
+        o.strike = d['strike']
+    if 'symbol' in d:
+        o.symbol = d['symbol']
+    if 'tradingClass' in d:
+        o.tradingClass = d['tradingClass']
+    return o
+
+def convert_TagValueInput(d: dict) -> 'ibapi.tag_value.TagValue':
+    o = ibapi.tag_value.TagValue()
+    if 'tag' in d:
+        o.tag = d['tag']
+    if 'value' in d:
+        o.value = d['value']
+    return o
+
+def convert_DeltaNeutralContractInput(d: dict) -> 'ibapi.contract.DeltaNeutralContract':
+    o = ibapi.contract.DeltaNeutralContract()
+    if 'conId' in d:
+        o.conId = d['conId']
+    if 'delta' in d:
+        o.delta = d['delta']
+    if 'price' in d:
+        o.price = d['price']
+    return o
+
+def convert_ScannerSubscriptionInput(d: dict) -> 'ibapi.scanner.ScannerSubscription':
+    o = ibapi.scanner.ScannerSubscription()
+    if 'abovePrice' in d:
+        o.abovePrice = d['abovePrice']
+    if 'aboveVolume' in d:
+        o.aboveVolume = d['aboveVolume']
+    if 'averageOptionVolumeAbove' in d:
+        o.averageOptionVolumeAbove = d['averageOptionVolumeAbove']
+    if 'belowPrice' in d:
+        o.belowPrice = d['belowPrice']
+    if 'couponRateAbove' in d:
+        o.couponRateAbove = d['couponRateAbove']
+    if 'couponRateBelow' in d:
+        o.couponRateBelow = d['couponRateBelow']
+    if 'excludeConvertible' in d:
+        o.excludeConvertible = d['excludeConvertible']
+    if 'instrument' in d:
+        o.instrument = d['instrument']
+    if 'locationCode' in d:
+        o.locationCode = d['locationCode']
+    if 'marketCapAbove' in d:
+        o.marketCapAbove = d['marketCapAbove']
+    if 'marketCapBelow' in d:
+        o.marketCapBelow = d['marketCapBelow']
+    if 'maturityDateAbove' in d:
+        o.maturityDateAbove = d['maturityDateAbove']
+    if 'maturityDateBelow' in d:
+        o.maturityDateBelow = d['maturityDateBelow']
+    if 'moodyRatingAbove' in d:
+        o.moodyRatingAbove = d['moodyRatingAbove']
+    if 'moodyRatingBelow' in d:
+        o.moodyRatingBelow = d['moodyRatingBelow']
+    if 'numberOfRows' in d:
+        o.numberOfRows = d['numberOfRows']
+    if 'scanCode' in d:
+        o.scanCode = d['scanCode']
+    if 'scannerSettingPairs' in d:
+        o.scannerSettingPairs = d['scannerSettingPairs']
+    if 'spRatingAbove' in d:
+        o.spRatingAbove = d['spRatingAbove']
+    if 'spRatingBelow' in d:
+        o.spRatingBelow = d['spRatingBelow']
+    if 'stockTypeFilter' in d:
+        o.stockTypeFilter = d['stockTypeFilter']
+    return o
+
+def convert_ComboLegInput(d: dict) -> 'ibapi.contract.ComboLeg':
+    o = ibapi.contract.ComboLeg()
+    if 'action' in d:
+        o.action = d['action']
+    if 'conId' in d:
+        o.conId = d['conId']
+    if 'designatedLocation' in d:
+        o.designatedLocation = d['designatedLocation']
+    if 'exchange' in d:
+        o.exchange = d['exchange']
+    if 'exemptCode' in d:
+        o.exemptCode = d['exemptCode']
+    if 'openClose' in d:
+        o.openClose = d['openClose']
+    if 'ratio' in d:
+        o.ratio = d['ratio']
+    if 'shortSaleSlot' in d:
+        o.shortSaleSlot = d['shortSaleSlot']
+    return o
+
+def convert_OrderInput(d: dict) -> 'ibapi.order.Order':
+    o = ibapi.order.Order()
+    if 'account' in d:
+        o.account = d['account']
+    if 'action' in d:
+        o.action = d['action']
+    if 'activeStartTime' in d:
+        o.activeStartTime = d['activeStartTime']
+    if 'activeStopTime' in d:
+        o.activeStopTime = d['activeStopTime']
+    if 'adjustableTrailingUnit' in d:
+        o.adjustableTrailingUnit = d['adjustableTrailingUnit']
+    if 'adjustedOrderType' in d:
+        o.adjustedOrderType = d['adjustedOrderType']
+    if 'adjustedStopLimitPrice' in d:
+        o.adjustedStopLimitPrice = d['adjustedStopLimitPrice']
+    if 'adjustedStopPrice' in d:
+        o.adjustedStopPrice = d['adjustedStopPrice']
+    if 'adjustedTrailingAmount' in d:
+        o.adjustedTrailingAmount = d['adjustedTrailingAmount']
+    if 'algoId' in d:
+        o.algoId = d['algoId']
+    if 'algoParams' in d:
+        o.algoParams = None if d['algoParams'] is None else [ None if i is None else convert_TagValueInput(i) for i in d['algoParams'] ]
+    if 'algoStrategy' in d:
+        o.algoStrategy = d['algoStrategy']
+    if 'allOrNone' in d:
+        o.allOrNone = d['allOrNone']
+    if 'auctionStrategy' in d:
+        o.auctionStrategy = d['auctionStrategy']
+    if 'autoCancelDate' in d:
+        o.autoCancelDate = d['autoCancelDate']
+    if 'autoCancelParent' in d:
+        o.autoCancelParent = d['autoCancelParent']
+    if 'auxPrice' in d:
+        o.auxPrice = d['auxPrice']
+    if 'basisPoints' in d:
+        o.basisPoints = d['basisPoints']
+    if 'basisPointsType' in d:
+        o.basisPointsType = d['basisPointsType']
+    if 'blockOrder' in d:
+        o.blockOrder = d['blockOrder']
+    if 'cashQty' in d:
+        o.cashQty = d['cashQty']
+    if 'clearingAccount' in d:
+        o.clearingAccount = d['clearingAccount']
+    if 'clearingIntent' in d:
+        o.clearingIntent = d['clearingIntent']
+    if 'clientId' in d:
+        o.clientId = d['clientId']
+    if 'conditions' in d:
+        o.conditions = None if d['conditions'] is None else [ None if i is None else convert_OrderConditionInput(i) for i in d['conditions'] ]
+    if 'conditionsCancelOrder' in d:
+        o.conditionsCancelOrder = d['conditionsCancelOrder']
+    if 'conditionsIgnoreRth' in d:
+        o.conditionsIgnoreRth = d['conditionsIgnoreRth']
+    if 'continuousUpdate' in d:
+        o.continuousUpdate = d['continuousUpdate']
+    if 'delta' in d:
+        o.delta = d['delta']
+    if 'deltaNeutralAuxPrice' in d:
+        o.deltaNeutralAuxPrice = d['deltaNeutralAuxPrice']
+    if 'deltaNeutralClearingAccount' in d:
+        o.deltaNeutralClearingAccount = d['deltaNeutralClearingAccount']
+    if 'deltaNeutralClearingIntent' in d:
+        o.deltaNeutralClearingIntent = d['deltaNeutralClearingIntent']
+    if 'deltaNeutralConId' in d:
+        o.deltaNeutralConId = d['deltaNeutralConId']
+    if 'deltaNeutralDesignatedLocation' in d:
+        o.deltaNeutralDesignatedLocation = d['deltaNeutralDesignatedLocation']
+    if 'deltaNeutralOpenClose' in d:
+        o.deltaNeutralOpenClose = d['deltaNeutralOpenClose']
+    if 'deltaNeutralOrderType' in d:
+        o.deltaNeutralOrderType = d['deltaNeutralOrderType']
+    if 'deltaNeutralSettlingFirm' in d:
+        o.deltaNeutralSettlingFirm = d['deltaNeutralSettlingFirm']
+    if 'deltaNeutralShortSale' in d:
+        o.deltaNeutralShortSale = d['deltaNeutralShortSale']
+    if 'deltaNeutralShortSaleSlot' in d:
+        o.deltaNeutralShortSaleSlot = d['deltaNeutralShortSaleSlot']
+    if 'designatedLocation' in d:
+        o.designatedLocation = d['designatedLocation']
+    if 'discretionaryAmt' in d:
+        o.discretionaryAmt = d['discretionaryAmt']
+    if 'discretionaryUpToLimitPrice' in d:
+        o.discretionaryUpToLimitPrice = d['discretionaryUpToLimitPrice']
+    if 'displaySize' in d:
+        o.displaySize = d['displaySize']
+    if 'dontUseAutoPriceForHedge' in d:
+        o.dontUseAutoPriceForHedge = d['dontUseAutoPriceForHedge']
+    if 'eTradeOnly' in d:
+        o.eTradeOnly = d['eTradeOnly']
+    if 'exemptCode' in d:
+        o.exemptCode = d['exemptCode']
+    if 'extOperator' in d:
+        o.extOperator = d['extOperator']
+    if 'faGroup' in d:
+        o.faGroup = d['faGroup']
+    if 'faMethod' in d:
+        o.faMethod = d['faMethod']
+    if 'faPercentage' in d:
+        o.faPercentage = d['faPercentage']
+    if 'faProfile' in d:
+        o.faProfile = d['faProfile']
+    if 'filledQuantity' in d:
+        o.filledQuantity = d['filledQuantity']
+    if 'firmQuoteOnly' in d:
+        o.firmQuoteOnly = d['firmQuoteOnly']
+    if 'goodAfterTime' in d:
+        o.goodAfterTime = d['goodAfterTime']
+    if 'goodTillDate' in d:
+        o.goodTillDate = d['goodTillDate']
+    if 'hedgeParam' in d:
+        o.hedgeParam = d['hedgeParam']
+    if 'hedgeType' in d:
+        o.hedgeType = d['hedgeType']
+    if 'hidden' in d:
+        o.hidden = d['hidden']
+    if 'imbalanceOnly' in d:
+        o.imbalanceOnly = d['imbalanceOnly']
+    if 'isOmsContainer' in d:
+        o.isOmsContainer = d['isOmsContainer']
+    if 'isPeggedChangeAmountDecrease' in d:
+        o.isPeggedChangeAmountDecrease = d['isPeggedChangeAmountDecrease']
+    if 'lmtPrice' in d:
+        o.lmtPrice = d['lmtPrice']
+    if 'lmtPriceOffset' in d:
+        o.lmtPriceOffset = d['lmtPriceOffset']
+    if 'mifid2DecisionAlgo' in d:
+        o.mifid2DecisionAlgo = d['mifid2DecisionAlgo']
+    if 'mifid2DecisionMaker' in d:
+        o.mifid2DecisionMaker = d['mifid2DecisionMaker']
+    if 'mifid2ExecutionAlgo' in d:
+        o.mifid2ExecutionAlgo = d['mifid2ExecutionAlgo']
+    if 'mifid2ExecutionTrader' in d:
+        o.mifid2ExecutionTrader = d['mifid2ExecutionTrader']
+    if 'minQty' in d:
+        o.minQty = d['minQty']
+    if 'modelCode' in d:
+        o.modelCode = d['modelCode']
+    if 'nbboPriceCap' in d:
+        o.nbboPriceCap = d['nbboPriceCap']
+    if 'notHeld' in d:
+        o.notHeld = d['notHeld']
+    if 'ocaGroup' in d:
+        o.ocaGroup = d['ocaGroup']
+    if 'ocaType' in d:
+        o.ocaType = d['ocaType']
+    if 'openClose' in d:
+        o.openClose = d['openClose']
+    if 'optOutSmartRouting' in d:
+        o.optOutSmartRouting = d['optOutSmartRouting']
+    if 'orderComboLegs' in d:
+        o.orderComboLegs = None if d['orderComboLegs'] is None else [ None if i is None else convert_OrderComboLegInput(i) for i in d['orderComboLegs'] ]
+    if 'orderId' in d:
+        o.orderId = d['orderId']
+    if 'orderMiscOptions' in d:
+        o.orderMiscOptions = None if d['orderMiscOptions'] is None else [ None if i is None else convert_TagValueInput(i) for i in d['orderMiscOptions'] ]
+    if 'orderRef' in d:
+        o.orderRef = d['orderRef']
+    if 'orderType' in d:
+        o.orderType = d['orderType']
+    if 'origin' in d:
+        o.origin = d['origin']
+    if 'outsideRth' in d:
+        o.outsideRth = d['outsideRth']
+    if 'overridePercentageConstraints' in d:
+        o.overridePercentageConstraints = d['overridePercentageConstraints']
+    if 'parentId' in d:
+        o.parentId = d['parentId']
+    if 'parentPermId' in d:
+        o.parentPermId = d['parentPermId']
+    if 'peggedChangeAmount' in d:
+        o.peggedChangeAmount = d['peggedChangeAmount']
+    if 'percentOffset' in d:
+        o.percentOffset = d['percentOffset']
+    if 'permId' in d:
+        o.permId = d['permId']
+    if 'randomizePrice' in d:
+        o.randomizePrice = d['randomizePrice']
+    if 'randomizeSize' in d:
+        o.randomizeSize = d['randomizeSize']
+    if 'refFuturesConId' in d:
+        o.refFuturesConId = d['refFuturesConId']
+    if 'referenceChangeAmount' in d:
+        o.referenceChangeAmount = d['referenceChangeAmount']
+    if 'referenceContractId' in d:
+        o.referenceContractId = d['referenceContractId']
+    if 'referenceExchangeId' in d:
+        o.referenceExchangeId = d['referenceExchangeId']
+    if 'referencePriceType' in d:
+        o.referencePriceType = d['referencePriceType']
+    if 'routeMarketableToBbo' in d:
+        o.routeMarketableToBbo = d['routeMarketableToBbo']
+    if 'rule80A' in d:
+        o.rule80A = d['rule80A']
+    if 'scaleAutoReset' in d:
+        o.scaleAutoReset = d['scaleAutoReset']
+    if 'scaleInitFillQty' in d:
+        o.scaleInitFillQty = d['scaleInitFillQty']
+    if 'scaleInitLevelSize' in d:
+        o.scaleInitLevelSize = d['scaleInitLevelSize']
+    if 'scaleInitPosition' in d:
+        o.scaleInitPosition = d['scaleInitPosition']
+    if 'scalePriceAdjustInterval' in d:
+        o.scalePriceAdjustInterval = d['scalePriceAdjustInterval']
+    if 'scalePriceAdjustValue' in d:
+        o.scalePriceAdjustValue = d['scalePriceAdjustValue']
+    if 'scalePriceIncrement' in d:
+        o.scalePriceIncrement = d['scalePriceIncrement']
+    if 'scaleProfitOffset' in d:
+        o.scaleProfitOffset = d['scaleProfitOffset']
+    if 'scaleRandomPercent' in d:
+        o.scaleRandomPercent = d['scaleRandomPercent']
+    if 'scaleSubsLevelSize' in d:
+        o.scaleSubsLevelSize = d['scaleSubsLevelSize']
+    if 'scaleTable' in d:
+        o.scaleTable = d['scaleTable']
+    if 'settlingFirm' in d:
+        o.settlingFirm = d['settlingFirm']
+    if 'shareholder' in d:
+        o.shareholder = d['shareholder']
+    if 'shortSaleSlot' in d:
+        o.shortSaleSlot = d['shortSaleSlot']
+    if 'smartComboRoutingParams' in d:
+        o.smartComboRoutingParams = None if d['smartComboRoutingParams'] is None else [ None if i is None else convert_TagValueInput(i) for i in d['smartComboRoutingParams'] ]
+    if 'softDollarTier' in d:
+        o.softDollarTier = None if d['softDollarTier'] is None else convert_SoftDollarTierInput(d['softDollarTier'])
+    if 'solicited' in d:
+        o.solicited = d['solicited']
+    if 'startingPrice' in d:
+        o.startingPrice = d['startingPrice']
+    if 'stockRangeLower' in d:
+        o.stockRangeLower = d['stockRangeLower']
+    if 'stockRangeUpper' in d:
+        o.stockRangeUpper = d['stockRangeUpper']
+    if 'stockRefPrice' in d:
+        o.stockRefPrice = d['stockRefPrice']
+    if 'sweepToFill' in d:
+        o.sweepToFill = d['sweepToFill']
+    if 'tif' in d:
+        o.tif = d['tif']
+    if 'totalQuantity' in d:
+        o.totalQuantity = d['totalQuantity']
+    if 'trailStopPrice' in d:
+        o.trailStopPrice = d['trailStopPrice']
+    if 'trailingPercent' in d:
+        o.trailingPercent = d['trailingPercent']
+    if 'transmit' in d:
+        o.transmit = d['transmit']
+    if 'triggerMethod' in d:
+        o.triggerMethod = d['triggerMethod']
+    if 'triggerPrice' in d:
+        o.triggerPrice = d['triggerPrice']
+    if 'usePriceMgmtAlgo' in d:
+        o.usePriceMgmtAlgo = d['usePriceMgmtAlgo']
+    if 'volatility' in d:
+        o.volatility = d['volatility']
+    if 'volatilityType' in d:
+        o.volatilityType = d['volatilityType']
+    if 'whatIf' in d:
+        o.whatIf = d['whatIf']
+    return o
+
+def convert_OrderConditionInput(d: dict) -> 'ibapi.order_condition.OrderCondition':
+    o = ibapi.order_condition.Create(d['condType'])
+    if o is None:
+        raise GraphQLError(f"Unknown condType {d['condType']} of ib_OrderConditionInput")
+    if 'isConjunctionConnection' in d:
+        o.isConjunctionConnection = d['isConjunctionConnection']
+    if 'secType' in d:
+        o.secType = d['secType']
+    if 'exchange' in d:
+        o.exchange = d['exchange']
+    if 'symbol' in d:
+        o.symbol = d['symbol']
+    if 'isMore' in d:
+        o.isMore = d['isMore']
+    if 'percent' in d:
+        o.percent = d['percent']
+    if 'conId' in d:
+        o.conId = d['conId']
+    if 'time' in d:
+        o.time = d['time']
+    if 'price' in d:
+        o.price = d['price']
+    if 'triggerMethod' in d:
+        o.triggerMethod = d['triggerMethod']
+    if 'changePercent' in d:
+        o.changePercent = d['changePercent']
+    if 'volume' in d:
+        o.volume = d['volume']
+    return o
+
+def convert_SoftDollarTierInput(d: dict) -> 'ibapi.softdollartier.SoftDollarTier':
+    o = ibapi.softdollartier.SoftDollarTier()
+    if 'displayName' in d:
+        o.displayName = d['displayName']
+    if 'name' in d:
+        o.name = d['name']
+    if 'val' in d:
+        o.val = d['val']
+    return o
+
+def convert_OrderComboLegInput(d: dict) -> 'ibapi.order.OrderComboLeg':
+    o = ibapi.order.OrderComboLeg()
+    if 'price' in d:
+        o.price = d['price']
+    return o
+
+@query.field("ib_queryDisplayGroups")
+async def resolve_ib_queryDisplayGroups(obj,info):
+    
+    return await request_loader(info, g_client).load('queryDisplayGroups')
+@subscription.source("ib_calculateImpliedVolatility")
+async def source_ib_calculateImpliedVolatility(obj,info,contract: ibapi.contract.Contract,optionPrice: float,underPrice: float,implVolOptions: List[ibapi.tag_value.TagValue]) -> AsyncGenerator:
+    
+    contract = convert_ContractInput(contract)
+    implVolOptions = [ convert_TagValueInput(val) for val in implVolOptions ]
+    return await g_client.calculateImpliedVolatility(contract,optionPrice,underPrice,implVolOptions)
+
+@subscription.field("ib_calculateImpliedVolatility")
+async def resolve_ib_calculateImpliedVolatility(obj,info,contract: ibapi.contract.Contract,optionPrice: float,underPrice: float,implVolOptions: List[ibapi.tag_value.TagValue]):
+    return obj
+
+@subscription.source("ib_calculateOptionPrice")
+async def source_ib_calculateOptionPrice(obj,info,contract: ibapi.contract.Contract,volatility: float,underPrice: float,optPrcOptions: List[ibapi.tag_value.TagValue]) -> AsyncGenerator:
+    
+    contract = convert_ContractInput(contract)
+    optPrcOptions = [ convert_TagValueInput(val) for val in optPrcOptions ]
+    return await g_client.calculateOptionPrice(contract,volatility,underPrice,optPrcOptions)
+
+@subscription.field("ib_calculateOptionPrice")
+async def resolve_ib_calculateOptionPrice(obj,info,contract: ibapi.contract.Contract,volatility: float,underPrice: float,optPrcOptions: List[ibapi.tag_value.TagValue]):
+    return obj
+
+@query.field("ib_reqAccountSummary")
+async def resolve_ib_reqAccountSummary(obj,info,groupName: str,tags: str):
+    
+    return await request_loader(info, g_client).load('reqAccountSummary',groupName,tags)
+@query.field("ib_reqAccountUpdatesMulti")
+async def resolve_ib_reqAccountUpdatesMulti(obj,info,account: str,modelCode: str,ledgerAndNLV: bool):
+    
+    return await request_loader(info, g_client).load('reqAccountUpdatesMulti',account,modelCode,ledgerAndNLV)
+@query.field("ib_reqFundamentalData")
+async def resolve_ib_reqFundamentalData(obj,info,contract: ibapi.contract.Contract,reportType: str,fundamentalDataOptions: List[ibapi.tag_value.TagValue]):
+    
+    contract = convert_ContractInput(contract)
+    fundamentalDataOptions = [ convert_TagValueInput(val) for val in fundamentalDataOptions ]
+    return await request_loader(info, g_client).load('reqFundamentalData',contract,reportType,fundamentalDataOptions)
+@query.field("ib_reqHeadTimeStamp")
+async def resolve_ib_reqHeadTimeStamp(obj,info,contract: ibapi.contract.Contract,whatToShow: str,useRTH: int,formatDate: int):
+    
+    contract = convert_ContractInput(contract)
+    return await request_loader(info, g_client).load('reqHeadTimeStamp',contract,whatToShow,useRTH,formatDate)
+@query.field("ib_reqHistogramData")
+async def resolve_ib_reqHistogramData(obj,info,contract: ibapi.contract.Contract,useRTH: bool,timePeriod: str):
+    
+    contract = convert_ContractInput(contract)
+    return await request_loader(info, g_client).load('reqHistogramData',contract,useRTH,timePeriod)
+@query.field("ib_reqHistoricalData")
+async def resolve_ib_reqHistoricalData(obj,info,contract: ibapi.contract.Contract,endDateTime: str,durationStr: str,barSizeSetting: str,whatToShow: str,useRTH: int,formatDate: int,chartOptions: List[ibapi.tag_value.TagValue]):
+    
+    contract = convert_ContractInput(contract)
+    chartOptions = [ convert_TagValueInput(val) for val in chartOptions ]
+    return await request_loader(info, g_client).load('reqHistoricalData',contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions)
+@subscription.source("ib_reqHistoricalData")
+async def source_ib_reqHistoricalData(obj,info,contract: ibapi.contract.Contract,endDateTime: str,durationStr: str,barSizeSetting: str,whatToShow: str,useRTH: int,formatDate: int,chartOptions: List[ibapi.tag_value.TagValue]) -> AsyncGenerator:
+    
+    contract = convert_ContractInput(contract)
+    chartOptions = [ convert_TagValueInput(val) for val in chartOptions ]
+    return await g_client.reqHistoricalDataAsSubscription(contract,endDateTime,durationStr,barSizeSetting,whatToShow,useRTH,formatDate,chartOptions)
+
+@subscription.field("ib_reqHistoricalData")
+async def resolve_ib_reqHistoricalData(obj,info,contract: ibapi.contract.Contract,endDateTime: str,durationStr: str,barSizeSetting: str,whatToShow: str,useRTH: int,formatDate: int,chartOptions: List[ibapi.tag_value.TagValue]):
+    return obj
+
+@query.field("ib_reqMktData")
+async def resolve_ib_reqMktData(obj,info,contract: ibapi.contract.Contract,genericTickList: str,regulatorySnapshot: bool,mktDataOptions: List[ibapi.tag_value.TagValue]):
+    
+    contract = convert_ContractInput(contract)
+    mktDataOptions = [ convert_TagValueInput(val) for val in mktDataOptions ]
+    return await request_loader(info, g_client).load('reqMktData',contract,genericTickList,regulatorySnapshot,mktDataOptions)
+@subscription.source("ib_reqMktData")
+async def source_ib_reqMktData(obj,info,contract: ibapi.contract.Contract,genericTickList: str,regulatorySnapshot: bool,mktDataOptions: List[ibapi.tag_value.TagValue]) -> AsyncGenerator:
+    
+    contract = convert_ContractInput(contract)
+    mktDataOptions = [ convert_TagValueInput(val) for val in mktDataOptions ]
+    return await g_subscriptions.subscribe(('reqMktDataAsSubscription',contract,genericTickList,regulatorySnapshot,mktDataOptions), lambda: g_client.reqMktDataAsSubscription(contract,genericTickList,regulatorySnapshot,mktDataOptions), tick_type_key)
+
+@subscription.field("ib_reqMktData")
+async def resolve_ib_reqMktData(obj,info,contract: ibapi.contract.Contract,genericTickList: str,regulatorySnapshot: bool,mktDataOptions: List[ibapi.tag_value.TagValue]):
+    return obj
+
+union_ib_ReqMktDataResponse = UnionType("ib_ReqMktDataResponse")
+@union_ib_ReqMktDataResponse.type_resolver
+def resolve_ib_ReqMktDataResponse(obj, *_):
+    if isinstance(obj, TickPrice):
+        return "ib_TickPrice"
+
+    elif isinstance(obj, TickSize):
+        return "ib_TickSize"
+
+    elif isinstance(obj, TickEFP):
+        return "ib_TickEFP"
+
+    elif isinstance(obj, TickNews):
+        return "ib_TickNews"
+
+    elif isinstance(obj, RerouteMktDataReq):
+        return "ib_RerouteMktDataReq"
+
+    elif isinstance(obj, RerouteMktDepthReq):
+        return "ib_RerouteMktDepthReq"
+
+    elif isinstance(obj, TickReqParams):
+        return "ib_TickReqParams"
+
+    elif isinstance(obj, DeltaNeutralValidation):
+        return "ib_DeltaNeutralValidation"
+
+    return None
+
+@subscription.source("ib_reqMktDepth")
+async def source_ib_reqMktDepth(obj,info,contract: ibapi.contract.Contract,numRows: int,isSmartDepth: bool,mktDepthOptions: List[ibapi.tag_value.TagValue]) -> AsyncGenerator:
+    
+    contract = convert_ContractInput(contract)
+    mktDepthOptions = [ convert_TagValueInput(val) for val in mktDepthOptions ]
+    return await g_client.reqMktDepth(contract,numRows,isSmartDepth,mktDepthOptions)
+
+@subscription.field("ib_reqMktDepth")
+async def resolve_ib_reqMktDepth(obj,info,contract: ibapi.contract.Contract,numRows: int,isSmartDepth: bool,mktDepthOptions: List[ibapi.tag_value.TagValue]):
+    return obj
+
+union_ib_ReqMktDepthResponse = UnionType("ib_ReqMktDepthResponse")
+@union_ib_ReqMktDepthResponse.type_resolver
+def resolve_ib_ReqMktDepthResponse(obj, *_):
+    if isinstance(obj, UpdateMktDepth):
+        return "ib_UpdateMktDepth"
+
+    elif isinstance(obj, UpdateMktDepthL2):
+        return "ib_UpdateMktDepthL2"
+
+    return None
+
+@subscription.source("ib_reqNewsBulletins")
+async def source_ib_reqNewsBulletins(obj,info,allMsgs: bool) -> AsyncGenerator:
+    
+    return await g_client.reqNewsBulletins(allMsgs)
+
+@subscription.field("ib_reqNewsBulletins")
+async def resolve_ib_reqNewsBulletins(obj,info,allMsgs: bool):
+    return obj
+
+@subscription.source("ib_placeOrder")
+async def source_ib_placeOrder(obj,info,orderId: int,contract: ibapi.contract.Contract,order: ibapi.order.Order) -> AsyncGenerator:
+    
+    contract = convert_ContractInput(contract)
+    order = convert_OrderInput(order)
+    return await g_client.placeOrder(orderId,contract,order)
+
+@subscription.field("ib_placeOrder")
+async def resolve_ib_placeOrder(obj,info,orderId: int,contract: ibapi.contract.Contract,order: ibapi.order.Order):
+    return obj
+
+@query.field("ib_reqPnL")
+async def resolve_ib_reqPnL(obj,info,account: str,modelCode: str):
+    
+    return await request_loader(info, g_client).load('reqPnL',account,modelCode)
+@query.field("ib_reqPnLSingle")
+async def resolve_ib_reqPnLSingle(obj,info,account: str,modelCode: str,conid: int):
+    
+    return await request_loader(info, g_client).load('reqPnLSingle',account,modelCode,conid)
+@query.field("ib_reqPositions")
+async def resolve_ib_reqPositions(obj,info):
+    
+    return await request_loader(info, g_client).load('reqPositions')
+@query.field("ib_reqPositionsMulti")
+async def resolve_ib_reqPositionsMulti(obj,info,account: str,modelCode: str):
+    
+    return await request_loader(info, g_client).load('reqPositionsMulti',account,modelCode)
+@subscription.source("ib_reqRealTimeBars")
+async def source_ib_reqRealTimeBars(obj,info,contract: ibapi.contract.Contract,barSize: int,whatToShow: str,useRTH: bool,realTimeBarsOptions: List[ibapi.tag_value.TagValue]) -> AsyncGenerator:
+    
+    contract = convert_ContractInput(contract)
+    realTimeBarsOptions = [ convert_TagValueInput(val) for val in realTimeBarsOptions ]
+    return await g_client.reqRealTimeBars(contract,barSize,whatToShow,useRTH,realTimeBarsOptions)
+
+@subscription.field("ib_reqRealTimeBars")
+async def resolve_ib_reqRealTimeBars(obj,info,contract: ibapi.contract.Contract,barSize: int,whatToShow: str,useRTH: bool,realTimeBarsOptions: List[ibapi.tag_value.TagValue]):
+    return obj
+
+@query.field("ib_reqScannerSubscription")
+async def resolve_ib_reqScannerSubscription(obj,info,subscription: ibapi.scanner.ScannerSubscription,scannerSubscriptionOptions: List[ibapi.tag_value.TagValue],scannerSubscriptionFilterOptions: List[ibapi.tag_value.TagValue]):
+    
+    subscription = convert_ScannerSubscriptionInput(subscription)
+    scannerSubscriptionOptions = [ convert_TagValueInput(val) for val in scannerSubscriptionOptions ]
+    scannerSubscriptionFilterOptions = [ convert_TagValueInput(val) for val in scannerSubscriptionFilterOptions ]
+    return await request_loader(info, g_client).load('reqScannerSubscription',subscription,scannerSubscriptionOptions,scannerSubscriptionFilterOptions)
+@subscription.source("ib_reqTickByTickData")
+async def source_ib_reqTickByTickData(obj,info,contract: ibapi.contract.Contract,tickType: str,numberOfTicks: int,ignoreSize: bool) -> AsyncGenerator:
+    
+    contract = convert_ContractInput(contract)
+    return await g_subscriptions.subscribe(('reqTickByTickData',contract,tickType,numberOfTicks,ignoreSize), lambda: g_client.reqTickByTickData(contract,tickType,numberOfTicks,ignoreSize))
+
+@subscription.field("ib_reqTickByTickData")
+async def resolve_ib_reqTickByTickData(obj,info,contract: ibapi.contract.Contract,tickType: str,numberOfTicks: int,ignoreSize: bool):
+    return obj
+
+union_ib_ReqTickByTickDataResponse = UnionType("ib_ReqTickByTickDataResponse")
+@union_ib_ReqTickByTickDataResponse.type_resolver
+def resolve_ib_ReqTickByTickDataResponse(obj, *_):
+    if isinstance(obj, TickByTickAllLast):
+        return "ib_TickByTickAllLast"
+
+    elif isinstance(obj, TickByTickBidAsk):
+        return "ib_TickByTickBidAsk"
+
+    elif isinstance(obj, TickByTickMidPoint):
+        return "ib_TickByTickMidPoint"
+
+    return None
+
+@query.field("ib_reqAccountUpdates")
+async def resolve_ib_reqAccountUpdates(obj,info,subscribe: bool,acctCode: str):
+    
+    return await request_loader(info, g_client).load('reqAccountUpdates',subscribe,acctCode)
+union_ib_ReqAccountUpdatesResponse = UnionType("ib_ReqAccountUpdatesResponse")
+@union_ib_ReqAccountUpdatesResponse.type_resolver
+def resolve_ib_ReqAccountUpdatesResponse(obj, *_):
+    if isinstance(obj, UpdateAccountValue):
+        return "ib_UpdateAccountValue"
+
+    elif isinstance(obj, UpdateAccountTime):
+        return "ib_UpdateAccountTime"
+
+    elif isinstance(obj, UpdatePortfolio):
+        return "ib_UpdatePortfolio"
+
+    return None
+
+@query.field("ib_reqContractDetails")
+async def resolve_ib_reqContractDetails(obj,info,contract: ibapi.contract.Contract):
+    
+    contract = convert_ContractInput(contract)
+    return await request_loader(info, g_client).load('reqContractDetails',contract)
+@query.field("ib_reqCurrentTime")
+async def resolve_ib_reqCurrentTime(obj,info):
+    
+    return await request_loader(info, g_client).load('reqCurrentTime')
+@query.field("ib_reqCompletedOrders")
+async def resolve_ib_reqCompletedOrders(obj,info,apiOnly: bool):
+    
+    return await request_loader(info, g_client).load('reqCompletedOrders',apiOnly)
+@query.field("ib_reqExecutions")
+async def resolve_ib_reqExecutions(obj,info,execFilter: ibapi.execution.ExecutionFilter):
+    
+    execFilter = convert_ExecutionFilterInput(execFilter)
+    return await request_loader(info, g_client).load('reqExecutions',execFilter)
+@query.field("ib_reqFamilyCodes")
+async def resolve_ib_reqFamilyCodes(obj,info):
+    
+    return await g_field_cache.load(('reqFamilyCodes',), lambda: request_loader(info, g_client).load('reqFamilyCodes'))
+@query.field("ib_reqHistoricalNews")
+async def resolve_ib_reqHistoricalNews(obj,info,conId: int,providerCodes: str,startDateTime: str,endDateTime: str,totalResults: int,historicalNewsOptions: List[ibapi.tag_value.TagValue]):
+    
+    historicalNewsOptions = [ convert_TagValueInput(val) for val in historicalNewsOptions ]
+    return await request_loader(info, g_client).load('reqHistoricalNews',conId,providerCodes,startDateTime,endDateTime,totalResults,historicalNewsOptions)
+@query.field("ib_reqHistoricalTicks")
+async def resolve_ib_reqHistoricalTicks(obj,info,contract: ibapi.contract.Contract,startDateTime: str,endDateTime: str,numberOfTicks: int,whatToShow: str,useRth: int,ignoreSize: bool,miscOptions: List[ibapi.tag_value.TagValue]):
+    
+    contract = convert_ContractInput(contract)
+    miscOptions = [ convert_TagValueInput(val) for val in miscOptions ]
+    return await request_loader(info, g_client).load('reqHistoricalTicks',contract,startDateTime,endDateTime,numberOfTicks,whatToShow,useRth,ignoreSize,miscOptions)
+union_ib_ReqHistoricalTicksResponse = UnionType("ib_ReqHistoricalTicksResponse")
+@union_ib_ReqHistoricalTicksResponse.type_resolver
+def resolve_ib_ReqHistoricalTicksResponse(obj, *_):
+    if isinstance(obj, HistoricalTicks):
+        return "ib_HistoricalTicks"
+
+    elif isinstance(obj, HistoricalTicksBidAsk):
+        return "ib_HistoricalTicksBidAsk"
+
+    elif isinstance(obj, HistoricalTicksLast):
+        return "ib_HistoricalTicksLast"
+
+    return None
+
+@query.field("ib_reqIds")
+async def resolve_ib_reqIds(obj,info,numIds: int):
+    
+    return await request_loader(info, g_client).load('reqIds',numIds)
+@query.field("ib_reqManagedAccts")
+async def resolve_ib_reqManagedAccts(obj,info):
+    
+    return await request_loader(info, g_client).load('reqManagedAccts')
+@query.field("ib_reqMarketRule")
+async def resolve_ib_reqMarketRule(obj,info,marketRuleId: int):
+    
+    return await g_field_cache.load(('reqMarketRule',marketRuleId,), lambda: request_loader(info, g_client).load('reqMarketRule',marketRuleId))
+@query.field("ib_reqMatchingSymbols")
+async def resolve_ib_reqMatchingSymbols(obj,info,pattern: str):
+    
+    return await request_loader(info, g_client).load('reqMatchingSymbols',pattern)
+@query.field("ib_reqMktDepthExchanges")
+async def resolve_ib_reqMktDepthExchanges(obj,info):
+    
+    return await g_field_cache.load(('reqMktDepthExchanges',), lambda: request_loader(info, g_client).load('reqMktDepthExchanges'))
+@query.field("ib_reqNewsArticle")
+async def resolve_ib_reqNewsArticle(obj,info,reqId: int,providerCode: str,articleId: str,newsArticleOptions: List[ibapi.tag_value.TagValue]):
+    
+    newsArticleOptions = [ convert_TagValueInput(val) for val in newsArticleOptions ]
+    return await request_loader(info, g_client).load('reqNewsArticle',reqId,providerCode,articleId,newsArticleOptions)
+@query.field("ib_reqNewsProviders")
+async def resolve_ib_reqNewsProviders(obj,info):
+    
+    return await g_field_cache.load(('reqNewsProviders',), lambda: request_loader(info, g_client).load('reqNewsProviders'))
+@query.field("ib_reqScannerParameters")
+async def resolve_ib_reqScannerParameters(obj,info):
+    
+    return await g_field_cache.load(('reqScannerParameters',), lambda: request_loader(info, g_client).load('reqScannerParameters'))
+@query.field("ib_reqSecDefOptParams")
+async def resolve_ib_reqSecDefOptParams(obj,info,underlyingSymbol: str,futFopExchange: str,underlyingSecType: str,underlyingConId: int):
+    
+    return await request_loader(info, g_client).load('reqSecDefOptParams',underlyingSymbol,futFopExchange,underlyingSecType,underlyingConId)
+@query.field("ib_reqSmartComponents")
+async def resolve_ib_reqSmartComponents(obj,info,bboExchange: str):
+    
+    return await request_loader(info, g_client).load('reqSmartComponents',bboExchange)
+@query.field("ib_reqSoftDollarTiers")
+async def resolve_ib_reqSoftDollarTiers(obj,info):
+    
+    return await request_loader(info, g_client).load('reqSoftDollarTiers')
+@query.field("ib_requestFA")
+async def resolve_ib_requestFA(obj,info,faData: int):
+    
+    return await request_loader(info, g_client).load('requestFA',faData)
+@subscription.source("ib_subscribeToGroupEvents")
+async def source_ib_subscribeToGroupEvents(obj,info,groupId: int) -> AsyncGenerator:
+    
+    return await g_client.subscribeToGroupEvents(groupId)
+
+@subscription.field("ib_subscribeToGroupEvents")
+async def resolve_ib_subscribeToGroupEvents(obj,info,groupId: int):
+    return obj
+union_types = [union_ib_ReqMktDataResponse,union_ib_ReqMktDepthResponse,union_ib_ReqTickByTickDataResponse,union_ib_ReqAccountUpdatesResponse,union_ib_ReqHistoricalTicksResponse]
\ No newline at end of file
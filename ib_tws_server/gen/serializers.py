@@ -0,0 +1,375 @@
+
+from ib_tws_server.gen.client_responses import *
+from ib_tws_server.ib_imports import *
+from ib_tws_server.util.object_to_json import to_json_value
+from typing import Callable, Dict, Tuple
+
+# Serializers return the __dict__ of objects whose members are all JSON values instead of a copy,
+# so their results must be treated as read only
+
+def serialize_TickOptionComputation(o: 'TickOptionComputation') -> dict:
+    return o.__dict__
+
+def serialize_AccountSummary(o: 'AccountSummary') -> dict:
+    return o.__dict__
+
+def serialize_AccountUpdateMulti(o: 'AccountUpdateMulti') -> dict:
+    return o.__dict__
+
+def serialize_TickPrice(o: 'TickPrice') -> dict:
+    return o.__dict__ if o.attrib is None else { **o.__dict__,
+        'attrib': None if o.attrib is None else serialize_TickAttrib(o.attrib),
+    }
+
+def serialize_TickSize(o: 'TickSize') -> dict:
+    return o.__dict__
+
+def serialize_TickEFP(o: 'TickEFP') -> dict:
+    return o.__dict__
+
+def serialize_TickNews(o: 'TickNews') -> dict:
+    return o.__dict__
+
+def serialize_RerouteMktDataReq(o: 'RerouteMktDataReq') -> dict:
+    return o.__dict__
+
+def serialize_RerouteMktDepthReq(o: 'RerouteMktDepthReq') -> dict:
+    return o.__dict__
+
+def serialize_TickReqParams(o: 'TickReqParams') -> dict:
+    return o.__dict__
+
+def serialize_DeltaNeutralValidation(o: 'DeltaNeutralValidation') -> dict:
+    return o.__dict__ if o.deltaNeutralContract is None else { **o.__dict__,
+        'deltaNeutralContract': None if o.deltaNeutralContract is None else serialize_DeltaNeutralContract(o.deltaNeutralContract),
+    }
+
+def serialize_UpdateMktDepth(o: 'UpdateMktDepth') -> dict:
+    return o.__dict__
+
+def serialize_UpdateMktDepthL2(o: 'UpdateMktDepthL2') -> dict:
+    return o.__dict__
+
+def serialize_UpdateNewsBulletin(o: 'UpdateNewsBulletin') -> dict:
+    return o.__dict__
+
+def serialize_OrderStatus(o: 'OrderStatus') -> dict:
+    return o.__dict__
+
+def serialize_Pnl(o: 'Pnl') -> dict:
+    return o.__dict__
+
+def serialize_PnlSingle(o: 'PnlSingle') -> dict:
+    return o.__dict__
+
+def serialize_Position(o: 'Position') -> dict:
+    return o.__dict__ if o.contract is None else { **o.__dict__,
+        'contract': None if o.contract is None else serialize_Contract(o.contract),
+    }
+
+def serialize_PositionMulti(o: 'PositionMulti') -> dict:
+    return o.__dict__ if o.contract is None else { **o.__dict__,
+        'contract': None if o.contract is None else serialize_Contract(o.contract),
+    }
+
+def serialize_RealtimeBar(o: 'RealtimeBar') -> dict:
+    return o.__dict__
+
+def serialize_ScannerData(o: 'ScannerData') -> dict:
+    return o.__dict__ if o.contractDetails is None else { **o.__dict__,
+        'contractDetails': None if o.contractDetails is None else serialize_ContractDetails(o.contractDetails),
+    }
+
+def serialize_TickByTickAllLast(o: 'TickByTickAllLast') -> dict:
+    return o.__dict__ if o.tickAttribLast is None else { **o.__dict__,
+        'tickAttribLast': None if o.tickAttribLast is None else serialize_TickAttribLast(o.tickAttribLast),
+    }
+
+def serialize_TickByTickBidAsk(o: 'TickByTickBidAsk') -> dict:
+    return o.__dict__ if o.tickAttribBidAsk is None else { **o.__dict__,
+        'tickAttribBidAsk': None if o.tickAttribBidAsk is None else serialize_TickAttribBidAsk(o.tickAttribBidAsk),
+    }
+
+def serialize_TickByTickMidPoint(o: 'TickByTickMidPoint') -> dict:
+    return o.__dict__
+
+def serialize_UpdateAccountValue(o: 'UpdateAccountValue') -> dict:
+    return o.__dict__
+
+def serialize_UpdateAccountTime(o: 'UpdateAccountTime') -> dict:
+    return o.__dict__
+
+def serialize_UpdatePortfolio(o: 'UpdatePortfolio') -> dict:
+    return o.__dict__ if o.contract is None else { **o.__dict__,
+        'contract': None if o.contract is None else serialize_Contract(o.contract),
+    }
+
+def serialize_CompletedOrder(o: 'CompletedOrder') -> dict:
+    return o.__dict__ if o.contract is None and o.order is None and o.orderState is None else { **o.__dict__,
+        'contract': None if o.contract is None else serialize_Contract(o.contract),
+        'order': None if o.order is None else serialize_Order(o.order),
+        'orderState': None if o.orderState is None else serialize_OrderState(o.orderState),
+    }
+
+def serialize_ExecDetails(o: 'ExecDetails') -> dict:
+    return o.__dict__ if o.contract is None and o.execution is None else { **o.__dict__,
+        'contract': None if o.contract is None else serialize_Contract(o.contract),
+        'execution': None if o.execution is None else serialize_Execution(o.execution),
+    }
+
+def serialize_HistoricalNews(o: 'HistoricalNews') -> dict:
+    return o.__dict__
+
+def serialize_HistoricalTicks(o: 'HistoricalTicks') -> dict:
+    return o.__dict__ if not o.ticks else { **o.__dict__,
+        'ticks': None if o.ticks is None else [ serialize_HistoricalTick(v) for v in o.ticks ],
+    }
+
+def serialize_HistoricalTicksBidAsk(o: 'HistoricalTicksBidAsk') -> dict:
+    return o.__dict__ if not o.ticks else { **o.__dict__,
+        'ticks': None if o.ticks is None else [ serialize_HistoricalTickBidAsk(v) for v in o.ticks ],
+    }
+
+def serialize_HistoricalTicksLast(o: 'HistoricalTicksLast') -> dict:
+    return o.__dict__ if not o.ticks else { **o.__dict__,
+        'ticks': None if o.ticks is None else [ serialize_HistoricalTickLast(v) for v in o.ticks ],
+    }
+
+def serialize_MarketRule(o: 'MarketRule') -> dict:
+    return o.__dict__ if not o.priceIncrements else { **o.__dict__,
+        'priceIncrements': None if o.priceIncrements is None else [ serialize_PriceIncrement(v) for v in o.priceIncrements ],
+    }
+
+def serialize_NewsArticle(o: 'NewsArticle') -> dict:
+    return o.__dict__
+
+def serialize_SecurityDefinitionOptionParameter(o: 'SecurityDefinitionOptionParameter') -> dict:
+    return o.__dict__ if o.expirations is None and o.strikes is None else { **o.__dict__,
+        'expirations': to_json_value(o.expirations),
+        'strikes': to_json_value(o.strikes),
+    }
+
+def serialize_ReceiveFA(o: 'ReceiveFA') -> dict:
+    return o.__dict__
+
+def serialize_HistoricalTick(o: 'ibapi.common.HistoricalTick') -> dict:
+    return o.__dict__
+
+def serialize_HistoricalTickBidAsk(o: 'ibapi.common.HistoricalTickBidAsk') -> dict:
+    return o.__dict__ if o.tickAttribBidAsk is None else { **o.__dict__,
+        'tickAttribBidAsk': None if o.tickAttribBidAsk is None else serialize_TickAttribBidAsk(o.tickAttribBidAsk),
+    }
+
+def serialize_TickAttribLast(o: 'ibapi.common.TickAttribLast') -> dict:
+    return o.__dict__
+
+def serialize_Order(o: 'ibapi.order.Order') -> dict:
+    return o.__dict__ if not o.algoParams and not o.conditions and not o.orderComboLegs and not o.orderMiscOptions and not o.smartComboRoutingParams and o.softDollarTier is None else { **o.__dict__,
+        'algoParams': None if o.algoParams is None else [ serialize_TagValue(v) for v in o.algoParams ],
+        'conditions': None if o.conditions is None else [ serialize_OrderCondition(v) for v in o.conditions ],
+        'orderComboLegs': None if o.orderComboLegs is None else [ serialize_OrderComboLeg(v) for v in o.orderComboLegs ],
+        'orderMiscOptions': None if o.orderMiscOptions is None else [ serialize_TagValue(v) for v in o.orderMiscOptions ],
+        'smartComboRoutingParams': None if o.smartComboRoutingParams is None else [ serialize_TagValue(v) for v in o.smartComboRoutingParams ],
+        'softDollarTier': None if o.softDollarTier is None else serialize_SoftDollarTier(o.softDollarTier),
+    }
+
+def serialize_TickAttrib(o: 'ibapi.common.TickAttrib') -> dict:
+    return o.__dict__
+
+def serialize_OrderCondition(o: 'ibapi.order_condition.OrderCondition') -> dict:
+    return o.__dict__
+
+def serialize_PriceIncrement(o: 'ibapi.common.PriceIncrement') -> dict:
+    return o.__dict__
+
+def serialize_Contract(o: 'ibapi.contract.Contract') -> dict:
+    return o.__dict__ if not o.comboLegs and o.deltaNeutralContract is None else { **o.__dict__,
+        'comboLegs': None if o.comboLegs is None else [ serialize_ComboLeg(v) for v in o.comboLegs ],
+        'deltaNeutralContract': None if o.deltaNeutralContract is None else serialize_DeltaNeutralContract(o.deltaNeutralContract),
+    }
+
+def serialize_HistoricalTickLast(o: 'ibapi.common.HistoricalTickLast') -> dict:
+    return o.__dict__ if o.tickAttribLast is None else { **o.__dict__,
+        'tickAttribLast': None if o.tickAttribLast is None else serialize_TickAttribLast(o.tickAttribLast),
+    }
+
+def serialize_TagValue(o: 'ibapi.tag_value.TagValue') -> dict:
+    return o.__dict__
+
+def serialize_OrderComboLeg(o: 'ibapi.order.OrderComboLeg') -> dict:
+    return o.__dict__
+
+def serialize_SoftDollarTier(o: 'ibapi.softdollartier.SoftDollarTier') -> dict:
+    return o.__dict__
+
+def serialize_OrderState(o: 'ibapi.order_state.OrderState') -> dict:
+    return o.__dict__
+
+def serialize_ContractDetails(o: 'ibapi.contract.ContractDetails') -> dict:
+    return o.__dict__ if o.contract is None and not o.secIdList else { **o.__dict__,
+        'contract': None if o.contract is None else serialize_Contract(o.contract),
+        'secIdList': to_json_value(o.secIdList),
+    }
+
+def serialize_DeltaNeutralContract(o: 'ibapi.contract.DeltaNeutralContract') -> dict:
+    return o.__dict__
+
+def serialize_Execution(o: 'ibapi.execution.Execution') -> dict:
+    return o.__dict__
+
+def serialize_ComboLeg(o: 'ibapi.contract.ComboLeg') -> dict:
+    return o.__dict__
+
+def serialize_TickAttribBidAsk(o: 'ibapi.common.TickAttribBidAsk') -> dict:
+    return o.__dict__
+
+def serialize_HistogramData(o: 'ibapi.common.HistogramData') -> dict:
+    return o.__dict__
+
+def serialize_FamilyCode(o: 'ibapi.common.FamilyCode') -> dict:
+    return o.__dict__
+
+def serialize_DepthMktDataDescription(o: 'ibapi.common.DepthMktDataDescription') -> dict:
+    return o.__dict__
+
+def serialize_ContractDescription(o: 'ibapi.contract.ContractDescription') -> dict:
+    return o.__dict__ if o.contract is None and not o.derivativeSecTypes else { **o.__dict__,
+        'contract': None if o.contract is None else serialize_Contract(o.contract),
+        'derivativeSecTypes': to_json_value(o.derivativeSecTypes),
+    }
+
+def serialize_NewsProvider(o: 'ibapi.common.NewsProvider') -> dict:
+    return o.__dict__
+
+def serialize_BarData(o: 'ibapi.common.BarData') -> dict:
+    return o.__dict__
+
+# Members of the object types of the GraphQL schema by class
+FIELDS: Dict[type, Tuple[str, ...]] = {
+    TickOptionComputation: ('tickType', 'tickAttrib', 'impliedVol', 'delta', 'optPrice', 'pvDividend', 'gamma', 'vega', 'theta', 'undPrice', ),
+    AccountSummary: ('account', 'tag', 'value', 'currency', ),
+    AccountUpdateMulti: ('account', 'modelCode', 'key', 'value', 'currency', ),
+    TickPrice: ('tickType', 'price', 'attrib', ),
+    TickSize: ('tickType', 'size', ),
+    TickEFP: ('tickType', 'basisPoints', 'formattedBasisPoints', 'totalDividends', 'holdDays', 'futureLastTradeDate', 'dividendImpact', 'dividendsToLastTradeDate', ),
+    TickNews: ('timeStamp', 'providerCode', 'articleId', 'headline', 'extraData', ),
+    RerouteMktDataReq: ('conId', 'exchange', ),
+    RerouteMktDepthReq: ('conId', 'exchange', ),
+    TickReqParams: ('minTick', 'bboExchange', 'snapshotPermissions', ),
+    DeltaNeutralValidation: ('deltaNeutralContract', ),
+    UpdateMktDepth: ('position', 'operation', 'side', 'price', 'size', ),
+    UpdateMktDepthL2: ('position', 'marketMaker', 'operation', 'side', 'price', 'size', 'isSmartDepth', ),
+    UpdateNewsBulletin: ('msgId', 'msgType', 'newsMessage', 'originExch', ),
+    OrderStatus: ('orderId', 'status', 'filled', 'remaining', 'avgFillPrice', 'permId', 'parentId', 'lastFillPrice', 'clientId', 'whyHeld', 'mktCapPrice', ),
+    Pnl: ('dailyPnL', 'unrealizedPnL', 'realizedPnL', ),
+    PnlSingle: ('pos', 'dailyPnL', 'unrealizedPnL', 'realizedPnL', 'value', ),
+    Position: ('account', 'contract', 'position', 'avgCost', ),
+    PositionMulti: ('account', 'modelCode', 'contract', 'pos', 'avgCost', ),
+    RealtimeBar: ('time', 'open_', 'high', 'low', 'close', 'volume', 'wap', 'count', ),
+    ScannerData: ('rank', 'contractDetails', 'distance', 'benchmark', 'projection', 'legsStr', ),
+    TickByTickAllLast: ('tickType', 'time', 'price', 'size', 'tickAttribLast', 'exchange', 'specialConditions', ),
+    TickByTickBidAsk: ('time', 'bidPrice', 'askPrice', 'bidSize', 'askSize', 'tickAttribBidAsk', ),
+    TickByTickMidPoint: ('time', 'midPoint', ),
+    UpdateAccountValue: ('key', 'val', 'currency', 'accountName', ),
+    UpdateAccountTime: ('timeStamp', ),
+    UpdatePortfolio: ('contract', 'position', 'marketPrice', 'marketValue', 'averageCost', 'unrealizedPNL', 'realizedPNL', 'accountName', ),
+    CompletedOrder: ('contract', 'order', 'orderState', ),
+    ExecDetails: ('contract', 'execution', ),
+    HistoricalNews: ('time', 'providerCode', 'articleId', 'headline', ),
+    HistoricalTicks: ('ticks', ),
+    HistoricalTicksBidAsk: ('ticks', ),
+    HistoricalTicksLast: ('ticks', ),
+    MarketRule: ('marketRuleId', 'priceIncrements', ),
+    NewsArticle: ('requestId', 'articleType', 'articleText', ),
+    SecurityDefinitionOptionParameter: ('exchange', 'underlyingConId', 'tradingClass', 'multiplier', 'expirations', 'strikes', ),
+    ReceiveFA: ('faData', 'cxml', ),
+    ibapi.common.HistoricalTick: ('price', 'size', 'time', ),
+    ibapi.common.HistoricalTickBidAsk: ('priceAsk', 'priceBid', 'sizeAsk', 'sizeBid', 'tickAttribBidAsk', 'time', ),
+    ibapi.common.TickAttribLast: ('pastLimit', 'unreported', ),
+    ibapi.order.Order: ('account', 'action', 'activeStartTime', 'activeStopTime', 'adjustableTrailingUnit', 'adjustedOrderType', 'adjustedStopLimitPrice', 'adjustedStopPrice', 'adjustedTrailingAmount', 'algoId', 'algoParams', 'algoStrategy', 'allOrNone', 'auctionStrategy', 'autoCancelDate', 'autoCancelParent', 'auxPrice', 'basisPoints', 'basisPointsType', 'blockOrder', 'cashQty', 'clearingAccount', 'clearingIntent', 'clientId', 'conditions', 'conditionsCancelOrder', 'conditionsIgnoreRth', 'continuousUpdate', 'delta', 'deltaNeutralAuxPrice', 'deltaNeutralClearingAccount', 'deltaNeutralClearingIntent', 'deltaNeutralConId', 'deltaNeutralDesignatedLocation', 'deltaNeutralOpenClose', 'deltaNeutralOrderType', 'deltaNeutralSettlingFirm', 'deltaNeutralShortSale', 'deltaNeutralShortSaleSlot', 'designatedLocation', 'discretionaryAmt', 'discretionaryUpToLimitPrice', 'displaySize', 'dontUseAutoPriceForHedge', 'eTradeOnly', 'exemptCode', 'extOperator', 'faGroup', 'faMethod', 'faPercentage', 'faProfile', 'filledQuantity', 'firmQuoteOnly', 'goodAfterTime', 'goodTillDate', 'hedgeParam', 'hedgeType', 'hidden', 'imbalanceOnly', 'isOmsContainer', 'isPeggedChangeAmountDecrease', 'lmtPrice', 'lmtPriceOffset', 'mifid2DecisionAlgo', 'mifid2DecisionMaker', 'mifid2ExecutionAlgo', 'mifid2ExecutionTrader', 'minQty', 'modelCode', 'nbboPriceCap', 'notHeld', 'ocaGroup', 'ocaType', 'openClose', 'optOutSmartRouting', 'orderComboLegs', 'orderId', 'orderMiscOptions', 'orderRef', 'orderType', 'origin', 'outsideRth', 'overridePercentageConstraints', 'parentId', 'parentPermId', 'peggedChangeAmount', 'percentOffset', 'permId', 'randomizePrice', 'randomizeSize', 'refFuturesConId', 'referenceChangeAmount', 'referenceContractId', 'referenceExchangeId', 'referencePriceType', 'routeMarketableToBbo', 'rule80A', 'scaleAutoReset', 'scaleInitFillQty', 'scaleInitLevelSize', 'scaleInitPosition', 'scalePriceAdjustInterval', 'scalePriceAdjustValue', 'scalePriceIncrement', 'scaleProfitOffset', 'scaleRandomPercent', 'scaleSubsLevelSize', 'scaleTable', 'settlingFirm', 'shareholder', 'shortSaleSlot', 'smartComboRoutingParams', 'softDollarTier', 'solicited', 'startingPrice', 'stockRangeLower', 'stockRangeUpper', 'stockRefPrice', 'sweepToFill', 'tif', 'totalQuantity', 'trailStopPrice', 'trailingPercent', 'transmit', 'triggerMethod', 'triggerPrice', 'usePriceMgmtAlgo', 'volatility', 'volatilityType', 'whatIf', ),
+    ibapi.common.TickAttrib: ('canAutoExecute', 'pastLimit', 'preOpen', ),
+    ibapi.order_condition.OrderCondition: ('condType', 'isConjunctionConnection', 'secType', 'exchange', 'symbol', 'isMore', 'percent', 'conId', 'time', 'price', 'triggerMethod', 'changePercent', 'volume', ),
+    ibapi.common.PriceIncrement: ('increment', 'lowEdge', ),
+    ibapi.contract.Contract: ('comboLegs', 'comboLegsDescrip', 'conId', 'currency', 'deltaNeutralContract', 'exchange', 'includeExpired', 'lastTradeDateOrContractMonth', 'localSymbol', 'multiplier', 'primaryExchange', 'right', 'secId', 'secIdType', 'secType', 'strike', 'symbol', 'tradingClass', ),
+    ibapi.common.HistoricalTickLast: ('exchange', 'price', 'size', 'specialConditions', 'tickAttribLast', 'time', ),
+    ibapi.tag_value.TagValue: ('tag', 'value', ),
+    ibapi.order.OrderComboLeg: ('price', ),
+    ibapi.softdollartier.SoftDollarTier: ('displayName', 'name', 'val', ),
+    ibapi.order_state.OrderState: ('commission', 'commissionCurrency', 'completedStatus', 'completedTime', 'equityWithLoanAfter', 'equityWithLoanBefore', 'equityWithLoanChange', 'initMarginAfter', 'initMarginBefore', 'initMarginChange', 'maintMarginAfter', 'maintMarginBefore', 'maintMarginChange', 'maxCommission', 'minCommission', 'status', 'warningText', ),
+    ibapi.contract.ContractDetails: ('aggGroup', 'bondType', 'callable', 'category', 'contract', 'contractMonth', 'convertible', 'coupon', 'couponType', 'cusip', 'descAppend', 'evMultiplier', 'evRule', 'industry', 'issueDate', 'lastTradeTime', 'liquidHours', 'longName', 'marketName', 'marketRuleIds', 'maturity', 'mdSizeMultiplier', 'minTick', 'nextOptionDate', 'nextOptionPartial', 'nextOptionType', 'notes', 'orderTypes', 'priceMagnifier', 'putable', 'ratings', 'realExpirationDate', 'secIdList', 'stockType', 'subcategory', 'timeZoneId', 'tradingHours', 'underConId', 'underSecType', 'underSymbol', 'validExchanges', ),
+    ibapi.contract.DeltaNeutralContract: ('conId', 'delta', 'price', ),
+    ibapi.execution.Execution: ('acctNumber', 'avgPrice', 'clientId', 'cumQty', 'evMultiplier', 'evRule', 'exchange', 'execId', 'lastLiquidity', 'liquidation', 'modelCode', 'orderId', 'orderRef', 'permId', 'price', 'shares', 'side', 'time', ),
+    ibapi.contract.ComboLeg: ('action', 'conId', 'designatedLocation', 'exchange', 'exemptCode', 'openClose', 'ratio', 'shortSaleSlot', ),
+    ibapi.common.TickAttribBidAsk: ('askPastHigh', 'bidPastLow', ),
+    ibapi.common.HistogramData: ('count', 'price', ),
+    ibapi.common.FamilyCode: ('accountID', 'familyCodeStr', ),
+    ibapi.common.DepthMktDataDescription: ('aggGroup', 'exchange', 'listingExch', 'secType', 'serviceDataType', ),
+    ibapi.contract.ContractDescription: ('contract', 'derivativeSecTypes', ),
+    ibapi.common.NewsProvider: ('code', 'name', ),
+    ibapi.common.BarData: ('average', 'barCount', 'close', 'date', 'high', 'low', 'open', 'volume', ),
+}
+
+# Serializers of the object types by class, used by ib_tws_server.util.object_to_json
+SERIALIZERS: Dict[type, Callable[[object], dict]] = {
+    TickOptionComputation: serialize_TickOptionComputation,
+    AccountSummary: serialize_AccountSummary,
+    AccountUpdateMulti: serialize_AccountUpdateMulti,
+    TickPrice: serialize_TickPrice,
+    TickSize: serialize_TickSize,
+    TickEFP: serialize_TickEFP,
+    TickNews: serialize_TickNews,
+    RerouteMktDataReq: serialize_RerouteMktDataReq,
+    RerouteMktDepthReq: serialize_RerouteMktDepthReq,
+    TickReqParams: serialize_TickReqParams,
+    DeltaNeutralValidation: serialize_DeltaNeutralValidation,
+    UpdateMktDepth: serialize_UpdateMktDepth,
+    UpdateMktDepthL2: serialize_UpdateMktDepthL2,
+    UpdateNewsBulletin: serialize_UpdateNewsBulletin,
+    OrderStatus: serialize_OrderStatus,
+    Pnl: serialize_Pnl,
+    PnlSingle: serialize_PnlSingle,
+    Position: serialize_Position,
+    PositionMulti: serialize_PositionMulti,
+    RealtimeBar: serialize_RealtimeBar,
+    ScannerData: serialize_ScannerData,
+    TickByTickAllLast: serialize_TickByTickAllLast,
+    TickByTickBidAsk: serialize_TickByTickBidAsk,
+    TickByTickMidPoint: serialize_TickByTickMidPoint,
+    UpdateAccountValue: serialize_UpdateAccountValue,
+    UpdateAccountTime: serialize_UpdateAccountTime,
+    UpdatePortfolio: serialize_UpdatePortfolio,
+    CompletedOrder: serialize_CompletedOrder,
+    ExecDetails: serialize_ExecDetails,
+    HistoricalNews: serialize_HistoricalNews,
+    HistoricalTicks: serialize_HistoricalTicks,
+    HistoricalTicksBidAsk: serialize_HistoricalTicksBidAsk,
+    HistoricalTicksLast: serialize_HistoricalTicksLast,
+    MarketRule: serialize_MarketRule,
+    NewsArticle: serialize_NewsArticle,
+    SecurityDefinitionOptionParameter: serialize_SecurityDefinitionOptionParameter,
+    ReceiveFA: serialize_ReceiveFA,
+    ibapi.common.HistoricalTick: serialize_HistoricalTick,
+    ibapi.common.HistoricalTickBidAsk: serialize_HistoricalTickBidAsk,
+    ibapi.common.TickAttribLast: serialize_TickAttribLast,
+    ibapi.order.Order: serialize_Order,
+    ibapi.common.TickAttrib: serialize_TickAttrib,
+    ibapi.order_condition.OrderCondition: serialize_OrderCondition,
+    ibapi.common.PriceIncrement: serialize_PriceIncrement,
+    ibapi.contract.Contract: serialize_Contract,
+    ibapi.common.HistoricalTickLast: serialize_HistoricalTickLast,
+    ibapi.tag_value.TagValue: serialize_TagValue,
+    ibapi.order.OrderComboLeg: serialize_OrderComboLeg,
+    ibapi.softdollartier.SoftDollarTier: serialize_SoftDollarTier,
+    ibapi.order_state.OrderState: serialize_OrderState,
+    ibapi.contract.ContractDetails: serialize_ContractDetails,
+    ibapi.contract.DeltaNeutralContract: serialize_DeltaNeutralContract,
+    ibapi.execution.Execution: serialize_Execution,
+    ibapi.contract.ComboLeg: serialize_ComboLeg,
+    ibapi.common.TickAttribBidAsk: serialize_TickAttribBidAsk,
+    ibapi.common.HistogramData: serialize_HistogramData,
+    ibapi.common.FamilyCode: serialize_FamilyCode,
+    ibapi.common.DepthMktDataDescription: serialize_DepthMktDataDescription,
+    ibapi.contract.ContractDescription: serialize_ContractDescription,
+    ibapi.common.NewsProvider: serialize_NewsProvider,
+    ibapi.common.BarData: serialize_BarData,
+}
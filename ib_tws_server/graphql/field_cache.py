@@ -0,0 +1,142 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from ib_tws_server.api_definition import REQUEST_DEFINITIONS
+from ib_tws_server.util.request_key import canonical_key
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+@dataclass(frozen=True)
+class FieldCachePolicy:
+    """
+    Caching of the results of a GraphQL query field by FieldCache. Results are fresh for `ttl`
+    seconds, and are then answered stale for up to `stale_ttl` more seconds while they are
+    reloaded in the background
+    """
+    ttl: float
+    stale_ttl: float = 0
+
+def default_policies() -> Dict[str, FieldCachePolicy]:
+    """
+    The policies of the requests with a cache_stale_ttl in their ApiDefinition, by request name
+    """
+    return { d.request_method.__name__: FieldCachePolicy(d.cache_ttl, d.cache_stale_ttl) for d in REQUEST_DEFINITIONS if d.cache_stale_ttl is not None }
+
+class FieldCacheStats():
+    """
+    Number of fresh and stale hits, misses, background reloads and failed reloads, and evictions
+    """
+    hits: int
+    stale_hits: int
+    misses: int
+    reloads: int
+    failed_reloads: int
+    evictions: int
+
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.evictions = 0
+
+class _FieldCacheEntry():
+    __slots__ = ('fresh_until', 'stale_until', 'value')
+
+    def __init__(self, fresh_until: float, stale_until: float, value: Any):
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.value = value
+
+class FieldCache():
+    """
+    Caches the results of the GraphQL query fields with a FieldCachePolicy in `policies`, by default
+    the requests with a cache_stale_ttl in their ApiDefinition, keyed by
+    the request name and its arguments, and evicts entries in LRU order once `max_entries` is
+    reached. Results past their ttl are answered stale while a single reload runs in the
+    background, so only requests with no result within ttl + stale_ttl wait for TWS. Concurrent
+    misses of a request share one load. A failed reload keeps the stale result.
+
+    All callers receive the same result object, so results should be treated as read only
+    """
+    MAX_ENTRIES = 1000
+
+    stats: FieldCacheStats
+
+    def __init__(self, policies: Dict[str, FieldCachePolicy] = None, max_entries: int = MAX_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self._policies = policies if policies is not None else default_policies()
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, _FieldCacheEntry]' = OrderedDict()
+        self._loads: Dict[Hashable, asyncio.Future] = {}
+        self.stats = FieldCacheStats()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def policy(self, request_name: str) -> FieldCachePolicy:
+        return self._policies.get(request_name)
+
+    async def load(self, request: Tuple, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached result of `request`, or calls `load` and caches its result. `request`
+        is a tuple of the request name and its arguments
+        """
+        policy = self._policies.get(request[0])
+        if policy is None:
+            return await load()
+        key = canonical_key(request)
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.fresh_until > now:
+                self.stats.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if entry.stale_until > now:
+                self.stats.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._loads:
+                    self.stats.reloads += 1
+                    self._start_load(key, policy, load).add_done_callback(self._reload_done)
+                return entry.value
+            del self._entries[key]
+
+        self.stats.misses += 1
+        f = self._loads.get(key)
+        if f is None:
+            f = self._start_load(key, policy, load)
+        # Shield the shared load from the cancellation of one of its callers
+        return await asyncio.shield(f)
+
+    def _start_load(self, key: Hashable, policy: FieldCachePolicy, load: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        f = self._loads[key] = asyncio.ensure_future(self._load(key, policy, load))
+        return f
+
+    async def _load(self, key: Hashable, policy: FieldCachePolicy, load: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await load()
+        finally:
+            del self._loads[key]
+        now = self._clock()
+        self._entries[key] = _FieldCacheEntry(now + policy.ttl, now + policy.ttl + policy.stale_ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return value
+
+    def _reload_done(self, f: asyncio.Future):
+        if not f.cancelled() and f.exception() is not None:
+            self.stats.failed_reloads += 1
+
+    def invalidate(self, request_name: str = None):
+        """
+        Removes the cached results of a request, or all cached results
+        """
+        if request_name is None:
+            self._entries.clear()
+        else:
+            for k in [ k for k in self._entries if k[0] == request_name ]:
+                del self._entries[k]
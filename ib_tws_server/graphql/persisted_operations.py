@@ -0,0 +1,183 @@
+from ariadne.asgi.handlers import GraphQLHTTPHandler
+from collections import OrderedDict
+from graphql import DocumentNode, GraphQLError, GraphQLSchema, parse, specified_rules, validate
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+# Error codes of the automatic persisted queries protocol, which clients use to fall back to sending the query
+PERSISTED_QUERY_NOT_FOUND = "PERSISTED_QUERY_NOT_FOUND"
+PERSISTED_QUERY_NOT_SUPPORTED = "PERSISTED_QUERY_NOT_SUPPORTED"
+
+def operation_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+class PersistedOperation():
+    """
+    A parsed and validated operation
+    """
+    __slots__ = ('hash', 'query', 'document')
+
+    def __init__(self, hash: str, query: str, document: DocumentNode):
+        self.hash = hash
+        self.query = query
+        self.document = document
+
+class PersistedOperationsStats():
+    """
+    Number of requests answered with a persisted document, and of requests that parsed and validated their query
+    """
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+class PersistedOperations():
+    """
+    Parses and validates GraphQL operations once and keeps their documents by the SHA-256 hash
+    of the query. Clients send `extensions: { persistedQuery: { version: 1, sha256Hash } }`
+    and the variables instead of the query, as in the automatic persisted queries protocol.
+
+    Operations passed to register are kept for the lifetime of the server. With
+    `allow_unregistered` set, the documents of other queries, whether sent with their hash or
+    as plain queries, are kept as well in LRU order up to `max_entries`. Otherwise only
+    registered operations are executed.
+
+    graphql-core executes documents without a compiled plan, so a persisted operation saves
+    the parsing and validation of the query, which is most of the overhead of small
+    operations against the large generated schema
+    """
+    MAX_ENTRIES = 1000
+
+    stats: PersistedOperationsStats
+
+    def __init__(self, schema: GraphQLSchema, allow_unregistered: bool = True, max_entries: int = MAX_ENTRIES):
+        self._schema = schema
+        self._allow_unregistered = allow_unregistered
+        self._max_entries = max_entries
+        self._registered: Dict[str, PersistedOperation] = {}
+        self._recent: 'OrderedDict[str, PersistedOperation]' = OrderedDict()
+        # Validated documents by id, which the query validator doesn't validate again
+        self._validated: Dict[int, DocumentNode] = {}
+        self.stats = PersistedOperationsStats()
+
+    def __len__(self):
+        return len(self._registered) + len(self._recent)
+
+    def _compile(self, hash: str, query: str) -> PersistedOperation:
+        document = parse(query)
+        errors = validate(self._schema, document, specified_rules)
+        if len(errors) > 0:
+            raise errors[0]
+        self._validated[id(document)] = document
+        return PersistedOperation(hash, query, document)
+
+    def register(self, query: str) -> str:
+        """
+        Parses and validates an operation and returns its hash. Raises GraphQLError if the operation is invalid
+        """
+        hash = operation_hash(query)
+        if hash not in self._registered:
+            self._registered[hash] = self._compile(hash, query)
+        return hash
+
+    def register_from_file(self, path: str) -> List[str]:
+        """
+        Registers the operations of a JSON file with a list of queries, or an object of queries by hash
+        """
+        with open(path) as f:
+            operations = json.load(f)
+        if isinstance(operations, dict):
+            for hash,query in operations.items():
+                if operation_hash(query) != hash:
+                    raise ValueError(f"The hash {hash} doesn't match its query")
+            operations = list(operations.values())
+        return [ self.register(q) for q in operations ]
+
+    def lookup(self, hash: str) -> Optional[PersistedOperation]:
+        op = self._registered.get(hash)
+        if op is None:
+            op = self._recent.get(hash)
+            if op is not None:
+                self._recent.move_to_end(hash)
+        return op
+
+    def resolve(self, data: Any) -> Optional[PersistedOperation]:
+        """
+        Returns the persisted operation of the data of a GraphQL request. Returns None for queries
+        that should be parsed and validated as usual, e.g. invalid queries so their errors are
+        reported. Raises GraphQLError when the operation isn't available
+        """
+        if not isinstance(data, dict):
+            return None
+        query = data.get("query")
+        extensions = data.get("extensions")
+        persisted = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+        if isinstance(persisted, dict):
+            hash = persisted.get("sha256Hash")
+            op = self.lookup(hash)
+            if op is not None:
+                self.stats.hits += 1
+                return op
+            if not self._allow_unregistered:
+                raise GraphQLError("PersistedQueryNotFound", extensions={ "code": PERSISTED_QUERY_NOT_FOUND })
+            if not isinstance(query, str):
+                # The client retries with the query
+                raise GraphQLError("PersistedQueryNotFound", extensions={ "code": PERSISTED_QUERY_NOT_FOUND })
+            if operation_hash(query) != hash:
+                raise GraphQLError("provided sha does not match query")
+        elif isinstance(query, str):
+            if not self._allow_unregistered:
+                raise GraphQLError("Only persisted operations are allowed", extensions={ "code": PERSISTED_QUERY_NOT_SUPPORTED })
+            hash = operation_hash(query)
+            op = self.lookup(hash)
+            if op is not None:
+                self.stats.hits += 1
+                return op
+        else:
+            return None
+
+        self.stats.misses += 1
+        try:
+            op = self._compile(hash, query)
+        except GraphQLError:
+            return None
+        self._recent[hash] = op
+        while len(self._recent) > self._max_entries:
+            _,evicted = self._recent.popitem(last=False)
+            del self._validated[id(evicted.document)]
+            self.stats.evictions += 1
+        return op
+
+    def validate(self, schema: GraphQLSchema, document_ast: DocumentNode, rules=None, max_errors: int = None, **kwargs) -> List[GraphQLError]:
+        """
+        Query validator of the GraphQL application that skips the documents of persisted operations
+        """
+        if schema is self._schema and self._validated.get(id(document_ast)) is document_ast and (rules is None or tuple(rules) == specified_rules):
+            return []
+        return validate(schema, document_ast, rules, max_errors, **kwargs)
+
+class PersistedOperationsHTTPHandler(GraphQLHTTPHandler):
+    """
+    HTTP handler that executes the persisted documents of the operations it receives
+    """
+    operations: PersistedOperations
+
+    def __init__(self, operations: PersistedOperations, **kwargs):
+        super().__init__(**kwargs)
+        self.operations = operations
+
+    async def execute_graphql_query(self, request: Any, data: Any, *, context_value: Any = None, query_document: DocumentNode = None):
+        if query_document is None:
+            try:
+                op = self.operations.resolve(data)
+            except GraphQLError as e:
+                return False, { "errors": [ self.error_formatter(e, self.debug) ] }
+            if op is not None:
+                data = dict(data, query=op.query)
+                query_document = op.document
+        return await super().execute_graphql_query(request, data, context_value=context_value, query_document=query_document)
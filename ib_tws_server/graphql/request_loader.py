@@ -0,0 +1,101 @@
+import asyncio
+from ib_tws_server.api_definition import REQUEST_DEFINITIONS
+from ib_tws_server.util.request_key import canonical_key
+from typing import Any, Dict, FrozenSet, Hashable, List, Tuple
+
+# Queries without side effects, whose results are shared by equal calls of an operation
+CACHEABLE_REQUESTS: FrozenSet[str] = frozenset([ d.request_method.__name__ for d in REQUEST_DEFINITIONS if d.request_method is not None and d.idempotent ])
+
+# Requests that are subject to the historical data pacing rules
+HISTORICAL_REQUESTS: FrozenSet[str] = frozenset([ d.request_method.__name__ for d in REQUEST_DEFINITIONS if d.request_method is not None and d.uses_historical_pacing ])
+
+# Key of the loader in the context of a GraphQL operation
+LOADER_CONTEXT_KEY = "ib_request_loader"
+
+class RequestLoaderStats():
+    """
+    Number of loads, of loads answered by an equal load of the same operation, and of calls made to the client
+    """
+    loads: int
+    deduplicated: int
+    calls: int
+
+    def __init__(self):
+        self.loads = 0
+        self.deduplicated = 0
+        self.calls = 0
+
+class RequestLoader():
+    """
+    Loads the results of the query resolvers of one GraphQL operation. Loads made in the same
+    event loop iteration, e.g. by the resolvers of sibling fields, are collected and dispatched
+    together. Equal loads of side effect free queries (CACHEABLE_REQUESTS) are made once and the
+    result is kept for the lifetime of the operation.
+
+    At most `max_concurrency` calls of the operation are in flight, and at most
+    `max_historical_concurrency` historical data requests, since TWS paces those and further
+    requests only queue up in the HistoricalPacingGovernor. Calls are dispatched in the order
+    they were loaded
+    """
+    MAX_CONCURRENCY = 50
+    MAX_HISTORICAL_CONCURRENCY = 6
+
+    stats: RequestLoaderStats
+
+    def __init__(self, client: 'AsyncioClient', max_concurrency: int = MAX_CONCURRENCY, max_historical_concurrency: int = MAX_HISTORICAL_CONCURRENCY):
+        self._client = client
+        self._loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._historical_semaphore = asyncio.Semaphore(max_historical_concurrency)
+        self._results: Dict[Hashable, asyncio.Future] = {}
+        self._batch: List[Tuple[asyncio.Future, str, Tuple]] = []
+        self.stats = RequestLoaderStats()
+
+    async def load(self, method_name: str, *args) -> Any:
+        self.stats.loads += 1
+        key = None
+        if method_name in CACHEABLE_REQUESTS:
+            key = (method_name, canonical_key(args))
+            f = self._results.get(key)
+            if f is not None:
+                self.stats.deduplicated += 1
+                # Shield the shared future from the cancellation of one of its resolvers
+                return await asyncio.shield(f)
+        f = self._loop.create_future()
+        if key is not None:
+            self._results[key] = f
+        if len(self._batch) == 0:
+            self._loop.call_soon(self._dispatch)
+        self._batch.append((f, method_name, args))
+        return await asyncio.shield(f)
+
+    def _dispatch(self):
+        batch = self._batch
+        self._batch = []
+        for f,method_name,args in batch:
+            self._loop.create_task(self._call(f, method_name, args))
+
+    async def _call(self, f: asyncio.Future, method_name: str, args: Tuple):
+        semaphore = self._historical_semaphore if method_name in HISTORICAL_REQUESTS else self._semaphore
+        async with semaphore:
+            self.stats.calls += 1
+            try:
+                res = await getattr(self._client, method_name)(*args)
+            except Exception as e:
+                if not f.done():
+                    f.set_exception(e)
+                return
+        if not f.done():
+            f.set_result(res)
+
+def request_loader(info: 'graphql.GraphQLResolveInfo', client: 'AsyncioClient') -> RequestLoader:
+    """
+    Returns the loader of the operation of a resolver, which is kept in the operation context
+    """
+    context = info.context
+    if not isinstance(context, dict):
+        return RequestLoader(client)
+    loader = context.get(LOADER_CONTEXT_KEY)
+    if loader is None:
+        loader = context[LOADER_CONTEXT_KEY] = RequestLoader(client)
+    return loader
@@ -1,13 +1,15 @@
 from ariadne import make_executable_schema, load_schema_from_path
 from ariadne.asgi import GraphQL
+from graphql import GraphQLSchema
 from ib_tws_server.gen.asyncio_client import AsyncioClient
 from ib_tws_server.gen.graphql_resolver import query, subscription, graphql_resolver_set_client, union_types
+from ib_tws_server.graphql.persisted_operations import PersistedOperations, PersistedOperationsHTTPHandler
 import logging
 import os
 from starlette.middleware.cors import CORSMiddleware
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import sys
-from typing import Union
+from typing import Callable, Union
 
 logging.basicConfig(stream=sys.stdout, level=logging.WARN)
 logger = logging.getLogger()
@@ -17,9 +19,11 @@ class IbClientLifespan:
     receive: Receive
     send: Send
     ib_client: AsyncioClient
+    client_factory: Callable[[], AsyncioClient]
 
-    def __init__(self, app: ASGIApp):
+    def __init__(self, app: ASGIApp, client_factory: Callable[[], AsyncioClient] = AsyncioClient):
         self.app = app
+        self.client_factory = client_factory
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         if scope["type"] != "lifespan":
@@ -31,7 +35,7 @@ class IbClientLifespan:
         if msg["type"] != "lifespan.startup":
             raise RuntimeError(f"Unexpected Lifetime event {msg}")
         print("Received start up...")
-        self.ib_client = self.create_and_start_ib_client()
+        self.ib_client = await self.create_and_connect_ib_client()
         await send({"type": "lifespan.startup.complete"})
         msg = await receive()
         if msg["type"] != "lifespan.shutdown":
@@ -39,33 +43,46 @@ class IbClientLifespan:
         self.ib_client.disconnect(True)
         await send({"type": "lifespan.shutdown.complete"})
 
-    # Create the client object that interacts with TWS and start the connection
-    def create_and_start_ib_client(self):
-        c = AsyncioClient()
+    # Create the client object that interacts with TWS and connect without blocking the event loop.
+    # The client reconnects by itself when the connection is lost
+    async def create_and_connect_ib_client(self):
+        c = self.client_factory()
         host = os.getenv('IB_SERVER_HOST')
         port = os.getenv('IB_SERVER_PORT')
 
         if host is None:
-            logger.warn(f"IB_SERVER_HOST is not set. Using default")
+            logger.warning(f"IB_SERVER_HOST is not set. Using default")
             host = "127.0.0.1"
         if port is None:
-            logger.warn(f"IB_SERVER_PORT is not set. Using default")
+            logger.warning(f"IB_SERVER_PORT is not set. Using default")
             port = 7496
         else:
             port = int(port)
 
-        connection_retry_interval = 5
-        c.start(host, port, 0, connection_retry_interval)
+        await c.connect(host, port, 0)
         graphql_resolver_set_client(c)
         return c
 
-def create_app():
+# Operations are parsed and validated once and can be sent by hash. IB_PERSISTED_OPERATIONS is an optional
+# JSON file with the operations to register. With IB_PERSISTED_OPERATIONS_ONLY set to 1, true or yes, only those are executed
+def create_persisted_operations(schema: GraphQLSchema) -> PersistedOperations:
+    path = os.getenv('IB_PERSISTED_OPERATIONS')
+    only = os.getenv('IB_PERSISTED_OPERATIONS_ONLY', '').lower() in ('1', 'true', 'yes')
+    operations = PersistedOperations(schema, allow_unregistered=not only)
+    if path is not None:
+        operations.register_from_file(path)
+    elif only:
+        logger.warning(f"IB_PERSISTED_OPERATIONS_ONLY is set without IB_PERSISTED_OPERATIONS. No operations can be executed")
+    return operations
+
+def create_app(client_factory: Callable[[], AsyncioClient] = AsyncioClient):
     type_defs = load_schema_from_path("ib_tws_server/gen/schema.graphql")
     schema = make_executable_schema(type_defs, query, subscription, union_types)
-    ariadneApp = GraphQL(schema, debug=True)
+    operations = create_persisted_operations(schema)
+    ariadneApp = GraphQL(schema, debug=True, query_validator=operations.validate, http_handler=PersistedOperationsHTTPHandler(operations))
     # Wrap ariadne with CORS middleware for CORS handling
     corsWrapper = CORSMiddleware(app=ariadneApp, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
     # Wrap with IB client lifespan wrapper
-    return IbClientLifespan(corsWrapper)
+    return IbClientLifespan(corsWrapper, client_factory)
 
 app = create_app()
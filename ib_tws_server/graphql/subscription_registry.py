@@ -0,0 +1,71 @@
+import asyncio
+from ib_tws_server.asyncio.broadcast_channel import BroadcastChannel, BroadcastSubscriber
+from ib_tws_server.asyncio.shared_upstream import SharedUpstream, SharedUpstreams
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Hashable, Tuple
+
+ReplayKeyType = Callable[[Any], Hashable]
+
+def tick_type_key(tick: object) -> Hashable:
+    """
+    Replay key of market data responses: the latest tick of every tick type is replayed
+    """
+    return getattr(tick, 'tickType', type(tick))
+
+class _Broadcast(SharedUpstream):
+    """
+    An upstream subscription and the channel its updates are published to
+    """
+    channel: BroadcastChannel
+    # Latest update by replay key, delivered first to subscribers that join later
+    latest: Dict[Hashable, Any]
+
+    def __init__(self, key: Hashable, ready: asyncio.Future, channel: BroadcastChannel, replay_key: ReplayKeyType):
+        super().__init__(key, ready)
+        self.channel = channel
+        self.replay_key = replay_key
+        self.latest = {} if replay_key is not None else None
+
+    def consumer_count(self) -> int:
+        return self.channel.subscriber_count()
+
+    def publish(self, val: Any):
+        if self.latest is not None:
+            self.latest[self.replay_key(val)] = val
+        self.channel.publish(val)
+
+    def close(self):
+        self.channel.close()
+
+class SubscriptionRegistry(SharedUpstreams[BroadcastSubscriber]):
+    """
+    Shares the subscriptions of the GraphQL subscription sources between websocket subscribers
+    with equal arguments. The first subscriber opens the subscription with the client, and its
+    updates are published to a BroadcastChannel that every subscriber reads with its own cursor.
+    Subscribers only receive the updates published after they joined, preceded by the latest
+    update of every `replay_key` if one is given, e.g. the current bid and ask of a market data
+    subscription. The subscription is cancelled when the last subscriber leaves
+    """
+    def __init__(self, capacity: int = BroadcastChannel.CAPACITY):
+        super().__init__()
+        self._capacity = capacity
+
+    def subscriber_count(self, request: Tuple) -> int:
+        b = self._get(request)
+        return b.consumer_count() if b is not None else 0
+
+    async def subscribe(self, request: Tuple, subscribe: Callable[[], Awaitable[AsyncGenerator]], replay_key: ReplayKeyType = None) -> BroadcastSubscriber:
+        """
+        Returns a subscriber of the active subscription equal to `request`, or opens a new
+        subscription by calling `subscribe`. `request` is a tuple of the request name and its arguments
+        """
+        return await self._join(request, subscribe, replay_key)
+
+    def _create(self, key: Hashable, ready: asyncio.Future, replay_key: ReplayKeyType) -> _Broadcast:
+        return _Broadcast(key, ready, BroadcastChannel(self._capacity), replay_key)
+
+    def _add_consumer(self, b: _Broadcast, replay_key: ReplayKeyType) -> BroadcastSubscriber:
+        replay = list(b.latest.values()) if b.latest is not None else None
+        return b.channel.subscribe(lambda s: self._release(b), replay)
+
+    def _discard_consumer(self, b: _Broadcast, subscriber: BroadcastSubscriber):
+        subscriber.close()
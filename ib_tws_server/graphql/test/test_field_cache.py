@@ -0,0 +1,86 @@
+import asyncio
+from ib_tws_server.graphql.field_cache import FieldCache, FieldCachePolicy, default_policies
+from unittest import IsolatedAsyncioTestCase
+
+class Clock():
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class Loader():
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise ValueError("failed")
+        return self.calls
+
+POLICIES = { 'reqMarketRule': FieldCachePolicy(10, 100) }
+
+class TestFieldCache(IsolatedAsyncioTestCase):
+    async def test_fresh_results_are_cached(self):
+        clock = Clock()
+        cache = FieldCache(POLICIES, clock=clock)
+        load = Loader()
+        res = await asyncio.gather(*[ cache.load(('reqMarketRule', 26), load) for _ in range(3) ])
+        self.assertEqual(res, [ 1, 1, 1 ])
+        clock.now = 9
+        self.assertEqual(await cache.load(('reqMarketRule', 26), load), 1)
+        self.assertEqual(await cache.load(('reqMarketRule', 27), load), 2)
+        self.assertEqual((cache.stats.hits, cache.stats.misses, load.calls), (1, 4, 2))
+
+    async def test_stale_results_are_reloaded_in_background(self):
+        clock = Clock()
+        cache = FieldCache(POLICIES, clock=clock)
+        load = Loader()
+        await cache.load(('reqMarketRule', 26), load)
+        clock.now = 50
+        self.assertEqual(await asyncio.gather(cache.load(('reqMarketRule', 26), load), cache.load(('reqMarketRule', 26), load)), [ 1, 1 ])
+        await asyncio.sleep(0.05)
+        self.assertEqual(await cache.load(('reqMarketRule', 26), load), 2)
+        self.assertEqual((cache.stats.stale_hits, cache.stats.reloads, load.calls), (2, 1, 2))
+        clock.now = 500
+        self.assertEqual(await cache.load(('reqMarketRule', 26), load), 3)
+
+    async def test_failed_reload_keeps_stale_result(self):
+        clock = Clock()
+        cache = FieldCache(POLICIES, clock=clock)
+        load = Loader()
+        await cache.load(('reqMarketRule', 26), load)
+        clock.now = 50
+        load.fail = True
+        self.assertEqual(await cache.load(('reqMarketRule', 26), load), 1)
+        await asyncio.sleep(0.05)
+        self.assertEqual(cache.stats.failed_reloads, 1)
+        self.assertEqual(await cache.load(('reqMarketRule', 26), load), 1)
+
+    async def test_entries_are_evicted_in_lru_order(self):
+        cache = FieldCache(POLICIES, max_entries=2, clock=Clock())
+        load = Loader()
+        for id in [ 1, 2, 1, 3 ]:
+            await cache.load(('reqMarketRule', id), load)
+        self.assertEqual((len(cache), cache.stats.evictions), (2, 1))
+        self.assertEqual(await cache.load(('reqMarketRule', 1), load), 1)
+        self.assertEqual(await cache.load(('reqMarketRule', 2), load), 4)
+
+    async def test_fields_without_policy_and_invalidate(self):
+        cache = FieldCache(POLICIES, clock=Clock())
+        load = Loader()
+        await cache.load(('reqCurrentTime',), load)
+        await cache.load(('reqCurrentTime',), load)
+        await cache.load(('reqMarketRule', 26), load)
+        cache.invalidate('reqMarketRule')
+        self.assertEqual(await cache.load(('reqMarketRule', 26), load), 4)
+        self.assertEqual(len(cache), 1)
+
+    def test_default_policies_follow_api_definitions(self):
+        policies = default_policies()
+        self.assertEqual(policies['reqMarketRule'], FieldCachePolicy(24 * 60 * 60, 24 * 60 * 60))
+        self.assertNotIn('reqMatchingSymbols', policies)
+        self.assertEqual(FieldCache().policy('reqFamilyCodes'), policies['reqFamilyCodes'])
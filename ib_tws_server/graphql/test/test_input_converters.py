@@ -0,0 +1,70 @@
+from graphql import GraphQLError
+from ib_tws_server.ib_imports import *
+from unittest import TestCase, skipIf
+
+try:
+    from ib_tws_server.gen import graphql_resolver
+except ImportError:
+    graphql_resolver = None
+
+@skipIf(graphql_resolver is None, "The code hasn't been generated")
+class TestInputConverters(TestCase):
+    def test_contract(self):
+        """Nested objects and lists of objects are converted"""
+        c = graphql_resolver.convert_ContractInput({
+            'symbol': "SPY",
+            'secType': "BAG",
+            'comboLegs': [ { 'conId': 1, 'ratio': 2, 'action': "BUY" }, None ],
+            'deltaNeutralContract': { 'conId': 3, 'delta': 0.5 }
+        })
+        self.assertIsInstance(c, ibapi.contract.Contract)
+        self.assertEqual(c.symbol, "SPY")
+        self.assertEqual(c.currency, "")
+        self.assertIsInstance(c.comboLegs[0], ibapi.contract.ComboLeg)
+        self.assertEqual(c.comboLegs[0].ratio, 2)
+        self.assertEqual(c.comboLegs[0].exchange, "")
+        self.assertIsNone(c.comboLegs[1])
+        self.assertIsInstance(c.deltaNeutralContract, ibapi.contract.DeltaNeutralContract)
+        self.assertEqual(c.deltaNeutralContract.delta, 0.5)
+
+    def test_missing_members(self):
+        """Members that aren't in the input keep their default"""
+        c = graphql_resolver.convert_ContractInput({ 'symbol': "SPY", 'comboLegs': None })
+        self.assertIsNone(c.comboLegs)
+        self.assertIsNone(c.deltaNeutralContract)
+
+    def test_order(self):
+        """Lists of tag values and the soft dollar tier of orders are converted"""
+        o = graphql_resolver.convert_OrderInput({
+            'action': "BUY",
+            'totalQuantity': 10,
+            'algoParams': [ { 'tag': "maxPctVol", 'value': "0.1" } ],
+            'softDollarTier': { 'name': "a", 'val': "b", 'displayName': "c" }
+        })
+        self.assertIsInstance(o, ibapi.order.Order)
+        self.assertEqual(o.totalQuantity, 10)
+        self.assertEqual(o.orderType, "")
+        self.assertIsInstance(o.algoParams[0], ibapi.tag_value.TagValue)
+        self.assertEqual(o.algoParams[0].value, "0.1")
+        self.assertIsInstance(o.softDollarTier, ibapi.softdollartier.SoftDollarTier)
+        self.assertEqual(o.softDollarTier.displayName, "c")
+
+    def test_order_conditions(self):
+        """Order conditions are created by their condType, so placeOrder can encode them"""
+        o = graphql_resolver.convert_OrderInput({
+            'conditions': [
+                { 'condType': ibapi.order_condition.OrderCondition.Price, 'conId': 265598, 'exchange': "SMART", 'isMore': True, 'price': 200.0, 'triggerMethod': 0 },
+                { 'condType': ibapi.order_condition.OrderCondition.Time, 'isConjunctionConnection': False, 'isMore': True, 'time': "20261019 09:30:00" }
+            ]
+        })
+        price,time = o.conditions
+        self.assertIsInstance(price, ibapi.order_condition.PriceCondition)
+        self.assertEqual((price.conId, price.price), (265598, 200.0))
+        self.assertIsInstance(time, ibapi.order_condition.TimeCondition)
+        self.assertFalse(time.isConjunctionConnection)
+        self.assertEqual(len(price.make_fields()), 6)
+        self.assertEqual(len(time.make_fields()), 3)
+
+    def test_unknown_order_condition(self):
+        with self.assertRaises(GraphQLError):
+            graphql_resolver.convert_OrderInput({ 'conditions': [ { 'condType': 2 } ] })
@@ -0,0 +1,88 @@
+from ariadne import QueryType, make_executable_schema
+from ariadne.asgi import GraphQL
+from ib_tws_server.graphql.persisted_operations import PERSISTED_QUERY_NOT_FOUND, PersistedOperations, PersistedOperationsHTTPHandler, operation_hash
+from graphql import GraphQLError
+import httpx
+import os
+from unittest import IsolatedAsyncioTestCase, mock, skipIf
+
+try:
+    from ib_tws_server.graphql.server_entry import create_persisted_operations
+except ImportError:
+    create_persisted_operations = None
+
+TYPE_DEFS = """
+type Query {
+    hello(name: String!): String!
+}
+"""
+
+QUERY = "query Hello($name: String!) { hello(name: $name) }"
+
+def create_schema():
+    query = QueryType()
+    query.set_field("hello", lambda obj, info, name: f"Hello {name}")
+    return make_executable_schema(TYPE_DEFS, query)
+
+def persisted(hash: str) -> dict:
+    return { "persistedQuery": { "version": 1, "sha256Hash": hash } }
+
+class TestPersistedOperations(IsolatedAsyncioTestCase):
+    async def post(self, operations: PersistedOperations, data: dict) -> dict:
+        app = GraphQL(operations._schema, query_validator=operations.validate, http_handler=PersistedOperationsHTTPHandler(operations))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            res = await client.post("/", json=data)
+        return res.json()
+
+    async def test_registered_operation_is_executed_by_hash(self):
+        operations = PersistedOperations(create_schema(), allow_unregistered=False)
+        hash = operations.register(QUERY)
+        self.assertEqual(hash, operation_hash(QUERY))
+        for name in [ "A", "B" ]:
+            res = await self.post(operations, { "variables": { "name": name }, "extensions": persisted(hash) })
+            self.assertEqual(res, { "data": { "hello": f"Hello {name}" } })
+        self.assertEqual((operations.stats.hits, operations.stats.misses), (2, 0))
+
+    async def test_unregistered_operations_are_rejected(self):
+        operations = PersistedOperations(create_schema(), allow_unregistered=False)
+        res = await self.post(operations, { "extensions": persisted("0" * 64) })
+        self.assertEqual(res["errors"][0]["extensions"]["code"], PERSISTED_QUERY_NOT_FOUND)
+        res = await self.post(operations, { "query": QUERY, "variables": { "name": "A" } })
+        self.assertNotIn("data", res)
+
+    async def test_automatic_registration(self):
+        operations = PersistedOperations(create_schema())
+        hash = operation_hash(QUERY)
+        res = await self.post(operations, { "variables": { "name": "A" }, "extensions": persisted(hash) })
+        self.assertEqual(res["errors"][0]["extensions"]["code"], PERSISTED_QUERY_NOT_FOUND)
+        res = await self.post(operations, { "query": QUERY, "variables": { "name": "A" }, "extensions": persisted(hash) })
+        self.assertEqual(res, { "data": { "hello": "Hello A" } })
+        res = await self.post(operations, { "variables": { "name": "B" }, "extensions": persisted(hash) })
+        self.assertEqual(res, { "data": { "hello": "Hello B" } })
+        res = await self.post(operations, { "query": QUERY, "variables": { "name": "C" } })
+        self.assertEqual(res, { "data": { "hello": "Hello C" } })
+        self.assertEqual((operations.stats.hits, operations.stats.misses), (2, 1))
+
+    async def test_invalid_queries_are_reported_and_not_kept(self):
+        operations = PersistedOperations(create_schema())
+        res = await self.post(operations, { "query": "{ goodbye }" })
+        self.assertIn("goodbye", res["errors"][0]["message"])
+        self.assertEqual(len(operations), 0)
+        with self.assertRaises(GraphQLError):
+            operations.register("{ goodbye }")
+
+    async def test_recent_operations_are_evicted(self):
+        operations = PersistedOperations(create_schema(), max_entries=1)
+        registered = operations.register(QUERY)
+        first = operations.resolve({ "query": '{ hello(name: "A") }' })
+        operations.resolve({ "query": '{ hello(name: "B") }' })
+        self.assertEqual((len(operations), operations.stats.evictions), (2, 1))
+        self.assertIsNone(operations.lookup(first.hash))
+        self.assertIsNotNone(operations.lookup(registered))
+
+@skipIf(create_persisted_operations is None, "The code hasn't been generated")
+class TestPersistedOperationsOnly(IsolatedAsyncioTestCase):
+    async def test_environment_variable_is_a_boolean(self):
+        for value,only in [ ("1", True), ("true", True), ("Yes", True), ("0", False), ("false", False), ("", False) ]:
+            with mock.patch.dict(os.environ, { "IB_PERSISTED_OPERATIONS_ONLY": value }):
+                self.assertEqual(create_persisted_operations(create_schema())._allow_unregistered, not only, value)
@@ -0,0 +1,71 @@
+import asyncio
+from ib_tws_server.graphql.request_loader import LOADER_CONTEXT_KEY, RequestLoader, request_loader
+from unittest import IsolatedAsyncioTestCase
+
+class FakeClient():
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self, name: str, *args):
+        self.calls.append((name, *args))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return args
+
+    async def reqContractDetails(self, contract: str):
+        return await self._call('reqContractDetails', contract)
+
+    async def reqHistoricalData(self, contract: str):
+        return await self._call('reqHistoricalData', contract)
+
+    async def reqAccountSummary(self, group: str):
+        return await self._call('reqAccountSummary', group)
+
+    async def reqMarketRule(self, id: int):
+        raise ValueError(id)
+
+class Info():
+    def __init__(self, context):
+        self.context = context
+
+class TestRequestLoader(IsolatedAsyncioTestCase):
+    async def test_equal_queries_are_loaded_once(self):
+        client = FakeClient()
+        loader = RequestLoader(client)
+        res = await asyncio.gather(*[ loader.load('reqContractDetails', s) for s in [ "A", "B", "A", "A" ] ])
+        self.assertEqual(res, [ ("A",), ("B",), ("A",), ("A",) ])
+        self.assertEqual(await loader.load('reqContractDetails', "B"), ("B",))
+        self.assertEqual(client.calls, [ ('reqContractDetails', "A"), ('reqContractDetails', "B") ])
+        self.assertEqual((loader.stats.loads, loader.stats.deduplicated, loader.stats.calls), (5, 3, 2))
+
+    async def test_queries_with_side_effects_are_not_shared(self):
+        client = FakeClient()
+        loader = RequestLoader(client)
+        await asyncio.gather(loader.load('reqAccountSummary', "All"), loader.load('reqAccountSummary', "All"))
+        self.assertEqual(len(client.calls), 2)
+
+    async def test_concurrency_limits(self):
+        client = FakeClient()
+        loader = RequestLoader(client, max_concurrency=3, max_historical_concurrency=2)
+        await asyncio.gather(*[ loader.load('reqHistoricalData', i) for i in range(6) ])
+        self.assertEqual(client.max_in_flight, 2)
+        client.max_in_flight = 0
+        await asyncio.gather(*[ loader.load('reqContractDetails', i) for i in range(6) ])
+        self.assertEqual(client.max_in_flight, 3)
+
+    async def test_errors_are_raised_to_every_caller(self):
+        loader = RequestLoader(FakeClient())
+        res = await asyncio.gather(loader.load('reqMarketRule', 1), loader.load('reqMarketRule', 1), return_exceptions=True)
+        self.assertTrue(all([ isinstance(e, ValueError) for e in res ]))
+
+    async def test_loader_is_kept_in_the_operation_context(self):
+        client = FakeClient()
+        context = {}
+        loader = request_loader(Info(context), client)
+        self.assertIs(request_loader(Info(context), client), loader)
+        self.assertIs(context[LOADER_CONTEXT_KEY], loader)
+        self.assertIsNot(request_loader(Info({}), client), loader)
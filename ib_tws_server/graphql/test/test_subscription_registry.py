@@ -0,0 +1,103 @@
+import asyncio
+from ib_tws_server.graphql.subscription_registry import SubscriptionRegistry, tick_type_key
+from unittest import IsolatedAsyncioTestCase
+
+class Tick():
+    def __init__(self, tickType: int, price: float):
+        self.tickType = tickType
+        self.price = price
+
+class Upstream():
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        val = await self.queue.get()
+        if val is None:
+            raise StopAsyncIteration
+        return val
+
+    async def aclose(self):
+        self.closed = True
+
+class TestSubscriptionRegistry(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.upstreams = []
+
+    async def open(self):
+        await asyncio.sleep(0.01)
+        u = Upstream()
+        self.upstreams.append(u)
+        return u
+
+    async def test_equal_subscriptions_share_one_upstream(self):
+        r = SubscriptionRegistry()
+        subs = await asyncio.gather(*[ r.subscribe(('reqTickByTickData', { 'symbol': 'AAPL' }, 'Last'), self.open) for _ in range(5) ])
+        other = await r.subscribe(('reqTickByTickData', { 'symbol': 'MSFT' }, 'Last'), self.open)
+        self.assertEqual(len(self.upstreams), 2)
+        self.assertEqual(r.upstream_count(), 2)
+        self.assertEqual(r.subscriber_count(('reqTickByTickData', { 'symbol': 'AAPL' }, 'Last')), 5)
+        self.assertEqual((r.stats.upstream_subscriptions, r.stats.shared_subscriptions), (2, 4))
+        self.upstreams[0].queue.put_nowait(1)
+        self.assertEqual(await asyncio.gather(*[ s.__anext__() for s in subs ]), [ 1 ] * 5)
+        self.assertEqual(other.qsize(), 0)
+
+    async def test_last_subscriber_closes_upstream(self):
+        r = SubscriptionRegistry()
+        a = await r.subscribe(('req', 1), self.open)
+        b = await r.subscribe(('req', 1), self.open)
+        await a.aclose()
+        self.assertFalse(self.upstreams[0].closed)
+        await b.aclose()
+        await asyncio.sleep(0)
+        self.assertTrue(self.upstreams[0].closed)
+        self.assertEqual(r.upstream_count(), 0)
+        await r.subscribe(('req', 1), self.open)
+        self.assertEqual(len(self.upstreams), 2)
+
+    async def test_late_subscriber_receives_latest_value_per_key(self):
+        r = SubscriptionRegistry()
+        a = await r.subscribe(('reqMktData', 1), self.open, tick_type_key)
+        u = self.upstreams[0]
+        for t in [ Tick(1, 10), Tick(2, 11), Tick(1, 12) ]:
+            u.queue.put_nowait(t)
+        while a.qsize() < 3:
+            await asyncio.sleep(0)
+        b = await r.subscribe(('reqMktData', 1), self.open, tick_type_key)
+        u.queue.put_nowait(Tick(2, 13))
+        self.assertEqual([ (t.tickType, t.price) for t in [ await b.__anext__() for _ in range(3) ] ], [ (1, 12), (2, 11), (2, 13) ])
+
+    async def test_ended_upstream_ends_subscribers(self):
+        r = SubscriptionRegistry()
+        a = await r.subscribe(('req', 1), self.open)
+        self.upstreams[0].queue.put_nowait(None)
+        self.assertEqual([ v async for v in a ], [])
+        self.assertEqual(r.upstream_count(), 0)
+
+    async def test_failed_subscribe_fails_joiners(self):
+        r = SubscriptionRegistry()
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("rejected")
+        res = await asyncio.gather(r.subscribe(('req', 1), fail), r.subscribe(('req', 1), fail), return_exceptions=True)
+        self.assertTrue(all(isinstance(e, ValueError) for e in res))
+        self.assertEqual(r.upstream_count(), 0)
+
+    async def test_cancelled_opener_doesnt_cancel_joiners(self):
+        """Subscribers waiting for a subscription whose opener was cancelled open it again"""
+        r = SubscriptionRegistry()
+        opener = asyncio.create_task(r.subscribe(('req', 1), self.open))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(r.subscribe(('req', 1), self.open))
+        await asyncio.sleep(0)
+        opener.cancel()
+        sub = await joiner
+        self.assertTrue(opener.cancelled())
+        self.assertEqual(len(self.upstreams), 1)
+        self.assertEqual(r.subscriber_count(('req', 1)), 1)
+        self.upstreams[0].queue.put_nowait(1)
+        self.assertEqual(await sub.__anext__(), 1)
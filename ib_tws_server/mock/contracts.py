@@ -0,0 +1,13 @@
+from ibapi.contract import Contract
+
+"""
+Contracts used by the tests and benchmarks that run against the mock TWS server
+"""
+
+def contract_for_symbol(sym: str) -> Contract:
+    c = Contract()
+    c.symbol = sym
+    c.secType = "STK"
+    c.currency = "USD"
+    c.exchange = "SMART"
+    return c
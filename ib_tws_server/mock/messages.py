@@ -0,0 +1,209 @@
+from ibapi.comm import make_field, make_msg, read_fields
+from ibapi.message import IN, OUT
+from ibapi.server_versions import *
+from ibapi.ticktype import TickTypeEnum
+import struct
+from typing import Iterator, List, Tuple
+
+"""
+Encoders for the messages sent by the mock TWS server, and decoders for the requests sent by EClient.
+
+The layouts follow the TWS API decoder for the server version negotiated by the mock server
+(SERVER_VERSION below), which is supported by TWS API 9.76 and later.
+"""
+
+SERVER_VERSION = MIN_SERVER_VER_PRICE_MGMT_ALGO
+MIN_SUPPORTED_CLIENT_VERSION = MIN_SERVER_VER_TICK_BY_TICK_IGNORE_SIZE
+
+TICK_BY_TICK_TYPES = {
+    "Last": 1,
+    "AllLast": 2,
+    "BidAsk": 3,
+    "MidPoint": 4
+}
+
+def encode(*fields) -> bytes:
+    return make_msg("".join([ make_field(f) for f in fields ]))
+
+def split_messages(buf: bytes) -> Tuple[List[bytes], bytes]:
+    """
+    Splits length prefixed messages from buf. Returns the complete messages and the remaining bytes
+    """
+    ret = []
+    offset = 0
+    while len(buf) - offset >= 4:
+        size = struct.unpack_from("!I", buf, offset)[0]
+        if len(buf) - offset - 4 < size:
+            break
+        ret.append(buf[offset + 4:offset + 4 + size])
+        offset += 4 + size
+    return ret, buf[offset:]
+
+def decode_fields(msg: bytes) -> List[str]:
+    return [ f.decode() for f in read_fields(msg) ]
+
+def parse_client_version_range(handshake: str) -> Tuple[int,int]:
+    """
+    Parses the "v<min>..<max> [options]" handshake sent by EClient.connect
+    """
+    versions = handshake.split(" ")[0]
+    if not versions.startswith("v") or ".." not in versions:
+        raise ValueError(f"Unexpected handshake {handshake}")
+    min_version,max_version = versions[1:].split("..")
+    return int(min_version), int(max_version)
+
+class MockContract():
+    """
+    The subset of contract fields included in requests that the mock server uses
+    """
+    con_id: int
+    symbol: str
+    sec_type: str
+    last_trade_date: str
+    strike: float
+    right: str
+    multiplier: str
+    exchange: str
+    primary_exchange: str
+    currency: str
+    local_symbol: str
+    trading_class: str
+
+    def __init__(self, fields: Iterator[str]):
+        self.con_id = int(next(fields) or 0)
+        self.symbol = next(fields)
+        self.sec_type = next(fields)
+        self.last_trade_date = next(fields)
+        self.strike = float(next(fields) or 0)
+        self.right = next(fields)
+        self.multiplier = next(fields)
+        self.exchange = next(fields)
+        self.primary_exchange = next(fields)
+        self.currency = next(fields)
+        self.local_symbol = next(fields)
+        self.trading_class = next(fields)
+
+    def mock_con_id(self) -> int:
+        if self.con_id > 0:
+            return self.con_id
+        # Stable across runs, unlike hash()
+        return sum([ (i + 1) * ord(c) for i,c in enumerate(self.symbol + self.sec_type) ]) + 1000
+
+def skip_combo_legs(fields: Iterator[str], contract: MockContract):
+    if contract.sec_type == "BAG":
+        for _ in range(int(next(fields)) * 4):
+            next(fields)
+
+# Server -> client messages
+
+def server_version_msg(server_version: int, conn_time: str) -> bytes:
+    return encode(server_version, conn_time)
+
+def next_valid_id_msg(order_id: int) -> bytes:
+    return encode(IN.NEXT_VALID_ID, 1, order_id)
+
+def managed_accounts_msg(accounts: str) -> bytes:
+    return encode(IN.MANAGED_ACCTS, 1, accounts)
+
+def error_msg(req_id: int, code: int, msg: str) -> bytes:
+    return encode(IN.ERR_MSG, 2, req_id, code, msg)
+
+def current_time_msg(t: int) -> bytes:
+    return encode(IN.CURRENT_TIME, 1, t)
+
+def contract_data_msg(req_id: int, c: MockContract) -> bytes:
+    exchange = c.exchange or "SMART"
+    primary_exchange = c.primary_exchange or "NASDAQ"
+    currency = c.currency or "USD"
+    return encode(IN.CONTRACT_DATA, 8, req_id,
+        c.symbol, c.sec_type, c.last_trade_date, c.strike, c.right, exchange, currency, c.local_symbol or c.symbol,
+        # marketName, tradingClass, conId, minTick, mdSizeMultiplier, multiplier
+        c.symbol, c.trading_class or c.symbol, c.mock_con_id(), 0.01, 100, c.multiplier,
+        # orderTypes, validExchanges, priceMagnifier, underConId, longName, primaryExchange
+        "LMT,MKT,STP", f"SMART,{primary_exchange}", 1, 0, f"{c.symbol} MOCK CONTRACT", primary_exchange,
+        # contractMonth, industry, category, subcategory, timeZoneId, tradingHours, liquidHours
+        "", "Technology", "Computers", "Software", "US/Eastern", "20210101:0400-20210101:2000", "20210101:0930-20210101:1600",
+        # evRule, evMultiplier, secIdListCount, aggGroup, underSymbol, underSecType, marketRuleIds, realExpirationDate
+        "", 0, 0, 1, "", "", "26,26", "")
+
+def contract_data_end_msg(req_id: int) -> bytes:
+    return encode(IN.CONTRACT_DATA_END, 1, req_id)
+
+def historical_data_msg(req_id: int, start: str, end: str, bars: List[Tuple[str, float, float, float, float, int, float, int]]) -> bytes:
+    fields = [ IN.HISTORICAL_DATA, req_id, start, end, len(bars) ]
+    for b in bars:
+        fields.extend(b)
+    return encode(*fields)
+
+def tick_price_msg(req_id: int, tick_type: int, price: float, size: int) -> bytes:
+    return encode(IN.TICK_PRICE, 6, req_id, tick_type, price, size, 0)
+
+def tick_size_msg(req_id: int, tick_type: int, size: int) -> bytes:
+    return encode(IN.TICK_SIZE, 6, req_id, tick_type, size)
+
+def tick_snapshot_end_msg(req_id: int) -> bytes:
+    return encode(IN.TICK_SNAPSHOT_END, 1, req_id)
+
+def tick_by_tick_last_msg(req_id: int, tick_type: int, t: int, price: float, size: int, exchange: str) -> bytes:
+    return encode(IN.TICK_BY_TICK, req_id, tick_type, t, price, size, 0, exchange, "")
+
+def tick_by_tick_bid_ask_msg(req_id: int, t: int, bid: float, ask: float, bid_size: int, ask_size: int) -> bytes:
+    return encode(IN.TICK_BY_TICK, req_id, TICK_BY_TICK_TYPES["BidAsk"], t, bid, ask, bid_size, ask_size, 0)
+
+def tick_by_tick_mid_point_msg(req_id: int, t: int, mid: float) -> bytes:
+    return encode(IN.TICK_BY_TICK, req_id, TICK_BY_TICK_TYPES["MidPoint"], t, mid)
+
+# Client -> server requests. Each parser receives an iterator positioned after the message id
+
+class ContractDetailsRequest():
+    def __init__(self, fields: Iterator[str]):
+        next(fields) # version
+        self.req_id = int(next(fields))
+        self.contract = MockContract(fields)
+
+class MktDataRequest():
+    def __init__(self, fields: Iterator[str]):
+        next(fields) # version
+        self.req_id = int(next(fields))
+        self.contract = MockContract(fields)
+        skip_combo_legs(fields, self.contract)
+        if next(fields) == "1":
+            # delta neutral contract
+            for _ in range(3):
+                next(fields)
+        self.generic_tick_list = next(fields)
+        self.snapshot = next(fields) == "1"
+
+class HistoricalDataRequest():
+    def __init__(self, fields: Iterator[str]):
+        self.req_id = int(next(fields))
+        self.contract = MockContract(fields)
+        next(fields) # includeExpired
+        self.end_date_time = next(fields)
+        self.bar_size = next(fields)
+        self.duration = next(fields)
+        self.use_rth = int(next(fields))
+        self.what_to_show = next(fields)
+        self.format_date = int(next(fields))
+        skip_combo_legs(fields, self.contract)
+        self.keep_up_to_date = next(fields) == "1"
+
+class TickByTickRequest():
+    def __init__(self, fields: Iterator[str]):
+        self.req_id = int(next(fields))
+        self.contract = MockContract(fields)
+        self.tick_type = next(fields)
+        self.number_of_ticks = int(next(fields))
+        self.ignore_size = next(fields) == "1"
+
+class CancelRequest():
+    def __init__(self, fields: Iterator[str], has_version: bool):
+        if has_version:
+            next(fields)
+        self.req_id = int(next(fields))
+
+SIZE_TICK_TYPES = {
+    TickTypeEnum.BID: TickTypeEnum.BID_SIZE,
+    TickTypeEnum.ASK: TickTypeEnum.ASK_SIZE,
+    TickTypeEnum.LAST: TickTypeEnum.LAST_SIZE
+}
@@ -0,0 +1,95 @@
+from ibapi.client import EClient
+from ibapi.common import BarData
+from ibapi.contract import ContractDetails
+from ibapi.wrapper import EWrapper
+from ib_tws_server.mock.contracts import contract_for_symbol
+from ib_tws_server.mock.messages import MockContract, split_messages
+from ib_tws_server.mock.tws_server import MockTwsConfig, MockTwsServer
+from threading import Event, Thread
+from typing import List
+from unittest import TestCase
+
+class RecordingWrapper(EWrapper):
+    def __init__(self):
+        EWrapper.__init__(self)
+        self.next_valid_id = Event()
+        self.done = Event()
+        self.current_time: int = None
+        self.contract_details: List[ContractDetails] = []
+        self.bars: List[BarData] = []
+        self.ticks = 0
+
+    def nextValidId(self, orderId: int):
+        self.next_valid_id.set()
+
+    def currentTime(self, time: int):
+        self.current_time = time
+        self.done.set()
+
+    def contractDetails(self, reqId: int, contractDetails: ContractDetails):
+        self.contract_details.append(contractDetails)
+
+    def contractDetailsEnd(self, reqId: int):
+        self.done.set()
+
+    def historicalData(self, reqId: int, bar: BarData):
+        self.bars.append(bar)
+
+    def historicalDataEnd(self, reqId: int, start: str, end: str):
+        self.done.set()
+
+    def tickByTickBidAsk(self, reqId: int, time: int, bidPrice: float, askPrice: float, bidSize: int, askSize: int, tickAttribBidAsk):
+        self.ticks += 1
+        if self.ticks == 10:
+            self.done.set()
+
+class TestMessages(TestCase):
+    def test_split_messages_keeps_partial_message(self):
+        msgs,rest = split_messages(b"\0\0\0\2ab\0\0\0\3c")
+        self.assertEqual(msgs, [ b"ab" ])
+        self.assertEqual(rest, b"\0\0\0\3c")
+
+    def test_mock_con_id_is_stable(self):
+        fields = [ "0", "AMZN", "STK", "", "0", "", "", "SMART", "", "USD", "", "" ]
+        self.assertEqual(MockContract(iter(fields)).mock_con_id(), MockContract(iter(fields)).mock_con_id())
+
+class TestMockTwsServer(TestCase):
+    def setUp(self):
+        self.server = MockTwsServer(MockTwsConfig(tick_rate=1000, bars_per_request=20))
+        self.server.start_in_thread()
+        self.wrapper = RecordingWrapper()
+        self.client = EClient(self.wrapper)
+        self.client.connect("127.0.0.1", self.server.port, 0)
+        self.thread = Thread(target=self.client.run, daemon=True)
+        self.thread.start()
+        self.assertTrue(self.wrapper.next_valid_id.wait(5))
+
+    def tearDown(self):
+        self.client.disconnect()
+        self.thread.join(5)
+        self.server.stop_thread()
+
+    def wait(self):
+        self.assertTrue(self.wrapper.done.wait(5))
+        self.wrapper.done.clear()
+
+    def test_queries(self):
+        self.client.reqCurrentTime()
+        self.wait()
+        self.assertGreater(self.wrapper.current_time, 0)
+
+        self.client.reqContractDetails(1, contract_for_symbol("AMZN"))
+        self.wait()
+        self.assertEqual(len(self.wrapper.contract_details), 1)
+        self.assertEqual(self.wrapper.contract_details[0].contract.symbol, "AMZN")
+        self.assertGreater(self.wrapper.contract_details[0].contract.conId, 0)
+
+        self.client.reqHistoricalData(2, contract_for_symbol("AMZN"), "", "1 D", "1 min", "TRADES", 0, 2, False, [])
+        self.wait()
+        self.assertEqual(len(self.wrapper.bars), 20)
+
+    def test_tick_by_tick_stream(self):
+        self.client.reqTickByTickData(3, contract_for_symbol("AMZN"), "BidAsk", 0, False)
+        self.wait()
+        self.client.cancelTickByTickData(3)
+        self.assertGreaterEqual(self.server.ticks_sent, 10)
@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+from collections import Counter
+from ib_tws_server.mock.messages import *
+import logging
+import math
+import sys
+import time
+from threading import Event, Thread
+from typing import Callable, Dict, Set
+
+logger = logging.getLogger(__name__)
+
+class MockTwsConfig():
+    """
+    Behavior of the mock TWS server
+
+    tick_rate: ticks per second sent for each streaming subscription. 0 sends ticks as fast as
+        the connection allows
+    bars_per_request: number of bars returned for each historical data request
+    response_delay: seconds to wait before responding to a query, to simulate the TWS round trip
+    """
+    tick_rate: float
+    bars_per_request: int
+    response_delay: float
+    managed_accounts: str
+
+    def __init__(self, tick_rate: float = 1000, bars_per_request: int = 100, response_delay: float = 0, managed_accounts: str = "DU000000"):
+        self.tick_rate = tick_rate
+        self.bars_per_request = bars_per_request
+        self.response_delay = response_delay
+        self.managed_accounts = managed_accounts
+
+class MockTwsSession():
+    """
+    A single client connection to the mock TWS server
+    """
+    TICK_INTERVAL = 0.001
+
+    def __init__(self, server: 'MockTwsServer', reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._server = server
+        self._config = server.config
+        self._reader = reader
+        self._writer = writer
+        self._streams: Dict[int, asyncio.Task] = {}
+        self._handlers: Dict[int, Callable[[Iterator[str]], None]] = {
+            OUT.START_API: self._start_api,
+            OUT.REQ_IDS: self._req_ids,
+            OUT.REQ_CURRENT_TIME: self._req_current_time,
+            OUT.REQ_CONTRACT_DATA: self._req_contract_details,
+            OUT.REQ_HISTORICAL_DATA: self._req_historical_data,
+            OUT.CANCEL_HISTORICAL_DATA: lambda f: self._cancel(CancelRequest(f, True)),
+            OUT.REQ_MKT_DATA: self._req_mkt_data,
+            OUT.CANCEL_MKT_DATA: lambda f: self._cancel(CancelRequest(f, True)),
+            OUT.REQ_TICK_BY_TICK_DATA: self._req_tick_by_tick_data,
+            OUT.CANCEL_TICK_BY_TICK_DATA: lambda f: self._cancel(CancelRequest(f, False))
+        }
+        self.server_version = None
+
+    def close(self):
+        for t in self._streams.values():
+            t.cancel()
+        self._streams.clear()
+        self._writer.close()
+
+    def _send(self, msg: bytes):
+        self._writer.write(msg)
+
+    async def _handshake(self) -> bool:
+        prefix = await self._reader.readexactly(4)
+        if prefix != b"API\0":
+            logger.error(f"Unexpected handshake prefix {prefix}")
+            return False
+        size = struct.unpack("!I", await self._reader.readexactly(4))[0]
+        min_version,max_version = parse_client_version_range((await self._reader.readexactly(size)).decode())
+        if max_version < MIN_SUPPORTED_CLIENT_VERSION or min_version > SERVER_VERSION:
+            logger.error(f"Unsupported client versions {min_version}..{max_version}")
+            return False
+        self.server_version = min(max_version, SERVER_VERSION)
+        self._send(server_version_msg(self.server_version, time.strftime("%Y%m%d %H:%M:%S EST")))
+        await self._writer.drain()
+        return True
+
+    async def run(self):
+        try:
+            if not await self._handshake():
+                return
+            buf = b""
+            while True:
+                data = await self._reader.read(65536)
+                if len(data) == 0:
+                    break
+                msgs,buf = split_messages(buf + data)
+                for m in msgs:
+                    self._dispatch(decode_fields(m))
+                await self._writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.close()
+
+    def _dispatch(self, fields: List[str]):
+        self._server.requests_received += 1
+        msg_id = int(fields[0])
+        self._server.messages_received[msg_id] += 1
+        handler = self._handlers.get(msg_id)
+        if handler is None:
+            logger.debug(f"Ignoring unsupported message {fields}")
+            return
+        handler(iter(fields[1:]))
+
+    def _respond(self, f: Callable[[], None]):
+        if self._config.response_delay > 0:
+            asyncio.get_running_loop().call_later(self._config.response_delay, f)
+        else:
+            f()
+
+    def _stream(self, req_id: int, gen: Callable[[int], List[bytes]]):
+        self._cancel_stream(req_id)
+        self._streams[req_id] = asyncio.create_task(self._run_stream(gen))
+
+    def _cancel_stream(self, req_id: int):
+        t = self._streams.pop(req_id, None)
+        if t is not None:
+            t.cancel()
+
+    async def _run_stream(self, gen: Callable[[int], List[bytes]]):
+        """
+        Sends ticks at the configured rate. Ticks are sent in batches every TICK_INTERVAL seconds
+        since sleeping between individual ticks doesn't scale to high rates
+        """
+        loop = asyncio.get_running_loop()
+        seq = 0
+        start = loop.time()
+        while not self._writer.is_closing():
+            if self._config.tick_rate > 0:
+                due = math.floor((loop.time() - start) * self._config.tick_rate) + 1
+            else:
+                due = seq + 100
+            while seq < due and not self._writer.is_closing():
+                # Count before sending so the count includes every tick a client has received
+                self._server.ticks_sent += 1
+                for m in gen(seq):
+                    self._send(m)
+                seq += 1
+            await self._writer.drain()
+            if self._config.tick_rate > 0:
+                await asyncio.sleep(max(MockTwsSession.TICK_INTERVAL, 1 / self._config.tick_rate))
+            else:
+                await asyncio.sleep(0)
+
+    def _cancel(self, req: CancelRequest):
+        self._cancel_stream(req.req_id)
+
+    def _start_api(self, fields: Iterator[str]):
+        self._send(next_valid_id_msg(1))
+        self._send(managed_accounts_msg(self._config.managed_accounts))
+
+    def _req_ids(self, fields: Iterator[str]):
+        self._respond(lambda: self._send(next_valid_id_msg(1)))
+
+    def _req_current_time(self, fields: Iterator[str]):
+        self._respond(lambda: self._send(current_time_msg(int(time.time()))))
+
+    def _req_contract_details(self, fields: Iterator[str]):
+        req = ContractDetailsRequest(fields)
+        def respond():
+            if len(req.contract.symbol) == 0 and req.contract.con_id == 0:
+                self._send(error_msg(req.req_id, 200, "No security definition has been found for the request"))
+                return
+            self._send(contract_data_msg(req.req_id, req.contract))
+            self._send(contract_data_end_msg(req.req_id))
+        self._respond(respond)
+
+    def _req_historical_data(self, fields: Iterator[str]):
+        req = HistoricalDataRequest(fields)
+        def respond():
+            end = int(time.time()) // 60 * 60
+            count = self._config.bars_per_request
+            bars = []
+            for i in range(count):
+                t = end - (count - i) * 60
+                date = str(t) if req.format_date == 2 else time.strftime("%Y%m%d  %H:%M:%S", time.localtime(t))
+                price = 100 + (i % 50) * 0.01
+                bars.append((date, price, price + 0.05, price - 0.05, price + 0.01, 100 + i, price, 10))
+            self._send(historical_data_msg(req.req_id, str(end - count * 60), str(end), bars))
+        self._respond(respond)
+
+    def _req_mkt_data(self, fields: Iterator[str]):
+        req = MktDataRequest(fields)
+        def tick(seq: int) -> List[bytes]:
+            price = 100 + (seq % 100) * 0.01
+            tick_type = [ TickTypeEnum.BID, TickTypeEnum.ASK, TickTypeEnum.LAST ][seq % 3]
+            if tick_type == TickTypeEnum.ASK:
+                price += 0.01
+            return [ tick_price_msg(req.req_id, tick_type, price, 100 + seq % 10) ]
+        if req.snapshot:
+            def respond():
+                for i in range(3):
+                    for m in tick(i):
+                        self._send(m)
+                self._send(tick_snapshot_end_msg(req.req_id))
+            self._respond(respond)
+        else:
+            self._stream(req.req_id, tick)
+
+    def _req_tick_by_tick_data(self, fields: Iterator[str]):
+        req = TickByTickRequest(fields)
+        tick_type = TICK_BY_TICK_TYPES.get(req.tick_type)
+        if tick_type is None:
+            self._send(error_msg(req.req_id, 10190, f"Unsupported tick type {req.tick_type}"))
+            return
+        def tick(seq: int) -> List[bytes]:
+            t = int(time.time())
+            price = 100 + (seq % 100) * 0.01
+            if tick_type == TICK_BY_TICK_TYPES["BidAsk"]:
+                return [ tick_by_tick_bid_ask_msg(req.req_id, t, price, price + 0.01, 100, 200) ]
+            elif tick_type == TICK_BY_TICK_TYPES["MidPoint"]:
+                return [ tick_by_tick_mid_point_msg(req.req_id, t, price + 0.005) ]
+            else:
+                return [ tick_by_tick_last_msg(req.req_id, tick_type, t, price, 100, "NASDAQ") ]
+        self._stream(req.req_id, tick)
+
+class MockTwsServer():
+    """
+    A local stand-in for TWS that implements the socket protocol for a subset of requests:
+    the connection handshake, reqIds, reqCurrentTime, reqContractDetails, reqHistoricalData,
+    reqMktData and reqTickByTickData. Streaming requests send synthetic ticks at the
+    configured rate until they are cancelled.
+    """
+    config: MockTwsConfig
+    requests_received: int
+    # Number of messages received by message id (ibapi.message.OUT)
+    messages_received: Counter
+    ticks_sent: int
+
+    def __init__(self, config: MockTwsConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config if config is not None else MockTwsConfig()
+        self.host = host
+        self.port = port
+        self.requests_received = 0
+        self.messages_received = Counter()
+        self.ticks_sent = 0
+        self._server: asyncio.AbstractServer = None
+        self._loop: asyncio.AbstractEventLoop = None
+        self._thread: Thread = None
+        self._sessions: Set[MockTwsSession] = set()
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = MockTwsSession(self, reader, writer)
+        self._sessions.add(session)
+        try:
+            await session.run()
+        finally:
+            self._sessions.discard(session)
+
+    async def start(self):
+        """
+        Starts listening on the running event loop. When port is 0 a free port is picked,
+        which is available via the port member once this returns
+        """
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._on_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        for s in list(self._sessions):
+            s.close()
+        await self._server.wait_closed()
+
+    def start_in_thread(self):
+        """
+        Runs the server in a dedicated thread with its own event loop. Returns once the server is listening
+        """
+        started = Event()
+        loop = asyncio.new_event_loop()
+
+        async def serve():
+            await self.start()
+            started.set()
+            await self._server.serve_forever()
+
+        def run():
+            try:
+                loop.run_until_complete(serve())
+            except asyncio.CancelledError:
+                pass
+            finally:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+
+        self._thread = Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop_thread(self):
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._thread.join()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run a mock TWS server for local testing and benchmarking")
+    parser.add_argument("--port", "-p", dest='port', type=int, help="Port to listen on", default=7497)
+    parser.add_argument("--host", "-t", dest='host', help="Host to listen on", default="127.0.0.1")
+    parser.add_argument("--tick-rate", dest='tick_rate', type=float, help="Ticks per second for each subscription, 0 for unthrottled", default=1000)
+    parser.add_argument("--bars-per-request", dest='bars_per_request', type=int, help="Bars returned for each historical data request", default=100)
+    parser.add_argument("--response-delay", dest='response_delay', type=float, help="Seconds to wait before responding to queries", default=0)
+    parser.add_argument("--debug", "-d", dest='debug', action="store_true", help="Enable debug logging", default=False)
+    args = parser.parse_args()
+    logging.basicConfig(stream=sys.stdout, level=logging.DEBUG if args.debug else logging.INFO)
+
+    async def main():
+        server = MockTwsServer(MockTwsConfig(args.tick_rate, args.bars_per_request, args.response_delay), args.host, args.port)
+        await server.start()
+        logger.info(f"Mock TWS server listening on {server.host}:{server.port}")
+        await server._server.serve_forever()
+
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+from enum import Enum
+from ib_tws_server.util.historical_columns import HistoricalColumns
+from ib_tws_server.util.tuple_response import TupleResponse
+from operator import itemgetter
+from typing import Callable, Optional, Tuple
+
+class BarKind(Enum):
+    """
+    How a BarAggregator closes bars
+
+    TIME: Every `size` seconds, aligned to multiples of `size` since the epoch
+    VOLUME: Every `size` shares or contracts. Trades that cross the boundary are split between bars
+    TICKS: Every `size` ticks
+    """
+    TIME = 0
+    VOLUME = 1
+    TICKS = 2
+
+class AggregatedBar(TupleResponse):
+    """
+    A bar emitted by BarAggregator. time is the start of the bar in epoch seconds. vwap is the
+    volume weighted average price, or the average tick price for bars without volume
+    """
+    __slots__ = ()
+    _fields = ('time', 'open', 'high', 'low', 'close', 'volume', 'vwap', 'count')
+
+    def __new__(cls, time: float, open: float, high: float, low: float, close: float, volume: float, vwap: float, count: int):
+        return tuple.__new__(cls, (time, open, high, low, close, volume, vwap, count))
+
+    time = property(itemgetter(0))
+    open = property(itemgetter(1))
+    high = property(itemgetter(2))
+    low = property(itemgetter(3))
+    close = property(itemgetter(4))
+    volume = property(itemgetter(5))
+    vwap = property(itemgetter(6))
+    count = property(itemgetter(7))
+
+class AggregatedBarColumns(HistoricalColumns):
+    """
+    The bars emitted by a BarAggregator with keep_history set, in columns
+    """
+    COLUMNS = { 'time': 'd', 'open': 'd', 'high': 'd', 'low': 'd', 'close': 'd', 'volume': 'd', 'vwap': 'd', 'count': 'q' }
+
+    def __init__(self):
+        super().__init__(AggregatedBarColumns.COLUMNS)
+        self._appends = [ self.columns[n].append for n in AggregatedBarColumns.COLUMNS ]
+
+    def append(self, bar: AggregatedBar):
+        for a,v in zip(self._appends, bar):
+            a(v)
+
+def tick_price_size(tick: object) -> Tuple[float, float]:
+    """
+    Returns the price and size of a TickByTickAllLast, TickByTickBidAsk or TickByTickMidPoint
+    response. Quotes have the mid price and no size
+    """
+    price = getattr(tick, 'price', None)
+    if price is not None:
+        return price, tick.size
+    mid = getattr(tick, 'midPoint', None)
+    if mid is not None:
+        return mid, 0
+    return (tick.bidPrice + tick.askPrice) / 2, 0
+
+class BarAggregator():
+    """
+    Aggregates ticks into OHLCV and VWAP bars and calls `on_bar` with every completed bar. The
+    open bar is kept in scalars, so adding a tick doesn't allocate. Completed bars are appended
+    to the array columns of `history` if keep_history is set.
+
+    Time bars are closed by the first tick of a later bar or by flush, so a caller that wants
+    bars without waiting for the next tick calls flush when the bar ends. Intervals without
+    ticks have no bar. Volume bars need ticks with a size, i.e. AllLast ticks
+    """
+    kind: BarKind
+    size: float
+    history: Optional[AggregatedBarColumns]
+
+    def __init__(self, kind: BarKind, size: float, on_bar: Callable[[AggregatedBar], None], keep_history: bool = False):
+        if size <= 0:
+            raise ValueError("The bar size must be positive")
+        self.kind = kind
+        self.size = size
+        self.history = AggregatedBarColumns() if keep_history else None
+        self._on_bar = on_bar
+        self._count = 0
+        self._end: float = None
+
+    @property
+    def bar_end(self) -> Optional[float]:
+        """
+        End time of the open time bar, None if there is no open bar
+        """
+        return self._end if self._count > 0 else None
+
+    def add(self, price: float, size: float, timestamp: float):
+        if self.kind == BarKind.TIME:
+            if self._count > 0 and timestamp >= self._end:
+                self._emit()
+            if self._count == 0:
+                start = (timestamp // self.size) * self.size
+                self._end = start + self.size
+                self._open_bar(start, price)
+            self._add(price, size)
+        elif self.kind == BarKind.TICKS:
+            if self._count == 0:
+                self._open_bar(timestamp, price)
+            self._add(price, size)
+            if self._count >= self.size:
+                self._emit()
+        else:
+            while True:
+                if self._count == 0:
+                    self._open_bar(timestamp, price)
+                remaining = self.size - self._volume
+                if size < remaining:
+                    self._add(price, size)
+                    break
+                # Fill the bar and carry the rest of the trade over to the next one
+                self._add(price, remaining)
+                self._emit()
+                size -= remaining
+                if size <= 0:
+                    break
+
+    def flush(self, now: float):
+        """
+        Emits the open time bar if it ended at `now`
+        """
+        if self._count > 0 and self.kind == BarKind.TIME and now >= self._end:
+            self._emit()
+
+    def _open_bar(self, time: float, price: float):
+        self._time = time
+        self._open = self._high = self._low = price
+        self._volume = 0
+        self._price_volume = 0.0
+        self._price_sum = 0.0
+
+    def _add(self, price: float, size: float):
+        if price > self._high:
+            self._high = price
+        elif price < self._low:
+            self._low = price
+        self._close = price
+        self._volume += size
+        self._price_volume += price * size
+        self._price_sum += price
+        self._count += 1
+
+    def _emit(self):
+        vwap = self._price_volume / self._volume if self._volume > 0 else self._price_sum / self._count
+        bar = AggregatedBar(self._time, self._open, self._high, self._low, self._close, self._volume, vwap, self._count)
+        self._count = 0
+        if self.history is not None:
+            self.history.append(bar)
+        self._on_bar(bar)
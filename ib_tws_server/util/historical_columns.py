@@ -0,0 +1,180 @@
+from array import array
+from datetime import date
+from ib_tws_server.ib_imports import *
+from typing import Dict, List, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+Column = Union[array, List[str]]
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+class BarDateParser():
+    """
+    Converts BarData.date strings into epoch seconds. Bars have the format 'yyyymmdd' for daily
+    and larger bars, and 'yyyymmdd hh:mm:ss' with an optional time zone, or epoch seconds for
+    formatDate=2, for intraday bars. Dates and times of day are each parsed once and cached,
+    since bars of a request share a small set of them. Times with a time zone or in the TWS
+    login time zone are returned as if they were UTC, i.e. as wall clock time
+    """
+    def __init__(self):
+        self._days: Dict[str, int] = {}
+        self._times: Dict[str, int] = {}
+
+    def _day(self, s: str) -> int:
+        ret = self._days.get(s)
+        if ret is None:
+            ret = (date(int(s[0:4]), int(s[4:6]), int(s[6:8])).toordinal() - _EPOCH_ORDINAL) * 86400
+            self._days[s] = ret
+        return ret
+
+    def _time(self, s: str) -> int:
+        ret = self._times.get(s)
+        if ret is None:
+            ret = int(s[0:2]) * 3600 + int(s[3:5]) * 60 + int(s[6:8])
+            self._times[s] = ret
+        return ret
+
+    def parse(self, s: str) -> int:
+        if len(s) == 8:
+            return self._day(s)
+        parts = s.split()
+        if len(parts) == 1:
+            return int(s)
+        return self._day(parts[0]) + self._time(parts[1])
+
+class HistoricalColumns():
+    """
+    Base class of columnar historical data. Numeric columns are array.array buffers that grow
+    as responses arrive, so no object is kept per bar or tick. String columns are lists
+    """
+    # numpy dtype of a column, which defaults to the dtype of its type code
+    DTYPES: Dict[str, str] = {}
+
+    columns: Dict[str, Column]
+
+    def __init__(self, types: Dict[str, str]):
+        """
+        `types` maps the column names to array.array type codes, or None for string columns
+        """
+        self._types = types
+        self.columns = { n: array(t) if t is not None else [] for n,t in types.items() }
+
+    def __len__(self):
+        return len(self.columns['time'])
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def to_numpy(self) -> 'numpy.ndarray':
+        """
+        Returns the columns as a numpy structured array
+        """
+        if numpy is None:
+            raise ImportError("numpy is required to convert historical columns to numpy arrays")
+        dtypes = [ (n, self.DTYPES.get(n, numpy.dtype(t).str if t is not None else 'O')) for n,t in self._types.items() ]
+        ret = numpy.empty(len(self), dtype=dtypes)
+        for n,t in self._types.items():
+            c = self.columns[n]
+            ret[n] = numpy.frombuffer(c, dtype=t) if t is not None and len(c) > 0 else c
+        return ret
+
+class HistoricalBarColumns(HistoricalColumns):
+    """
+    Response of AsyncioClient.reqHistoricalDataColumnar. The time column holds the
+    bar dates in epoch seconds as parsed by BarDateParser
+    """
+    COLUMNS = { 'time': 'q', 'open': 'd', 'high': 'd', 'low': 'd', 'close': 'd', 'volume': 'd', 'barCount': 'q', 'average': 'd' }
+    DTYPES = { 'time': 'datetime64[s]' }
+
+    def __init__(self):
+        super().__init__(HistoricalBarColumns.COLUMNS)
+        self._parser = BarDateParser()
+        c = self.columns
+        self._time = c['time'].append
+        self._open = c['open'].append
+        self._high = c['high'].append
+        self._low = c['low'].append
+        self._close = c['close'].append
+        self._volume = c['volume'].append
+        self._bar_count = c['barCount'].append
+        self._average = c['average'].append
+
+    def append(self, bar: 'ibapi.common.BarData'):
+        """
+        Called by the wrapper for every bar
+        """
+        self._time(self._parser.parse(bar.date))
+        self._open(bar.open)
+        self._high(bar.high)
+        self._low(bar.low)
+        self._close(bar.close)
+        self._volume(bar.volume)
+        self._bar_count(bar.barCount)
+        self._average(bar.average)
+
+class HistoricalTickColumns(HistoricalColumns):
+    """
+    Response of AsyncioClient.reqHistoricalTicksColumnar. The columns depend on whatToShow:
+    time, price and size for MIDPOINT, time, priceBid, priceAsk, sizeBid, sizeAsk, bidPastLow and
+    askPastHigh for BID_ASK, and time, price, size, exchange, specialConditions, pastLimit and
+    unreported for TRADES. The time column holds epoch seconds
+    """
+    MIDPOINT_COLUMNS = { 'time': 'q', 'price': 'd', 'size': 'd' }
+    BID_ASK_COLUMNS = { 'time': 'q', 'priceBid': 'd', 'priceAsk': 'd', 'sizeBid': 'd', 'sizeAsk': 'd', 'bidPastLow': 'b', 'askPastHigh': 'b' }
+    TRADES_COLUMNS = { 'time': 'q', 'price': 'd', 'size': 'd', 'exchange': None, 'specialConditions': None, 'pastLimit': 'b', 'unreported': 'b' }
+    DTYPES = { 'time': 'datetime64[s]', 'bidPastLow': '?', 'askPastHigh': '?', 'pastLimit': '?', 'unreported': '?' }
+
+    def __init__(self):
+        # The columns are replaced when the first ticks are of another type
+        super().__init__(HistoricalTickColumns.MIDPOINT_COLUMNS)
+
+    def append(self, res: object):
+        """
+        Called by the wrapper with the ticks of every historicalTicks, historicalTicksBidAsk
+        and historicalTicksLast callback
+        """
+        ticks = res.ticks
+        if len(ticks) == 0:
+            return
+        if isinstance(ticks[0], ibapi.common.HistoricalTickBidAsk):
+            self._reset_columns(HistoricalTickColumns.BID_ASK_COLUMNS)
+            self._append_bid_ask(ticks)
+        elif isinstance(ticks[0], ibapi.common.HistoricalTickLast):
+            self._reset_columns(HistoricalTickColumns.TRADES_COLUMNS)
+            self._append_last(ticks)
+        else:
+            self._append_midpoint(ticks)
+
+    def _reset_columns(self, types: Dict[str, str]):
+        if self._types is not types and len(self) == 0:
+            super().__init__(types)
+
+    def _append_midpoint(self, ticks: List['ibapi.common.HistoricalTick']):
+        c = self.columns
+        c['time'].extend([ t.time for t in ticks ])
+        c['price'].extend([ t.price for t in ticks ])
+        c['size'].extend([ t.size for t in ticks ])
+
+    def _append_bid_ask(self, ticks: List['ibapi.common.HistoricalTickBidAsk']):
+        c = self.columns
+        c['time'].extend([ t.time for t in ticks ])
+        c['priceBid'].extend([ t.priceBid for t in ticks ])
+        c['priceAsk'].extend([ t.priceAsk for t in ticks ])
+        c['sizeBid'].extend([ t.sizeBid for t in ticks ])
+        c['sizeAsk'].extend([ t.sizeAsk for t in ticks ])
+        c['bidPastLow'].extend([ t.tickAttribBidAsk.bidPastLow for t in ticks ])
+        c['askPastHigh'].extend([ t.tickAttribBidAsk.askPastHigh for t in ticks ])
+
+    def _append_last(self, ticks: List['ibapi.common.HistoricalTickLast']):
+        c = self.columns
+        c['time'].extend([ t.time for t in ticks ])
+        c['price'].extend([ t.price for t in ticks ])
+        c['size'].extend([ t.size for t in ticks ])
+        c['exchange'].extend([ t.exchange for t in ticks ])
+        c['specialConditions'].extend([ t.specialConditions for t in ticks ])
+        c['pastLimit'].extend([ t.tickAttribLast.pastLimit for t in ticks ])
+        c['unreported'].extend([ t.tickAttribLast.unreported for t in ticks ])
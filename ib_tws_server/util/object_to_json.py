@@ -1,4 +1,56 @@
 import json
+from ib_tws_server.util.tuple_response import TupleResponse
+from typing import Any, Callable, Dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_serializers: Dict[type, Callable[[Any], dict]] = None
+
+def serializers() -> Dict[type, Callable[[Any], dict]]:
+    """
+    The serializers generated for the response classes and the ibapi classes of the GraphQL
+    schema, by class. Empty if the code hasn't been generated
+    """
+    global _serializers
+    if _serializers is None:
+        try:
+            from ib_tws_server.gen.serializers import SERIALIZERS
+            _serializers = SERIALIZERS
+        except ImportError:
+            _serializers = {}
+    return _serializers
+
+def to_json_value(o: Any) -> Any:
+    """
+    Converts an object into dicts, lists and values that the json module encodes without a
+    default function. Objects of classes with a generated serializer are converted by their
+    field list, other objects by their __dict__
+    """
+    if o is None or isinstance(o, (str, int, float)):
+        return o
+    s = serializers().get(type(o))
+    if s is not None:
+        return s(o)
+    if isinstance(o, TupleResponse):
+        return { k: to_json_value(v) for k,v in zip(o._fields, o) }
+    if isinstance(o, (list, tuple, set, frozenset)):
+        if len(o) == 0:
+            return []
+        # Responses are usually lists of one class, so look up the serializer once
+        first = type(next(iter(o)))
+        s = serializers().get(first)
+        if s is None:
+            return [ to_json_value(v) for v in o ]
+        return [ s(v) if type(v) is first else to_json_value(v) for v in o ]
+    if isinstance(o, dict):
+        return { k: to_json_value(v) for k,v in o.items() }
+    d = getattr(o, '__dict__', None)
+    if d is not None:
+        return { k: to_json_value(v) for k,v in d.items() }
+    return o
 
 class JsonEncoder(json.JSONEncoder):
     """
@@ -9,8 +61,20 @@ class JsonEncoder(json.JSONEncoder):
             return list(o)
         return o.__dict__
 
+    def iterencode(self, o, _one_shot=False):
+        return super().iterencode(to_json_value(o), _one_shot)
+
 def object_to_json(o):
-    return json.dumps(o, cls=JsonEncoder)
+    return json.dumps(to_json_value(o))
+
+def object_to_json_bytes(o) -> bytes:
+    """
+    Compact UTF-8 JSON encoding of a response, e.g. a list of BarData. Uses orjson if it's
+    installed, which encodes nan and infinity as null instead of NaN and Infinity
+    """
+    if orjson is not None:
+        return orjson.dumps(to_json_value(o), option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(to_json_value(o), separators=(',', ':'), ensure_ascii=False).encode()
 
 def object_to_pretty_json(o):
-    return json.dumps(o, cls=JsonEncoder, indent="    ")
+    return json.dumps(to_json_value(o), indent="    ")
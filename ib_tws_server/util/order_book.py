@@ -0,0 +1,165 @@
+from array import array
+from typing import List, Optional, Tuple
+
+# Values of the side and operation members of UpdateMktDepth and UpdateMktDepthL2
+SIDE_ASK = 0
+SIDE_BID = 1
+OPERATION_INSERT = 0
+OPERATION_UPDATE = 1
+OPERATION_DELETE = 2
+
+Level = Tuple[float, float]
+
+class OrderBookSide():
+    """
+    The rows of one side of an order book, best price first. Prices and sizes are kept in
+    array.array buffers that are allocated once with room for max_rows rows. Inserts and
+    deletes shift the rows below the position in place, so applying an update allocates nothing
+    """
+    max_rows: int
+    prices: array
+    sizes: array
+    # Market makers of L2 updates, None for rows from UpdateMktDepth
+    market_makers: List[Optional[str]]
+    count: int
+
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+        self.prices = array('d', [ 0.0 ]) * max_rows
+        self.sizes = array('d', [ 0.0 ]) * max_rows
+        self.market_makers = [ None ] * max_rows
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, position: int, price: float, size: float, market_maker: str = None):
+        if position >= self.max_rows:
+            return
+        position = min(position, self.count)
+        # The last row falls off a full book
+        end = min(self.count, self.max_rows - 1)
+        if position < end:
+            self.prices[position + 1:end + 1] = self.prices[position:end]
+            self.sizes[position + 1:end + 1] = self.sizes[position:end]
+            self.market_makers[position + 1:end + 1] = self.market_makers[position:end]
+        self._set(position, price, size, market_maker)
+        self.count = end + 1
+
+    def update(self, position: int, price: float, size: float, market_maker: str = None):
+        if position >= self.max_rows:
+            return
+        self._set(position, price, size, market_maker)
+        if position >= self.count:
+            self.count = position + 1
+
+    def delete(self, position: int):
+        if position >= self.count:
+            return
+        end = self.count - 1
+        if position < end:
+            self.prices[position:end] = self.prices[position + 1:end + 1]
+            self.sizes[position:end] = self.sizes[position + 1:end + 1]
+            self.market_makers[position:end] = self.market_makers[position + 1:end + 1]
+        self._set(end, 0.0, 0.0, None)
+        self.count = end
+
+    def clear(self):
+        for i in range(self.count):
+            self._set(i, 0.0, 0.0, None)
+        self.count = 0
+
+    def _set(self, position: int, price: float, size: float, market_maker: Optional[str]):
+        self.prices[position] = price
+        self.sizes[position] = size
+        self.market_makers[position] = market_maker
+
+    def best_price(self) -> Optional[float]:
+        return self.prices[0] if self.count > 0 else None
+
+    def levels(self, n: int = None) -> List[Level]:
+        """
+        Returns the price and size of the first n rows, or of all rows if n is None
+        """
+        k = self.count if n is None else min(n, self.count)
+        return list(zip(self.prices[:k], self.sizes[:k]))
+
+class OrderBookSnapshot():
+    """
+    Copy of the first rows of an OrderBook at a version
+    """
+    version: int
+    bids: List[Level]
+    asks: List[Level]
+
+    def __init__(self, version: int, bids: List[Level], asks: List[Level]):
+        self.version = version
+        self.bids = bids
+        self.asks = asks
+
+class OrderBook():
+    """
+    Order book maintained from the UpdateMktDepth and UpdateMktDepthL2 responses of reqMktDepth.
+    apply changes the rows in place and increments version, so readers can tell whether the
+    book changed since they last looked without replaying the updates
+    """
+    bids: OrderBookSide
+    asks: OrderBookSide
+    version: int
+
+    def __init__(self, num_rows: int):
+        self.bids = OrderBookSide(num_rows)
+        self.asks = OrderBookSide(num_rows)
+        self.version = 0
+        # Readers of the same version share a snapshot
+        self._snapshot: OrderBookSnapshot = None
+        self._snapshot_rows: int = None
+
+    def apply(self, update: object):
+        """
+        Applies an UpdateMktDepth or UpdateMktDepthL2 response
+        """
+        side = self.bids if update.side == SIDE_BID else self.asks
+        op = update.operation
+        if op == OPERATION_INSERT:
+            side.insert(update.position, update.price, update.size, getattr(update, 'marketMaker', None))
+        elif op == OPERATION_UPDATE:
+            side.update(update.position, update.price, update.size, getattr(update, 'marketMaker', None))
+        elif op == OPERATION_DELETE:
+            side.delete(update.position)
+        else:
+            return
+        self.version += 1
+
+    def clear(self):
+        self.bids.clear()
+        self.asks.clear()
+        self.version += 1
+
+    def best_bid(self) -> Optional[float]:
+        return self.bids.best_price()
+
+    def best_ask(self) -> Optional[float]:
+        return self.asks.best_price()
+
+    def mid(self) -> Optional[float]:
+        if self.bids.count == 0 or self.asks.count == 0:
+            return None
+        return (self.bids.prices[0] + self.asks.prices[0]) / 2
+
+    def spread(self) -> Optional[float]:
+        if self.bids.count == 0 or self.asks.count == 0:
+            return None
+        return self.asks.prices[0] - self.bids.prices[0]
+
+    def snapshot(self, n: int = None) -> OrderBookSnapshot:
+        """
+        Returns the first n rows of each side, or all rows if n is None. Snapshots are shared
+        by callers until the book changes, so they must not be modified
+        """
+        s = self._snapshot
+        if s is not None and s.version == self.version and self._snapshot_rows == n:
+            return s
+        s = self._snapshot = OrderBookSnapshot(self.version, self.bids.levels(n), self.asks.levels(n))
+        self._snapshot_rows = n
+        return s
@@ -0,0 +1,37 @@
+import json
+from typing import Any, Hashable
+
+def canonical_key(o: any) -> Hashable:
+    """
+    Converts request arguments into a hashable value such that arguments that are equal
+    by value map to equal keys. TWS API objects like ibapi.contract.Contract don't implement
+    __eq__ or __hash__, so objects are compared by their class and their members.
+    """
+    if o is None or isinstance(o, (str, int, float, bool, bytes)):
+        return o
+    if isinstance(o, (list, tuple)):
+        return tuple(canonical_key(v) for v in o)
+    if isinstance(o, (set, frozenset)):
+        return frozenset(canonical_key(v) for v in o)
+    if isinstance(o, dict):
+        return tuple(sorted((k, canonical_key(v)) for k,v in o.items()))
+    if hasattr(o, '__dict__'):
+        return (o.__class__.__qualname__,) + tuple(sorted((k, canonical_key(v)) for k,v in o.__dict__.items()))
+    if hasattr(o, '__slots__'):
+        return (o.__class__.__qualname__,) + tuple((k, canonical_key(getattr(o, k, None))) for k in o.__slots__)
+    return o
+
+def _json_value(key: Hashable) -> Any:
+    if isinstance(key, tuple):
+        return [ _json_value(v) for v in key ]
+    if isinstance(key, frozenset):
+        # The iteration order of sets depends on the hash seed of the process
+        return { 'set': sorted((_json_value(v) for v in key), key=lambda v: json.dumps(v, default=repr)) }
+    return key
+
+def serialize_key(key: Hashable) -> str:
+    """
+    Serializes a key returned by canonical_key into a string that is the same for equal keys
+    in every process, e.g. to persist it
+    """
+    return json.dumps(_json_value(key), separators=(',', ':'), default=repr)
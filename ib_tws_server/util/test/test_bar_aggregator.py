@@ -0,0 +1,44 @@
+from ib_tws_server.util.bar_aggregator import AggregatedBar, BarAggregator, BarKind, tick_price_size
+from unittest import TestCase
+
+class Tick():
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+class TestBarAggregator(TestCase):
+    def test_time_bars(self):
+        bars = []
+        a = BarAggregator(BarKind.TIME, 0.5, bars.append, keep_history=True)
+        a.add(10.0, 100, 100.1)
+        a.add(12.0, 100, 100.2)
+        a.add(9.0, 200, 100.4)
+        a.add(11.0, 100, 100.5)
+        self.assertEqual(bars, [ AggregatedBar(100.0, 10.0, 12.0, 9.0, 9.0, 400, 10.0, 3) ])
+        a.flush(100.9)
+        self.assertEqual(len(bars), 1)
+        a.flush(101.0)
+        self.assertEqual(bars[1], AggregatedBar(100.5, 11.0, 11.0, 11.0, 11.0, 100, 11.0, 1))
+        self.assertEqual(list(a.history['close']), [ 9.0, 11.0 ])
+        self.assertIsNone(a.bar_end)
+
+    def test_volume_bars_split_trades(self):
+        bars = []
+        a = BarAggregator(BarKind.VOLUME, 100, bars.append)
+        a.add(10.0, 60, 1)
+        a.add(11.0, 190, 2)
+        self.assertEqual([ (b.volume, b.close) for b in bars ], [ (100, 11.0), (100, 11.0) ])
+        self.assertAlmostEqual(bars[0].vwap, 10.4)
+        a.add(12.0, 50, 3)
+        self.assertEqual(bars[2], AggregatedBar(2, 11.0, 12.0, 11.0, 12.0, 100, 11.5, 2))
+
+    def test_tick_bars_without_volume(self):
+        bars = []
+        a = BarAggregator(BarKind.TICKS, 2, bars.append)
+        for i,(bid,ask) in enumerate([ (1.0, 2.0), (2.0, 3.0), (3.0, 4.0) ]):
+            price,size = tick_price_size(Tick(time=0, bidPrice=bid, askPrice=ask, bidSize=1, askSize=1))
+            a.add(price, size, i)
+        self.assertEqual(bars, [ AggregatedBar(0, 1.5, 2.5, 1.5, 2.5, 0, 2.0, 2) ])
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            BarAggregator(BarKind.TIME, 0, print)
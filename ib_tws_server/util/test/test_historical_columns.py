@@ -0,0 +1,86 @@
+from ib_tws_server.ib_imports import *
+from ib_tws_server.util.historical_columns import BarDateParser, HistoricalBarColumns, HistoricalTickColumns
+from unittest import TestCase, skipIf
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class Ticks():
+    def __init__(self, ticks):
+        self.ticks = ticks
+
+def bar(date: str, close: float) -> 'ibapi.common.BarData':
+    b = ibapi.common.BarData()
+    b.date = date
+    b.open = b.high = b.low = b.average = b.close = close
+    b.volume = 100
+    b.barCount = 10
+    return b
+
+class TestBarDateParser(TestCase):
+    def test_formats(self):
+        p = BarDateParser()
+        self.assertEqual(p.parse("20240102"), 1704153600)
+        self.assertEqual(p.parse("20240102 09:30:00"), 1704153600 + 34200)
+        self.assertEqual(p.parse("20240102  09:30:00"), 1704153600 + 34200)
+        self.assertEqual(p.parse("20240102 09:30:00 US/Eastern"), 1704153600 + 34200)
+        self.assertEqual(p.parse("1704187800"), 1704187800)
+
+class TestHistoricalColumns(TestCase):
+    def test_bars(self):
+        c = HistoricalBarColumns()
+        c.append(bar("20240102 09:30:00", 100.5))
+        c.append(bar("20240102 09:31:00", 101.5))
+        self.assertEqual(len(c), 2)
+        self.assertEqual(list(c['time']), [ 1704187800, 1704187860 ])
+        self.assertEqual(list(c['close']), [ 100.5, 101.5 ])
+        self.assertEqual(list(c['barCount']), [ 10, 10 ])
+
+    def test_midpoint_ticks(self):
+        t = ibapi.common.HistoricalTick()
+        t.time = 1704187800
+        t.price = 100.5
+        t.size = 0
+        c = HistoricalTickColumns()
+        c.append(Ticks([ t, t ]))
+        self.assertEqual(len(c), 2)
+        self.assertEqual(list(c['price']), [ 100.5, 100.5 ])
+
+    def test_trade_ticks(self):
+        t = ibapi.common.HistoricalTickLast()
+        t.time = 1704187800
+        t.price = 100.5
+        t.size = 200
+        t.exchange = "NASDAQ"
+        t.tickAttribLast.unreported = True
+        c = HistoricalTickColumns()
+        c.append(Ticks([]))
+        c.append(Ticks([ t ]))
+        self.assertEqual(list(c['exchange']), [ "NASDAQ" ])
+        self.assertEqual(list(c['unreported']), [ 1 ])
+        self.assertEqual(list(c['size']), [ 200 ])
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_to_numpy(self):
+        c = HistoricalBarColumns()
+        c.append(bar("20240102 09:30:00", 100.5))
+        a = c.to_numpy()
+        self.assertEqual(a['time'][0], numpy.datetime64('2024-01-02T09:30:00'))
+        self.assertEqual(a['close'][0], 100.5)
+        self.assertEqual(len(HistoricalTickColumns().to_numpy()), 0)
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_bid_ask_to_numpy(self):
+        t = ibapi.common.HistoricalTickBidAsk()
+        t.time = 1704187800
+        t.priceBid = 100.5
+        t.priceAsk = 100.6
+        t.tickAttribBidAsk.askPastHigh = True
+        c = HistoricalTickColumns()
+        c.append(Ticks([ t ]))
+        a = c.to_numpy()
+        self.assertEqual(a['priceAsk'][0], 100.6)
+        self.assertTrue(a['askPastHigh'][0])
+        self.assertFalse(a['bidPastLow'][0])
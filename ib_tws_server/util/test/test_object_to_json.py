@@ -0,0 +1,61 @@
+from ib_tws_server.ib_imports import *
+from ib_tws_server.util.object_to_json import object_to_json, object_to_json_bytes, object_to_pretty_json, serializers, to_json_value
+from ib_tws_server.util.tuple_response import TupleResponse
+import json
+from operator import itemgetter
+from unittest import TestCase, skipIf
+
+class TickSize(TupleResponse):
+    __slots__ = ()
+    _fields = ('tickType', 'size', )
+
+    def __new__(cls, tickType: 'int'= None, size: 'int'= None):
+        return tuple.__new__(cls, (tickType, size, ))
+
+    tickType: 'int' = property(itemgetter(0))
+    size: 'int' = property(itemgetter(1))
+
+class Holder():
+    def __init__(self, values):
+        self.values = values
+        self.tick = TickSize(1, 2)
+
+def contract_details() -> 'ibapi.contract.ContractDetails':
+    d = ibapi.contract.ContractDetails()
+    d.contract.symbol = "AAPL"
+    d.contract.comboLegs = [ ibapi.contract.ComboLeg() ]
+    d.secIdList = [ "ISIN" ]
+    return d
+
+class TestObjectToJson(TestCase):
+    def test_objects_without_serializer(self):
+        o = Holder({ 1: [ TickSize(0, 100) ] })
+        self.assertEqual(to_json_value(o), { 'values': { 1: [ { 'tickType': 0, 'size': 100 } ] }, 'tick': { 'tickType': 1, 'size': 2 } })
+        self.assertEqual(to_json_value([ 1, "a", None ]), [ 1, "a", None ])
+        self.assertEqual(sorted(to_json_value({ 1.5, 2.5 })), [ 1.5, 2.5 ])
+
+    def test_json_bytes_are_compact(self):
+        self.assertEqual(json.loads(object_to_json_bytes([ TickSize(0, 100) ])), [ { 'tickType': 0, 'size': 100 } ])
+        self.assertNotIn(b" ", object_to_json_bytes([ TickSize(0, 100) ]))
+
+    @skipIf(len(serializers()) == 0, "The code hasn't been generated")
+    def test_generated_serializers_match_instance_dict(self):
+        b = ibapi.common.BarData()
+        b.date = "20200102 09:30:00"
+        b.close = 10.5
+        self.assertIs(to_json_value(b), b.__dict__)
+        d = contract_details()
+        expected = dict(d.__dict__, contract=dict(d.contract.__dict__, comboLegs=[ d.contract.comboLegs[0].__dict__ ], deltaNeutralContract=None))
+        self.assertEqual(to_json_value([ d, d ]), [ expected, expected ])
+        self.assertEqual(json.loads(object_to_json(d)), json.loads(json.dumps(expected)))
+
+    @skipIf(len(serializers()) == 0, "The code hasn't been generated")
+    def test_list_items_of_other_types_than_the_hint(self):
+        """TWS fills ContractDetails.secIdList, a list of strings in the schema, with TagValues"""
+        d = contract_details()
+        d.secIdList = [ ibapi.tag_value.TagValue("ISIN", "US0378331005") ]
+        expected = [ { 'tag': "ISIN", 'value': "US0378331005" } ]
+        self.assertEqual(to_json_value(d)['secIdList'], expected)
+        self.assertEqual(json.loads(object_to_json(d))['secIdList'], expected)
+        self.assertEqual(json.loads(object_to_pretty_json(d))['secIdList'], expected)
+        self.assertEqual(json.loads(object_to_json_bytes(d))['secIdList'], expected)
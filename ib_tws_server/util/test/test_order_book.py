@@ -0,0 +1,59 @@
+from ib_tws_server.util.order_book import OrderBook, OPERATION_DELETE, OPERATION_INSERT, OPERATION_UPDATE, SIDE_ASK, SIDE_BID
+from unittest import TestCase
+
+class Update():
+    def __init__(self, position: int, operation: int, side: int, price: float = 0.0, size: float = 0.0):
+        self.position = position
+        self.operation = operation
+        self.side = side
+        self.price = price
+        self.size = size
+
+class UpdateL2(Update):
+    def __init__(self, position: int, marketMaker: str, operation: int, side: int, price: float = 0.0, size: float = 0.0):
+        super().__init__(position, operation, side, price, size)
+        self.marketMaker = marketMaker
+
+class TestOrderBook(TestCase):
+    def test_insert_update_delete(self):
+        b = OrderBook(5)
+        b.apply(Update(0, OPERATION_INSERT, SIDE_BID, 100.0, 1))
+        b.apply(Update(0, OPERATION_INSERT, SIDE_BID, 100.5, 2))
+        b.apply(Update(2, OPERATION_INSERT, SIDE_BID, 99.5, 3))
+        b.apply(Update(0, OPERATION_INSERT, SIDE_ASK, 101.0, 4))
+        self.assertEqual(b.bids.levels(), [ (100.5, 2), (100.0, 1), (99.5, 3) ])
+        b.apply(Update(1, OPERATION_UPDATE, SIDE_BID, 100.0, 10))
+        b.apply(Update(0, OPERATION_DELETE, SIDE_BID))
+        self.assertEqual(b.bids.levels(), [ (100.0, 10), (99.5, 3) ])
+        self.assertEqual(b.asks.levels(), [ (101.0, 4) ])
+        self.assertEqual(b.version, 6)
+
+    def test_full_side_drops_the_last_row(self):
+        b = OrderBook(2)
+        for p in [ 1.0, 2.0, 3.0 ]:
+            b.apply(Update(0, OPERATION_INSERT, SIDE_ASK, p, 1))
+        self.assertEqual(b.asks.levels(), [ (3.0, 1), (2.0, 1) ])
+        b.apply(Update(2, OPERATION_INSERT, SIDE_ASK, 4.0, 1))
+        b.apply(Update(5, OPERATION_DELETE, SIDE_ASK))
+        self.assertEqual(len(b.asks), 2)
+
+    def test_market_makers_follow_their_rows(self):
+        b = OrderBook(3)
+        b.apply(UpdateL2(0, "ARCA", OPERATION_INSERT, SIDE_BID, 10.0, 1))
+        b.apply(UpdateL2(0, "NSDQ", OPERATION_INSERT, SIDE_BID, 10.1, 1))
+        self.assertEqual(b.bids.market_makers[:2], [ "NSDQ", "ARCA" ])
+        b.apply(UpdateL2(0, "NSDQ", OPERATION_DELETE, SIDE_BID))
+        self.assertEqual(b.bids.market_makers, [ "ARCA", None, None ])
+
+    def test_mid_spread_and_snapshot(self):
+        b = OrderBook(3)
+        self.assertIsNone(b.mid())
+        b.apply(Update(0, OPERATION_INSERT, SIDE_BID, 99.0, 1))
+        b.apply(Update(1, OPERATION_INSERT, SIDE_BID, 98.0, 2))
+        b.apply(Update(0, OPERATION_INSERT, SIDE_ASK, 101.0, 3))
+        self.assertEqual(b.mid(), 100.0)
+        self.assertEqual(b.spread(), 2.0)
+        s = b.snapshot(1)
+        b.apply(Update(0, OPERATION_DELETE, SIDE_BID))
+        self.assertEqual((s.version, s.bids, s.asks), (3, [ (99.0, 1) ], [ (101.0, 3) ]))
+        self.assertEqual(b.best_bid(), 98.0)
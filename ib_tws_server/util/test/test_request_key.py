@@ -0,0 +1,27 @@
+from ib_tws_server.util.request_key import canonical_key, serialize_key
+from ib_tws_server.ib_imports import *
+from ib_tws_server.mock.contracts import contract_for_symbol
+from unittest import TestCase
+
+class TestRequestKey(TestCase):
+    def test_equal_contracts_have_equal_keys(self):
+        self.assertEqual(canonical_key(contract_for_symbol("AMZN")), canonical_key(contract_for_symbol("AMZN")))
+        self.assertEqual(hash(canonical_key(contract_for_symbol("AMZN"))), hash(canonical_key(contract_for_symbol("AMZN"))))
+        self.assertNotEqual(canonical_key(contract_for_symbol("AMZN")), canonical_key(contract_for_symbol("MSFT")))
+
+    def test_nested_values(self):
+        a = contract_for_symbol("AMZN")
+        b = contract_for_symbol("AMZN")
+        leg = ibapi.contract.ComboLeg()
+        leg.conId = 1
+        a.comboLegs = [ leg ]
+        self.assertNotEqual(canonical_key(("reqContractDetails", a)), canonical_key(("reqContractDetails", b)))
+        b.comboLegs = [ ibapi.contract.ComboLeg() ]
+        b.comboLegs[0].conId = 1
+        self.assertEqual(canonical_key(("reqContractDetails", a)), canonical_key(("reqContractDetails", b)))
+        self.assertEqual(canonical_key({ "b": [1, 2], "a": None }), canonical_key({ "a": None, "b": (1, 2) }))
+
+    def test_serialized_keys_are_deterministic(self):
+        self.assertEqual(serialize_key(canonical_key(("req", { "b", "a", "c" }))), '["req",{"set":["a","b","c"]}]')
+        self.assertEqual(serialize_key(canonical_key(("req", contract_for_symbol("AMZN")))), serialize_key(canonical_key(("req", contract_for_symbol("AMZN")))))
+        self.assertNotEqual(serialize_key(canonical_key(("req", 1))), serialize_key(canonical_key(("req", "1"))))
@@ -0,0 +1,55 @@
+from ib_tws_server.util.object_to_json import object_to_json
+from ib_tws_server.util.tuple_response import TupleResponse
+from operator import itemgetter
+import pickle
+from unittest import TestCase
+
+class TickPrice(TupleResponse):
+    """
+    The shape of a class generated with --response-classes tuple
+    """
+    __slots__ = ()
+    _fields = ('tickType', 'price', 'attrib', )
+
+    def __new__(cls, tickType: 'int'= None, price: 'float'= None, attrib: 'object'= None):
+        return tuple.__new__(cls, (tickType, price, attrib, ))
+
+    tickType: 'int' = property(itemgetter(0))
+    price: 'float' = property(itemgetter(1))
+    attrib: 'object' = property(itemgetter(2))
+
+class TickSize(TupleResponse):
+    __slots__ = ()
+    _fields = ('tickType', 'size', )
+
+    def __new__(cls, tickType: 'int'= None, size: 'int'= None):
+        return tuple.__new__(cls, (tickType, size, ))
+
+    tickType: 'int' = property(itemgetter(0))
+    size: 'int' = property(itemgetter(1))
+
+class TestTupleResponse(TestCase):
+    def test_members(self):
+        t = TickPrice(1, 100.5)
+        self.assertEqual(t.tickType, 1)
+        self.assertEqual(t.price, 100.5)
+        self.assertIsNone(t.attrib)
+        self.assertEqual(t, TickPrice(tickType=1, price=100.5))
+        self.assertFalse(hasattr(t, '__dict__'))
+        self.assertEqual(repr(t), "TickPrice(tickType=1, price=100.5, attrib=None)")
+
+    def test_immutable(self):
+        t = TickPrice(1, 100.5)
+        with self.assertRaises(AttributeError):
+            t.price = 101
+
+    def test_different_classes_are_not_equal(self):
+        self.assertNotEqual(TickPrice(1, 2), TickSize(1, 2))
+        self.assertNotEqual(TickPrice(1, 2, None), (1, 2, None))
+
+    def test_pickle(self):
+        t = TickPrice(1, 100.5)
+        self.assertEqual(pickle.loads(pickle.dumps(t)), t)
+
+    def test_json(self):
+        self.assertEqual(object_to_json([ TickSize(0, 100) ]), '[{"tickType": 0, "size": 100}]')
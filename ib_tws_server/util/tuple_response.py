@@ -0,0 +1,28 @@
+from typing import Dict, Tuple
+
+class TupleResponse(tuple):
+    """
+    Base class of the response classes generated in the tuple mode of ResponseTypesGenerator.
+    Members are stored in the tuple and exposed as read only properties, which avoids a
+    __dict__ per instance and makes construction a single tuple allocation. Subclasses
+    list their members in _fields.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({', '.join([ f'{n}={v!r}' for n,v in zip(self._fields, self) ])})"
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = tuple.__hash__
+
+    def _asdict(self) -> Dict[str, object]:
+        return dict(zip(self._fields, self))